@@ -9,6 +9,9 @@ from abc import ABCMeta, abstractmethod
 from typing import Optional
 
 from fedbiomed.common.constants import (
+    DEFAULT_COMPRESSION_THRESHOLD,
+    DEFAULT_GRPC_MAX_MESSAGE_LENGTH,
+    MAX_MESSAGE_BYTES_LENGTH,
     ErrorNumbers,
     MPSPDZ_certificate_prefix,
     CONFIG_FOLDER_NAME,
@@ -82,10 +85,17 @@ class Config(metaclass=ABCMeta):
 
         return True
 
-    def get(self, section, key) -> str:
-        """Returns value for given ket and section"""
+    def get(self, section, key, **kwargs) -> str:
+        """Returns value for given ket and section
 
-        return self._cfg.get(section, key)
+        Args:
+            section: section of the config
+            key: key of the value in the section
+            **kwargs: passed to `ConfigParser.get`, eg `fallback` value for keys
+                missing from config files generated by previous versions
+        """
+
+        return self._cfg.get(section, key, **kwargs)
 
     def sections(self) -> list:
         """Returns sections of the config"""
@@ -146,6 +156,21 @@ class Config(metaclass=ABCMeta):
             )
         }
 
+        # Compression and chunking of the messages exchanged by the researcher and the nodes
+        self._cfg['transport'] = {
+            'compression': os.getenv('COMPRESSION_CODEC', 'none'),
+            'compression_threshold': os.getenv('COMPRESSION_THRESHOLD', DEFAULT_COMPRESSION_THRESHOLD),
+            'compression_shuffle': os.getenv('COMPRESSION_SHUFFLE', False),
+            'chunk_size': os.getenv('CHUNK_SIZE', MAX_MESSAGE_BYTES_LENGTH),
+            'max_message_length': os.getenv('GRPC_MAX_MESSAGE_LENGTH', DEFAULT_GRPC_MAX_MESSAGE_LENGTH),
+            'flow_control_window': os.getenv('GRPC_FLOW_CONTROL_WINDOW', 0),
+        }
+
+        # Number of processes encrypting or decrypting secure aggregation vectors, 0 for the number of CPUs
+        self._cfg['secagg'] = {
+            'workers': os.getenv('SECAGG_WORKERS', 1),
+        }
+
         # Calls child class add_parameterss
         self.add_parameters()
 
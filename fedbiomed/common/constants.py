@@ -68,9 +68,15 @@ __messaging_protocol_version__ = FBM_Component_Version('2')  # format of gRPC me
 
 
 
-# Max message length as bytes
+# Max message length as bytes, default size of the chunks of the messages
 MAX_MESSAGE_BYTES_LENGTH = 4000000 - sys.getsizeof(bytes("", encoding="UTF-8")) # 4MB 
 
+# Default maximum length as bytes of the gRPC messages sent and received
+DEFAULT_GRPC_MAX_MESSAGE_LENGTH = 100 * 1024 * 1024
+
+# Messages smaller than this length as bytes are not compressed
+DEFAULT_COMPRESSION_THRESHOLD = 64 * 1024
+
 
 
 class _BaseEnum(Enum):
@@ -141,6 +147,36 @@ class HashingAlgorithms(_BaseEnum):
     BLAKE2S = 'BLAKE2S'
 
 
+class ParamsDeltaMode(_BaseEnum):
+    """Enumeration class, used to characterize how model parameters are sent to nodes that hold
+    a previous version of the model
+
+    Attributes:
+        NONE: parameters are always sent in full
+        DIFF: lossless delta against the previous version
+        QUANTIZED: delta against the previous version quantized on 8 bits (lossy)
+    """
+
+    NONE = 'none'
+    DIFF = 'diff'
+    QUANTIZED = 'quantized'
+
+
+class TransportPrecision(_BaseEnum):
+    """Enumeration class, used to characterize the precision of floating point model parameters
+    exchanged between researcher and nodes
+
+    Attributes:
+        FP16: parameters are cast to IEEE half precision
+        BF16: parameters are cast to bfloat16, with the range of single precision
+        INT8: parameters are quantized on 8 bits with a scale for each layer
+    """
+
+    FP16 = 'fp16'
+    BF16 = 'bf16'
+    INT8 = 'int8'
+
+
 class TrainingPlanStatus(_BaseEnum):
     """Constant values for training plan type that will be saved into db
 
@@ -282,6 +318,7 @@ class ErrorNumbers(_BaseEnum):
     FB321 = "FB321: Secure aggregation delete error"
     FB322 = "FB322: Dataset registration error"
     FB323 = "FB323: Node State error"
+    FB324 = "FB324: training plan not found in node cache"
 
     # application error on researcher
 
@@ -41,6 +41,9 @@ Common Global Variables:
 - PORT_INCREMENT_FILE     : File for storing next port to be allocated for MP-SPDZ
 - CERT_DIR                : Directory for storing certificates for MP-SPDZ
 - DEFAULT_BIPRIMES_DIR    : Directory for storing default biprimes files
+- COMPRESSION_CODEC       : Codec for compressing the messages sent to the peer component, None to disable
+- COMPRESSION_THRESHOLD   : Messages smaller than this number of bytes are not compressed
+- COMPRESSION_SHUFFLE     : True if the bytes of the messages are shuffled before compressing them
 '''
 
 import os
@@ -49,7 +52,8 @@ from typing import Any
 
 from fedbiomed.common.constants import ErrorNumbers, VAR_FOLDER_NAME, \
     CACHE_FOLDER_NAME, CONFIG_FOLDER_NAME, TMP_FOLDER_NAME, \
-    CERTS_FOLDER_NAME
+    CERTS_FOLDER_NAME, DEFAULT_COMPRESSION_THRESHOLD, DEFAULT_GRPC_MAX_MESSAGE_LENGTH, \
+    MAX_MESSAGE_BYTES_LENGTH
 from fedbiomed.common.exceptions import FedbiomedEnvironError
 from fedbiomed.common.utils import (
     ROOT_DIR, 
@@ -183,3 +187,29 @@ class Environ(metaclass=SingletonABCMeta):
             "MPSPDZ_CERTIFICATE_PEM",
             os.path.join(self._values["CONFIG_DIR"], public_key)
         )
+
+        # Transport section may be missing from config files generated by previous versions
+        compression = os.getenv('COMPRESSION_CODEC',
+                                self.config.get('transport', 'compression', fallback='none'))
+        self._values['COMPRESSION_CODEC'] = None if compression.lower() == 'none' else compression
+        self._values['COMPRESSION_THRESHOLD'] = int(
+            os.getenv('COMPRESSION_THRESHOLD',
+                      self.config.get('transport', 'compression_threshold',
+                                      fallback=str(DEFAULT_COMPRESSION_THRESHOLD))))
+        self._values['COMPRESSION_SHUFFLE'] = \
+            os.getenv('COMPRESSION_SHUFFLE',
+                      self.config.get('transport', 'compression_shuffle', fallback='False')) \
+            .lower() in ('true', '1', 't', True)
+        self._values['CHUNK_SIZE'] = int(
+            os.getenv('CHUNK_SIZE',
+                      self.config.get('transport', 'chunk_size', fallback=str(MAX_MESSAGE_BYTES_LENGTH))))
+        self._values['GRPC_MAX_MESSAGE_LENGTH'] = int(
+            os.getenv('GRPC_MAX_MESSAGE_LENGTH',
+                      self.config.get('transport', 'max_message_length',
+                                      fallback=str(DEFAULT_GRPC_MAX_MESSAGE_LENGTH))))
+        self._values['GRPC_FLOW_CONTROL_WINDOW'] = int(
+            os.getenv('GRPC_FLOW_CONTROL_WINDOW',
+                      self.config.get('transport', 'flow_control_window', fallback='0')))
+        # 0 (None) to use all the CPUs. Secagg section may be missing from config files generated by previous versions
+        self._values['SECAGG_WORKERS'] = int(
+            os.getenv('SECAGG_WORKERS', self.config.get('secagg', 'workers', fallback='1'))) or None
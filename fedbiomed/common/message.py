@@ -6,7 +6,7 @@ Definition of messages exchanged by the researcher and the nodes
 '''
 
 import functools
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, Optional, get_args, Union, List
 
 from google.protobuf.message import Message as ProtobufMessage
@@ -17,6 +17,7 @@ import fedbiomed.transport.protocols.researcher_pb2 as r_pb2
 from fedbiomed.common.constants import ErrorNumbers, __messaging_protocol_version__
 from fedbiomed.common.exceptions import FedbiomedMessageError
 from fedbiomed.common.logger import logger
+from fedbiomed.common.secagg import CiphertextVector
 
 
 def catch_dataclass_exception(cls: Callable):
@@ -287,6 +288,8 @@ class TaskRequest(ProtoSerializableMessage, RequiresProtocolVersion):
     """Task request message from node to researcher"""
     __PROTO_TYPE__ = r_pb2.TaskRequest
     node: str
+    codecs: list = field(default_factory=list)
+    max_message_length: int = 0
 
 
 @dataclass
@@ -297,6 +300,9 @@ class TaskResponse(ProtoSerializableMessage):
     size: int
     iteration: int
     bytes_: bytes
+    compression: str = ""
+    codecs: list = field(default_factory=list)
+    max_message_length: int = 0
 
 
 @dataclass
@@ -307,6 +313,25 @@ class TaskResult(ProtoSerializableMessage):
     size: int
     iteration: int
     bytes_: bytes
+    compression: str = ""
+    compression_time: float = 0.
+    transfer_id: str = ""
+
+
+@dataclass
+class ReplyStatusRequest(ProtoSerializableMessage):
+    """Request from node to researcher for the status of a reply transfer"""
+    __PROTO_TYPE__ = r_pb2.ReplyStatusRequest
+
+    transfer_id: str
+
+
+@dataclass
+class ReplyStatus(ProtoSerializableMessage):
+    """Number of consecutive chunks of a reply transfer received by the researcher"""
+    __PROTO_TYPE__ = r_pb2.ReplyStatus
+
+    received: int
 
 
 @dataclass
@@ -684,12 +709,18 @@ class TrainRequest(RequestReply, RequiresProtocolVersion):
         dataset_id: id of the dataset that is used for training
         training: Declares whether training will be performed
         model_args: Arguments to initialize training plan class
-        training_plan_url: URL where TrainingPlan is available
+        training_plan: Source of the training plan, or None if the node already received it
+        training_plan_hash: Hash of the source of the training plan
         training_plan_class: Class name of the training plan
         command: Reply command string
         aggregator_args: ??
         aux_var_urls: Optional list of URLs where Optimizer auxiliary
             variables files are available
+        model_version: Version of the model parameters, or None if the version is not tracked
+        base_model_version: Version of the model parameters `params` is a delta against, or None
+            if `params` are the full model parameters
+        params_precision: Precision of the low precision encoding of `params`, or None if `params`
+            are sent in full precision
 
     Raises:
         FedbiomedMessageError: triggered if message's fields validation failed
@@ -702,7 +733,7 @@ class TrainRequest(RequestReply, RequiresProtocolVersion):
     training: bool
     model_args: dict
     params: dict
-    training_plan: str
+    training_plan: Optional[str]
     training_plan_class: str
     command: str
     round: int
@@ -712,6 +743,10 @@ class TrainRequest(RequestReply, RequiresProtocolVersion):
     secagg_biprime_id: Optional[str] = None
     secagg_random: Optional[float] = None
     secagg_clipping_range: Optional[int] = None
+    model_version: Optional[str] = None
+    base_model_version: Optional[str] = None
+    params_precision: Optional[str] = None
+    training_plan_hash: Optional[str] = None
 
 
 @catch_dataclass_exception
@@ -726,6 +761,8 @@ class TrainReply(RequestReply, RequiresProtocolVersion):
         node_id: Node id that replies the request
         dataset_id: id of the dataset that is used for training
         params_url: URL of parameters uploaded by node
+        params_precision: Precision of the low precision encoding of `params`, or None if `params`
+            are sent in full precision
         timing: Timing statistics
         msg: Custom message
         command: Reply command string
@@ -744,10 +781,11 @@ class TrainReply(RequestReply, RequiresProtocolVersion):
     state_id: Optional[str] = None
     sample_size: Optional[int] = None
     encrypted: bool = False
-    params: Optional[Union[Dict, List]] = None  # None for testing only
+    params: Optional[Union[Dict, List, CiphertextVector]] = None  # None for testing only
     optimizer_args: Optional[Dict] = None  # None for testing only
     optim_aux_var: Optional[Dict] = None  # None for testing only
-    encryption_factor: Optional[List] = None  # None for testing only
+    encryption_factor: Optional[Union[List, CiphertextVector]] = None  # None for testing only
+    params_precision: Optional[str] = None
 
 
 class MessageFactory:
@@ -133,6 +133,14 @@ class Model(Generic[_MT, DT], metaclass=ABCMeta):
             List of model weights as float.
         """
 
+    @abstractmethod
+    def num_params(self) -> int:
+        """Counts model weights, without gathering their values
+
+        Returns:
+            Number of model weights, i.e. length of the vector returned by `flatten`.
+        """
+
     @abstractmethod
     def export(self, filename: str) -> None:
         """Export the wrapped model to a dump file.
@@ -152,6 +152,22 @@ class BaseSkLearnModel(Model, metaclass=ABCMeta):
 
         return flatten
 
+    def num_params(self) -> int:
+        """Counts model weights, without gathering their values
+
+        Raises:
+            FedbiomedModelError: If the model parameters are not initialized.
+
+        Returns:
+            Number of model weights, i.e. length of the vector returned by `flatten`.
+        """
+        if not self.param_list:
+            raise FedbiomedModelError(
+                f"{ErrorNumbers.FB622.value}. Attribute `param_list` is empty. You should "
+                f"have initialized the model beforehand (try calling `set_init_params`)"
+            )
+        return sum(np.size(getattr(self.model, key)) for key in self.param_list)
+
     def unflatten(
             self,
             weights_vector: List[float]
@@ -90,6 +90,14 @@ class TorchModel(Model):
 
         return params
 
+    def num_params(self) -> int:
+        """Counts model weights, without gathering their values
+
+        Returns:
+            Number of model weights, i.e. length of the vector returned by `flatten`.
+        """
+        return sum(param.numel() for param in self.model.parameters())
+
     def unflatten(
             self,
             weights_vector: List[float]
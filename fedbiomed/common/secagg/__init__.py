@@ -2,10 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from ._ciphertext_vector import CiphertextAccumulator, CiphertextVector
 from ._jls import JoyeLibert, quantize, reverse_quantize
 from ._secagg_crypter import SecaggCrypter, EncryptedNumber
 
 __all__ = [
+    "CiphertextAccumulator",
+    "CiphertextVector",
     "JoyeLibert",
     "EncryptedNumber",
     "SecaggCrypter",
@@ -0,0 +1,189 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+
+from typing import Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+from gmpy2 import from_binary, mpz
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedSecaggCrypterError
+
+
+# `gmpy2.from_binary` decodes an `mpz` from a type byte, a sign byte and the magnitude in little-endian order
+_MPZ_HEADER = b"\x01\x01"
+_MPZ_HEADER_SIZE = len(_MPZ_HEADER)
+
+# `mpz.to_bytes` is only available from gmpy2 2.2
+_MPZ_TO_BYTES = hasattr(mpz, "to_bytes")
+
+# Number of ciphertexts converted at once when unpacking a vector
+_UNPACK_BATCH_SIZE = 4096
+
+
+class CiphertextVector:
+    """Vector of ciphertexts packed in a single buffer.
+
+    Ciphertexts are stored as fixed-width big-endian unsigned integers, one after
+    the other in a contiguous bytes buffer. This is much more compact to store and
+    to serialize than a list of Python integers, and is converted to and from
+    `mpz` integers in bulk: when unpacking, byte order of batches of ciphertexts
+    is swapped at once with numpy to the binary format of gmpy2, so that each
+    ciphertext is converted by a single call to `gmpy2.from_binary`.
+    """
+
+    def __init__(self, data: Union[bytes, memoryview], width: int) -> None:
+        """Constructor of the class
+
+        Args:
+            data: buffer of the packed ciphertexts
+            width: size in bytes of each ciphertext
+
+        Raises:
+            FedbiomedSecaggCrypterError: buffer size is not a multiple of `width`
+        """
+        if not isinstance(width, int) or width <= 0 or len(data) % width:
+            raise FedbiomedSecaggCrypterError(
+                f"{ErrorNumbers.FB624.value}: Invalid ciphertext vector, buffer of {len(data)} bytes can not "
+                f"be split into ciphertexts of {width} bytes"
+            )
+        self._data = data
+        self._width = width
+
+    @classmethod
+    def from_ints(cls, values: Iterable[Union[int, mpz]], width: int) -> 'CiphertextVector':
+        """Packs ciphertexts into a vector.
+
+        Args:
+            values: ciphertexts, as integers or `mpz`
+            width: size in bytes of each ciphertext, large enough for the biggest ciphertext
+
+        Returns:
+            Vector of the packed ciphertexts
+        """
+        try:
+            if _MPZ_TO_BYTES:
+                data = b"".join([mpz(value).to_bytes(width, "big") for value in values])
+            else:
+                # `int.to_bytes` is faster than `gmpy2.to_binary` followed by swapping the byte order
+                data = b"".join([int(value).to_bytes(width, "big") for value in values])
+        except OverflowError as exp:
+            raise FedbiomedSecaggCrypterError(
+                f"{ErrorNumbers.FB624.value}: Ciphertext does not fit in {width} bytes") from exp
+
+        return cls(data, width)
+
+    @property
+    def data(self) -> Union[bytes, memoryview]:
+        """Returns the buffer of the packed ciphertexts"""
+        return self._data
+
+    @property
+    def width(self) -> int:
+        """Returns the size in bytes of each ciphertext"""
+        return self._width
+
+    def to_mpz(self) -> List[mpz]:
+        """Unpacks the ciphertexts.
+
+        Returns:
+            Ciphertexts, as `mpz` integers
+        """
+        return list(self)
+
+    def __iter__(self) -> Iterator[mpz]:
+        """Unpacks the ciphertexts, as `mpz` integers, by batches of ciphertexts"""
+        width = self._width
+        row_size = width + _MPZ_HEADER_SIZE
+        ciphertexts = np.frombuffer(self._data, dtype=np.uint8).reshape(-1, width)
+        rows = np.empty((min(len(ciphertexts), _UNPACK_BATCH_SIZE), row_size), dtype=np.uint8)
+        rows[:, width:] = np.frombuffer(_MPZ_HEADER[::-1], dtype=np.uint8)
+        for start in range(0, len(ciphertexts), _UNPACK_BATCH_SIZE):
+            batch = ciphertexts[start:start + _UNPACK_BATCH_SIZE]
+            rows[:len(batch), :width] = batch
+            # reversing the rows gives the header followed by the little-endian magnitude of each ciphertext,
+            # in reverse order. Numpy strips the trailing zeros of bytes strings, which are the most
+            # significant bytes of the magnitudes
+            binaries = rows[:len(batch)].reshape(-1)[::-1].copy().view(f"S{row_size}").tolist()
+            binaries.reverse()
+            yield from map(from_binary, binaries)
+
+    def __len__(self) -> int:
+        """Returns the number of ciphertexts"""
+        return len(self._data) // self._width
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CiphertextVector):
+            return NotImplemented
+        return self._width == other._width and memoryview(self._data) == memoryview(other._data)
+
+    def __repr__(self) -> str:
+        return f"<CiphertextVector of {len(self)} ciphertexts of {self._width} bytes>"
+
+
+class CiphertextAccumulator:
+    """Running homomorphic sum of vectors of Joye-Libert ciphertexts, updated with one vector at a time.
+
+    Joye-Libert ciphertexts are summed by multiplying them modulo the square of the biprime. Each
+    vector is folded into the running product as soon as it is available, and can then be released:
+    only the running product, of the size of a single vector, is held in memory, whatever the number
+    of vectors summed.
+    """
+
+    def __init__(self, biprime: int) -> None:
+        """Constructor of the class
+
+        Args:
+            biprime: Biprime of the public parameter the ciphertexts are encrypted with
+        """
+        self._n_square = mpz(biprime) ** 2
+        self._sum: Optional[List[mpz]] = None
+        self._count = 0
+
+    def reset(self) -> None:
+        """Empties the accumulator"""
+        self._sum = None
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Number of vectors added to the sum"""
+        return self._count
+
+    def add(self, ciphertexts: Union[CiphertextVector, List[int]]) -> None:
+        """Adds a vector of ciphertexts to the sum
+
+        Args:
+            ciphertexts: Ciphertexts to add, as a ciphertext vector or a list of integers
+
+        Raises:
+            FedbiomedSecaggCrypterError: number of ciphertexts differs from the vectors already added
+        """
+        if self._sum is not None and len(ciphertexts) != len(self._sum):
+            raise FedbiomedSecaggCrypterError(
+                f"{ErrorNumbers.FB624.value}: Can not sum vectors of {len(self._sum)} and {len(ciphertexts)} "
+                f"ciphertexts. Encrypted parameters of all nodes should have the same size."
+            )
+
+        n_square = self._n_square
+        if self._sum is None:
+            self._sum = [mpz(c) % n_square for c in ciphertexts]
+        else:
+            self._sum = [s * mpz(c) % n_square for s, c in zip(self._sum, ciphertexts)]
+        self._count += 1
+
+    def to_mpz(self) -> List[mpz]:
+        """Gets the sum of the ciphertexts
+
+        Returns:
+            Summed ciphertexts, as `mpz` integers, empty if no vector was added
+        """
+        return [] if self._sum is None else list(self._sum)
+
+    def __len__(self) -> int:
+        """Returns the number of ciphertexts of the sum"""
+        return 0 if self._sum is None else len(self._sum)
+
+    def __repr__(self) -> str:
+        return f"<CiphertextAccumulator of {self._count} vectors of {len(self)} ciphertexts>"
@@ -21,8 +21,12 @@ Fed-BioMed FL infrastructure.
 """
 
 import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from math import ceil, floor, log2
-from typing import List, Tuple, Union, Callable
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable
 
 import gmpy2
 from gmpy2 import mpz, gcd
@@ -33,7 +37,7 @@ from fedbiomed.common.logger import logger
 
 
 def _check_clipping_range(
-        values: List[float],
+        values: Union[List[float], np.ndarray],
         clipping_range: float
 ) -> None:
     """Checks clipping range for quantization
@@ -43,20 +47,16 @@ def _check_clipping_range(
         clipping_range: Clipping range
 
     """
-    state = False
+    values = np.asarray(values, dtype=np.float64)
 
-    for x in values:
-        if x < -clipping_range or x > clipping_range:
-            state = True
-
-    if state:
+    if values.size and (values.min() < -clipping_range or values.max() > clipping_range):
         logger.info(
             "There are some numbers in the local vector that exceeds clipping range. Please increase the "
             "clipping range to account for value")
 
 
 def quantize(
-    weights: List[float],
+    weights: Union[List[float], np.ndarray],
     clipping_range: Union[int, None] = None,
     target_range: int = VEParameters.TARGET_RANGE,
 ) -> List[int]:
@@ -76,19 +76,17 @@ def quantize(
     if clipping_range is None:
         clipping_range = VEParameters.CLIPPING_RANGE
 
+    weights = np.asarray(weights, dtype=np.float64)
     _check_clipping_range(weights, clipping_range)
 
-    f = np.vectorize(
-        lambda x: min(
-            target_range - 1,
-            (sorted((-clipping_range, x, clipping_range))[1] + clipping_range) *
-            target_range /
-            (2 * clipping_range),
-        )
-    )
-    quantized_list = f(weights).astype(int)
+    # computed in place, in the same order as `(clip(x) + c) * t / (2 * c)` so that results are exact
+    quantized = np.clip(weights, -clipping_range, clipping_range)
+    quantized += clipping_range
+    quantized *= target_range
+    quantized /= 2 * clipping_range
+    np.minimum(quantized, target_range - 1, out=quantized)
 
-    return quantized_list.tolist()
+    return quantized.astype(int).tolist()
 
 
 def multiply(xs: List[int], k: int) -> List[int]:
@@ -117,7 +115,8 @@ def divide(xs: List[int], k: int) -> List[int]:
     Returns:
         List of divided integers
     """
-    xs = np.array(xs, dtype=np.uint32)
+    # sums of weighted quantized values of several users do not fit in 32 bits
+    xs = np.array(xs, dtype=np.float64)
     return (xs / k).tolist()
 
 
@@ -143,14 +142,11 @@ def reverse_quantize(
     max_range = clipping_range
     min_range = -clipping_range
     step_size = (max_range - min_range) / (target_range - 1)
-    f = np.vectorize(
-        lambda x: (min_range + step_size * x)
-    )
 
-    weights = np.array(weights)
-    reverse_quantized_list = f(weights.astype(float))
+    reverse_quantized = np.asarray(weights, dtype=np.float64) * step_size
+    reverse_quantized += min_range
 
-    return reverse_quantized_list.tolist()
+    return reverse_quantized.tolist()
 
 
 def invert(
@@ -199,18 +195,266 @@ def powmod(
     return gmpy2.powmod(a, b, c)
 
 
+def _hash_taus(
+        public_param: 'PublicParam',
+        tau: int,
+        start: int,
+        stop: int
+) -> List[mpz]:
+    """Hashes the time period of the elements `[start, stop)` of a vector
+
+    Args:
+        public_param: The public parameters
+        tau: The time period
+        start: index of the first element
+        stop: index after the last element
+
+    Returns:
+        hashed time period of each element
+    """
+    shift = public_param.bits // 2
+    return public_param.hashing_function_batch([(i << shift) | tau for i in range(start, stop)])
+
+
+def _masks(
+        public_param: 'PublicParam',
+        tau: int,
+        start: int,
+        stop: int,
+        exponent: mpz
+) -> List[mpz]:
+    """Computes the masks \\(H(\\tau)^{e} \\mod N^2\\) of the elements `[start, stop)` of a vector
+
+    Args:
+        public_param: The public parameters
+        tau: The time period
+        start: index of the first element
+        stop: index after the last element
+        exponent: The exponent \\(e\\), derived from the user or server key
+
+    Returns:
+        mask of each element
+    """
+    n_square = public_param.n_square
+    return [powmod(h, exponent, n_square) for h in _hash_taus(public_param, tau, start, stop)]
+
+
+# public parameters of the pool worker process, set once when the worker starts
+_worker_public_param: Optional['PublicParam'] = None
+
+
+def _init_worker(public_param: 'PublicParam') -> None:
+    """Initializes a worker process of a `JLSPool` with the public parameters"""
+    global _worker_public_param
+    _worker_public_param = public_param
+
+
+def _worker_masks(
+        tau: int,
+        start: int,
+        stop: int,
+        exponent: mpz
+) -> List[mpz]:
+    """Computes the masks of a shard of a vector in a worker process of a `JLSPool`"""
+    return _masks(_worker_public_param, tau, start, stop, exponent)
+
+
+class JLSPool:
+    """Computes the masks of the Joye-Libert scheme in parallel, in a pool of processes.
+
+    Encryption and decryption mask each element of a vector with \\(H(\\tau)^{e} \\mod N^2\\),
+    which costs a full-domain hash and a modular exponentiation per element, computed by the Python
+    interpreter and `gmpy2` on a single core. The vector is split into contiguous shards, one per
+    worker. Public parameters are sent once to each worker when the pool starts, so that shards only
+    carry their bounds, the time period and the exponent.
+
+    Masks only depend on the public parameters, the time period, the exponent and the length of the
+    vector, so they can be computed in the background with `precompute` before the vector is known.
+    `masks` then returns the precomputed masks, waiting for their computation to end if needed.
+
+    The pool is created on first use, with spawned worker processes, started again when used with
+    other public parameters, and is not copied with the object, nor are the precomputed masks.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            min_shard_size: int = 16
+    ) -> None:
+        """Constructs the pool
+
+        Args:
+            max_workers: maximum number of worker processes. Defaults to None, the number of CPUs.
+                With a single worker, masks are computed in the calling process.
+            min_shard_size: minimum number of elements in a shard, so that small vectors are not split
+                in shards that cost more to dispatch than to compute. Defaults to 16.
+
+        Raises:
+            ValueError: bad number of workers or shard size
+        """
+        if max_workers is not None and \
+                (not isinstance(max_workers, int) or isinstance(max_workers, bool) or max_workers < 1):
+            raise ValueError(f"Number of workers should be a positive integer, not {max_workers}")
+        if not isinstance(min_shard_size, int) or isinstance(min_shard_size, bool) or min_shard_size < 1:
+            raise ValueError(f"Minimum shard size should be a positive integer, not {min_shard_size}")
+
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._min_shard_size = min_shard_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_public_param: Optional['PublicParam'] = None
+        self._pool_lock = threading.Lock()
+
+        # thread computing masks in the background, and masks it computes indexed by
+        # modulus, time period and exponent
+        self._background: Optional[ThreadPoolExecutor] = None
+        self._precomputed: Dict[Tuple[mpz, int, mpz], Tuple['PublicParam', int, Future]] = {}
+
+    @property
+    def max_workers(self) -> int:
+        """Maximum number of worker processes"""
+        return self._max_workers
+
+    def shards(self, len_: int) -> List[Tuple[int, int]]:
+        """Splits a vector into contiguous shards of about the same size
+
+        Args:
+            len_: number of elements of the vector
+
+        Returns:
+            Bounds `(start, stop)` of the shards
+        """
+        n_shards = max(1, min(self._max_workers, len_ // self._min_shard_size))
+        bounds = [len_ * i // n_shards for i in range(n_shards + 1)]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def masks(
+            self,
+            public_param: 'PublicParam',
+            tau: int,
+            len_: int,
+            exponent: mpz
+    ) -> List[mpz]:
+        """Computes the masks \\(H(\\tau)^{e} \\mod N^2\\) of the elements of a vector
+
+        Args:
+            public_param: The public parameters
+            tau: The time period
+            len_: number of elements of the vector
+            exponent: The exponent \\(e\\), derived from the user or server key
+
+        Returns:
+            mask of each element
+        """
+        precomputed = self._precomputed.get((public_param.n_modulus, tau, exponent))
+        if precomputed is not None and precomputed[0] == public_param and precomputed[1] >= len_:
+            try:
+                return precomputed[2].result()[:len_]
+            except Exception as exp:
+                logger.debug(f"Precomputation of the masks failed, computing them again: {exp}")
+
+        return self._compute(public_param, tau, len_, exponent)
+
+    def precompute(
+            self,
+            public_param: 'PublicParam',
+            tau: int,
+            len_: int,
+            exponent: mpz
+    ) -> None:
+        """Starts computing the masks of the elements of a vector in a background thread
+
+        Masks of the other time periods are discarded. Masks of a vector are also the first masks
+        of any longer vector, so they are used by `masks` for vectors of at most `len_` elements.
+
+        Args:
+            public_param: The public parameters
+            tau: The time period
+            len_: number of elements of the vector
+            exponent: The exponent \\(e\\), derived from the user or server key
+        """
+        self._precomputed = {key: value for key, value in self._precomputed.items() if key[1] == tau}
+        if self._background is None:
+            self._background = ThreadPoolExecutor(max_workers=1)
+        future = self._background.submit(self._compute, public_param, tau, len_, exponent)
+        self._precomputed[(public_param.n_modulus, tau, exponent)] = (public_param, len_, future)
+
+    def _compute(
+            self,
+            public_param: 'PublicParam',
+            tau: int,
+            len_: int,
+            exponent: mpz
+    ) -> List[mpz]:
+        """Computes the masks of the elements of a vector, in shards computed by the workers"""
+        shards = self.shards(len_)
+        if len(shards) == 1:
+            return _masks(public_param, tau, 0, len_, exponent)
+
+        starts, stops = zip(*shards)
+        results = self._get_pool(public_param).map(
+            _worker_masks, [tau] * len(shards), starts, stops, [exponent] * len(shards))
+        return [mask for shard in results for mask in shard]
+
+    def shutdown(self) -> None:
+        """Stops the workers and the background thread and discards the precomputed masks.
+
+        Workers are started again on next use.
+        """
+        if self._background is not None:
+            self._background.shutdown()
+            self._background = None
+        self._precomputed = {}
+        with self._pool_lock:
+            self._shutdown_pool()
+
+    def _shutdown_pool(self) -> None:
+        """Stops the workers"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_public_param = None
+
+    def _get_pool(self, public_param: 'PublicParam') -> ProcessPoolExecutor:
+        """Returns the pool of workers sharing the public parameters, creating it if needed"""
+        with self._pool_lock:
+            if self._pool is not None and self._pool_public_param != public_param:
+                self._shutdown_pool()
+            if self._pool is None:
+                # workers are spawned, not forked, from the multi-threaded node and researcher processes
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(public_param,))
+                self._pool_public_param = public_param
+            return self._pool
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_pool_public_param'] = None
+        state['_pool_lock'] = None
+        state['_background'] = None
+        state['_precomputed'] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._pool_lock = threading.Lock()
 
 
 class VES:
     """The vector encoding class
 
-    This class encodes and decodes vector elements to create smaller size vectors using a packing technique
-
+    This class encodes and decodes vector elements to create smaller size vectors using a packing technique.
+    Each element of the output vector packs `comp_ratio` elements of the input vector, with enough bits per
+    element for the sum of `add_ops + 1` encoded vectors not to overflow. The last element of the output
+    vector is completed with padding values, whose sums are larger than the sum of any input values, so
+    that decoding restores the exact length of the input vector.
 
     Attributes:
         _ptsize: The bit length of the plaintext (the number of bits of an element in the output vector)
         _valuesize: The bit length of an element of the input vector
-        _vectorsize: The number of element of the input vector
     """
 
     def __init__(
@@ -236,7 +480,7 @@ class VES:
         """Gets element size and compression ratio by given additional operation count.
 
         Args:
-            add_ops: ?
+            add_ops: number of encoded vectors that are summed before decoding
 
         Returns:
             tuple of element size and compression ratio
@@ -246,6 +490,17 @@ class VES:
 
         return element_size, comp_ratio
 
+    def compression_ratio(self, add_ops: int) -> int:
+        """Gets the number of input elements packed in each element of the output vector.
+
+        Args:
+            add_ops: number of encoded vectors that are summed before decoding
+
+        Returns:
+            compression ratio
+        """
+        return self._get_elements_size_and_compression_ratio(add_ops)[1]
+
     def encode(
             self,
             V: List[int],
@@ -254,25 +509,19 @@ class VES:
         """Encode a vector to a smaller size vector
 
         Args:
-            V: ?
-            add_ops: ?
+            V: vector of integers in `[0, 2**valuesize)`
+            add_ops: number of encoded vectors that are summed before decoding
 
         Returns:
             list of encoded values
         """
         element_size, comp_ratio = self._get_elements_size_and_compression_ratio(add_ops)
 
-        bs = comp_ratio
-        e = []
         E = []
-        for v in V:
-            e.append(v)
-            bs -= 1
-            if bs == 0:
-                E.append(self._batch(e, element_size))
-                e = []
-                bs = comp_ratio
-        if e:
+        for i in range(0, len(V), comp_ratio):
+            e = list(V[i:i + comp_ratio])
+            # last element is completed with padding values
+            e.extend([1 << self._valuesize] * (comp_ratio - len(e)))
             E.append(self._batch(e, element_size))
         return E
 
@@ -284,18 +533,22 @@ class VES:
         """Decode a vector back to original size vector
 
         Args:
-            E: ?
-            add_ops: ?
+            E: sum of `add_ops` encoded vectors
+            add_ops: number of encoded vectors that were summed
         Returns:
             Decoded vector
         """
 
-        element_size, _ = self._get_elements_size_and_compression_ratio(add_ops)
+        element_size, comp_ratio = self._get_elements_size_and_compression_ratio(add_ops)
         V = []
 
         for e in E:
-            for v in self._debatch(e, element_size):
-                V.append(v)
+            V.extend(self._debatch(e, element_size, comp_ratio))
+
+        # sum of padding values is `add_ops << valuesize`, larger than any sum of input values
+        padding = add_ops << self._valuesize
+        while V and V[-1] >= padding:
+            V.pop()
         return V
 
     @staticmethod
@@ -313,20 +566,15 @@ class VES:
     @staticmethod
     def _debatch(
             b: int,
-            element_size: int
+            element_size: int,
+            comp_ratio: int
     ) -> List[int]:
+        """Unpacks the `comp_ratio` elements of an element of the encoded vector, including zeros
         """
-        """
+        mask = (1 << element_size) - 1
         V = []
-        bit = 0b1
-        mask = 0b1
-        for _ in range(element_size - 1):
-            mask <<= 1
-            mask |= bit
-
-        while b != 0:
-            v = mask & b
-            V.append(int(v))
+        for _ in range(comp_ratio):
+            V.append(int(b & mask))
             b >>= element_size
         return V
 
@@ -347,13 +595,17 @@ class PublicParam:
 
     **H** : `function` --
         The hash algorithm \\(H : \\mathbb{Z} \\rightarrow \\mathbb{Z}_{N^2}^{*}\\)
+
+    **H_batch** : `function` --
+        Optional hash algorithm \\(H\\) applied to a list of values at once
     """
 
     def __init__(
             self,
             n_modulus: mpz,
             bits: int,
-            hashing_function: Callable
+            hashing_function: Callable,
+            batch_hashing_function: Optional[Callable] = None
     ) -> None:
         """
 
@@ -361,12 +613,15 @@ class PublicParam:
             n_modulus: The modulus \\(N\\)
             bits: The number of bits of the modulus \\(N\\)
             hashing_function: The hash algorithm \\(H : \\mathbb{Z} \\rightarrow \\mathbb{Z}_{N^2}^{*}\\)
+            batch_hashing_function: Optional hash algorithm \\(H\\) applied to a list of values at once.
+                Defaults to None, `hashing_function` is applied to each value.
         """
 
         self._n_modulus = n_modulus
         self._n_square = n_modulus * n_modulus
         self._bits = bits
         self._hashing_function = hashing_function
+        self._batch_hashing_function = batch_hashing_function
 
     @property
     def bits(self) -> int:
@@ -406,6 +661,19 @@ class PublicParam:
         """
         return self._hashing_function(val)
 
+    def hashing_function_batch(self, values: List[int]) -> List[mpz]:
+        """Applies hashing to each value of a list
+
+        Args:
+            values: Values for hashing
+
+        Returns:
+            hashed values
+        """
+        if self._batch_hashing_function is not None:
+            return self._batch_hashing_function(values)
+        return [self._hashing_function(val) for val in values]
+
     def __eq__(
             self,
             other: 'PublicParam'
@@ -616,12 +884,33 @@ class BaseKey:
             list of tau values
         """
 
-        taus = (np.arange(0, len_, dtype=mpz) << self._public_param.bits // 2) | tau
+        return _hash_taus(self._public_param, tau, 0, len_)
 
-        # with multiprocessing.Pool() as pool:
-        #     result = pool.map(self._public_param.hashing_function, taus)
+    def _masks(
+            self,
+            tau: int,
+            len_: int,
+            exponent: mpz,
+            pool: Optional[JLSPool] = None
+    ) -> np.ndarray:
+        """Computes the masks \\(H(\\tau)^{e} \\mod N^2\\) of the elements of a vector
 
-        return [self._public_param.hashing_function(t) for t in taus]
+        Args:
+            tau: The time period
+            len_: number of elements of the vector
+            exponent: The exponent \\(e\\), derived from the key
+            pool: optional pool of processes computing the masks in parallel. Defaults to None,
+                masks are computed in the calling process.
+
+        Returns:
+            mask of each element
+        """
+        if pool is not None:
+            masks = pool.masks(self._public_param, tau, len_, exponent)
+        else:
+            masks = _masks(self._public_param, tau, 0, len_, exponent)
+
+        return np.array(masks, dtype=object)
 
 
 class UserKey(BaseKey):
@@ -643,13 +932,15 @@ class UserKey(BaseKey):
     def encrypt(
             self,
             plaintext: List[mpz],
-            tau: int
+            tau: int,
+            pool: Optional[JLSPool] = None
     ) -> List[mpz]:
         """Encrypts a plaintext  for time period tau
 
         Args:
             plaintext: The plaintext/value to encrypt
             tau:  The time period
+            pool: optional pool of processes encrypting shards of the plaintext in parallel
 
 
         Returns:
@@ -666,11 +957,9 @@ class UserKey(BaseKey):
         # Use numpy vectors to increase speed of calculation
         plaintext = np.array(plaintext)
         nude_ciphertext = (self._public_param.n_modulus * plaintext + 1) % self._public_param.n_square
-        taus = self._populate_tau(tau=tau, len_=len(plaintext))
 
         # This process takes some time
-        vec_pow_mod = np.vectorize(powmod, otypes=[mpz])
-        r = vec_pow_mod(taus, self._key, self._public_param.n_square)
+        r = self._masks(tau, len(plaintext), self._key, pool)
         cipher = (nude_ciphertext * r) % self._public_param.n_square
 
         # Convert np array to list
@@ -697,7 +986,8 @@ class ServerKey(BaseKey):
             self,
             cipher: List[EncryptedNumber],
             tau: int,
-            delta: int = 1
+            delta: int = 1,
+            pool: Optional[JLSPool] = None
     ) -> List[int]:
         """Decrypts the aggregated ciphertexts of all users for time period tau
 
@@ -705,6 +995,7 @@ class ServerKey(BaseKey):
             cipher:  An aggregated ciphertext, with weighted averaging or not
             tau: The time period, (training round)
             delta: ...
+            pool: optional pool of processes decrypting shards of the ciphertext in parallel
 
         Returns:
             List of decrypted sum of user inputs
@@ -722,10 +1013,7 @@ class ServerKey(BaseKey):
 
         # TODO: Find out what is going wrong in numpy implementation
         ciphertext = [c.ciphertext for c in cipher]
-        taus = self._populate_tau(tau=tau, len_=len(ciphertext))
-
-        powmod_ = np.vectorize(powmod, otypes=[mpz])
-        mod = powmod_(taus, delta ** 2 * self._key, self._public_param.n_square)
+        mod = self._masks(tau, len(ciphertext), delta ** 2 * self._key, pool)
 
         v = (ciphertext * mod) % self._public_param.n_square
         x = ((v - 1) // self._public_param.n_modulus) % self._public_param.n_modulus
@@ -745,20 +1033,38 @@ class JoyeLibert:
 
     Attributes:
         _vector_encoder: The vector encoding/decoding scheme
+        _pool: The pool of processes encrypting and decrypting in parallel, if any
 
     """
 
-    def __init__(self):
+    def __init__(self, pool: Optional[JLSPool] = None):
         """Constructs the class
 
-        VEParameters.TARGET_RANGE + VEParameters.WEIGHT_RANGE should be
-        equal or less than 2**32
+        VEParameters.TARGET_RANGE * VEParameters.WEIGHT_RANGE should be
+        equal or less than 2**32. Packed plaintexts have one bit less than the key size of the
+        biprime \\(N\\), so that they are always smaller than \\(N\\).
+
+        Args:
+            pool: optional pool of processes encrypting and decrypting shards of the vectors in parallel.
+                Defaults to None, vectors are encrypted and decrypted in the calling process.
         """
+        self._pool = pool
         self._vector_encoder = VES(
-            ptsize=VEParameters.KEY_SIZE // 2,
+            ptsize=VEParameters.KEY_SIZE // 2 - 1,
             valuesize=ceil(log2(VEParameters.TARGET_RANGE) + log2(VEParameters.WEIGHT_RANGE))
         )
 
+    def compression_ratio(self, n_users: int) -> int:
+        """Gets the number of inputs packed in each cipher.
+
+        Args:
+            n_users: Number of nodes/users that participates secure aggregation
+
+        Returns:
+            Number of inputs per cipher
+        """
+        return self._vector_encoder.compression_ratio(add_ops=n_users)
+
     def protect(self,
                 public_param: PublicParam,
                 user_key: UserKey,
@@ -806,7 +1112,7 @@ class JoyeLibert:
             add_ops=n_users
         )
 
-        return user_key.encrypt(x_u_tau, tau)
+        return user_key.encrypt(x_u_tau, tau, pool=self._pool)
 
     def aggregate(
             self,
@@ -851,9 +1157,39 @@ class JoyeLibert:
 
         sum_of_vectors: List[EncryptedNumber] = [sum(ep) for ep in zip(*list_y_u_tau)]
 
-        decrypted_vector = sk_0.decrypt(sum_of_vectors, tau)
+        return self.decrypt_sum(sk_0=sk_0, tau=tau, y_tau=sum_of_vectors, n_users=n_user)
+
+    def decrypt_sum(
+            self,
+            sk_0: ServerKey,
+            tau: int,
+            y_tau: List[EncryptedNumber],
+            n_users: int
+    ) -> List[int]:
+        """Decrypts the product of the users protected inputs with the server's secret key
+
+        Ciphers \\(y_{\\tau} = \\prod_1^n{y_{u,\\tau}}\\) can be multiplied by the caller as they are
+        received, rather than all given at once to `aggregate`.
 
-        return self._vector_encoder.decode(decrypted_vector, add_ops=n_user)
+        Args:
+            sk_0: The server's secret key \\(sk_0\\)
+            tau: The time period \\(\\tau\\)
+            y_tau: The product of the users' protected inputs \\(y_{\\tau}\\)
+            n_users: The number of users whose protected inputs are multiplied
+
+        Returns:
+            The sum of the users' inputs of type `int`
+
+        Raises:
+            ValueError: bad argument value
+            TypeError: bad argument type
+        """
+        if not isinstance(sk_0, ServerKey):
+            raise ValueError("Key must be an instance of `ServerKey`")
+
+        decrypted_vector = sk_0.decrypt(y_tau, tau, pool=self._pool)
+
+        return self._vector_encoder.decode(decrypted_vector, add_ops=n_users)
 
 
 class FDH:
@@ -922,3 +1258,51 @@ class FDH:
                 break
 
         return r
+
+    def H_batch(
+            self,
+            ts: List[int]
+    ) -> List[mpz]:
+        """Computes the FDH of each value of a list, as `H` does.
+
+        Inputs are hashed as big-endian integers of `bits_size // 2` bytes, which mostly are leading
+        zeros for time periods. The hash state after the leading zeros is computed once for each input
+        length, and copied to hash the remaining bytes of each input. Invertibility of the hashes is
+        checked at once, on their product.
+
+        Args:
+            ts: The inputs of the hash function
+
+        Returns:
+            A value in \\(\\mathbb{Z}^*_N\\) for each input
+        """
+        if self.bits_size // 8 <= hashlib.sha256().digest_size:
+            return [self.H(t) for t in ts]
+
+        input_size = self.bits_size // 2
+        prefixes = {}
+        hashes = []
+
+        for t in ts:
+            t = int(t)
+            size = (t.bit_length() + 7) // 8
+            prefix = prefixes.get(size)
+            if prefix is None:
+                if size > input_size:
+                    # `H` raises the error of an input that is too large
+                    return [self.H(t) for t in ts]
+                prefix = prefixes[size] = hashlib.sha256(bytes(input_size - size))
+
+            h = prefix.copy()
+            h.update(t.to_bytes(size, "big") + b"\x01")
+            hashes.append(mpz(int.from_bytes(h.digest(), "big")))
+
+        # hashes are all invertible if their product is: a single gcd is computed for all the hashes
+        product = mpz(1)
+        for r in hashes:
+            product = product * r % self._n_modules
+        if gcd(product, self._n_modules) != 1:
+            # hash of the first counter is seldom not invertible, `H` then hashes the next counters
+            hashes = [r if gcd(r, self._n_modules) == 1 else self.H(t) for r, t in zip(hashes, ts)]
+
+        return hashes
@@ -3,15 +3,18 @@
 
 
 import time
+from math import ceil
 
-from typing import List, Union
+from typing import List, Optional, Union
 from gmpy2 import mpz
 
 from fedbiomed.common.exceptions import FedbiomedSecaggCrypterError
 from fedbiomed.common.constants import ErrorNumbers, VEParameters
 from fedbiomed.common.logger import logger
 
+from ._ciphertext_vector import CiphertextAccumulator, CiphertextVector
 from ._jls import JoyeLibert, \
+    JLSPool, \
     EncryptedNumber, \
     ServerKey, \
     UserKey, \
@@ -32,9 +35,79 @@ class SecaggCrypter:
     by converting it proper format for the framework.
     """
 
-    def __init__(self) -> None:
-        """Constructs ParameterEncrypter"""
-        self._jls = JoyeLibert()
+    def __init__(self, max_workers: Optional[int] = 1) -> None:
+        """Constructs ParameterEncrypter
+
+        Args:
+            max_workers: number of processes encrypting and decrypting shards of the parameters in parallel,
+                None for the number of CPUs. Defaults to 1, parameters are encrypted in the calling process.
+
+        Raises:
+            FedbiomedSecaggCrypterError: bad number of workers
+        """
+        try:
+            pool = JLSPool(max_workers=max_workers)
+        except ValueError as exp:
+            raise FedbiomedSecaggCrypterError(f"{ErrorNumbers.FB624.value}: {exp}") from exp
+
+        self._pool = pool
+        self._jls = JoyeLibert(pool=pool)
+
+    def compression_ratio(self, num_nodes: int) -> int:
+        """Gets the number of parameters packed in each ciphertext.
+
+        Each weighted quantized parameter takes `log2(TARGET_RANGE * WEIGHT_RANGE)` bits, plus enough
+        bits for the sum of the parameters of `num_nodes` nodes not to overflow.
+
+        Args:
+            num_nodes: Number of nodes that encrypt parameters for aggregation
+
+        Returns:
+            Number of parameters per ciphertext
+        """
+        return self._jls.compression_ratio(num_nodes)
+
+    def precompute_masks(
+            self,
+            num_nodes: int,
+            current_round: int,
+            num_params: int,
+            key: int,
+            biprime: int
+    ) -> None:
+        """Starts computing the masks of the ciphertexts of the parameters in the background.
+
+        Masks do not depend on the values of the parameters, only on their number, so they can be
+        computed while the parameters are trained, with the user key of a node before `encrypt`, or
+        while the parameters are trained by the nodes, with the server key before `aggregate`.
+        Encryption and decryption then only multiply each ciphertext by its mask.
+
+        Args:
+            num_nodes: Number of nodes that encrypt parameters for aggregation
+            current_round: Current round of federated training
+            num_params: Number of parameters to encrypt or aggregate
+            key: User key of the node, or server key of the researcher
+            biprime: Prime number to create public parameter
+
+        Raises:
+            FedbiomedSecaggCrypterError: bad parameters
+        """
+        if not isinstance(key, int) or not isinstance(num_params, int) or num_params < 0:
+            raise FedbiomedSecaggCrypterError(
+                f"{ErrorNumbers.FB624.value}: The arguments `key` and `num_params` must be integers"
+            )
+
+        public_param = self._setup_public_param(biprime=biprime)
+        num_ciphertexts = ceil(num_params / self.compression_ratio(num_nodes))
+
+        self._pool.precompute(public_param, current_round, num_ciphertexts, mpz(key))
+
+    def shutdown(self) -> None:
+        """Stops the worker processes and the background thread, and discards the precomputed masks.
+
+        Workers are started again on next use.
+        """
+        self._pool.shutdown()
 
     @staticmethod
     def _setup_public_param(biprime: int) -> PublicParam:
@@ -52,7 +125,8 @@ class SecaggCrypter:
 
         return PublicParam(n_modulus=biprime,
                            bits=key_size // 2,
-                           hashing_function=fdh.H)
+                           hashing_function=fdh.H,
+                           batch_hashing_function=fdh.H_batch)
 
     def encrypt(
             self,
@@ -63,7 +137,7 @@ class SecaggCrypter:
             biprime: int,
             clipping_range: Union[int, None] = None,
             weight: int = None,
-    ) -> List[int]:
+    ) -> CiphertextVector:
         """Encrypts model parameters.
 
         Args:
@@ -77,7 +151,7 @@ class SecaggCrypter:
                 must grater than minimum model parameters
 
         Returns:
-            List of encrypted parameters
+            Vector of encrypted parameters
 
         Raises:
             FedbiomedSecaggCrypterError: bad parameters
@@ -137,15 +211,19 @@ class SecaggCrypter:
                 f"{ErrorNumbers.FB624.value} Error during parameter encryption. {exp}") from exp
 
         time_elapsed = time.process_time() - start
-        logger.debug(f"Encryption of the parameters took {time_elapsed} seconds.")
+        logger.debug(f"Encryption of the parameters took {time_elapsed} seconds, {len(params)} parameters "
+                     f"are packed in {len(encrypted_params)} ciphertexts.")
 
-        return [int(e_p) for e_p in encrypted_params]
+        # ciphertexts are integers modulo n^2
+        width = (public_param.n_square.bit_length() + 7) // 8
+
+        return CiphertextVector.from_ints(encrypted_params, width)
 
     def aggregate(
             self,
             current_round: int,
             num_nodes: int,
-            params: List[List[int]],
+            params: List[Union[CiphertextVector, List[int]]],
             key: int,
             biprime: int,
             total_sample_size: int,
@@ -155,7 +233,7 @@ class SecaggCrypter:
 
         Args:
             current_round: The round that the aggregation will be done
-            params: Aggregated/Summed encrypted parameters
+            params: Encrypted parameters of each node, as ciphertext vectors or lists of integers
             num_nodes: number of nodes
             key: The key that will be used for decryption
             biprime: Biprime number of `PublicParam`
@@ -169,8 +247,6 @@ class SecaggCrypter:
              FedbiomedSecaggCrypterError: bad parameters
              FedbiomedSecaggCrypterError: aggregation issue
         """
-        start = time.process_time()
-
         if len(params) != num_nodes:
             raise FedbiomedSecaggCrypterError(
                 f"{ErrorNumbers.FB624.value}: Num of parameters that are received from nodes "
@@ -178,26 +254,81 @@ class SecaggCrypter:
                 f"be some nodes did not answered to training request or num of clients of "
                 "`ParameterEncrypter` has not been set properly before train request.")
 
-        if not isinstance(params, list) or not all([isinstance(p, list) for p in params]):
+        if not isinstance(params, list) or not all([isinstance(p, (list, CiphertextVector)) for p in params]):
             raise FedbiomedSecaggCrypterError(f"{ErrorNumbers.FB624}: The parameters to aggregate should "
                                               f"list containing list of parameters")
 
-        if not all([all([isinstance(p_, int) for p_ in p]) for p in params]):
+        if not all([isinstance(p, CiphertextVector) or all([isinstance(p_, int) for p_ in p]) for p in params]):
             raise FedbiomedSecaggCrypterError(f"{ErrorNumbers.FB624}: Invalid parameter type. The parameters "
                                               f"should be type of integers.")
 
+        # ciphertexts of each node are folded into the sum one node at a time
+        accumulator = CiphertextAccumulator(biprime)
+        for p in params:
+            accumulator.add(p)
+
+        return self.decrypt_sum(
+            current_round=current_round,
+            num_nodes=num_nodes,
+            summed=accumulator,
+            key=key,
+            biprime=biprime,
+            total_sample_size=total_sample_size,
+            clipping_range=clipping_range
+        )
+
+    def decrypt_sum(
+            self,
+            current_round: int,
+            num_nodes: int,
+            summed: CiphertextAccumulator,
+            key: int,
+            biprime: int,
+            total_sample_size: int,
+            clipping_range: Union[int, None] = None
+    ) -> List[float]:
+        """Decrypts the homomorphic sum of the encrypted parameters of the nodes
+
+        Encrypted parameters of each node can be added to `summed` as soon as they are received, and
+        then released, rather than aggregated all at once with `aggregate`.
+
+        Args:
+            current_round: The round that the aggregation will be done
+            num_nodes: number of nodes
+            summed: Sum of the encrypted parameters of the nodes
+            key: The key that will be used for decryption
+            biprime: Biprime number of `PublicParam`
+            total_sample_size: sum of number of samples from all nodes
+            clipping_range: Clipping range for reverse-quantization, should be the
+                same clipping range used for quantization
+
+        Returns:
+            Aggregated parameters decrypted and structured
+
+        Raises:
+             FedbiomedSecaggCrypterError: bad parameters
+             FedbiomedSecaggCrypterError: aggregation issue
+        """
+        start = time.process_time()
+
+        if not isinstance(summed, CiphertextAccumulator) or summed.count != num_nodes:
+            raise FedbiomedSecaggCrypterError(
+                f"{ErrorNumbers.FB624.value}: Num of parameters that are summed does not match the number "
+                f"of nodes has been set for the encrypter.")
+
         # TODO provide dynamically created biprime. Biprime that is used
         #  on the node-side should matched the one used for decryption
         public_param = self._setup_public_param(biprime=biprime)
         key = ServerKey(public_param, key)
 
-        params = self._convert_to_encrypted_number(params, public_param)
+        sum_of_params = self._convert_to_encrypted_number([summed.to_mpz()], public_param)[0]
 
         try:
-            sum_of_weights = self._jls.aggregate(
+            sum_of_weights = self._jls.decrypt_sum(
                 sk_0=key,
                 tau=current_round,  # The time period \\(\\tau\\)
-                list_y_u_tau=params
+                y_tau=sum_of_params,
+                n_users=num_nodes
             )
         except (ValueError, TypeError) as e:
             raise FedbiomedSecaggCrypterError(f"{ErrorNumbers.FB624.value}: The aggregation of encrypted parameters "
@@ -205,7 +336,7 @@ class SecaggCrypter:
 
         # TODO implement weighted averaging here or in `self._jls.aggregate`
         # Reverse quantize and division (averaging)
-        logger.info(f"Aggregating {len(params)} parameters from {num_nodes} nodes.")
+        logger.info(f"Aggregating {len(summed)} ciphertexts from {num_nodes} nodes.")
         aggregated_params = self._apply_average(sum_of_weights, total_sample_size)
 
         aggregated_params: List[float] = reverse_quantize(
@@ -251,13 +382,13 @@ class SecaggCrypter:
 
     @staticmethod
     def _convert_to_encrypted_number(
-            params: List[List[int]],
+            params: List[Union[CiphertextVector, List[int]]],
             public_param: PublicParam
     ) -> List[List[EncryptedNumber]]:
         """Converts encrypted integers to `EncryptedNumber`
 
         Args:
-            params: A list containing list of encrypted integers for each node
+            params: A list containing ciphertext vector or list of encrypted integers for each node
             public_param: Public parameter used while encrypting the model parameters
         Returns:
             list of `EncryptedNumber` objects
@@ -265,6 +396,8 @@ class SecaggCrypter:
 
         encrypted_number = []
         for parameters in params:
+            if isinstance(parameters, CiphertextVector):
+                parameters = parameters.to_mpz()
             encrypted_number.append([EncryptedNumber(public_param, mpz(param)) for param in parameters])
 
         return encrypted_number
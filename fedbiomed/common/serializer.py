@@ -3,23 +3,46 @@
 
 """MsgPack serialization utils, wrapped into a namespace class."""
 
+import mmap
+import os
+import struct
 from math import ceil
-from typing import Any, Optional
+from typing import Any, Dict, Mapping, Optional, Union
 
 import msgpack
 import numpy as np
 import torch
 from declearn.model.api import Vector
 
-from fedbiomed.common.exceptions import FedbiomedTypeError
+from fedbiomed.common.exceptions import FedbiomedTypeError, FedbiomedValueError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.metrics import MetricTypes
+from fedbiomed.common.secagg import CiphertextVector
 
 __all__ = [
     "Serializer",
 ]
 
 
+# MsgPack extension type codes of numpy arrays, torch tensors and secagg ciphertext vectors
+_EXT_NDARRAY = 1
+_EXT_TENSOR = 2
+_EXT_CIPHERTEXTS = 3
+
+# Array data is aligned on this number of bytes in extension payloads
+_EXT_ALIGNMENT = 16
+
+# Leading bytes of parameters files written by `Serializer.dump_params`.
+# 0xc1 is never used by MsgPack, so that these files cannot be mistaken for MsgPack dumps.
+_PARAMS_FILE_MAGIC = b"\xc1FBPARAM"
+# Magic bytes, followed by the offset and length of the index of the layers
+_PARAMS_FILE_HEADER = struct.Struct("<8sQQ")
+
+# Header of a MsgPack ext 32 extension type: format, length of the payload and extension type code
+_EXT32_HEADER = struct.Struct(">BIb")
+_EXT32_FORMAT = 0xc9
+
+
 class Serializer:
     """MsgPack-based (de)serialization utils, wrapped into a namespace class.
 
@@ -32,6 +55,16 @@ class Serializer:
         - numpy arrays and scalars
         - torch tensors (that are always loaded on CPU)
         - tuples (which would otherwise be converted to lists)
+        - secure aggregation ciphertext vectors
+
+    Numpy arrays and torch tensors are encoded as MsgPack extension types,
+    made of a compact binary header (dtype and shape) followed by the raw
+    array data. Numpy arrays are decoded as views on the received data,
+    without copy: decoded numpy arrays are read-only, consumers that need to
+    modify them in place should copy them first. Torch has no read-only
+    tensors, so tensors are copied out of read-only data, and are only
+    views on writable data, such as the copy-on-write mapping of the files
+    loaded with `load_params`.
     """
 
     @classmethod
@@ -53,6 +86,38 @@ class Serializer:
         
         return ser
 
+    @classmethod
+    def dumps_fields(cls, obj: Dict[str, Any]) -> bytes:
+        """Serialize the entries of a dict into MsgPack-encoded bytes, without map header.
+
+        Entries encoded separately can be spliced into a single MsgPack map,
+        by prepending the concatenated entries with `dumps_map_header`.
+
+        Args:
+            obj: Dict whose entries need encoding.
+
+        Returns:
+            MsgPack-encoded bytes that contains the input dict entries.
+        """
+        packer = msgpack.Packer(default=cls._default, strict_types=True, autoreset=False)
+        for key, value in obj.items():
+            packer.pack(key)
+            packer.pack(value)
+
+        return packer.bytes()
+
+    @staticmethod
+    def dumps_map_header(length: int) -> bytes:
+        """Serialize the header of a MsgPack map.
+
+        Args:
+            length: Number of entries of the map.
+
+        Returns:
+            MsgPack-encoded map header.
+        """
+        return msgpack.Packer().pack_map_header(length)
+
     @classmethod
     def dump(cls, obj: Any, path: str) -> None:
         """Serialize data into a MsgPack binary dump file.
@@ -65,23 +130,30 @@ class Serializer:
             msgpack.pack(obj, file, default=cls._default, strict_types=True)
 
     @classmethod
-    def loads(cls, data: bytes) -> Any:
+    def loads(cls, data: Union[bytes, memoryview]) -> Any:
         """Load serialized data from a MsgPack-encoded string.
 
         Args:
-            data: MsgPack-encoded bytes that needs decoding.
+            data: MsgPack-encoded bytes that needs decoding. Any bytes-like
+                object can be passed, eg a zero-copy `memoryview` on a buffer.
 
         Returns:
             Data loaded and decoded from the input bytes.
         """
         return msgpack.unpackb(
-            data, object_hook=cls._object_hook, strict_map_key=False
+            data, object_hook=cls._object_hook, ext_hook=cls._ext_hook,
+            strict_map_key=False
         )
 
     @classmethod
     def load(cls, path: str) -> Any:
         """Load serialized data from a MsgPack dump file.
 
+        Parameters files written by `dump_params` are also supported, and
+        loaded with `load_params`. Files holding a single secure aggregation
+        ciphertext vector are memory-mapped, as parameters files are: the
+        vector is a view on the file, which is read lazily.
+
         Args:
             path: Path to a MsgPack file, the contents of which to decode.
 
@@ -89,10 +161,93 @@ class Serializer:
             Data loaded and decoded from the target file.
         """
         with open(path, "rb") as file:
+            head = file.read(len(_PARAMS_FILE_MAGIC))
+            if head == _PARAMS_FILE_MAGIC:
+                return cls.load_params(path)
+            if len(head) >= _EXT32_HEADER.size:
+                fmt, length, code = _EXT32_HEADER.unpack_from(head)
+                if fmt == _EXT32_FORMAT and code == _EXT_CIPHERTEXTS and \
+                        _EXT32_HEADER.size + length == os.fstat(file.fileno()).st_size:
+                    buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY))
+                    return cls._ext_hook(code, buffer[_EXT32_HEADER.size:])
+            file.seek(0)
             return msgpack.unpack(
-                file, object_hook=cls._object_hook, strict_map_key=False
+                file, object_hook=cls._object_hook, ext_hook=cls._ext_hook,
+                strict_map_key=False
             )
 
+    @classmethod
+    def dump_params(cls, params: Mapping[Any, Any], path: str) -> None:
+        """Write model parameters into a parameters file, one layer at a time.
+
+        Layers are written one after the other, followed by an index of their
+        offsets in the file. Numpy arrays and torch tensors are written
+        directly from their buffer, other values are MsgPack-encoded. Memory
+        use is thus bounded by the size of a layer, and layers can be mapped
+        separately when loading the file with `load_params`.
+
+        Args:
+            params: Model parameters, as a mapping of layer names to values.
+            path: Path to the created parameters file.
+        """
+        index = []
+        # file is replaced once written: parameters mapped from a former
+        # version of the file remain valid
+        part_path = f"{path}.part"
+        with open(part_path, "wb") as file:
+            file.write(_PARAMS_FILE_HEADER.pack(_PARAMS_FILE_MAGIC, 0, 0))
+            for name, value in params.items():
+                # align layers, so that arrays mapped from the file are aligned
+                file.write(bytes(-file.tell() % _EXT_ALIGNMENT))
+                offset = file.tell()
+                if isinstance(value, (np.ndarray, torch.Tensor)):
+                    code = _EXT_TENSOR if isinstance(value, torch.Tensor) else _EXT_NDARRAY
+                    array = value.detach().cpu().numpy() if code == _EXT_TENSOR else value
+                    file.write(cls._array_header(array))
+                    file.write(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
+                else:
+                    code = 0
+                    file.write(cls.dumps(value))
+                index.append([name, code, offset, file.tell() - offset])
+
+            index_offset = file.tell()
+            index_length = file.write(cls.dumps(index))
+            file.seek(0)
+            file.write(_PARAMS_FILE_HEADER.pack(_PARAMS_FILE_MAGIC, index_offset, index_length))
+        os.replace(part_path, path)
+
+    @classmethod
+    def load_params(cls, path: str) -> Dict[Any, Any]:
+        """Load model parameters from a parameters file written by `dump_params`.
+
+        The file is memory-mapped: arrays and tensors are views on the file,
+        whose data are read lazily when layers are accessed, and may be
+        evicted from memory by the system. Mapping is copy-on-write, so that
+        modifying parameters in place does not alter the file.
+
+        Args:
+            path: Path to a parameters file.
+
+        Returns:
+            Model parameters, as a dict of layer names to values.
+
+        Raises:
+            FedbiomedValueError: if the file is not a parameters file.
+        """
+        with open(path, "rb") as file:
+            if file.read(len(_PARAMS_FILE_MAGIC)) != _PARAMS_FILE_MAGIC:
+                raise FedbiomedValueError(f"File '{path}' is not a parameters file.")
+            buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY))
+
+        _, index_offset, index_length = _PARAMS_FILE_HEADER.unpack_from(buffer)
+
+        params = {}
+        for name, code, offset, length in cls.loads(buffer[index_offset:index_offset + index_length]):
+            data = buffer[offset:offset + length]
+            params[name] = cls._ext_hook(code, data) if code else cls.loads(data)
+
+        return params
+
     @staticmethod
     def _default(obj: Any) -> Any:
         """Encode non-default object types into MsgPack-serializable data.
@@ -108,15 +263,16 @@ class Serializer:
         if isinstance(obj, tuple):
             return {"__type__": "tuple", "value": list(obj)}
         if isinstance(obj, np.ndarray):
-            spec = [obj.tobytes(), obj.dtype.name, list(obj.shape)]
-            return {"__type__": "np.ndarray", "value": spec}
+            return msgpack.ExtType(_EXT_NDARRAY, Serializer._pack_array(obj))
         if isinstance(obj, np.generic):
             spec = [obj.tobytes(), obj.dtype.name]
             return {"__type__": "np.generic", "value": spec}
         if isinstance(obj, torch.Tensor):
-            obj = obj.cpu().numpy()
-            spec = [obj.tobytes(), obj.dtype.name, list(obj.shape)]
-            return {"__type__": "torch.Tensor", "value": spec}
+            array = obj.detach().cpu().numpy()
+            return msgpack.ExtType(_EXT_TENSOR, Serializer._pack_array(array))
+        if isinstance(obj, CiphertextVector):
+            return msgpack.ExtType(
+                _EXT_CIPHERTEXTS, b"".join((struct.pack("<I", obj.width), obj.data)))
         if isinstance(obj, Vector):
             return {"__type__": "Vector", "value": obj.coefs}
         
@@ -128,6 +284,60 @@ class Serializer:
             f"Cannot serialize object of type '{type(obj)}'."
         )
 
+    @staticmethod
+    def _pack_array(array: np.ndarray) -> bytes:
+        """Encode a numpy array into the payload of a MsgPack extension type.
+
+        The payload is made of the number of dimensions, the length of the
+        dtype string, the dtype string, the shape (as 64 bits integers) and
+        padding to align the array data, followed by the raw array data.
+        Array data is copied once, directly from the array buffer.
+        """
+        data = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+        return b"".join((Serializer._array_header(array), data))
+
+    @staticmethod
+    def _array_header(array: np.ndarray) -> bytes:
+        """Encode the header of a numpy array, as used by `_pack_array`."""
+        dtype = array.dtype.str.encode()
+        header = struct.pack(
+            f"<BB{len(dtype)}s{array.ndim}q",
+            array.ndim, len(dtype), dtype, *array.shape
+        )
+        return header + bytes(-len(header) % _EXT_ALIGNMENT)
+
+    @staticmethod
+    def _unpack_array(data: Union[bytes, memoryview]) -> np.ndarray:
+        """Decode a numpy array from the payload of a MsgPack extension type.
+
+        The returned array is a read-only view on `data`.
+        """
+        ndim, len_dtype = struct.unpack_from("<BB", data)
+        dtype, *shape = struct.unpack_from(f"<{len_dtype}s{ndim}q", data, 2)
+        offset = 2 + len_dtype + 8 * ndim
+        offset += -offset % _EXT_ALIGNMENT
+        return np.frombuffer(data, dtype=dtype.decode(), offset=offset).reshape(shape)
+
+    @staticmethod
+    def _ext_hook(code: int, data: Union[bytes, memoryview]) -> Any:
+        """De-serialize MsgPack extension types encoded with `_default`."""
+        if code == _EXT_NDARRAY:
+            return Serializer._unpack_array(data)
+        if code == _EXT_TENSOR:
+            array = Serializer._unpack_array(data)
+            if not array.flags.writeable:
+                # tensors may be modified in place, which must not write into immutable data
+                array = array.copy()
+            return torch.from_numpy(array)
+        if code == _EXT_CIPHERTEXTS:
+            width, = struct.unpack_from("<I", data)
+            return CiphertextVector(memoryview(data)[4:], width)
+
+        logger.warning(
+            "Encountered an object that cannot be properly deserialized."
+        )
+        return msgpack.ExtType(code, data)
+
     @staticmethod
     def _object_hook(obj: Any) -> Any:
         """De-serialize non-default object types encoded with `_default`."""
@@ -7,7 +7,7 @@ Provide a way to easily to manage training arguments.
 from copy import deepcopy
 from typing import Any, Dict, Type, TypeVar, Union, Tuple, Callable
 
-from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.constants import ErrorNumbers, TransportPrecision
 from fedbiomed.common.exceptions import FedbiomedUserInputError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.metrics import MetricTypes
@@ -24,6 +24,15 @@ def _validate_dp_type(value: Any):
         return True
 
 
+@validator_decorator
+def _validate_transport_precision(value: Any):
+    """ Validates whether transport precision is valid"""
+    if value is not None and value not in TransportPrecision.list():
+        return False, f"Transport precision should be None or one of {TransportPrecision.list()} not {value}"
+    else:
+        return True
+
+
 DPArgsValidator = SchemeValidator({
     'type': {
         "rules": [str, _validate_dp_type], "required": True, "default": "central"
@@ -298,6 +307,7 @@ class TrainingArgs:
         | dp_args | arguments for Differential Privacy |
         | share_persistent_buffers | toggle whether nodes share the full state_dict (when True) or only trainable parameters (False) in a TorchTrainingPlan |
         | random_seed | set random seed at the beginning of each round |
+        | transport_precision | precision of the model parameters exchanged with the nodes: None for full precision, `fp16`, `bf16` or `int8`. Not applied to parameters encrypted with secure aggregation |
 
         """
         return {
@@ -354,6 +364,9 @@ class TrainingArgs:
             "random_seed": {
                 "rules": [cls.optional_type(typespec=int, argname='random_seed')], "required": True, "default": None
             },
+            "transport_precision": {
+                "rules": [_validate_transport_precision], "required": True, "default": None
+            },
             #MANI
             "gpu_num": {
                 "rules": [int], "required": True, "default": -1
@@ -280,6 +280,17 @@ class BaseTrainingPlan(metaclass=ABCMeta):
         """
         self._model.set_weights(params)
 
+    def num_params(self) -> int:
+        """Return the number of the model's parameters, as sent for secure aggregation.
+
+        Parameters are counted without post-processing nor copying them, unlike
+        `after_training_params(flatten=True)`.
+
+        Returns:
+            Number of model parameters, i.e. length of the flattened parameters.
+        """
+        return self._model.num_params()
+
     def set_aggregator_args(self, aggregator_args: Dict[str, Any]):
         raise FedbiomedTrainingPlanError("method not implemented and needed")
 
@@ -4,6 +4,7 @@
 from ._utils import (
     read_file,
     get_class_source,
+    get_source_hash,
     is_ipython,
     import_class_from_spec,
     import_class_object_from_file,
@@ -36,6 +37,16 @@ from ._secagg_utils import (
     matching_parties_biprime
 )
 
+from ._params_delta import (
+    encode_params_delta,
+    decode_params_delta,
+)
+
+from ._params_precision import (
+    encode_params_precision,
+    decode_params_precision,
+)
+
 from ._versions import (
     raise_for_version_compatibility,
     __default_version__,
@@ -47,6 +58,7 @@ __all__ = [
     # _utils
     "read_file",
     "get_class_source",
+    "get_source_hash",
     "is_ipython",
     "import_class_object_from_file"
     "import_class_from_spec",
@@ -68,6 +80,12 @@ __all__ = [
     "get_existing_component_db_names",
     "matching_parties_servkey",
     "matching_parties_biprime",
+    # _params_delta
+    "encode_params_delta",
+    "decode_params_delta",
+    # _params_precision
+    "encode_params_precision",
+    "decode_params_precision",
     # _versions
     "raise_for_version_compatibility",
     "__default_version__",
@@ -0,0 +1,164 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Delta encoding of model parameters against a previous version of the same model."""
+
+from typing import Any, Dict
+
+import numpy as np
+import torch
+
+from fedbiomed.common.constants import ErrorNumbers, ParamsDeltaMode
+from fedbiomed.common.exceptions import FedbiomedValueError
+
+
+# Number of levels of the quantized differences
+_QUANTIZATION_LEVELS = 255
+
+
+def _to_numpy(value: Any) -> np.ndarray:
+    """Returns a layer of parameters as a numpy array"""
+    if isinstance(value, torch.Tensor):
+        return value.detach().cpu().numpy()
+    return np.asarray(value)
+
+
+def _like(array: np.ndarray, base: Any) -> Any:
+    """Returns an array with the same type (numpy array or torch tensor) and device as `base`"""
+    if isinstance(base, torch.Tensor):
+        return torch.from_numpy(array).to(base.device)
+    return array
+
+
+def _bits(array: np.ndarray) -> np.ndarray:
+    """Returns a view of the array as unsigned integers of same width, for exact bitwise comparisons"""
+    return np.ascontiguousarray(array).view(f"u{array.dtype.itemsize}")
+
+
+def _encode_layer(base: np.ndarray, value: np.ndarray, mode: ParamsDeltaMode) -> Dict[str, Any]:
+    """Encodes a layer of parameters against the same layer of a previous version.
+
+    Args:
+        base: layer of the previous version
+        value: layer of the current version
+        mode: delta encoding mode
+
+    Returns:
+        Encoded layer
+    """
+    if base.shape != value.shape or base.dtype != value.dtype or value.dtype.hasobject:
+        return {"encoding": "full", "values": value}
+
+    if mode is ParamsDeltaMode.QUANTIZED and np.issubdtype(value.dtype, np.floating):
+        diff = value - base
+        low, high = float(diff.min(initial=0.)), float(diff.max(initial=0.))
+        scale = (high - low) / _QUANTIZATION_LEVELS or 1.
+        return {
+            "encoding": "quantized",
+            "offset": low,
+            "scale": scale,
+            "values": np.rint((diff - low) / scale).astype(np.uint8),
+        }
+
+    # Lossless encodings compare the bits of the values: unchanged values are exactly zero
+    xor = _bits(value) ^ _bits(base)
+    changed = np.flatnonzero(xor)
+    index_dtype = np.uint32 if value.size <= np.iinfo(np.uint32).max else np.uint64
+    if changed.size * (value.dtype.itemsize + np.dtype(index_dtype).itemsize) < value.nbytes:
+        return {
+            "encoding": "sparse",
+            "indices": changed.astype(index_dtype),
+            "values": value.reshape(-1)[changed],
+        }
+
+    return {"encoding": "xor", "values": xor}
+
+
+def _decode_layer(base: np.ndarray, layer: Dict[str, Any]) -> np.ndarray:
+    """Rebuilds a layer of parameters from the same layer of a previous version.
+
+    Args:
+        base: layer of the previous version
+        layer: encoded layer
+
+    Returns:
+        Layer of the current version
+    """
+    encoding = layer["encoding"]
+    if encoding == "full":
+        return _to_numpy(layer["values"])
+
+    if encoding == "quantized":
+        diff = layer["values"].astype(base.dtype) * layer["scale"] + layer["offset"]
+        return (base + diff).astype(base.dtype)
+
+    if encoding == "sparse":
+        value = base.copy()
+        value.reshape(-1)[layer["indices"]] = layer["values"]
+        return value
+
+    if encoding == "xor":
+        return (_bits(base) ^ layer["values"]).view(base.dtype).reshape(base.shape)
+
+    raise FedbiomedValueError(f"{ErrorNumbers.FB309.value}: unknown encoding of model parameters delta `{encoding}`")
+
+
+def encode_params_delta(
+        base: Dict[str, Any],
+        params: Dict[str, Any],
+        mode: ParamsDeltaMode
+) -> Dict[str, Dict[str, Any]]:
+    """Encodes model parameters as a delta against a previous version of the parameters.
+
+    In `DIFF` mode, each layer is encoded losslessly, either as the indices and values of the
+    changed weights when few weights changed, or as the bitwise XOR of the two versions, which
+    has zeros for unchanged weights and leading zero bytes for slightly changed ones. In
+    `QUANTIZED` mode, differences of floating point layers are quantized on 8 bits, which is lossy.
+
+    Layers that are missing from the previous version, or whose shape or type changed, are
+    sent in full.
+
+    Args:
+        base: previous version of the parameters
+        params: current version of the parameters
+        mode: delta encoding mode, must not be `NONE`
+
+    Returns:
+        Encoded delta, as a dictionary mapping parameters' names to their encoded layer
+    """
+    return {
+        name: _encode_layer(_to_numpy(base[name]), _to_numpy(value), mode) if name in base
+        else {"encoding": "full", "values": value}
+        for name, value in params.items()
+    }
+
+
+def decode_params_delta(
+        base: Dict[str, Any],
+        delta: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Rebuilds model parameters from an encoded delta and the version it was computed against.
+
+    Args:
+        base: version of the parameters the delta was computed against
+        delta: encoded delta, as returned by
+            [`encode_params_delta`][fedbiomed.common.utils.encode_params_delta]
+
+    Returns:
+        Model parameters, with the same type (numpy array or torch tensor) as the previous version
+
+    Raises:
+        FedbiomedValueError: the delta cannot be decoded with this previous version
+    """
+    params = {}
+    for name, layer in delta.items():
+        if name in base:
+            params[name] = _like(_decode_layer(_to_numpy(base[name]), layer), base[name])
+        elif layer["encoding"] == "full":
+            params[name] = layer["values"]
+        else:
+            raise FedbiomedValueError(
+                f"{ErrorNumbers.FB309.value}: layer `{name}` of model parameters delta is missing "
+                "from the base version")
+
+    return params
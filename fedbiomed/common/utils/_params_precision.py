@@ -0,0 +1,137 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Low precision encoding of model parameters, to reduce the size of the parameters exchanged."""
+
+from typing import Any, Dict
+
+import numpy as np
+import torch
+
+from fedbiomed.common.constants import ErrorNumbers, TransportPrecision
+from fedbiomed.common.exceptions import FedbiomedValueError
+
+
+# Largest magnitude of the quantized values, symmetric around zero
+_INT8_LEVELS = 127
+# Bits of a single precision float kept in a bfloat16
+_BF16_SHIFT = 16
+_BF16_NAN = 0x7FC0
+
+
+def _to_numpy(value: Any) -> np.ndarray:
+    """Returns a layer of parameters as a numpy array"""
+    if isinstance(value, torch.Tensor):
+        return value.detach().cpu().numpy()
+    return np.asarray(value)
+
+
+def _encode_layer(value: Any, precision: TransportPrecision) -> Dict[str, Any]:
+    """Encodes a layer of parameters with a lower precision.
+
+    Args:
+        value: layer of parameters, numpy array or torch tensor
+        precision: precision of the encoded layer
+
+    Returns:
+        Encoded layer
+    """
+    array = _to_numpy(value)
+    if not np.issubdtype(array.dtype, np.floating) or array.dtype.itemsize <= 2:
+        return {"encoding": "full", "values": value}
+
+    layer = {
+        "encoding": precision.value,
+        "dtype": array.dtype.str,
+        "tensor": isinstance(value, torch.Tensor),
+    }
+
+    if precision is TransportPrecision.FP16:
+        layer["values"] = array.astype(np.float16)
+
+    elif precision is TransportPrecision.BF16:
+        # keep the 16 most significant bits of the single precision value, rounded to nearest even
+        bits = np.ascontiguousarray(array, dtype=np.float32).view(np.uint32)
+        rounded = (bits + (0x7FFF + ((bits >> _BF16_SHIFT) & 1))) >> _BF16_SHIFT
+        layer["values"] = np.where(np.isnan(array), _BF16_NAN, rounded).astype(np.uint16)
+
+    elif precision is TransportPrecision.INT8:
+        scale = float(np.abs(array).max(initial=0.)) / _INT8_LEVELS or 1.
+        layer["scale"] = scale
+        layer["values"] = np.rint(array / scale).clip(-_INT8_LEVELS, _INT8_LEVELS).astype(np.int8)
+
+    return layer
+
+
+def _decode_layer(layer: Dict[str, Any]) -> Any:
+    """Rebuilds a layer of parameters from its low precision encoding.
+
+    Args:
+        layer: encoded layer
+
+    Returns:
+        Layer of parameters, with its original type and data type
+
+    Raises:
+        FedbiomedValueError: unknown encoding
+    """
+    encoding = layer["encoding"]
+    if encoding == "full":
+        return layer["values"]
+
+    values = _to_numpy(layer["values"])
+    dtype = np.dtype(layer["dtype"])
+    if encoding == TransportPrecision.FP16.value:
+        array = values.astype(dtype)
+    elif encoding == TransportPrecision.BF16.value:
+        array = (values.astype(np.uint32) << _BF16_SHIFT).view(np.float32).astype(dtype)
+    elif encoding == TransportPrecision.INT8.value:
+        array = values.astype(dtype) * dtype.type(layer["scale"])
+    else:
+        raise FedbiomedValueError(
+            f"{ErrorNumbers.FB309.value}: unknown precision encoding of model parameters `{encoding}`")
+
+    return torch.from_numpy(array) if layer["tensor"] else array
+
+
+def encode_params_precision(
+        params: Dict[str, Any],
+        precision: TransportPrecision
+) -> Dict[str, Dict[str, Any]]:
+    """Encodes model parameters with a lower precision, for transport.
+
+    Floating point layers are cast to half precision (`FP16`, `BF16`), or quantized on 8 bits
+    with a symmetric scale computed for each layer (`INT8`). Other layers are sent in full.
+    Encoding is lossy, parameters are rebuilt in their original precision by
+    [`decode_params_precision`][fedbiomed.common.utils.decode_params_precision].
+
+    Args:
+        params: model parameters, as a dictionary mapping parameters' names to numpy arrays
+            or torch tensors
+        precision: precision of the encoded parameters
+
+    Returns:
+        Encoded parameters, as a dictionary mapping parameters' names to their encoded layer
+    """
+    return {name: _encode_layer(value, precision) for name, value in params.items()}
+
+
+def decode_params_precision(params: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuilds model parameters from their low precision encoding.
+
+    Args:
+        params: encoded parameters, as returned by
+            [`encode_params_precision`][fedbiomed.common.utils.encode_params_precision]
+
+    Returns:
+        Model parameters, with the type (numpy array or torch tensor) and data type of the
+            parameters that were encoded
+
+    Raises:
+        FedbiomedValueError: the parameters cannot be decoded
+    """
+    try:
+        return {name: _decode_layer(layer) for name, layer in params.items()}
+    except (KeyError, IndexError, TypeError) as exc:
+        raise FedbiomedValueError(
+            f"{ErrorNumbers.FB309.value}: cannot decode low precision model parameters: {exc}") from exc
@@ -1,6 +1,7 @@
 # This file is originally part of Fed-BioMed
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
 import sys
 import os
 import inspect
@@ -71,6 +72,18 @@ def get_class_source(cls: Callable) -> str:
         return inspect.getsource(cls)
 
 
+def get_source_hash(source: str) -> str:
+    """Get the hash identifying a source code, e.g. the source of a training plan.
+
+    Args:
+        source: source code
+
+    Returns:
+        Hexadecimal SHA256 digest of the source code
+    """
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
 def is_ipython() -> bool:
     """
     Function that checks whether the codes (function itself) is executed in ipython kernel or not
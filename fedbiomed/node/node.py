@@ -6,6 +6,7 @@ Core code of the node component.
 '''
 from typing import Optional, Union, Callable
 
+from fedbiomed.common import utils
 from fedbiomed.common.constants import ErrorNumbers
 from fedbiomed.common.exceptions import FedbiomedMessageError
 from fedbiomed.common.logger import logger
@@ -14,6 +15,8 @@ from fedbiomed.common.tasks_queue import TasksQueue
 
 from fedbiomed.transport.controller import GrpcController
 from fedbiomed.transport.client import ResearcherCredentials
+from fedbiomed.transport.compression import PayloadCompressor
+from fedbiomed.transport.limits import TransportLimits
 
 from fedbiomed.node.environ import environ
 from fedbiomed.node.history_monitor import HistoryMonitor
@@ -22,6 +25,7 @@ from fedbiomed.node.training_plan_security_manager import TrainingPlanSecurityMa
 from fedbiomed.node.round import Round
 from fedbiomed.node.secagg import SecaggSetup
 from fedbiomed.node.secagg_manager import SecaggManager
+from fedbiomed.node.training_plan_cache import TrainingPlanCache
 
 
 class Node:
@@ -52,9 +56,18 @@ class Node:
             node_id=environ["ID"],
             researchers=[ResearcherCredentials(port=res['port'], host=res['ip'], certificate=res['certificate'])],
             on_message=self.on_message,
+            compressor=PayloadCompressor(
+                codec=environ["COMPRESSION_CODEC"],
+                threshold=environ["COMPRESSION_THRESHOLD"],
+                shuffle=environ["COMPRESSION_SHUFFLE"]),
+            limits=TransportLimits(
+                chunk_size=environ["CHUNK_SIZE"],
+                max_message_length=environ["GRPC_MAX_MESSAGE_LENGTH"],
+                flow_control_window=environ["GRPC_FLOW_CONTROL_WINDOW"]),
         )
         self.dataset_manager = dataset_manager
         self.tp_security_manager = tp_security_manager
+        self._training_plan_cache = TrainingPlanCache()
 
         self.node_args = node_args
 
@@ -249,6 +262,26 @@ class Node:
                                       researcher_id=msg.get_param('researcher_id'),
                                       send=self._grpc_client.send)
 
+        # researcher sends only the hash of a training plan already sent to the node
+        training_plan = msg.get_param('training_plan')
+        if training_plan is not None:
+            training_plan_hash = utils.get_source_hash(training_plan)
+        else:
+            training_plan_hash = msg.get_param('training_plan_hash')
+            cached_training_plan = self._training_plan_cache.get(training_plan_hash)
+            if cached_training_plan is None:
+                logger.info(f'Training plan {training_plan_hash} not found in cache, requesting its source')
+                self._grpc_client.send(NodeMessages.format_outgoing_message(
+                    {'command': "error",
+                     'request_id': msg.request_id,
+                     'node_id': environ['NODE_ID'],
+                     'researcher_id': msg.get_param('researcher_id'),
+                     'errnum': ErrorNumbers.FB324.name,
+                     'extra_msg': "Training plan not found in node cache"}
+                ))
+                return None
+            training_plan = cached_training_plan.source
+
         dataset_id = msg.get_param('dataset_id')
         data = self.dataset_manager.get_by_id(dataset_id)
 
@@ -268,13 +301,16 @@ class Node:
             if 'dlp_id' in data:
                 dlp_and_loading_block_metadata = self.dataset_manager.get_dlp_by_id(data['dlp_id'])
 
-            round_ = Round(training_plan=msg.get_param('training_plan'),
+            round_ = Round(training_plan=training_plan,
                            training_plan_class=msg.get_param('training_plan_class'),
                            model_kwargs=msg.get_param('model_args') or {},
                            training_kwargs=msg.get_param('training_args') or {},
                            training=msg.get_param('training') or False,
                            dataset=data,
                            params=msg.get_param('params'),
+                           model_version=msg.get_param('model_version'),
+                           base_model_version=msg.get_param('base_model_version'),
+                           params_precision=msg.get_param('params_precision'),
                            job_id=msg.get_param('job_id'),
                            researcher_id=msg.get_param('researcher_id'),
                            history_monitor=hist_monitor,
@@ -282,7 +318,9 @@ class Node:
                            node_args=self.node_args,
                            round_number=msg.get_param('round'),
                            dlp_and_loading_block_metadata=dlp_and_loading_block_metadata,
-                           aux_vars=msg.get_param('aux_vars'))
+                           aux_vars=msg.get_param('aux_vars'),
+                           training_plan_hash=training_plan_hash,
+                           training_plan_cache=self._training_plan_cache)
 
             # the round raises an error if it cannot initialize
             err_msg = round_.initialize_arguments(msg.get_param('state_id'))
@@ -27,6 +27,7 @@ class NodeStateFileName(_BaseEnum):
     Example: VALUE = "some_values_%s_%s"
     """
     OPTIMIZER: str = "optim_state_%s_%s"
+    MODEL_PARAMS: str = "model_params_%s_%s"
 
 
 class NodeStateManager:
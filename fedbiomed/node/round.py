@@ -17,7 +17,7 @@ import sys
 from typing import Dict, Union, Any, Optional, Tuple, List
 
 
-from fedbiomed.common.constants import ErrorNumbers, TrainingPlanApprovalStatus
+from fedbiomed.common.constants import ErrorNumbers, TrainingPlanApprovalStatus, TransportPrecision
 from fedbiomed.common.data import DataManager, DataLoadingPlan
 from fedbiomed.common.exceptions import (
     FedbiomedError, FedbiomedOptimizerError, FedbiomedRoundError,
@@ -35,6 +35,7 @@ from fedbiomed.node.environ import environ
 from fedbiomed.node.history_monitor import HistoryMonitor
 from fedbiomed.node.node_state_manager import NodeStateManager, NodeStateFileName
 from fedbiomed.node.secagg_manager import SKManager, BPrimeManager
+from fedbiomed.node.training_plan_cache import CachedTrainingPlan, TrainingPlanCache
 from fedbiomed.node.training_plan_security_manager import TrainingPlanSecurityManager
 
 
@@ -60,6 +61,11 @@ class Round:
         round_number: int = 0,
         dlp_and_loading_block_metadata: Optional[Tuple[dict, List[dict]]] = None,
         aux_vars: Optional[List[str]] = None,
+        model_version: Optional[str] = None,
+        base_model_version: Optional[str] = None,
+        params_precision: Optional[str] = None,
+        training_plan_hash: Optional[str] = None,
+        training_plan_cache: Optional[TrainingPlanCache] = None,
     ) -> None:
         """Constructor of the class
 
@@ -86,13 +92,30 @@ class Round:
             dlp_and_loading_block_metadata: Data loading plan to apply, or None if no DLP for this round.
             round_number: number of the iteration for this experiment
             aux_var: auxiliary variables of the model.
+            model_version: version of the model parameters, saved in the node state so that next
+                rounds can send a delta against it. None if the version is not tracked.
+            base_model_version: version of the model parameters `params` is a delta against, or
+                None if `params` are the full model parameters.
+            params_precision: precision of the low precision encoding of `params`, or None if
+                `params` are received in full precision.
+            training_plan_hash: hash of the training plan source, computed from the source if None.
+            training_plan_cache: cache of the training plans loaded by the node. Defaults to None,
+                training plan is not kept loaded after the round.
         """
 
         self._use_secagg: bool = False
         self.dataset = dataset
         self.training_plan_source = training_plan
         self.training_plan_class = training_plan_class
+        self._training_plan_hash = training_plan_hash or utils.get_source_hash(training_plan)
+        self._training_plan_cache = training_plan_cache if training_plan_cache is not None \
+            else TrainingPlanCache()
         self.params = params
+        self._model_version = model_version
+        self._base_model_version = base_model_version
+        self._params_precision = params_precision
+        self._base_model_state = None
+        self._model_state_entry = None
         self.job_id = job_id
         self.researcher_id = researcher_id
         self.history_monitor = history_monitor
@@ -110,7 +133,7 @@ class Round:
         self.testing_arguments = None
         self.loader_arguments = None
         self.training_arguments = None
-        self._secagg_crypter = SecaggCrypter()
+        self._secagg_crypter = SecaggCrypter(max_workers=environ['SECAGG_WORKERS'])
         self._secagg_clipping_range = None
         self._round = round_number
         self._biprime = None
@@ -233,6 +256,17 @@ class Round:
         Returns:
             Returns the corresponding node message, training reply instance
         """
+        try:
+            return self._run_model_training(secagg_arguments)
+        finally:
+            # secure aggregation workers and precomputed masks are only used during the round
+            self._secagg_crypter.shutdown()
+
+    def _run_model_training(
+            self,
+            secagg_arguments: Union[Dict, None] = None,
+    ) -> Dict[str, Any]:
+        """Runs one round of model training, see `run_model_training`"""
         # Validate secagg status. Raises error if the training request is not compatible with
         # secure aggregation settings
         try:
@@ -260,36 +294,53 @@ class Round:
                 logger.info(f'Training plan has been approved by the node {training_plan_["name"]}',
                             researcher_id=self.researcher_id)
 
-        # Import training plan, save to file, reload, instantiate a training plan
-        try:
-            CurrentTPModule, CurrentTrainingPlan = utils.import_class_from_spec(
-                code=self.training_plan_source, class_name=self.training_plan_class)
-            self.training_plan = CurrentTrainingPlan()
-        except Exception as e:
-            error_message = "Cannot instantiate training plan object."
-            return self._send_round_reply(success=False, message=error_message)
+        # Instantiate the training plan loaded by a previous round, if any
+        cached_training_plan = self._training_plan_cache.get(self._training_plan_hash)
+        if cached_training_plan is not None and cached_training_plan.class_name == self.training_plan_class:
+            CurrentTPModule = cached_training_plan.module
+            try:
+                self.training_plan = cached_training_plan.training_plan_class()
+            except Exception as e:
+                error_message = "Cannot instantiate training plan object."
+                return self._send_round_reply(success=False, message=error_message)
+        else:
+            # Import training plan, save to file, reload, instantiate a training plan
+            try:
+                CurrentTPModule, CurrentTrainingPlan = utils.import_class_from_spec(
+                    code=self.training_plan_source, class_name=self.training_plan_class)
+                self.training_plan = CurrentTrainingPlan()
+            except Exception as e:
+                error_message = "Cannot instantiate training plan object."
+                return self._send_round_reply(success=False, message=error_message)
 
-        # save and load training plan to a file to be sure
-        # 1. a file is associated to training plan so we can read its source, etc.
-        # 2. all dependencies are applied
-        training_plan_module = 'model_' + str(uuid.uuid4())
-        training_plan_file = os.path.join(self._keep_files_dir, training_plan_module + '.py')
-        try:
-            self.training_plan.save_code(training_plan_file, from_code=self.training_plan_source)
-        except Exception as e:
-            error_message = "Cannot save the training plan to a local tmp dir"
-            logger.error(f"Cannot save the training plan to a local tmp dir : {e}")
-            return self._send_round_reply(success=False, message=error_message)
+            # save and load training plan to a file to be sure
+            # 1. a file is associated to training plan so we can read its source, etc.
+            # 2. all dependencies are applied
+            training_plan_module = 'model_' + str(uuid.uuid4())
+            training_plan_file = os.path.join(self._keep_files_dir, training_plan_module + '.py')
+            try:
+                self.training_plan.save_code(training_plan_file, from_code=self.training_plan_source)
+            except Exception as e:
+                error_message = "Cannot save the training plan to a local tmp dir"
+                logger.error(f"Cannot save the training plan to a local tmp dir : {e}")
+                return self._send_round_reply(success=False, message=error_message)
 
-        del CurrentTrainingPlan
-        del CurrentTPModule
+            del CurrentTrainingPlan
+            del CurrentTPModule
 
-        try:
-            CurrentTPModule, self.training_plan = utils.import_class_object_from_file(
-                training_plan_file, self.training_plan_class)
-        except Exception as e:
-            error_message = "Cannot load training plan object from file."
-            return self._send_round_reply(success=False, message=error_message)
+            try:
+                CurrentTPModule, self.training_plan = utils.import_class_object_from_file(
+                    training_plan_file, self.training_plan_class)
+            except Exception as e:
+                error_message = "Cannot load training plan object from file."
+                return self._send_round_reply(success=False, message=error_message)
+
+            self._training_plan_cache.add(
+                self._training_plan_hash,
+                CachedTrainingPlan(source=self.training_plan_source,
+                                   class_name=self.training_plan_class,
+                                   module=CurrentTPModule,
+                                   training_plan_class=type(self.training_plan)))
 
         try:
             self.training_plan.post_init(model_args=self.model_arguments,
@@ -309,12 +360,52 @@ class Round:
                 previous_state_id = None
                 #return self._send_round_reply(success=False, message="Can't read previous node state.")
 
+        # Rebuild full precision model parameters when researcher sent them with a lower precision
+        if self._params_precision is not None:
+            try:
+                self.params = utils.decode_params_precision(self.params)
+            except Exception as e:
+                logger.debug(f"Cannot decode model parameters: {e}")
+                return self._send_round_reply(
+                    success=False,
+                    message="Cannot decode low precision model parameters.")
+
+        # Rebuild model parameters from the previous version when researcher sent a delta
+        if self._base_model_version is not None:
+            try:
+                self.params = self._rebuild_model_params()
+            except Exception as e:
+                logger.debug(f"Cannot rebuild model parameters: {e}")
+                return self._send_round_reply(
+                    success=False,
+                    message="Cannot rebuild model parameters from the previous version.")
+
         # Load model parameters received from researcher
         try:
             self.training_plan.set_model_params(self.params)
         except Exception as e:
             error_message = "Cannot initialize model parameters."
             return self._send_round_reply(success=False, message=error_message)
+
+        # Masks of the encrypted parameters only depend on their number: compute them while training
+        if self._use_secagg:
+            try:
+                self._secagg_crypter.precompute_masks(
+                    num_nodes=len(self._servkey["parties"]) - 1,  # -1: don't count researcher
+                    current_round=self._round,
+                    num_params=self.training_plan.num_params(),
+                    key=self._servkey["context"]["server_key"],
+                    biprime=self._biprime["context"]["biprime"])
+            except Exception as e:
+                # masks are computed when encrypting
+                logger.debug(f"Cannot precompute secure aggregation masks: {e}")
+
+        # Keep received model parameters, before training modifies them, for the next delta
+        if self.training and self._model_version is not None:
+            try:
+                self._save_model_params()
+            except Exception:
+                return self._send_round_reply(success=False, message="Can't save new node state.")
         # ---------------------------------------------------------------------
 
         # Process Optimizer auxiliary variables, if any.
@@ -430,6 +521,10 @@ class Round:
                 results["encryption_factor"] = encrypt(params=[secagg_arguments["secagg_random"]])
                 logger.info("Encryption is completed!",
                             researcher_id=self.researcher_id)
+            elif self.training_arguments['transport_precision'] is not None:
+                precision = TransportPrecision(self.training_arguments['transport_precision'])
+                model_weights = utils.encode_params_precision(model_weights, precision)
+                results["params_precision"] = precision.value
 
             results['params'] = model_weights
             results['optimizer_args'] = self.training_plan.optimizer_args()
@@ -551,6 +646,9 @@ class Round:
         # define here all the object that should be reloaded from the node state database
         state = self._node_state_manager.get(self.job_id, state_id)
 
+        # model parameters are reloaded only if a delta against them is received
+        self._base_model_state = state.get('model_state')
+
         optimizer_wrapper = self._get_base_optimizer()  # optimizer from TrainingPlan
         if state['optimizer_state'] is not None and \
            str(optimizer_wrapper.__class__) == state['optimizer_state']['optimizer_type']:
@@ -583,6 +681,9 @@ class Round:
         - optimizer_state:
             - optimizer_type (str)
             - state_path (str)
+        - model_state: model parameters received from researcher, only if their version is tracked
+            - version (str)
+            - state_path (str)
 
         Returns:
             `Round` state that will be saved in the database.
@@ -616,7 +717,9 @@ class Round:
             _success = False
             optimizer_state_entry = None
         state['optimizer_state'] = optimizer_state_entry
-        # add here other object states (ie model state, ...)
+        if self._model_state_entry is not None:
+            state['model_state'] = self._model_state_entry
+        # add here other object states
 
         # save completed node state
 
@@ -628,6 +731,38 @@ class Round:
 
         return state
 
+    def _rebuild_model_params(self) -> Dict[str, Any]:
+        """Rebuilds model parameters from the delta received from researcher.
+
+        The delta is decoded against the model parameters saved in the previous node state.
+
+        Returns:
+            Model parameters
+
+        Raises:
+            FedbiomedRoundError: previous node state does not hold the version of the model
+                parameters the delta was computed against.
+        """
+        if self._base_model_state is None or self._base_model_state['version'] != self._base_model_version:
+            raise FedbiomedRoundError(f"{ErrorNumbers.FB314.value}: model parameters version "
+                                      f"{self._base_model_version} not found in node state")
+
+        base = Serializer.load(self._base_model_state['state_path'])
+        return utils.decode_params_delta(base, self.params)
+
+    def _save_model_params(self) -> None:
+        """Saves model parameters received from researcher, to be added to the node state."""
+        params_path = self._node_state_manager.generate_folder_and_create_file_name(
+            self.job_id,
+            self._round,
+            NodeStateFileName.MODEL_PARAMS
+        )
+        Serializer.dump(self.params, path=params_path)
+        self._model_state_entry = {
+            'version': self._model_version,
+            'state_path': params_path
+        }
+
     def collect_optim_aux_var(self) -> Dict[str, Any]:
         """Collect auxiliary variables from the wrapped Optimizer, if any.
 
@@ -0,0 +1,82 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+'''Cache of the training plans loaded by the node, keyed by the hash of their source
+'''
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Optional
+
+from fedbiomed.common.logger import logger
+
+
+# Default number of training plans kept loaded by the node
+DEFAULT_TRAINING_PLAN_CACHE_SIZE = 8
+
+
+@dataclass
+class CachedTrainingPlan:
+    """Training plan loaded by the node
+
+    Attributes:
+        source: source code of the training plan
+        class_name: name of the training plan class
+        module: module imported from the source of the training plan
+        training_plan_class: training plan class, instantiated for each round
+    """
+    source: str
+    class_name: str
+    module: ModuleType
+    training_plan_class: type
+
+
+class TrainingPlanCache:
+    """Keeps the most recently used training plans loaded, so that the researcher sends the
+    source of a training plan only once and rounds don't import it again.
+
+    Training plans are keyed by the hash of their source, as computed by
+    [`get_source_hash`][fedbiomed.common.utils.get_source_hash].
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TRAINING_PLAN_CACHE_SIZE):
+        """Constructor of the class
+
+        Args:
+            max_size: maximum number of training plans kept in the cache
+        """
+        self._max_size = max_size
+        self._entries: OrderedDict[str, CachedTrainingPlan] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns the number of training plans in the cache"""
+        return len(self._entries)
+
+    def get(self, source_hash: str) -> Optional[CachedTrainingPlan]:
+        """Gets a training plan from the cache.
+
+        Args:
+            source_hash: hash of the source of the training plan
+
+        Returns:
+            Cached training plan, or None if it is not in the cache
+        """
+        entry = self._entries.get(source_hash)
+        if entry is not None:
+            self._entries.move_to_end(source_hash)
+        return entry
+
+    def add(self, source_hash: str, entry: CachedTrainingPlan) -> None:
+        """Adds a training plan to the cache, evicting the least recently used one if the cache is full.
+
+        Args:
+            source_hash: hash of the source of the training plan
+            entry: loaded training plan
+        """
+        self._entries[source_hash] = entry
+        self._entries.move_to_end(source_hash)
+
+        while len(self._entries) > self._max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug(f"Training plan {evicted} evicted from node cache")
@@ -3,14 +3,22 @@
 
 from .aggregator import Aggregator
 from .fedavg import FedAverage
+from .fedbuff import FedBuff
 from .scaffold import Scaffold
-from .functional import initialize, federated_averaging, weighted_sum
+from .executor import AggregationExecutor
+from .flat import FlatLayout, flat_weighted_sum
+from .functional import initialize, federated_averaging, weighted_sum, WeightedSumAccumulator
 
 __all__ = [
     "Aggregator",
+    "AggregationExecutor",
     "FedAverage",
+    "FedBuff",
     "initialize",
     "federated_averaging",
     "weighted_sum",
+    "WeightedSumAccumulator",
+    "FlatLayout",
+    "flat_weighted_sum",
     "Scaffold"
 ]
@@ -103,6 +103,34 @@ class Aggregator:
         logger.critical(msg)
         raise FedbiomedAggregatorError(msg)
 
+    @property
+    def streaming(self) -> bool:
+        """Whether the aggregator aggregates model parameters as soon as they are received.
+
+        When True, the parameters of each node are passed to
+        [`accumulate`][fedbiomed.researcher.aggregators.Aggregator.accumulate] as soon as they are
+        received, then `aggregate` is called once all the replies of the round are received.
+        """
+        return False
+
+    def reset_accumulator(self) -> None:
+        """Discards the parameters accumulated for a round, before a new round starts"""
+
+    def accumulate(self, node_id: str, params: Dict[str, Any]) -> None:
+        """Aggregates the model parameters of a node as soon as they are received
+
+        Args:
+            node_id: ID of the node that sent the parameters
+            params: model parameters of the node
+
+        Raises:
+            FedbiomedAggregatorError: If the method is not defined by inheritor
+        """
+        msg = ErrorNumbers.FB401.value + \
+            f": {type(self).__name__} does not support aggregation of parameters as soon as they are received"
+        logger.critical(msg)
+        raise FedbiomedAggregatorError(msg)
+
     def check_values(self, *args, **kwargs) -> True:
         return True
 
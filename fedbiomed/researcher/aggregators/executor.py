@@ -0,0 +1,155 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Parallel execution of aggregation computations on shards of model layers."""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedAggregatorError
+
+
+def layer_size(value: Union[torch.Tensor, np.ndarray]) -> int:
+    """Returns the number of weights of a model layer"""
+    if isinstance(value, torch.Tensor):
+        return value.numel()
+    return int(np.size(value))
+
+
+class AggregationExecutor:
+    """Executes aggregation computations in parallel on shards of the model layers.
+
+    Model layers are split into contiguous shards holding about the same number of weights,
+    and each shard is reduced by a worker of a pool of threads or processes.
+
+    Threads share the model parameters with the researcher, and numpy and torch release the GIL
+    in their vector operations, so that they are the best choice in most cases. Processes
+    receive a pickled copy of the layers of their shard, which only pays off when the
+    computation is bound by the Python interpreter.
+
+    The pool is created on first use, and is not copied with the executor.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            processes: bool = False,
+            min_shard_size: int = 2 ** 16
+    ):
+        """Constructor of the class
+
+        Args:
+            max_workers: maximum number of workers, ie of shards. Defaults to None, the number of CPUs.
+            processes: if True, shards are reduced in a pool of processes rather than of threads.
+                Defaults to False.
+            min_shard_size: minimum number of weights in a shard, so that small models are not split
+                in shards that cost more to dispatch than to reduce. Defaults to 65536.
+
+        Raises:
+            FedbiomedAggregatorError: bad number of workers or shard size
+        """
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers < 1):
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: number of aggregation workers should be a positive integer, "
+                f"not {max_workers}")
+        if not isinstance(min_shard_size, int) or min_shard_size < 1:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: minimum shard size should be a positive integer, "
+                f"not {min_shard_size}")
+
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._processes = processes
+        self._min_shard_size = min_shard_size
+        self._pool: Optional[Executor] = None
+
+    @property
+    def max_workers(self) -> int:
+        """Maximum number of workers"""
+        return self._max_workers
+
+    @property
+    def processes(self) -> bool:
+        """Whether shards are reduced in a pool of processes rather than of threads"""
+        return self._processes
+
+    def split(self, sizes: Sequence[int]) -> List[Tuple[int, int]]:
+        """Splits a sequence of layers in contiguous shards of about the same number of weights
+
+        Args:
+            sizes: number of weights of each layer
+
+        Returns:
+            Bounds `(start, stop)` of the shards in the sequence of layers
+        """
+        total = sum(sizes)
+        n_shards = max(1, min(self._max_workers, len(sizes), total // self._min_shard_size))
+
+        bounds = []
+        start = 0
+        cumulated = 0
+        for index, size in enumerate(sizes):
+            # cut before the layer when it ends further from the end of the shard than it starts
+            target = total * (len(bounds) + 1) / n_shards
+            if len(bounds) < n_shards - 1 and index > start and cumulated + size > target \
+                    and target - cumulated < cumulated + size - target:
+                bounds.append((start, index))
+                start = index
+            cumulated += size
+            if len(bounds) < n_shards - 1 and cumulated >= total * (len(bounds) + 1) / n_shards:
+                bounds.append((start, index + 1))
+                start = index + 1
+        if start < len(sizes) or not bounds:
+            bounds.append((start, len(sizes)))
+        return bounds
+
+    def shard_keys(self, params: Dict[str, Union[torch.Tensor, np.ndarray]]) -> List[List[str]]:
+        """Splits model layers in contiguous shards of about the same number of weights
+
+        Args:
+            params: model parameters, mapping model layer names to the model weights
+
+        Returns:
+            Names of the layers of each shard
+        """
+        keys = list(params)
+        return [keys[start:stop] for start, stop in self.split([layer_size(params[key]) for key in keys])]
+
+    def map(self, func: Callable[..., Any], *iterables: Iterable) -> List[Any]:
+        """Applies a function to the arguments of each shard, in parallel
+
+        A single shard is computed in the calling thread.
+
+        Args:
+            func: function reducing a shard; must be picklable (defined at module level) for processes
+            iterables: arguments of the function, one item for each shard
+
+        Returns:
+            Results of the function, in the order of the shards
+        """
+        args = list(zip(*iterables))
+        if len(args) <= 1:
+            return [func(*arg) for arg in args]
+        return list(self._get_pool().map(func, *zip(*args)))
+
+    def shutdown(self) -> None:
+        """Stops the workers, they are started again on next use"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> Executor:
+        """Returns the pool of workers, creating it on first use"""
+        if self._pool is None:
+            pool_class = ProcessPoolExecutor if self._processes else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self._max_workers)
+        return self._pool
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
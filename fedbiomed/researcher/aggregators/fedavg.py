@@ -4,7 +4,7 @@
 """
 """
 
-from typing import Dict, Union, Mapping
+from typing import Dict, Optional, Union, Mapping
 
 import torch # used by typing
 import numpy # used by typing
@@ -12,7 +12,8 @@ import numpy # used by typing
 from fedbiomed.common.constants import ErrorNumbers
 from fedbiomed.common.exceptions import FedbiomedAggregatorError
 from fedbiomed.researcher.aggregators.aggregator import Aggregator
-from fedbiomed.researcher.aggregators.functional import federated_averaging
+from fedbiomed.researcher.aggregators.executor import AggregationExecutor
+from fedbiomed.researcher.aggregators.functional import federated_averaging, WeightedSumAccumulator
 
 
 class FedAverage(Aggregator):
@@ -20,12 +21,51 @@ class FedAverage(Aggregator):
     Defines the Federated averaging strategy
     """
 
-    def __init__(self):
+    def __init__(
+            self,
+            streaming: bool = False,
+            flat: bool = False,
+            executor: Optional[AggregationExecutor] = None
+    ):
         """Construct `FedAverage` object as an instance of [`Aggregator`]
         [fedbiomed.researcher.aggregators.Aggregator].
+
+        Args:
+            streaming: if True, the parameters of each node are added to a running sum as soon as they
+                are received, so that aggregation overlaps with the training of the slowest nodes and
+                only the running sum is held in memory. Defaults to False.
+            flat: if True, models are packed in flat contiguous buffers, and summed with a single vector
+                operation for each node rather than layer by layer. Defaults to False.
+            executor: executor aggregating shards of the model layers in parallel, in a pool of threads
+                or processes. Defaults to None, models are aggregated in the calling thread.
         """
         super(FedAverage, self).__init__()
         self.aggregator_name = "FedAverage"
+        self._streaming = streaming
+        self._flat = flat
+        self._executor = executor
+        self._accumulator = WeightedSumAccumulator(flat=flat, executor=executor)
+
+    @property
+    def streaming(self) -> bool:
+        """Whether the aggregator aggregates model parameters as soon as they are received"""
+        return self._streaming
+
+    def reset_accumulator(self) -> None:
+        """Discards the parameters accumulated for a round, before a new round starts"""
+        self._accumulator.reset()
+
+    def accumulate(self, node_id: str, params: Dict[str, Union['torch.Tensor', 'numpy.ndarray']]) -> None:
+        """Adds the model parameters of a node to the running sum as soon as they are received
+
+        Nodes have the same weight, as in [`federated_averaging`]
+        [fedbiomed.researcher.aggregators.functional.federated_averaging].
+
+        Args:
+            node_id: ID of the node that sent the parameters
+            params: model parameters of the node
+        """
+        self._accumulator.add(node_id, params)
 
     def aggregate(
             self,
@@ -70,6 +110,12 @@ class FedAverage(Aggregator):
                 f"Sample sizes received from nodes might be corrupted."
             )
 
-        agg_params = federated_averaging(model_params_processed, weights_processed)
+        if self._streaming and sorted(self._accumulator.nodes) == sorted(model_params):
+            # parameters were already summed when received
+            agg_params = self._accumulator.average()
+        else:
+            self._accumulator.reset()
+            agg_params = federated_averaging(model_params_processed, weights_processed,
+                                             flat=self._flat, executor=self._executor)
 
         return agg_params
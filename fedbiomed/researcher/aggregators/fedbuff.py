@@ -0,0 +1,240 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Buffered asynchronous aggregation (FedBuff), with staleness weighted model updates.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import torch
+import numpy as np
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedAggregatorError
+from fedbiomed.common.logger import logger
+from fedbiomed.researcher.aggregators.aggregator import Aggregator
+from fedbiomed.researcher.aggregators.functional import initialize, _add_shard
+
+
+class FedBuff(Aggregator):
+    """Defines the buffered asynchronous aggregation strategy (FedBuff).
+
+    Nodes train from a version of the global model, and send back their model while other nodes
+    are still training. The update of each node, ie the difference between its model and the version
+    of the global model it trained from, is added to a buffer as soon as it is received. Once
+    `buffer_size` updates are buffered, the global model moves by the average of the buffered updates,
+    scaled by the server learning rate, and a new version of the global model is created.
+
+    An update is stale when the global model moved since the node started training. Updates are
+    weighted by `(1 + staleness) ** -staleness_exponent`, so that stale updates contribute less.
+
+    When used in a synchronous experiment, all the updates of a round are fresh, and the aggregator
+    is equivalent to federated averaging with a server learning rate.
+    """
+
+    def __init__(
+            self,
+            buffer_size: int = 2,
+            server_lr: float = 1.,
+            staleness_exponent: float = .5
+    ):
+        """Constructor of the class
+
+        Args:
+            buffer_size: number of updates aggregated into each version of the global model. Defaults to 2.
+            server_lr: learning rate applied to the average of the buffered updates. Defaults to 1.
+            staleness_exponent: exponent of the polynomial decay of the weight of stale updates,
+                0 weights all updates the same. Defaults to 0.5.
+
+        Raises:
+            FedbiomedAggregatorError: bad buffer size, learning rate or staleness exponent
+        """
+        super().__init__()
+        if not isinstance(buffer_size, int) or isinstance(buffer_size, bool) or buffer_size < 1:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: buffer size should be a positive integer, not {buffer_size}")
+        if not isinstance(server_lr, (int, float)) or server_lr <= 0:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: server learning rate should be a positive number, not {server_lr}")
+        if not isinstance(staleness_exponent, (int, float)) or staleness_exponent < 0:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: staleness exponent should be a non negative number, "
+                f"not {staleness_exponent}")
+
+        self.aggregator_name = "FedBuff"
+        self._buffer_size = buffer_size
+        self._server_lr = float(server_lr)
+        self._staleness_exponent = float(staleness_exponent)
+
+        # versions of the global model that nodes may still be training from
+        self._global_models: Dict[int, Dict[str, Union[torch.Tensor, np.ndarray]]] = {}
+        self._version: Optional[int] = None
+        self.reset_buffer()
+
+    @property
+    def buffer_size(self) -> int:
+        """Number of updates aggregated into each version of the global model"""
+        return self._buffer_size
+
+    @property
+    def server_lr(self) -> float:
+        """Learning rate applied to the average of the buffered updates"""
+        return self._server_lr
+
+    @property
+    def buffered(self) -> int:
+        """Number of updates in the buffer"""
+        return len(self._nodes)
+
+    @property
+    def is_full(self) -> bool:
+        """Whether enough updates are buffered to create a new version of the global model"""
+        return self.buffered >= self._buffer_size
+
+    @property
+    def nodes(self) -> List[str]:
+        """IDs of the nodes whose update is in the buffer, in the order they were added"""
+        return self._nodes
+
+    def reset_buffer(self) -> None:
+        """Empties the buffer of updates"""
+        self._sum: Optional[Dict[str, Union[torch.Tensor, np.ndarray]]] = None
+        self._nodes: List[str] = []
+
+    def staleness_weight(self, staleness: int) -> float:
+        """Returns the weight of an update in the buffer
+
+        Args:
+            staleness: number of versions of the global model created since the node started training
+
+        Returns:
+            Weight of the update
+        """
+        return (1. + max(staleness, 0)) ** -self._staleness_exponent
+
+    def set_global_model(self, version: int, params: Dict[str, Union[torch.Tensor, np.ndarray]]) -> None:
+        """Records a version of the global model, that nodes train from
+
+        Args:
+            version: version of the global model, increasing with each aggregation
+            params: parameters of the global model
+        """
+        self._global_models[version] = params
+        self._version = version if self._version is None else max(self._version, version)
+
+    def release_global_models(self, keep: Iterable[int]) -> None:
+        """Discards the versions of the global model that no node trains from anymore
+
+        Args:
+            keep: versions of the global model that nodes are still training from
+        """
+        keep = set(keep)
+        self._global_models = {
+            version: params for version, params in self._global_models.items() if version in keep
+        }
+
+    def add_update(
+            self,
+            node_id: str,
+            params: Dict[str, Union[torch.Tensor, np.ndarray]],
+            model_version: int
+    ) -> None:
+        """Adds the update of a node to the buffer, as soon as it is received
+
+        Args:
+            node_id: ID of the node that sent the model
+            params: model parameters of the node, after training
+            model_version: version of the global model the node trained from
+
+        Raises:
+            FedbiomedAggregatorError: unknown version of the global model
+        """
+        if model_version not in self._global_models:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: version {model_version} of the global model that node "
+                f"{node_id} trained from is unknown. Aggregation is aborted.")
+
+        staleness = self._version - model_version
+        logger.debug(f"Buffering update of node {node_id} trained from version {model_version} "
+                     f"of the global model, with staleness {staleness}")
+        self._add(node_id, params, self._global_models[model_version], self.staleness_weight(staleness))
+
+    def aggregate(
+            self,
+            model_params: Dict[str, Dict[str, Union[torch.Tensor, np.ndarray]]],
+            weights: Dict[str, float],
+            global_model: Dict[str, Union[torch.Tensor, np.ndarray]],
+            *args,
+            **kwargs
+    ) -> Mapping[str, Union[torch.Tensor, np.ndarray]]:
+        """Moves the global model by the average of the buffered updates
+
+        Models in `model_params` are first added to the buffer as fresh updates of `global_model`,
+        which is the case of the models of a synchronous round. The buffer is emptied.
+
+        Args:
+            model_params: models of the nodes that are not in the buffer yet, indexed by node ID
+            weights: ignored, buffered updates are weighted by their staleness
+            global_model: current global model
+            *args: ignored
+            **kwargs: ignored
+
+        Returns:
+            Parameters of the new version of the global model
+
+        Raises:
+            FedbiomedAggregatorError: empty buffer
+        """
+        for node_id, params in model_params.items():
+            self._add(node_id, params, global_model, 1.)
+
+        if self._sum is None:
+            raise FedbiomedAggregatorError(
+                f"{ErrorNumbers.FB401.value}: no model update was received. Aggregation is aborted.")
+
+        scale = self._server_lr / self.buffered
+        updates = self._sum
+        self.reset_buffer()
+
+        aggregated_params = {}
+        for key, update in updates.items():
+            if isinstance(update, torch.Tensor):
+                aggregated_params[key] = global_model[key].to(update.device) + scale * update
+            else:
+                aggregated_params[key] = np.asarray(global_model[key]) + scale * update
+        return aggregated_params
+
+    def _add(
+            self,
+            node_id: str,
+            params: Dict[str, Union[torch.Tensor, np.ndarray]],
+            base: Dict[str, Union[torch.Tensor, np.ndarray]],
+            weight: float
+    ) -> None:
+        """Adds the weighted difference between a model and the model it was trained from to the buffer"""
+        if self._sum is None:
+            self._sum = {key: initialize(val)[1] for key, val in params.items()}
+        _add_shard(self._sum, params, weight)
+        _add_shard(self._sum, base, -weight)
+        self._nodes.append(node_id)
+
+    def save_state_breakpoint(
+            self,
+            breakpoint_path: Optional[str] = None,
+            **aggregator_args_create: Any
+    ) -> Dict[str, Any]:
+        # adding aggregator parameters to the breakpoint that wont be sent to nodes
+        self._aggregator_args = {
+            **(self._aggregator_args or {}),
+            'buffer_size': self._buffer_size,
+            'server_lr': self._server_lr,
+            'staleness_exponent': self._staleness_exponent,
+        }
+        return super().save_state_breakpoint(breakpoint_path, **aggregator_args_create)
+
+    def load_state_breakpoint(self, state: Dict[str, Any], **kwargs) -> None:
+        super().load_state_breakpoint(state)
+        self._buffer_size = self._aggregator_args.get('buffer_size', self._buffer_size)
+        self._server_lr = self._aggregator_args.get('server_lr', self._server_lr)
+        self._staleness_exponent = self._aggregator_args.get('staleness_exponent', self._staleness_exponent)
@@ -0,0 +1,219 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Aggregation of model parameters packed in flat contiguous buffers."""
+
+from typing import TYPE_CHECKING, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import torch
+from scipy.linalg.blas import get_blas_funcs
+
+if TYPE_CHECKING:
+    from fedbiomed.researcher.aggregators.executor import AggregationExecutor
+
+
+class _LayerSlot(NamedTuple):
+    """Position of a model layer in the flat buffer"""
+    key: str
+    shape: Tuple[int, ...]
+    offset: int
+    size: int
+
+
+class FlatLayout:
+    """Layout of model parameters packed in a single contiguous buffer.
+
+    The layout is computed once from a model, and shared by all the models with the same layers,
+    so that models are packed in buffers of the same size and aggregated with single vector
+    operations (BLAS `axpy`) rather than layer by layer.
+
+    Buffers are torch tensors of single precision floats when the model layers are torch tensors,
+    and numpy arrays of double precision floats otherwise, as in
+    [`initialize`][fedbiomed.researcher.aggregators.functional.initialize].
+    """
+
+    def __init__(self, params: Dict[str, Union[torch.Tensor, np.ndarray]]):
+        """Constructor of the class
+
+        Args:
+            params: model parameters defining the layout, mapping model layer names to the model weights
+        """
+        self._slots: List[_LayerSlot] = []
+        self._device = None
+        offset = 0
+        for key, val in params.items():
+            if isinstance(val, torch.Tensor):
+                self._device = val.device
+                shape = tuple(val.shape)
+            else:
+                shape = np.shape(val)
+            size = int(np.prod(shape, dtype=np.int64))
+            self._slots.append(_LayerSlot(key, shape, offset, size))
+            offset += size
+        self._size = offset
+        self._tensor = self._device is not None
+
+    @property
+    def size(self) -> int:
+        """Number of weights of the model, ie size of the buffers"""
+        return self._size
+
+    @property
+    def keys(self) -> List[str]:
+        """Names of the model layers, in the order they are packed"""
+        return [slot.key for slot in self._slots]
+
+    @property
+    def sizes(self) -> List[int]:
+        """Number of weights of each model layer, in the order they are packed"""
+        return [slot.size for slot in self._slots]
+
+    def sublayout(self, start: int, stop: int) -> Tuple['FlatLayout', slice]:
+        """Returns the layout of a contiguous range of the model layers
+
+        Args:
+            start: index of the first layer of the range
+            stop: index after the last layer of the range
+
+        Returns:
+            Layout of the layers of the range, and the range of the buffer where they are packed
+        """
+        slots = self._slots[start:stop]
+        begin = slots[0].offset if slots else 0
+        layout = FlatLayout({})
+        layout._slots = [slot._replace(offset=slot.offset - begin) for slot in slots]
+        layout._size = sum(slot.size for slot in slots)
+        layout._device = self._device
+        layout._tensor = self._tensor
+        return layout, slice(begin, begin + layout._size)
+
+    def zeros(self) -> Union[torch.Tensor, np.ndarray]:
+        """Returns a buffer filled with zeros"""
+        if self._tensor:
+            return torch.zeros(self._size, dtype=torch.float32, device=self._device)
+        return np.zeros(self._size, dtype=float)
+
+    def pack(
+            self,
+            params: Dict[str, Union[torch.Tensor, np.ndarray]],
+            out: Optional[Union[torch.Tensor, np.ndarray]] = None
+    ) -> Union[torch.Tensor, np.ndarray]:
+        """Packs model parameters in a flat buffer
+
+        Args:
+            params: model parameters, with the layers of the layout
+            out: buffer where parameters are packed. Defaults to None, a new buffer is allocated.
+
+        Returns:
+            Buffer of the packed parameters
+        """
+        if out is None:
+            out = torch.empty(self._size, dtype=torch.float32, device=self._device) if self._tensor \
+                else np.empty(self._size, dtype=float)
+
+        for key, _, offset, size in self._slots:
+            val = params[key]
+            if self._tensor:
+                out[offset:offset + size].copy_(val.reshape(-1))
+            else:
+                out[offset:offset + size] = np.asarray(val).reshape(-1)
+        return out
+
+    def unpack(self, buffer: Union[torch.Tensor, np.ndarray]) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+        """Returns model parameters as views of a flat buffer
+
+        Args:
+            buffer: buffer of packed parameters
+
+        Returns:
+            Model parameters, mapping model layer names to views of the buffer
+        """
+        return {key: buffer[offset:offset + size].reshape(shape) for key, shape, offset, size in self._slots}
+
+    @staticmethod
+    def axpy(
+            weight: float,
+            x: Union[torch.Tensor, np.ndarray],
+            y: Union[torch.Tensor, np.ndarray]
+    ) -> None:
+        """Adds a weighted buffer to another buffer in place: `y += weight * x`
+
+        Args:
+            weight: weight of `x`
+            x: buffer added
+            y: buffer updated in place
+        """
+        if isinstance(y, torch.Tensor):
+            y.add_(x, alpha=weight)
+        else:
+            axpy = get_blas_funcs('axpy', (y,))
+            axpy(x, y, a=weight)
+
+
+def _flat_weighted_sum_shard(layout: FlatLayout,
+                             model_params: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
+                             proportions: List[float],
+                             total: Union[torch.Tensor, np.ndarray]) -> Union[torch.Tensor, np.ndarray]:
+    """Adds the weighted sum of models to a flat buffer, in place
+
+    Args:
+        layout: layout of the models
+        model_params: models parameters, with the layers of the layout
+        proportions: weights of the models
+        total: buffer the weighted sum is added to
+
+    Returns:
+        The `total` buffer
+    """
+    scratch = None
+    for model, weight in zip(model_params, proportions):
+        scratch = layout.pack(model, out=scratch)
+        layout.axpy(weight, scratch, total)
+    return total
+
+
+def flat_weighted_sum(
+        model_params: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
+        proportions: List[float],
+        layout: Optional[FlatLayout] = None,
+        out: Optional[Union[torch.Tensor, np.ndarray]] = None,
+        executor: Optional['AggregationExecutor'] = None
+) -> Mapping[str, Union[torch.Tensor, np.ndarray]]:
+    """Performs weighted sum operation on flat buffers
+
+    Gives the same result as [`weighted_sum`][fedbiomed.researcher.aggregators.functional.weighted_sum].
+    Each model is packed in turn in the same scratch buffer and added to the sum with a single `axpy`,
+    so that only two buffers of the size of the model are allocated.
+
+    Args:
+        model_params: list that contains nodes' model parameters; each model is stored as an OrderedDict (maps
+            model layer name to the model weights)
+        proportions: weights of all items whithin model_params's list
+        layout: layout of the models. Defaults to None, layout is computed from the first model.
+        out: buffer the weighted sum is added to, in place. Defaults to None, the sum starts from zeros.
+        executor: executor reducing contiguous ranges of the buffer in parallel. Defaults to None,
+            the sum is computed in the calling thread.
+
+    Returns:
+        Model resulting from the weighted sum operation, as views of a single flat buffer
+    """
+    layout = layout or FlatLayout(model_params[0])
+    total = layout.zeros() if out is None else out
+    if executor is None:
+        _flat_weighted_sum_shard(layout, model_params, proportions, total)
+        return layout.unpack(total)
+
+    shards = [layout.sublayout(start, stop) for start, stop in executor.split(layout.sizes)]
+    results = executor.map(
+        _flat_weighted_sum_shard,
+        [sub for sub, _ in shards],
+        [[{key: model[key] for key in sub.keys} for model in model_params] for sub, _ in shards],
+        [proportions] * len(shards),
+        [total[span] for _, span in shards],
+    )
+    if executor.processes and len(shards) > 1:
+        # workers summed into copies of the buffer
+        for (_, span), result in zip(shards, results):
+            total[span] = result
+    return layout.unpack(total)
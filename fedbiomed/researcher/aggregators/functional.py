@@ -2,11 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import copy
-from typing import Dict, List, Mapping, Tuple, Union
+from typing import Dict, List, Mapping, Optional, Tuple, Union
 
 import torch
 import numpy as np
 
+from fedbiomed.researcher.aggregators.executor import AggregationExecutor
+from fedbiomed.researcher.aggregators.flat import FlatLayout, flat_weighted_sum
+
 
 def initialize(val: Union[torch.Tensor, np.ndarray]) -> Tuple[str, Union[torch.Tensor, np.ndarray]]:
     """Initialize tensor or array vector. """
@@ -18,8 +21,12 @@ def initialize(val: Union[torch.Tensor, np.ndarray]) -> Tuple[str, Union[torch.T
         return 'array', np.zeros(val.shape, dtype = float)
 
 
-def federated_averaging(model_params: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
-                        weights: List[float]) -> Mapping[str, Union[torch.Tensor, np.ndarray]]:
+def federated_averaging(
+        model_params: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
+        weights: List[float],
+        flat: bool = False,
+        executor: Optional[AggregationExecutor] = None
+) -> Mapping[str, Union[torch.Tensor, np.ndarray]]:
     """Defines Federated Averaging (FedAvg) strategy for model aggregation.
 
     Args:
@@ -27,6 +34,10 @@ def federated_averaging(model_params: List[Dict[str, Union[torch.Tensor, np.ndar
             model layer name to the model weights)
         weights: weights for performing weighted sum in FedAvg strategy (depending on the dataset size of each node).
             Items in the list must always sum up to 1
+        flat: if True, models are packed in flat buffers and summed with
+            [`flat_weighted_sum`][fedbiomed.researcher.aggregators.flat.flat_weighted_sum]
+        executor: executor reducing shards of the model layers in parallel. Defaults to None,
+            the model is reduced in the calling thread.
 
     Returns:
         Final model with aggregated layers, as an OrderedDict object.
@@ -38,22 +49,37 @@ def federated_averaging(model_params: List[Dict[str, Union[torch.Tensor, np.ndar
     # Compute proportions
     #proportions = [n_k / sum(weights) for n_k in weights]
     proportions = [1 / len(weights) for n_k in weights]
-    return weighted_sum(model_params, proportions)
+    if flat:
+        return flat_weighted_sum(model_params, proportions, executor=executor)
+    return weighted_sum(model_params, proportions, executor=executor)
 
 
 def weighted_sum(model_params: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
-                 proportions: List[float]) -> Mapping[str, Union[torch.Tensor, np.ndarray]]:
+                 proportions: List[float],
+                 executor: Optional[AggregationExecutor] = None) -> Mapping[str, Union[torch.Tensor, np.ndarray]]:
     """Performs weighted sum operation
 
     Args:
         model_params (List[Dict[str, Union[torch.Tensor, np.ndarray]]]): list that contains nodes'
             model parameters; each model is stored as an OrderedDict (maps model layer name to the model weights)
         proportions (List[float]): weights of all items whithin model_params's list
+        executor (Optional[AggregationExecutor]): executor summing shards of the model layers in parallel.
+            Defaults to None, the sum is computed in the calling thread.
 
     Returns:
         Mapping[str, Union[torch.Tensor, np.ndarray]]: model resulting from the weigthed sum 
                                                        operation
     """
+    if executor is not None:
+        shards = executor.shard_keys(model_params[0])
+        if len(shards) > 1:
+            parts = executor.map(
+                weighted_sum,
+                [[{key: model[key] for key in keys} for model in model_params] for keys in shards],
+                [proportions] * len(shards),
+            )
+            return {key: val for part in parts for key, val in part.items()}
+
     # Empty model parameter dictionary
     avg_params = copy.deepcopy(model_params[0])
 
@@ -73,6 +99,122 @@ def weighted_sum(model_params: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
     return avg_params
 
 
+class WeightedSumAccumulator:
+    """Running weighted sum of model parameters, updated with one model at a time.
+
+    Only the sum is held in memory, models can be released as soon as they are added.
+    """
+
+    def __init__(self, flat: bool = False, executor: Optional[AggregationExecutor] = None):
+        """Constructor of the class
+
+        Args:
+            flat: if True, the sum is held in a flat buffer, and models are packed in a flat buffer
+                to be added with a single vector operation
+            executor: executor adding shards of the model layers in parallel. Defaults to None,
+                models are added in the calling thread.
+        """
+        self._flat = flat
+        self._executor = executor
+        self.reset()
+
+    def reset(self) -> None:
+        """Empties the accumulator"""
+        self._sum: Dict[str, Union[torch.Tensor, np.ndarray]] = None
+        self._total_weight = 0.
+        self._nodes: List[str] = []
+        self._layout: FlatLayout = None
+        self._flat_sum = None
+        self._scratch = None
+
+    @property
+    def nodes(self) -> List[str]:
+        """IDs of the nodes whose model was added, in the order they were added"""
+        return self._nodes
+
+    def add(self, node_id: str, params: Dict[str, Union[torch.Tensor, np.ndarray]], weight: float = 1.) -> None:
+        """Adds a model to the weighted sum
+
+        Args:
+            node_id: ID of the node that sent the model
+            params: model parameters, mapping model layer names to the model weights
+            weight: weight of the model in the sum
+        """
+        if self._flat:
+            if self._layout is None:
+                self._layout = FlatLayout(params)
+                self._flat_sum = self._layout.zeros()
+                self._sum = self._layout.unpack(self._flat_sum)
+            if self._executor is not None:
+                flat_weighted_sum([params], [weight], layout=self._layout, out=self._flat_sum,
+                                  executor=self._executor)
+            else:
+                self._scratch = self._layout.pack(params, out=self._scratch)
+                self._layout.axpy(weight, self._scratch, self._flat_sum)
+            self._total_weight += weight
+            self._nodes.append(node_id)
+            return
+
+        if self._sum is None:
+            self._sum = {key: initialize(val)[1] for key, val in params.items()}
+
+        if self._executor is not None:
+            shards = self._executor.shard_keys(self._sum)
+            parts = self._executor.map(
+                _add_shard,
+                [{key: self._sum[key] for key in keys} for keys in shards],
+                [{key: params[key] for key in keys} for keys in shards],
+                [weight] * len(shards),
+            )
+            # processes add to copies of the sum
+            for part in parts:
+                self._sum.update(part)
+        else:
+            _add_shard(self._sum, params, weight)
+        self._total_weight += weight
+        self._nodes.append(node_id)
+
+    def average(self) -> Mapping[str, Union[torch.Tensor, np.ndarray]]:
+        """Returns the weighted average of the models added, normalized by the sum of their weights
+
+        The accumulator is emptied, and can be used again for another sum.
+
+        Returns:
+            Averaged model parameters
+        """
+        assert self._sum is not None, 'No model was added.'
+        avg_params, total_weight, flat_sum = self._sum, self._total_weight, self._flat_sum
+        self.reset()
+        if flat_sum is not None:
+            flat_sum /= total_weight
+            return avg_params
+
+        for val in avg_params.values():
+            val /= total_weight
+        return avg_params
+
+
+def _add_shard(acc: Dict[str, Union[torch.Tensor, np.ndarray]],
+               params: Dict[str, Union[torch.Tensor, np.ndarray]],
+               weight: float) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+    """Adds weighted model parameters to a sum, in place
+
+    Args:
+        acc: sum of model parameters, updated in place
+        params: model parameters, with the layers of the sum
+        weight: weight of the model parameters
+
+    Returns:
+        The `acc` sum
+    """
+    for key, val in acc.items():
+        if isinstance(val, torch.Tensor):
+            val.add_(params[key].to(val.device), alpha=weight)
+        else:
+            val += weight * np.asarray(params[key])
+    return acc
+
+
 def init_correction_states(model_params: Dict, node_ids: Dict) -> Dict:
     init_params = {key: initialize(tensor)[1] for key, tensor in model_params.items()}
     client_correction = {node_id: copy.deepcopy(init_params) for node_id in node_ids}
@@ -19,10 +19,79 @@ from fedbiomed.common.serializer import Serializer
 from fedbiomed.common.training_plans import BaseTrainingPlan
 
 from fedbiomed.researcher.aggregators.aggregator import Aggregator
+from fedbiomed.researcher.aggregators.executor import AggregationExecutor, layer_size
+from fedbiomed.researcher.aggregators.flat import FlatLayout, flat_weighted_sum
 from fedbiomed.researcher.aggregators.functional import initialize
 from fedbiomed.researcher.datasets import FederatedDataSet
 
 
+def _model_updates_shard(
+    global_model: Dict[str, Union[torch.Tensor, np.ndarray]],
+    model_params: Dict[str, Dict[str, Union[torch.Tensor, np.ndarray]]],
+) -> Dict[str, Dict[str, Union[torch.Tensor, np.ndarray]]]:
+    """Computes the node-wise model updates (x - y_i) of a shard of the model layers"""
+    return {
+        node_id: {key: (global_model[key] - local_value) for key, local_value in params.items()}
+        for node_id, params in model_params.items()
+    }
+
+
+def _global_model_shard(
+    global_model: Dict[str, Union[torch.Tensor, np.ndarray]],
+    model_updates: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
+    server_lr: float,
+) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+    """Computes the aggregated model x - eta_g / S sum_S(update_i) of a shard of the model layers"""
+    return {
+        key: val - sum(updates[key] for updates in model_updates) * (server_lr / len(model_updates))
+        for key, val in global_model.items()
+    }
+
+
+def _correction_states_shard(
+    keys: List[str],
+    model_updates: Dict[str, Dict[str, Union[torch.Tensor, np.ndarray]]],
+    nodes_lr: Dict[str, Dict[str, float]],
+    nodes_deltas: Dict[str, Dict[str, Union[torch.Tensor, np.ndarray]]],
+    nodes_states: Dict[str, Dict[str, Union[torch.Tensor, np.ndarray]]],
+    n_updates: int,
+) -> Tuple[Dict, Dict, Dict]:
+    """Updates the Scaffold state variables of a shard of the model layers
+
+    See [`Scaffold.update_correction_states`][fedbiomed.researcher.aggregators.Scaffold.update_correction_states].
+
+    Args:
+        keys: names of the layers of the shard
+        model_updates: node-wise model updates of the layers
+        nodes_lr: node-wise learning rates
+        nodes_deltas: node-wise correction states of the layers
+        nodes_states: node-wise states of the layers
+        n_updates: number of local optimization steps
+
+    Returns:
+        Updated node-wise states, global state and node-wise correction states of the layers
+    """
+    nodes_states = {node_id: dict(state) for node_id, state in nodes_states.items()}
+    # c_i^{t+1} = delta_i^t + (x^t - y_i^t) / (M * eta)
+    for node_id, updates in model_updates.items():
+        d_i = nodes_deltas[node_id]
+        for (key, val) in updates.items():
+            if nodes_lr[node_id].get(key) is not None:
+                nodes_states[node_id][key] = d_i[key] + val / (nodes_lr[node_id][key] * n_updates)
+    # c^{t+1} = average(c_i^{t+1})
+    global_state = {}
+    for key in keys:
+        global_state[key] = 0
+        if any(state.get(key) is not None for state in nodes_states.values()):
+            global_state[key] = sum(state[key] for state in nodes_states.values()) / len(nodes_states)
+    # delta_i^{t+1} = c_i^{t+1} - c^{t+1}
+    nodes_deltas = {
+        node_id: {key: val - global_state[key] for key, val in state.items()}
+        for node_id, state in nodes_states.items()
+    }
+    return nodes_states, global_state, nodes_deltas
+
+
 class Scaffold(Aggregator):
     """
     Defines the Scaffold strategy
@@ -88,16 +157,29 @@ class Scaffold(Aggregator):
         {node id: learning rate}
     """
 
-    def __init__(self, server_lr: float = 1., fds: Optional[FederatedDataSet] = None):
+    def __init__(
+        self,
+        server_lr: float = 1.,
+        fds: Optional[FederatedDataSet] = None,
+        flat: bool = False,
+        executor: Optional[AggregationExecutor] = None,
+    ):
         """Constructs `Scaffold` object as an instance of [`Aggregator`]
         [fedbiomed.researcher.aggregators.Aggregator].
 
         Args:
             server_lr (float): server's (or Researcher's) learning rate. Defaults to 1..
             fds (FederatedDataset, optional): FederatedDataset obtained after a `search` request. Defaults to None.
+            flat: if True, model updates are packed in flat contiguous buffers to compute the aggregated model
+                with a single vector operation for each node rather than layer by layer. Defaults to False.
+            executor: executor computing the model updates, the correction states and the aggregated model
+                on shards of the model layers in parallel. Defaults to None, computations are done
+                in the calling thread.
 
         """
         super().__init__()
+        self._flat = flat
+        self._executor = executor
         self.aggregator_name: str = "Scaffold"
         if server_lr == 0.:
             raise FedbiomedAggregatorError("SCAFFOLD Error: Server learning rate cannot be equal to 0")
@@ -177,21 +259,62 @@ class Scaffold(Aggregator):
                 "Received updates from nodes that are unknown to this aggregator."
             )
         # Compute the node-wise model update: (x^t - y_i^t).
-        model_updates = {
-            node_id: {
-                key: (global_model[key] - local_value)
-                for key, local_value in params.items()
-            }
-            for node_id, params in model_params.items()
-        }
+        if self._executor is None:
+            model_updates = _model_updates_shard(global_model, model_params)
+        else:
+            shards = self._executor.shard_keys(global_model)
+            parts = self._executor.map(
+                _model_updates_shard,
+                [{key: global_model[key] for key in keys} for keys in shards],
+                [
+                    {node_id: {key: params[key] for key in keys if key in params}
+                     for node_id, params in model_params.items()}
+                    for keys in shards
+                ],
+            )
+            model_updates = {node_id: {} for node_id in model_params}
+            for part in parts:
+                for node_id, updates in part.items():
+                    model_updates[node_id].update(updates)
         # Update all Scaffold state variables.
         self.update_correction_states(model_updates, n_updates)
         # Compute and return the aggregated model parameters.
-        global_new = {}  # type: Dict[str, Union[torch.Tensor, np.ndarray]]
-        for key, val in global_model.items():
-            upd = sum(model_updates[node_id][key] for node_id in model_params)
-            global_new[key] = val - upd * (self.server_lr / len(model_params))
-        return global_new
+        updates = [model_updates[node_id] for node_id in model_params]
+        if self._flat:
+            return self._aggregate_flat(global_model, updates)
+        if self._executor is None:
+            return _global_model_shard(global_model, updates, self.server_lr)
+        shards = self._executor.shard_keys(global_model)
+        parts = self._executor.map(
+            _global_model_shard,
+            [{key: global_model[key] for key in keys} for keys in shards],
+            [[{key: upd[key] for key in keys} for upd in updates] for keys in shards],
+            [self.server_lr] * len(shards),
+        )
+        return {key: val for part in parts for key, val in part.items()}
+
+    def _aggregate_flat(
+        self,
+        global_model: Dict[str, Union[torch.Tensor, np.ndarray]],
+        model_updates: List[Dict[str, Union[torch.Tensor, np.ndarray]]],
+    ) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+        """Computes the aggregated model parameters on flat buffers: x(+) = x - eta_g / S sum_S(update_i)
+
+        Args:
+            global_model: parameters of the global model
+            model_updates: model updates of the nodes of the round
+
+        Returns:
+            Aggregated parameters, as views of a single flat buffer
+        """
+        layout = FlatLayout(global_model)
+        return flat_weighted_sum(
+            model_updates,
+            [-self.server_lr / len(model_updates)] * len(model_updates),
+            layout=layout,
+            out=layout.pack(global_model),
+            executor=self._executor,
+        )
 
     def init_correction_states(
         self,
@@ -240,35 +363,35 @@ class Scaffold(Aggregator):
             model_updates: node-wise model weight updates.
             n_updates: number of local optimization steps.
         """
-        # Update the node-wise states for participating nodes:
-        # c_i^{t+1} = delta_i^t + (x^t - y_i^t) / (M * eta)
-        for node_id, updates in model_updates.items():
-            d_i = self.nodes_deltas[node_id]
-            for (key, val) in updates.items():
-                if self.nodes_lr[node_id].get(key) is not None:
-                    self.nodes_states[node_id].update(
-                        {
-                        key: d_i[key] + val / (self.nodes_lr[node_id][key] * n_updates)
-                         }
-                    )
-        # Update the global state: c^{t+1} = average(c_i^{t+1})
-        for key in self.global_state:
-            self.global_state[key] = 0
-            for state in self.nodes_states.values():
-                if state.get(key) is not None:
-                    self.global_state[key] = (
-                        sum(state[key] for state in self.nodes_states.values())
-                            / len(self.nodes_states)
-                        )
-
-        # Compute the new node-wise correction states:
-        # delta_i^{t+1} = c_i^{t+1} - c^{t+1}
-        self.nodes_deltas = {
-            node_id: {
-                key: val - self.global_state[key] for key, val in state.items()
-            }
-            for node_id, state in self.nodes_states.items()
-        }
+        keys = list(self.global_state)
+        if self._executor is None:
+            parts = [_correction_states_shard(
+                keys, model_updates, self.nodes_lr, self.nodes_deltas, self.nodes_states, n_updates)]
+        else:
+            shards = [keys[start:stop] for start, stop in
+                      self._executor.split([layer_size(self.global_state[key]) for key in keys])]
+
+            def restrict(variable: Dict[str, Dict], shard: List[str]) -> Dict[str, Dict]:
+                return {node_id: {key: val[key] for key in shard if key in val} for node_id, val in variable.items()}
+
+            parts = self._executor.map(
+                _correction_states_shard,
+                shards,
+                [restrict(model_updates, shard) for shard in shards],
+                [self.nodes_lr] * len(shards),
+                [restrict(self.nodes_deltas, shard) for shard in shards],
+                [restrict(self.nodes_states, shard) for shard in shards],
+                [n_updates] * len(shards),
+            )
+
+        nodes_deltas = {node_id: {} for node_id in self.nodes_states}
+        for nodes_states, global_state, deltas in parts:
+            for node_id, state in nodes_states.items():
+                self.nodes_states[node_id].update(state)
+            self.global_state.update(global_state)
+            for node_id, delta in deltas.items():
+                nodes_deltas[node_id].update(delta)
+        self.nodes_deltas = nodes_deltas
 
     def create_aggregator_args(
         self,
@@ -6,7 +6,8 @@ import os
 from fedbiomed.common.constants import (
     SERVER_certificate_prefix,
     __researcher_config_version__,
-    CONFIG_FOLDER_NAME
+    CONFIG_FOLDER_NAME,
+    ParamsDeltaMode
 )
 
 from fedbiomed.common.certificate_manager import generate_certificate
@@ -37,5 +38,12 @@ class ResearcherConfig(Config):
             'host': grpc_host,
             'port': grpc_port,
             'pem' : os.path.relpath(pem_file, os.path.join(self.root, CONFIG_FOLDER_NAME)),
-            'key' : os.path.relpath(key_file, os.path.join(self.root, CONFIG_FOLDER_NAME))
+            'key' : os.path.relpath(key_file, os.path.join(self.root, CONFIG_FOLDER_NAME)),
+            # Number or comma separated IDs of the nodes the server waits for when starting, empty for a grace period
+            'expected_nodes': os.getenv('RESEARCHER_EXPECTED_NODES', ''),
+            # Maximum time in seconds to wait for the expected nodes, empty for the default
+            'setup_timeout': os.getenv('RESEARCHER_SERVER_SETUP_TIMEOUT', ''),
         }
+
+        # Encoding of the model parameters sent to nodes holding a previous version of the model
+        self._cfg['transport']['params_delta'] = os.getenv('PARAMS_DELTA', ParamsDeltaMode.NONE.value)
@@ -22,7 +22,7 @@ import os
 from fedbiomed.common.logger import logger
 from fedbiomed.common.exceptions import FedbiomedEnvironError
 from fedbiomed.common.constants import ComponentType, ErrorNumbers, \
-    TENSORBOARD_FOLDER_NAME
+    TENSORBOARD_FOLDER_NAME, ParamsDeltaMode
 from fedbiomed.common.environ import Environ
 from fedbiomed.researcher.config import ResearcherConfig
 
@@ -63,9 +63,38 @@ class ResearcherEnviron(Environ):
                                                 self._config.get('server', 'port'))
 
 
+        # Server is ready once this number of nodes, or these comma separated node IDs, have connected.
+        # If empty, nodes are given a grace period to connect
+        expected_nodes = os.getenv('RESEARCHER_EXPECTED_NODES',
+                                   self._config.get('server', 'expected_nodes', fallback='')).strip()
+        if not expected_nodes:
+            self._values["SERVER_EXPECTED_NODES"] = None
+        elif expected_nodes.isdigit():
+            self._values["SERVER_EXPECTED_NODES"] = int(expected_nodes)
+        else:
+            self._values["SERVER_EXPECTED_NODES"] = \
+                [node_id.strip() for node_id in expected_nodes.split(',') if node_id.strip()]
+        setup_timeout = os.getenv('RESEARCHER_SERVER_SETUP_TIMEOUT',
+                                  self._config.get('server', 'setup_timeout', fallback='')).strip()
+        try:
+            self._values["SERVER_SETUP_TIMEOUT"] = float(setup_timeout) if setup_timeout else None
+        except ValueError:
+            _msg = ErrorNumbers.FB600.value + ": server setup timeout is not a number " + setup_timeout
+            logger.critical(_msg)
+            raise FedbiomedEnvironError(_msg)
+
         self._values["SERVER_SSL_KEY"] = os.path.join(self._values["CONFIG_DIR"], self._config.get('server', 'key'))
         self._values["SERVER_SSL_CERT"] = os.path.join(self._values["CONFIG_DIR"], self._config.get('server', 'pem'))
 
+        params_delta = os.getenv('PARAMS_DELTA',
+                                 self._config.get('transport', 'params_delta', fallback=ParamsDeltaMode.NONE.value))
+        try:
+            self._values["PARAMS_DELTA"] = ParamsDeltaMode(params_delta.lower())
+        except ValueError:
+            _msg = ErrorNumbers.FB600.value + ": unknown encoding of model parameters deltas " + params_delta
+            logger.critical(_msg)
+            raise FedbiomedEnvironError(_msg)
+
         for _key in 'TENSORBOARD_RESULTS_DIR', 'EXPERIMENTS_DIR':
             dir = self._values[_key]
             if not os.path.isdir(dir):
@@ -37,7 +37,7 @@ from fedbiomed.common.utils import (
     import_class_from_file
 )
 
-from fedbiomed.researcher.aggregators import Aggregator, FedAverage
+from fedbiomed.researcher.aggregators import Aggregator, FedAverage, FedBuff
 from fedbiomed.researcher.datasets import FederatedDataSet
 from fedbiomed.researcher.environ import environ
 from fedbiomed.researcher.filetools import (
@@ -45,7 +45,8 @@ from fedbiomed.researcher.filetools import (
 )
 from fedbiomed.researcher.job import Job
 from fedbiomed.researcher.monitor import Monitor
-from fedbiomed.researcher.requests import Requests
+from fedbiomed.researcher.requests import Requests, RequestPolicy
+from fedbiomed.researcher.round_history import RoundHistory
 from fedbiomed.researcher.secagg import SecureAggregation
 from fedbiomed.researcher.strategies.strategy import Strategy
 from fedbiomed.researcher.strategies.default_strategy import DefaultStrategy
@@ -147,6 +148,7 @@ class Experiment:
         tensorboard: bool = False,
         experimentation_folder: Union[str, None] = None,
         secagg: Union[bool, SecureAggregation] = False,
+        retained_rounds: Optional[int] = 1,
     ) -> None:
         """Constructor of the class.
 
@@ -199,6 +201,10 @@ class Experiment:
                 confuse the last experimentation detection heuristic by `load_breakpoint`.
             secagg: whether to setup a secure aggregation context for this experiment, and use it
                 to send encrypted updates from nodes to researcher. Defaults to `False`
+            retained_rounds: number of latest rounds whose aggregated parameters and training replies
+                parameters are kept in memory. Parameters of older rounds are loaded from their file when
+                accessed through `aggregated_params()` and `training_replies()`. `None` keeps all the rounds
+                in memory. Defaults to 1.
         """
 
         # predefine all class variables, so no need to write try/except
@@ -223,6 +229,9 @@ class Experiment:
         self._client_states_dict = {}
         self._server_state = None
         self._secagg = None
+        self._retained_rounds = None
+        self._aggregated_params = None
+        self._training_policies = None
 
         # set self._secagg
         self.set_secagg(secagg)
@@ -261,11 +270,14 @@ class Experiment:
 
         self.set_training_plan_class(training_plan_class)
 
+        # set self._retained_rounds
+        self.set_retained_rounds(retained_rounds)
+
         # set self._job to Union[Job, None]
         self.set_job()
 
         # TODO: rewrite after experiment results refactoring
-        self._aggregated_params = {}
+        self._aggregated_params = RoundHistory(self._retained_rounds)
 
         self.set_save_breakpoints(save_breakpoints)
 
@@ -536,6 +548,26 @@ class Experiment:
 
         return self._job
 
+    @exp_exceptions
+    def retained_rounds(self) -> Optional[int]:
+        """Retrieves the number of latest rounds whose parameters are kept in memory.
+
+        Returns:
+            Number of rounds whose aggregated parameters and training replies parameters are kept in memory,
+                `None` if all the rounds are kept in memory.
+        """
+        return self._retained_rounds
+
+    @exp_exceptions
+    def training_policies(self) -> Optional[List[RequestPolicy]]:
+        """Retrieves the policies for collecting the training replies of the nodes.
+
+        Returns:
+            Policies applied to the training requests of each round, `None` if the rounds wait
+                for the replies of all the sampled nodes.
+        """
+        return self._training_policies
+
     @exp_exceptions
     def save_breakpoints(self) -> bool:
         """Retrieves the status of saving breakpoint after each round of training.
@@ -1327,7 +1359,8 @@ class Experiment:
                             model_args=self._model_args,
                             training_args=self._training_args,
                             data=self._fds,
-                            keep_files_dir=self.experimentation_path())
+                            keep_files_dir=self.experimentation_path(),
+                            retained_rounds=self._retained_rounds)
 
 
 
@@ -1338,6 +1371,72 @@ class Experiment:
     #
     # def set_aggregated_params(...)
 
+    @exp_exceptions
+    def set_retained_rounds(self, retained_rounds: Optional[int]) -> Optional[int]:
+        """Sets the number of latest rounds whose parameters are kept in memory + verification on arguments type
+
+        Aggregated parameters and training replies parameters of older rounds are evicted from memory,
+        and loaded from their file when accessed through `aggregated_params()` and `training_replies()`,
+        so that memory use does not grow with the number of rounds.
+
+        Args:
+            retained_rounds: number of latest rounds kept in memory, `None` to keep all the rounds.
+
+        Returns:
+            Number of rounds kept in memory
+
+        Raises:
+            FedbiomedExperimentError: bad retained_rounds type or value
+        """
+        if retained_rounds is not None and \
+                (not isinstance(retained_rounds, int) or isinstance(retained_rounds, bool)):
+            msg = ErrorNumbers.FB410.value + f' `retained_rounds` : {type(retained_rounds)}'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+        if retained_rounds is not None and retained_rounds < 1:
+            msg = ErrorNumbers.FB410.value + f' `retained_rounds` should be at least 1: {retained_rounds}'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+
+        self._retained_rounds = retained_rounds
+        if isinstance(self._aggregated_params, RoundHistory):
+            self._aggregated_params.retained_rounds = retained_rounds
+        if self._job is not None:
+            self._job.retained_rounds = retained_rounds
+
+        return self._retained_rounds
+
+    @exp_exceptions
+    def set_training_policies(self, policies: Optional[List[RequestPolicy]]) -> Optional[List[RequestPolicy]]:
+        """Sets the policies for collecting the training replies of the nodes + verification on arguments type
+
+        Policies may complete a round before all the sampled nodes reply, eg:
+        [`CompleteOnQuorum`][fedbiomed.researcher.requests.CompleteOnQuorum] aggregates the replies
+        received once a quorum of nodes has replied or a deadline has passed. Late replies are discarded.
+        Policies are not saved in breakpoints, and cannot be used with secure aggregation, which needs the
+        replies of all the sampled nodes. In asynchronous training, policies apply to the request of each
+        node separately, and only timeout, error and disconnection policies are supported: a node that
+        reaches the timeout is not sampled anymore.
+
+        Args:
+            policies: policies applied to the training requests of each round, `None` to wait for the
+                replies of all the sampled nodes.
+
+        Returns:
+            Policies applied to the training requests
+
+        Raises:
+            FedbiomedExperimentError: bad policies type
+        """
+        if policies is not None and \
+                (not isinstance(policies, list) or not all(isinstance(p, RequestPolicy) for p in policies)):
+            msg = ErrorNumbers.FB410.value + f' `policies` should be a list of `RequestPolicy`: {policies}'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+
+        self._training_policies = policies
+        return self._training_policies
+
     @exp_exceptions
     def set_save_breakpoints(self, save_breakpoints: bool) -> bool:
         """ Setter for save_breakpoints + verification on arguments type
@@ -1459,16 +1558,71 @@ class Experiment:
             # initial server state, before optimization/aggregation
 
         self._aggregator.set_training_plan_type(self._job.training_plan.type())
+        if self._node_selection_strategy.asynchronous:
+            aggregated_params = self._aggregate_async_updates()
+        else:
+            aggregated_params = self._aggregate_round_updates()
+
+        # Optionally refine the aggregated updates using an Optimizer.
+        aggregated_params = self._run_agg_optimizer(aggregated_params)
+
+        # Export aggregated parameters to a local file and upload it.
+        # Also assign the new values to the job's training plan's model.
+        self._global_model = aggregated_params  # update global model
+        aggregated_params_path = self._job.update_parameters(aggregated_params)
+        logger.info(f'Saved aggregated params for round {self._round_current} '
+                    f'in {aggregated_params_path}')
+
+        self._aggregated_params[self._round_current] = {'params': aggregated_params,
+                                                        'params_path': aggregated_params_path}
+
+        self._round_current += 1
+
+        # Update round in monitor for the next round
+        self._monitor.set_round(round_=self._round_current + 1)
+
+        if self._save_breakpoints:
+            self.breakpoint()
+
+        if self._node_selection_strategy.asynchronous and \
+                (test_after or (self._round_limit is not None and self._round_current >= self._round_limit)):
+            # no more rounds to aggregate the updates of the nodes still training
+            self._job.cancel_training_requests()
+
+        # do final validation after saving breakpoint :
+        # not saved in breakpoint for current round, but more simple
+        if test_after:
+            # FIXME: should we sample nodes here too?
+            aggr_args = self._aggregator.create_aggregator_args(self._global_model, self._job.nodes)
+            self._job.start_nodes_training_round(round_=self._round_current,
+                                                 aggregator_args=aggr_args,
+                                                 do_training=False)
+
+        return 1
+
+    def _aggregate_round_updates(self) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+        """Trains the sampled nodes in a synchronous round, and aggregates their models
+
+        Returns:
+            Aggregated parameters of the round
+        """
         # Sample nodes using strategy (if given)
         self._job.nodes = self._node_selection_strategy.sample_nodes(self._round_current)
 
         # If secure aggregation is activated ---------------------------------------------------------------------
         secagg_arguments = None
         if self._secagg.active:
+            if self._training_policies:
+                msg = ErrorNumbers.FB410.value + \
+                    ': training policies cannot be used with secure aggregation, which needs all the replies'
+                logger.critical(msg)
+                raise FedbiomedExperimentError(msg)
 
             self._secagg.setup(parties=[environ["ID"]] + self._job.nodes,
                                job_id=self._job.id)
             secagg_arguments = self._secagg.train_arguments()
+            # decryption masks are computed while nodes train
+            self._secagg.precompute_masks(self._round_current, self._job.training_plan.num_params())
         # --------------------------------------------------------------------------------------------------------
 
         # Check aggregator parameter(s) before starting a round
@@ -1482,6 +1636,16 @@ class Experiment:
         # Collect auxiliary variables from the aggregates optimizer, if any.
         optim_aux_var = self._collect_optim_aux_var()
 
+        # Encrypted parameters of each node are summed as soon as they are received, and aggregators
+        # that support it aggregate the parameters of each node as soon as they are received
+        on_params = None
+        if self._secagg.active:
+            self._secagg.reset_accumulator()
+            on_params = self._secagg.accumulate
+        elif self._aggregator.streaming:
+            self._aggregator.reset_accumulator()
+            on_params = self._aggregator.accumulate
+
         # Trigger training round on sampled nodes
         self._job.start_nodes_training_round(
             round_=self._round_current,
@@ -1489,6 +1653,8 @@ class Experiment:
             do_training=True,
             secagg_arguments=secagg_arguments,
             optim_aux_var=optim_aux_var,
+            on_params=on_params,
+            policies=self._training_policies,
         )
 
         # refining/normalizing model weights received from nodes
@@ -1520,38 +1686,56 @@ class Experiment:
                                                            n_updates=self._training_args.get('num_updates'),
                                                            n_round=self._round_current)
 
-        # Optionally refine the aggregated updates using an Optimizer.
         self._process_optim_aux_var()
-        aggregated_params = self._run_agg_optimizer(aggregated_params)
-
-        # Export aggregated parameters to a local file and upload it.
-        # Also assign the new values to the job's training plan's model.
-        self._global_model = aggregated_params  # update global model
-        aggregated_params_path = self._job.update_parameters(aggregated_params)
-        logger.info(f'Saved aggregated params for round {self._round_current} '
-                    f'in {aggregated_params_path}')
-
-        self._aggregated_params[self._round_current] = {'params': aggregated_params,
-                                                        'params_path': aggregated_params_path}
+        return aggregated_params
 
-        self._round_current += 1
+    def _aggregate_async_updates(self) -> Dict[str, Union[torch.Tensor, np.ndarray]]:
+        """Trains the nodes asynchronously, until enough updates are buffered to aggregate them
 
-        # Update round in monitor for the next round
-        self._monitor.set_round(round_=self._round_current + 1)
+        Nodes keep training between rounds: each node that replies is replaced right away by a node
+        sampled by the strategy, and trains from the current version of the global model. The update
+        of each node is added to the buffer of the aggregator as soon as it is received, and the
+        buffered updates are aggregated once the buffer is full.
 
-        if self._save_breakpoints:
-            self.breakpoint()
+        Returns:
+            Aggregated parameters of the round
 
-        # do final validation after saving breakpoint :
-        # not saved in breakpoint for current round, but more simple
-        if test_after:
-            # FIXME: should we sample nodes here too?
-            aggr_args = self._aggregator.create_aggregator_args(self._global_model, self._job.nodes)
-            self._job.start_nodes_training_round(round_=self._round_current,
-                                                 aggregator_args=aggr_args,
-                                                 do_training=False)
+        Raises:
+            FedbiomedExperimentError: aggregator or secure aggregation do not support asynchronous training
+        """
+        if not isinstance(self._aggregator, FedBuff):
+            msg = ErrorNumbers.FB410.value + \
+                f', asynchronous training requires a `FedBuff` aggregator, not {type(self._aggregator).__name__}'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
+        if self._secagg.active:
+            msg = ErrorNumbers.FB410.value + ', secure aggregation is not supported by asynchronous training'
+            logger.critical(msg)
+            raise FedbiomedExperimentError(msg)
 
-        return 1
+        self._aggregator.check_values(n_updates=self._training_args.get('num_updates'),
+                                      training_plan=self._job.training_plan)
+        self._aggregator.set_global_model(self._round_current, self._global_model)
+        aggregator_args = self._aggregator.create_aggregator_args(self._global_model, self._fds.node_ids())
+
+        while not self._aggregator.is_full:
+            nodes = self._node_selection_strategy.sample_nodes(self._round_current,
+                                                               busy_nodes=self._job.pending_training)
+            if nodes:
+                logger.info(f'Nodes starting training from version {self._round_current} of the model {nodes}')
+                self._job.send_training_requests(nodes, self._round_current, aggregator_args,
+                                                 policies=self._training_policies)
+
+            node_id, reply = self._job.wait_training_reply(self._round_current)
+            staleness = self._round_current - reply['model_version'] if reply is not None else 0
+            if self._node_selection_strategy.refine_reply(node_id, reply, self._round_current, staleness):
+                self._aggregator.add_update(node_id, reply['params'], reply['model_version'])
+
+        self._job.nodes = list(dict.fromkeys(self._aggregator.nodes))
+        logger.info(f'Aggregating updates of nodes {self._aggregator.nodes} in round {self._round_current}')
+        aggregated_params = self._aggregator.aggregate({}, {}, global_model=self._global_model)
+        self._aggregator.release_global_models(keep=self._job.pending_training.values())
+        return aggregated_params
 
     def _collect_optim_aux_var(
             self,
@@ -1738,32 +1922,6 @@ class Experiment:
                 test_after = False
 
             increment = self.run_once(increase=False, test_after=test_after)
-            #MANI
-            import gc
-            """import sys
-            from types import ModuleType, FunctionType
-            BLACKLIST = type, ModuleType, FunctionType
-            def getsize(obj):
-                if isinstance(obj, BLACKLIST):
-                    raise TypeError('getsize() does not take argument of type: '+ str(type(obj)))
-                seen_ids = set()
-                size = 0
-                objects = [obj]
-                while objects:
-                    need_referents = []
-                    for obj in objects:
-                        if not isinstance(obj, BLACKLIST) and id(obj) not in seen_ids:
-                            seen_ids.add(id(obj))
-                            size += sys.getsizeof(obj)
-                            need_referents.append(obj)
-                    objects = gc.get_referents(*need_referents)
-                return size
-            print("SIZES: ", getsize(self), getsize(self._job))"""
-            if self._round_current-2 in self._aggregated_params:
-                del self._aggregated_params[self._round_current-2]#['params']
-            if self._round_current-2 in self._job.training_replies:
-                del self._job.training_replies[self._round_current-2]
-            gc.collect()
 
             if increment == 0:
                 # should not happen
@@ -1772,6 +1930,10 @@ class Experiment:
                 logger.critical(msg)
                 raise FedbiomedExperimentError(msg)
 
+        if self._node_selection_strategy.asynchronous:
+            # updates of the nodes still training would only be aggregated by a later run
+            self._job.cancel_training_requests()
+
         return rounds
 
     # Training plan checking functions
@@ -1916,6 +2078,7 @@ class Experiment:
             # formatted in Experiment with current version
             'round_current': self._round_current,
             'round_limit': self._round_limit,
+            'retained_rounds': self._retained_rounds,
             'experimentation_folder': self._experimentation_folder,
             # aggregator state
             'aggregator': self._aggregator.save_state_breakpoint(breakpoint_path, global_model=self._global_model),
@@ -2044,7 +2207,8 @@ class Experiment:
                          training_args=saved_state.get("training_args"),
                          save_breakpoints=True,
                          experimentation_folder=saved_state.get('experimentation_folder'),
-                         secagg=SecureAggregation.load_state_breakpoint(saved_state.get('secagg')))
+                         secagg=SecureAggregation.load_state_breakpoint(saved_state.get('secagg')),
+                         retained_rounds=saved_state.get('retained_rounds', 1))
 
         # nota: we are initializing experiment with no aggregator: hence, by default,
         # `loaded_exp` will be loaded with FedAverage.
@@ -2060,9 +2224,10 @@ class Experiment:
             logger.critical(msg)
             raise FedbiomedExperimentError(msg)
         else:
-            loaded_exp._aggregated_params = loaded_exp._load_aggregated_params(
+            loaded_exp._aggregated_params = RoundHistory(loaded_exp._retained_rounds)
+            loaded_exp._aggregated_params.update(loaded_exp._load_aggregated_params(
                 saved_state.get('aggregated_params')
-            )
+            ))
 
         # retrieve and change federator
         bkpt_aggregator_args = saved_state.get("aggregator")
@@ -2106,7 +2271,10 @@ class Experiment:
             raise FedbiomedExperimentError(msg)
 
         aggregated_params = {}
-        for key, value in aggregated_params_init.items():
+        # parameters evicted from memory are not loaded again
+        items = aggregated_params_init.stored_items() if isinstance(aggregated_params_init, RoundHistory) \
+            else aggregated_params_init.items()
+        for key, value in items:
             if not isinstance(value, dict):
                 msg = ErrorNumbers.FB413.value + ' - save failed. ' + \
                     f'Bad type for aggregated params item {str(key)}, ' + \
@@ -5,19 +5,23 @@
 
 import atexit
 import copy
+import dataclasses
+import functools
 import inspect
 import os
+import queue
 import shutil
 import tempfile
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, TypeVar, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Type
 
-from fedbiomed.common.constants import TrainingPlanApprovalStatus, JOB_PREFIX, ErrorNumbers
+from fedbiomed.common.constants import TrainingPlanApprovalStatus, JOB_PREFIX, ErrorNumbers, ParamsDeltaMode, \
+    TransportPrecision
 from fedbiomed.common.exceptions import FedbiomedJobError, FedbiomedNodeStateAgentError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.serializer import Serializer
-from fedbiomed.common.message import  TrainRequest, TrainReply, TrainingPlanStatusRequest
+from fedbiomed.common.message import  ErrorMessage, TrainRequest, TrainReply, TrainingPlanStatusRequest
 from fedbiomed.common.training_args import TrainingArgs
 from fedbiomed.common.training_plans import TorchTrainingPlan, SKLearnTrainingPlan
 from fedbiomed.common import utils
@@ -26,7 +30,9 @@ from fedbiomed.researcher.datasets import FederatedDataSet
 from fedbiomed.researcher.environ import environ
 from fedbiomed.researcher.filetools import create_unique_link, create_unique_file_link
 from fedbiomed.researcher.node_state_agent import NodeStateAgent
-from fedbiomed.researcher.requests import Requests, MessagesByNode, DiscardOnTimeout
+from fedbiomed.researcher.requests import Requests, MessagesByNode, DiscardOnTimeout, Request, RequestPolicy, \
+    StopOnDisconnect, StopOnError, StopOnTimeout
+from fedbiomed.researcher.round_history import RoundHistory
 
 # for checking class passed to job (same definitions as experiment ...)
 # TODO : should we move this to common/constants.py ? No because it means import training plans in it ...
@@ -50,7 +56,8 @@ class Job:
                  training_args: TrainingArgs = None,
                  model_args: dict = None,
                  data: FederatedDataSet = None,
-                 keep_files_dir: str = None):
+                 keep_files_dir: str = None,
+                 retained_rounds: Optional[int] = None):
 
         """ Constructor of the class
 
@@ -62,6 +69,9 @@ class Job:
             data: Federated datasets
             keep_files_dir: Directory for storing files created by the job that we want to keep beyond the execution
                 of the job. Defaults to None, files are not kept after the end of the job.
+            retained_rounds: number of latest rounds whose training replies parameters are kept in memory,
+                parameters of older rounds are loaded from their file when accessed. Defaults to None, all
+                the rounds are kept in memory.
 
         Raises:
             FedbiomedJobError: bad argument type or value
@@ -87,12 +97,25 @@ class Job:
         self._researcher_id = environ['RESEARCHER_ID']
         self._training_args = training_args
         self._model_args = model_args
-        self._training_replies = {}  # will contain all node replies for every round
+        # will contain all node replies for every round
+        self._training_replies = RoundHistory(retained_rounds)
+        self._received_params = {}  # parameters of the replies already processed when received, by node
         self._model_file = None  # path to local file containing model code
         self._model_params_file = ""  # path to local file containing current version of aggregated params
         self._training_plan_class = training_plan_class
         self._aggregator_args = None
 
+        # Versions of the model parameters held by the nodes, to send them deltas instead of full parameters
+        self._params_delta_mode = environ['PARAMS_DELTA']
+        self._model_versions: Dict[str, Dict[str, Any]] = {}  # model parameters for each version
+        self._nodes_model_version: Dict[str, str] = {}  # version of the model parameters held by each node
+        self._nodes_training_plan: set = set()  # nodes which loaded the training plan in their cache
+        self._training_plan_source: Optional[Tuple[str, str]] = None  # training plan source and its hash
+
+        # Train requests of the asynchronous training that were sent but not processed yet, by node
+        self._pending_training: Dict[str, Dict[str, Any]] = {}
+        self._finished_training: queue.SimpleQueue = queue.SimpleQueue()
+
         if keep_files_dir:
             self._keep_files_dir = keep_files_dir
         else:
@@ -165,6 +188,22 @@ class Job:
     def training_replies(self):
         return self._training_replies
 
+    @property
+    def retained_rounds(self) -> Optional[int]:
+        """Number of latest rounds whose training replies parameters are kept in memory"""
+        return self._training_replies.retained_rounds
+
+    @retained_rounds.setter
+    def retained_rounds(self, retained_rounds: Optional[int]) -> None:
+        """Sets the number of latest rounds whose training replies parameters are kept in memory.
+
+        Parameters of older rounds are loaded from their file when the round is accessed.
+
+        Args:
+            retained_rounds: number of rounds, or None to keep all the rounds in memory
+        """
+        self._training_replies.retained_rounds = retained_rounds
+
     @property
     def training_args(self):
         return self._training_args.dict()
@@ -186,7 +225,7 @@ class Job:
         message = TrainingPlanStatusRequest(**{
             'researcher_id': self._researcher_id,
             'job_id': self._id,
-            'training_plan': self._training_plan.source(),
+            'training_plan': self._get_training_plan_source()[0],
             'command': 'training-plan-status'
         })
 
@@ -242,8 +281,10 @@ class Job:
                 self._nodes.remove(reply.node_id)  # remove the faulty node from the list
                 continue
 
-            params_path = os.path.join(self._keep_files_dir, f"params_{node_id}.mpk")
-            Serializer.dump(reply.params, params_path)
+            if node_id in self._received_params:
+                params, params_path = self._received_params.pop(node_id)
+            else:
+                params, params_path = self._store_reply_params(node_id, reply, round_)
 
             rtime_total = time.perf_counter() - timer[node_id]
 
@@ -254,11 +295,73 @@ class Job:
             self._training_replies[round_].update({
                 node_id: {
                     **reply.get_dict(),
+                    'params': params,
                     'params_path': params_path,
                     'timing': timing,
                 }
             })
 
+    def _store_reply_params(self, node_id: str, reply: TrainReply, round_: int) -> Tuple[Any, str]:
+        """Writes the parameters of a training reply to a file, and maps them from this file.
+
+        Each round has its own file, from which parameters are loaded again once they are evicted
+        from the training replies kept in memory.
+
+        Args:
+            node_id: ID of the node that sent the reply
+            reply: training reply
+            round_: training round of the reply
+
+        Returns:
+            A tuple of the parameters, mapped from the file, and the path of the file
+        """
+        params_path = os.path.join(self._keep_files_dir, f"params_{node_id}_round_{round_}.mpk")
+        params = reply.params
+        if reply.params_precision is not None:
+            # aggregation is done on full precision parameters
+            params = utils.decode_params_precision(params)
+        if isinstance(params, dict):
+            Serializer.dump_params(params, params_path)
+            # parameters mapped from file rather than kept in memory
+            params = Serializer.load_params(params_path)
+        else:
+            # encrypted parameters are a flat vector, also mapped from the file. File is replaced once
+            # written, so that vectors mapped from a former version of the file remain valid
+            Serializer.dump(params, f"{params_path}.part")
+            os.replace(f"{params_path}.part", params_path)
+            params = Serializer.load(params_path)
+
+        return params, params_path
+
+    def _on_training_reply(
+        self,
+        node_id: str,
+        reply: TrainReply,
+        on_params: Callable[[str, Dict[str, Any]], None],
+        round_: int,
+    ) -> None:
+        """Processes a training reply as soon as it is received, before the other replies.
+
+        Model parameters of the reply, or encrypted model parameters when secure aggregation is used, are
+        written to a file, mapped from this file and handed to `on_params`. Parameters deserialized from
+        the reply are released, so that the parameters of all the nodes are not held in memory at the
+        same time.
+
+        Args:
+            node_id: ID of the node that sent the reply
+            reply: training reply
+            on_params: callback called with the node ID and the model parameters of the reply
+            round_: training round of the reply
+        """
+        if not isinstance(reply, TrainReply) or not reply.success:
+            return
+
+        params, params_path = self._store_reply_params(node_id, reply, round_)
+        on_params(node_id, params)
+        self._received_params[node_id] = (params, params_path)
+        reply.params = None
+        reply.params_precision = None
+
     def start_nodes_training_round(
         self,
         round_: int,
@@ -266,6 +369,8 @@ class Job:
         secagg_arguments: Optional[Dict] = None,
         do_training: bool = True,
         optim_aux_var: Optional[Dict[str, Dict[str, Any]]] = None,
+        on_params: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        policies: Optional[List[RequestPolicy]] = None,
     ) -> None:
         """ Sends training request to nodes and waits for the replies
 
@@ -280,11 +385,77 @@ class Job:
                 Note that such variables may only be used if both the Experiment and node-side training plan
                 hold a declearn-based [Optimizer][fedbiomed.common.optimizers.Optimizer], and their plug-ins
                 are coherent with each other as to expected information exchange.
+            on_params: Optional callback called with the node ID and the model parameters, or the
+                encrypted model parameters, of each successful training reply, as soon as the reply is
+                received. Parameters are then kept mapped from a file rather than in memory. Defaults to
+                None, replies are processed after all of them are received.
+            policies: Optional policies for collecting the replies, eg: to complete the round once a quorum
+                of nodes has replied. Nodes that did not reply when the round completes are stopped, and keep
+                their previous version of the model parameters. Nodes sent the training plan again because
+                they miss it in their cache are handled by the same policies. Defaults to None, waits for all
+                the replies.
         """
 
+        training_plan, _ = self._get_training_plan_source()
+        messages, nodes_model_params = self._build_train_messages(
+            round_, aggregator_args, secagg_arguments, do_training, optim_aux_var, self._nodes)
+        timer = {node: time.perf_counter() for node in messages}
+
+        on_reply = None
+        self._received_params = {}
+        if on_params is not None and do_training:
+            on_reply = functools.partial(self._on_training_reply, on_params=on_params, round_=round_)
+
+        # nodes that miss the training plan are sent it within the same request, so that they are
+        # still handled by the policies of the round (eg: quorum, deadline)
+        on_error = functools.partial(self._resend_training_plan, messages=messages,
+                                     training_plan=training_plan, timer=timer)
+        with self._reqs.send(messages, self._nodes, on_reply=on_reply, on_error=on_error,
+                             policies=policies) as federated_req:
+            errors = federated_req.errors()
+            replies = federated_req.replies()
+            # successful replies mean the node loaded the training plan in its cache
+            self._nodes_training_plan.update(node for node, reply in replies.items() if reply.success)
+            self._get_training_testing_results(replies=replies, errors=errors, round_=round_, timer=timer)
+
+        self._update_nodes_model_version(nodes_model_params, do_training,
+                                         trained_nodes=[node for node in self._nodes if node in replies])
+
+        if do_training:
+            # update node states with node answers + when used node list has changed during the round
+            self._update_nodes_states_agent(before_training=False)
+
+        # return the list of nodes which answered because nodes in error have been removed
+        return self._nodes
+
+    def _build_train_messages(
+        self,
+        round_: int,
+        aggregator_args: Dict[str, Dict[str, Any]],
+        secagg_arguments: Optional[Dict],
+        do_training: bool,
+        optim_aux_var: Optional[Dict[str, Dict[str, Any]]],
+        nodes: List[str],
+    ) -> Tuple[MessagesByNode, Dict[str, Dict[str, Any]]]:
+        """Builds the train requests sent to nodes
+
+        Args:
+            round_: current number of round the algorithm is performing
+            aggregator_args: dictionary containing some metadata about the aggregation
+                strategy, useful to transfer some data when it's required by am aggregator.
+            secagg_arguments: Secure aggregation ServerKey context id
+            do_training: if False, skip training in this round (do only validation).
+            optim_aux_var: Auxiliary variables of the researcher-side Optimizer, if any.
+            nodes: IDs of the nodes that are sent a train request
+
+        Returns:
+            A tuple of the train request of each node, and of the model parameters related fields
+                of the requests, as returned by `_prepare_nodes_model_params`
+        """
         # Assign empty dict to secagg arguments if it is None
         secagg_arguments = {} if secagg_arguments is None else secagg_arguments
 
+        training_plan, training_plan_hash = self._get_training_plan_source()
         msg = {
             'researcher_id': self._researcher_id,
             'job_id': self._id,
@@ -292,9 +463,8 @@ class Job:
             'training': do_training,
             'model_args': self._model_args,
             'round': round_,
-            'training_plan': self._training_plan.source(),
+            'training_plan_hash': training_plan_hash,
             'training_plan_class': self._training_plan_class.__name__,
-            'params': self._get_model_params(),
             'secagg_servkey_id': secagg_arguments.get('secagg_servkey_id'),
             'secagg_biprime_id': secagg_arguments.get('secagg_biprime_id'),
             'secagg_random': secagg_arguments.get('secagg_random'),
@@ -304,8 +474,6 @@ class Job:
             'aux_vars': [],
         }
 
-        timer = {}
-
         if do_training:
             # update node states when used node list has changed from one round to another
             self._update_nodes_states_agent()
@@ -317,47 +485,343 @@ class Job:
         # Upload optimizer auxiliary variables, when there are.
         if do_training and optim_aux_var:
             aux_shared, aux_bynode = (
-                self._prepare_agg_optimizer_aux_var(optim_aux_var, nodes=list(self._nodes))
+                self._prepare_agg_optimizer_aux_var(optim_aux_var, nodes=list(nodes))
             )
 
         else:
             aux_shared = {}
             aux_bynode = {}
 
+        nodes_model_params = self._prepare_nodes_model_params(nodes)
+
         # Loop over nodes, add node specific data and send train request
         messages = MessagesByNode()
 
         #MANI
         #for node in self._nodes:
-        for iter, node in enumerate(self._nodes):
+        for iter, node in enumerate(nodes):
             msg['training_args'] = {**msg['training_args'], "gpu_num": iter}
 
             msg['dataset_id'] = self._data.data()[node]['dataset_id']
             msg['aux_vars'] = [aux_shared, aux_bynode.get(node, None)]
 
             msg['state_id'] = nodes_state_ids.get(node)
+            msg.update(nodes_model_params[node])
+
+            # nodes which already loaded the training plan are only sent its hash
+            msg['training_plan'] = None if node in self._nodes_training_plan else training_plan
 
             # FIXME: There might be another node join recently
             msg['aggregator_args'] = aggregator_args.get(node, {}) if aggregator_args else {}
             self._log_round_info(node=node, training=do_training)
 
-            timer[node] = time.perf_counter()
-
             messages.update({node: TrainRequest(**msg)})
 
-            # Sends training request
+        return messages, nodes_model_params
 
-        with self._reqs.send(messages, self._nodes) as federated_req:
-            errors = federated_req.errors()
-            replies = federated_req.replies()
-            self._get_training_testing_results(replies=replies, errors=errors, round_=round_, timer=timer)
+    def _get_training_plan_source(self) -> Tuple[str, str]:
+        """Returns the source of the training plan and its hash, computed on first call.
 
-        if do_training:
-            # update node states with node answers + when used node list has changed during the round
-            self._update_nodes_states_agent(before_training=False)
+        The training plan does not change once the job is created, and all the train requests share
+        the same source object, which is thus serialized once for all the nodes that miss it.
 
-        # return the list of nodes which answered because nodes in error have been removed
-        return self._nodes
+        Returns:
+            A tuple of the source of the training plan and of its hash
+        """
+        if self._training_plan_source is None:
+            source = self._training_plan.source()
+            self._training_plan_source = (source, utils.get_source_hash(source))
+        return self._training_plan_source
+
+    @property
+    def pending_training(self) -> Dict[str, int]:
+        """Nodes training asynchronously, mapped to the version of the global model they train from"""
+        return {node: pending['model_version'] for node, pending in self._pending_training.items()}
+
+    def send_training_requests(
+        self,
+        nodes: List[str],
+        round_: int,
+        aggregator_args: Optional[Dict[str, Dict[str, Any]]] = None,
+        policies: Optional[List[RequestPolicy]] = None,
+    ) -> None:
+        """Sends train requests to nodes without waiting for their replies, for asynchronous training.
+
+        Replies are received with `wait_training_reply`, while other nodes are still training.
+
+        Policies apply to the request of each node separately: a node that does not reply before
+        the timeout of a `DiscardOnTimeout` or `StopOnTimeout` policy, returns an error or
+        disconnects has failed, but other nodes keep training. Policies that depend on the replies
+        of several nodes, eg `CompleteOnQuorum`, are not supported.
+
+        Args:
+            nodes: IDs of the nodes that start training
+            round_: version of the global model the nodes train from, ie the current round
+            aggregator_args: dictionary containing some metadata about the aggregation
+                strategy, useful to transfer some data when it's required by am aggregator.
+            policies: policies applied to the train request of each node, `None` to wait for
+                the reply of each node without timeout.
+
+        Raises:
+            FedbiomedJobError: a policy is not supported by asynchronous training
+        """
+        for policy in policies or []:
+            if not isinstance(policy, (DiscardOnTimeout, StopOnTimeout, StopOnDisconnect, StopOnError)):
+                msg = f"{ErrorNumbers.FB418.value}: policy `{type(policy).__name__}` is not supported by " \
+                    "asynchronous training, only timeout, error and disconnection policies are"
+                logger.critical(msg)
+                raise FedbiomedJobError(msg)
+
+        if not nodes:
+            return
+
+        messages, nodes_model_params = self._build_train_messages(
+            round_, aggregator_args, None, True, None, nodes)
+
+        federated_req = self._reqs.send(messages, list(messages))
+        start_time = time.monotonic()
+        for req in federated_req.requests:
+            node = req.node.id
+            timeouts = [policy.timeout for policy in policies or []
+                        if isinstance(policy, (DiscardOnTimeout, StopOnTimeout)) and policy.applies_to(req)]
+            self._pending_training[node] = {
+                'request': req,
+                'model_version': round_,
+                'model_params': nodes_model_params[node],
+                'aggregator_args': aggregator_args,
+                'policies': policies,
+                'deadline': start_time + min(timeouts) if timeouts else None,
+                'start_time': time.perf_counter(),
+            }
+            req.add_done_callback(self._finished_training.put)
+        federated_req.send()
+
+    def wait_training_reply(self, round_: int) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Waits for the next reply of the nodes training asynchronously.
+
+        The reply is added to the training replies of the round, with the version of the global
+        model the node trained from in `model_version`. Nodes which miss the training plan in their
+        cache are sent their train request again, with the training plan source.
+
+        Waits at most until the nearest timeout of the train requests: the request of a node that
+        reaches its timeout is stopped, and the node is returned as failed.
+
+        Args:
+            round_: current round, in which the reply is aggregated
+
+        Returns:
+            A tuple of the ID of the node, and of its training reply as stored in the training
+                replies, or None if the node returned an error, disconnected or reached its timeout.
+
+        Raises:
+            FedbiomedJobError: no node is training
+        """
+        while True:
+            if not self._pending_training:
+                raise FedbiomedJobError(f"{ErrorNumbers.FB418.value}: no training reply to wait for, "
+                                        "no node is training")
+
+            deadlines = {node_id: pending['deadline'] for node_id, pending in self._pending_training.items()
+                         if pending['deadline'] is not None}
+            next_node = min(deadlines, key=deadlines.get, default=None)
+            try:
+                req: Request = self._finished_training.get(
+                    timeout=None if next_node is None else max(0., deadlines[next_node] - time.monotonic()))
+            except queue.Empty:
+                logger.error(f"Node {next_node} did not reply before the timeout of its train request")
+                pending = self._pending_training.pop(next_node)
+                pending['request'].flush(stopped=True)
+                self._update_nodes_model_version({next_node: pending['model_params']}, True, trained_nodes=[])
+                return next_node, None
+
+            node_id = req.node.id
+            pending = self._pending_training.get(node_id)
+            if pending is None or pending['request'] is not req:
+                # request was cancelled
+                continue
+            del self._pending_training[node_id]
+            req.flush(stopped=False)
+
+            if req.error is not None and req.error.errnum == ErrorNumbers.FB324.name:
+                logger.debug(f"Sending training plan source to node {node_id}")
+                self._nodes_training_plan.discard(node_id)
+                self.send_training_requests([node_id], round_, pending['aggregator_args'], pending['policies'])
+                continue
+
+            reply: TrainReply = req.reply
+            if req.error is not None:
+                logger.info(f"Error message received during training: {req.error.errnum}. {req.error.extra_msg}")
+                reply = None
+            elif reply is None:
+                logger.error(f"Node {node_id} disconnected during training")
+            elif not reply.success:
+                logger.error(f"Training failed for node {node_id}: {reply.msg}")
+
+            if reply is None or not reply.success:
+                self._update_nodes_model_version({node_id: pending['model_params']}, True, trained_nodes=[])
+                return node_id, None
+
+            self._nodes_training_plan.add(node_id)
+            params, params_path = self._store_reply_params(node_id, reply, round_)
+            timing = reply.timing
+            timing['rtime_total'] = time.perf_counter() - pending['start_time']
+
+            if round_ not in self._training_replies:
+                self._training_replies[round_] = {}
+            entry = {
+                **reply.get_dict(),
+                'params': params,
+                'params_path': params_path,
+                'timing': timing,
+                'model_version': pending['model_version'],
+            }
+            self._training_replies[round_][node_id] = entry
+
+            self._update_nodes_model_version({node_id: pending['model_params']}, True, trained_nodes=[node_id])
+            node_ids = list(self._data.data().keys()) if self._data and self._data.data() else []
+            self._node_state_agent.update_node_states(node_ids, {node_id: entry})
+            return node_id, entry
+
+    def cancel_training_requests(self) -> None:
+        """Cancels the train requests of the nodes training asynchronously.
+
+        Nodes stop the training if they did not finish it yet, their replies are discarded.
+        """
+        for node_id, pending in self._pending_training.items():
+            logger.debug(f"Cancelling train request of node {node_id}")
+            pending['request'].flush(stopped=True)
+            self._nodes_model_version.pop(node_id, None)
+        self._pending_training = {}
+        self._update_nodes_model_version({}, False)
+
+    def _resend_training_plan(
+        self,
+        node_id: str,
+        error: ErrorMessage,
+        messages: MessagesByNode,
+        training_plan: str,
+        timer: Dict,
+    ) -> Optional[TrainRequest]:
+        """Builds the train request sent again, with the training plan source, to a node that misses it.
+
+        Nodes whose cache doesn't contain the training plan anymore reply an error, and are sent
+        the same train request with the training plan source, once.
+
+        Args:
+            node_id: ID of the node that replied an error
+            error: error replied by the node
+            messages: train requests sent to each node, updated in place with the new request
+            training_plan: source of the training plan
+            timer: stores time elapsed on the researcher side
+
+        Returns:
+            Train request sent again to the node, or None if the error is not about a missing training plan
+        """
+        if error.errnum != ErrorNumbers.FB324.name or messages[node_id].training_plan is not None:
+            return None
+
+        logger.debug(f"Sending training plan source to node {node_id}")
+        self._nodes_training_plan.discard(node_id)
+        messages[node_id] = dataclasses.replace(messages[node_id], training_plan=training_plan)
+        timer[node_id] = time.perf_counter()
+        return messages[node_id]
+
+    def _prepare_nodes_model_params(self, nodes: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Prepares the model parameters sent to each node of the round.
+
+        Nodes holding a previous version of the model parameters receive a delta against this
+        version, other nodes receive the full parameters, encoded with the `transport_precision`
+        of the training arguments if any. The delta is computed once for all nodes holding the
+        same version, so that it is also serialized once.
+
+        Args:
+            nodes: IDs of the nodes that are sent the parameters. Defaults to None, the nodes of the round.
+
+        Returns:
+            Model parameters related fields of the train request of each node, as a dictionary
+                mapping node IDs to `params`, `model_version`, `base_model_version` and
+                `params_precision` fields.
+        """
+        nodes = self._nodes if nodes is None else nodes
+        params = self._get_model_params()
+        precision = self._training_args['transport_precision']
+        precision = TransportPrecision(precision) if precision is not None else None
+        if self._params_delta_mode is ParamsDeltaMode.NONE:
+            if precision is None:
+                return {node: {'params': params} for node in nodes}
+            encoded = utils.encode_params_precision(params, precision)
+            return {node: {'params': encoded, 'params_precision': precision.value} for node in nodes}
+
+        version = str(uuid.uuid4())
+        self._model_versions[version] = params
+
+        # fields of the request for each version of the parameters held by the nodes
+        fields_by_base: Dict[Optional[str], Dict[str, Any]] = {}
+        nodes_model_params = {}
+        for node in nodes:
+            base = self._nodes_model_version.get(node)
+            if base not in self._model_versions:
+                base = None
+
+            if base not in fields_by_base:
+                if base is None and precision is None:
+                    fields_by_base[base] = {'params': params, 'model_version': version, 'base_model_version': None,
+                                            'params_precision': None}
+                elif base is None:
+                    # low precision parameters are lossy: track the parameters as rebuilt by the node
+                    encoded = utils.encode_params_precision(params, precision)
+                    full_version = str(uuid.uuid4())
+                    self._model_versions[full_version] = utils.decode_params_precision(encoded)
+                    fields_by_base[base] = {'params': encoded, 'model_version': full_version,
+                                            'base_model_version': None, 'params_precision': precision.value}
+                else:
+                    delta = utils.encode_params_delta(self._model_versions[base], params, self._params_delta_mode)
+                    base_version = version
+                    if self._params_delta_mode is ParamsDeltaMode.QUANTIZED:
+                        # quantized delta is lossy: track the parameters as rebuilt by the node
+                        base_version = str(uuid.uuid4())
+                        self._model_versions[base_version] = utils.decode_params_delta(
+                            self._model_versions[base], delta)
+                    fields_by_base[base] = {'params': delta, 'model_version': base_version, 'base_model_version': base,
+                                            'params_precision': None}
+
+            nodes_model_params[node] = fields_by_base[base]
+
+        return nodes_model_params
+
+    def _update_nodes_model_version(
+        self,
+        nodes_model_params: Dict[str, Dict[str, Any]],
+        do_training: bool,
+        trained_nodes: Optional[List[str]] = None,
+    ) -> None:
+        """Updates the versions of the model parameters held by the nodes after a round.
+
+        Nodes keep the received parameters in their state only after a successful training,
+        other nodes are sent the full parameters in the next round. Versions of the
+        parameters that are not held by any node anymore, nor sent to a node still training,
+        are discarded.
+
+        Args:
+            nodes_model_params: model parameters related fields sent to each node of the round
+            do_training: whether the round was a training round
+            trained_nodes: IDs of the nodes that successfully trained. Defaults to None, the nodes of the round.
+        """
+        if self._params_delta_mode is ParamsDeltaMode.NONE:
+            return
+
+        trained_nodes = self._nodes if trained_nodes is None else trained_nodes
+        for node, fields in nodes_model_params.items():
+            if do_training and node in trained_nodes:
+                self._nodes_model_version[node] = fields['model_version']
+            elif do_training:
+                self._nodes_model_version.pop(node, None)
+
+        held_versions = set(self._nodes_model_version.values())
+        held_versions.update(pending['model_params']['model_version'] for pending in self._pending_training.values())
+        self._model_versions = {
+            version: params for version, params in self._model_versions.items() if version in held_versions
+        }
 
     @staticmethod
     def _prepare_agg_optimizer_aux_var(
@@ -478,7 +942,7 @@ class Job:
         """
         self._update_model_params(params)
         filename = os.path.join(self._keep_files_dir, f"aggregated_params_{uuid.uuid4()}.mpk")
-        Serializer.dump(params, filename)
+        Serializer.dump_params(params, filename)
         self._model_params_file = filename
 
         return filename
@@ -565,9 +1029,9 @@ class Job:
 
         self._load_and_set_model_params_from_file(saved_state.get("model_params_path"))
         # Reload the latest training replies.
-        self._training_replies = self._load_training_replies(
-            saved_state.get('training_replies', {})
-        )
+        training_replies = RoundHistory(self._training_replies.retained_rounds)
+        training_replies.update(self._load_training_replies(saved_state.get('training_replies', {})))
+        self._training_replies = training_replies
 
     @staticmethod
     def _save_training_replies(training_replies: Dict[int, Any]) -> List[List[Dict[str, Any]]]:
@@ -584,12 +1048,15 @@ class Job:
         """
         converted_training_replies = []
 
-        for round_ in training_replies.keys():
-            training_reply = copy.deepcopy(training_replies[round_])
-            # we want to strip some fields for the breakpoint
-            for reply in training_reply.values():
-                reply.pop('params', None)
-
+        # parameters evicted from memory are not loaded again
+        rounds = training_replies.stored_items() if isinstance(training_replies, RoundHistory) \
+            else training_replies.items()
+        for _, round_replies in rounds:
+            # we want to strip some fields for the breakpoint, before copying the replies
+            training_reply = {
+                node_id: copy.deepcopy({key: val for key, val in reply.items() if key != 'params'})
+                for node_id, reply in round_replies.items()
+            }
             converted_training_replies.append(training_reply)
 
         return converted_training_replies
@@ -15,6 +15,7 @@ from ._policies import \
     StopOnTimeout, \
     StopOnDisconnect, \
     StopOnError, \
+    CompleteOnQuorum, \
     PolicyController
 
 __all__ = [
@@ -29,5 +30,6 @@ __all__ = [
     "StopOnTimeout",
     "StopOnDisconnect",
     "StopOnError",
+    "CompleteOnQuorum",
     "PolicyController"
 ]
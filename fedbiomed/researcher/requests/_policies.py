@@ -1,33 +1,171 @@
 # This file is originally part of Fed-BioMed
 # SPDX-License-Identifier: Apache-2.0
 
-import datetime
+import math
+import time
 from typing import List, Optional, TypeVar, Dict
 
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedTypeError, FedbiomedValueError
+from fedbiomed.common.logger import logger
+
 from ._status import PolicyStatus, RequestStatus
 
 
 TRequest = TypeVar('TRequest')
 
+# Period (in seconds) at which policies that only implement the deprecated `continue_` are polled
+LEGACY_POLICY_POLL_PERIOD = 0.5
+
 
 class RequestPolicy:
-    """Base strategy to collect replies from remote agents"""
+    """Base strategy to collect replies from remote agents
+
+    Policies are event driven: [`start`][fedbiomed.researcher.requests.RequestPolicy.start] is called
+    once before waiting for the replies, then
+    [`on_finished`][fedbiomed.researcher.requests.RequestPolicy.on_finished] is called once for each
+    request that finishes (reply, error or disconnection), and
+    [`on_deadline`][fedbiomed.researcher.requests.RequestPolicy.on_deadline] when the
+    [`deadline`][fedbiomed.researcher.requests.RequestPolicy.deadline] of the policy is reached.
+
+    Subclasses that only implement the deprecated
+    [`continue_`][fedbiomed.researcher.requests.RequestPolicy.continue_] method are still supported:
+    `continue_` is called on each event, and polled every `LEGACY_POLICY_POLL_PERIOD` seconds.
+    """
+
+    _EVENT_HOOKS = ('start', 'on_finished', 'deadline', 'on_deadline')
 
     def __init__(self, nodes: Optional[List[str]] = None):
         self.status = None
         self._nodes = nodes
+        self._node_ids = set(nodes) if nodes else None
         self.stop_caused_by = None
+        self._requests = []
+        self._pending = 0
+        self._next_poll = None
 
-    def continue_(self, requests) -> PolicyStatus:
-        """Default strategy stops collecting result once all nodes has answered
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Adapts subclasses that only implement the deprecated `continue_` method to the event hooks
 
-        Returns:
-            False stops the iteration
+        Raises:
+            FedbiomedTypeError: subclass only implements `continue_`, but inherits event hooks of
+                another policy than `RequestPolicy`, which `continue_` cannot be adapted to.
         """
+        super().__init_subclass__(**kwargs)
+        if 'continue_' not in cls.__dict__ or any(hook in cls.__dict__ for hook in cls._EVENT_HOOKS):
+            return
+
+        legacy_hooks = (RequestPolicy._legacy_start, RequestPolicy._legacy_on_finished,
+                        RequestPolicy._legacy_deadline, RequestPolicy._legacy_on_deadline)
+        for hook, legacy_hook in zip(cls._EVENT_HOOKS, legacy_hooks):
+            if getattr(cls, hook) not in (getattr(RequestPolicy, hook), legacy_hook):
+                raise FedbiomedTypeError(
+                    f"{ErrorNumbers.FB400.value}: request policy `{cls.__name__}` only implements the "
+                    f"deprecated `continue_` method, which is not supported when inheriting from "
+                    f"`{cls.__mro__[1].__name__}`. Please implement `start`, `on_finished`, `deadline` "
+                    f"and `on_deadline` instead.")
+
+        logger.warning(f"Request policy `{cls.__name__}` implements `continue_`, which is deprecated and will "
+                       f"be removed in future Fed-BioMed releases. Please implement `start`, `on_finished`, "
+                       f"`deadline` and `on_deadline` instead.")
+        for hook, legacy_hook in zip(cls._EVENT_HOOKS, legacy_hooks):
+            setattr(cls, hook, legacy_hook)
+
+    def continue_(self, requests: List[TRequest]) -> PolicyStatus:
+        """Deprecated polling strategy, replaced by the event hooks of the policy.
+
+        Default strategy stops collecting result once all nodes has answered
 
+        Args:
+            requests: all the requests of the federated request
+
+        Returns:
+            CONTINUE if some request is expected to finish
+        """
         has_finished = all([req.has_finished() for req in requests])
         return self.keep() if not has_finished else self.completed()
 
+    def applies_to(self, req: TRequest) -> bool:
+        """Checks if the policy applies to a request
+
+        Args:
+            req: request to check
+
+        Returns:
+            True if the request is sent to one of the nodes of the policy
+        """
+        return self._node_ids is None or req.node.id in self._node_ids
+
+    def start(self, requests: List[TRequest]) -> PolicyStatus:
+        """Starts applying the policy to requests.
+
+        Default strategy stops collecting result once all nodes has answered
+
+        Args:
+            requests: requests handled by the policy
+
+        Returns:
+            CONTINUE if some request is expected to finish
+        """
+        self._requests = [req for req in requests if self.applies_to(req)]
+        self._pending = len(self._requests)
+
+        return self.keep() if self._pending else self.completed()
+
+    def on_finished(self, req: TRequest) -> PolicyStatus:
+        """Updates the policy when a request has finished.
+
+        Args:
+            req: request that has finished
+
+        Returns:
+            COMPLETED once all requests have finished
+        """
+        if self.applies_to(req):
+            self._pending -= 1
+
+        return self.keep() if self._pending > 0 else self.completed()
+
+    def deadline(self) -> Optional[float]:
+        """Returns the next deadline of the policy.
+
+        Returns:
+            Time of the deadline, as given by `time.monotonic`, or None if the policy has no deadline
+        """
+        return None
+
+    def on_deadline(self) -> PolicyStatus:
+        """Updates the policy when its deadline is reached.
+
+        Returns:
+            CONTINUE
+        """
+        return PolicyStatus.CONTINUE
+
+    def _legacy_start(self, requests: List[TRequest]) -> PolicyStatus:
+        """Starts a policy that implements `continue_`, which is given all the requests"""
+        self._requests = list(requests)
+        return self._legacy_poll()
+
+    def _legacy_on_finished(self, req: TRequest) -> PolicyStatus:
+        """Polls a policy that implements `continue_` when a request has finished"""
+        return self._legacy_poll()
+
+    def _legacy_deadline(self) -> Optional[float]:
+        """Returns the next time a policy that implements `continue_` is polled"""
+        return self._next_poll
+
+    def _legacy_on_deadline(self) -> PolicyStatus:
+        """Polls a policy that implements `continue_` periodically"""
+        return self._legacy_poll()
+
+    def _legacy_poll(self) -> PolicyStatus:
+        """Calls `continue_`, and schedules the next poll while the policy continues"""
+        status = self.continue_(self._requests)
+        self._next_poll = time.monotonic() + LEGACY_POLICY_POLL_PERIOD \
+            if status == PolicyStatus.CONTINUE else None
+        return status
+
     def stop(self, req) -> PolicyStatus:
         """Stop sign for strategy"""
         self.status = PolicyStatus.STOPPED
@@ -60,35 +198,71 @@ class _ReplyTimeoutPolicy(RequestPolicy):
         """
         super().__init__(nodes)
         self.timeout = timeout
-        self._time = None
+        self._deadline = None
+        self._is_timeout = False
 
-    def is_timeout(self) -> bool:
-        """Checks if timeout is reached.
+    def start(self, requests: List[TRequest]) -> PolicyStatus:
+        """Starts applying the policy to requests, and arms the timeout.
+
+        Args:
+            requests: requests handled by the policy
 
         Returns:
-            True if timeout
+            CONTINUE
         """
-        self._time = self._time or datetime.datetime.now()
-        time_interest = datetime.datetime.now()
-        return (time_interest - self._time).seconds > self.timeout
+        self._requests = [req for req in requests if self.applies_to(req)]
+        self._deadline = time.monotonic() + self.timeout
+        self._is_timeout = False
 
-    def apply(self, requests: List[TRequest], stop: bool) -> PolicyStatus:
-        """Applies timeout loop over requests
+        return self.keep()
+
+    def on_finished(self, req: TRequest) -> PolicyStatus:
+        """Timeout policies only act on deadline by default
 
         Args:
-            requests: list of requests to check for timeout
-            stop: whether to fail (STOPPED) if some request has reached the timeout
+            req: ignored
 
         Returns:
-            CONTINUE if no node has reached the timeout, or if `stop` is False
+            CONTINUE
         """
+        return PolicyStatus.CONTINUE
 
-        if self._nodes:
-            requests = [req for req in requests if req.node.id in self._nodes]
+    def deadline(self) -> Optional[float]:
+        """Returns the time when the timeout is reached, None once it was reached
 
-        for req in requests:
-            is_timeout = self.is_timeout()
-            if not req.has_finished() and is_timeout:
+        Returns:
+            Time of the timeout, as given by `time.monotonic`
+        """
+        return None if self._is_timeout else self._deadline
+
+    def on_deadline(self) -> PolicyStatus:
+        """Marks the timeout as reached, and applies the policy
+
+        Returns:
+            Status of the policy after the timeout
+        """
+        self._is_timeout = True
+        return self.on_timeout()
+
+    def on_timeout(self) -> PolicyStatus:
+        """Applies the policy when the timeout is reached
+
+        Returns:
+            CONTINUE
+        """
+        return PolicyStatus.CONTINUE
+
+    def apply(self, stop: bool) -> PolicyStatus:
+        """Marks the requests that did not finish as timed out
+
+        Args:
+            stop: whether to fail (STOPPED) if some request has reached the timeout
+
+        Returns:
+            CONTINUE if no node has reached the timeout, or if `stop` is False
+        """
+        for req in self._requests:
+            if not req.has_finished():
                 req.status = RequestStatus.TIMEOUT
                 if stop:
                     return self.stop(req)
@@ -98,46 +272,79 @@ class _ReplyTimeoutPolicy(RequestPolicy):
 
 class DiscardOnTimeout(_ReplyTimeoutPolicy):
     """Discards request that do not answer in given timeout"""
-    def continue_(self, requests: TRequest) -> PolicyStatus:
+    def on_timeout(self) -> PolicyStatus:
         """Discards requests that reach timeout, always continue
 
         Returns:
             CONTINUE
         """
-        return self.apply(requests, False)
+        return self.apply(False)
 
 
 class StopOnTimeout(_ReplyTimeoutPolicy):
     """Stops the request if nodes do not answer in given timeout"""
-    def continue_(self, requests) -> PolicyStatus:
-        """Continues federated request if nodes dont reach timeout
+    def on_timeout(self) -> PolicyStatus:
+        """Stops federated request if some node did not answer before timeout
 
         Returns:
-            CONTINUE if no node reached timeout, STOPPED if some node reached timeout
-                and timeout is reached
+            CONTINUE if all nodes answered, STOPPED if some node reached timeout
         """
-        return self.apply(requests, True)
+        return self.apply(True)
 
 
 class StopOnDisconnect(_ReplyTimeoutPolicy):
     """Stops collecting results if a node disconnects
     """
 
-    def continue_(self, requests: TRequest) -> PolicyStatus:
-        """Continues federated request if nodes are not disconnect
+    def __init__(self, timeout: int = 5, nodes: Optional[List[str]] = None) -> None:
+        """Implements timeout attributes
+
+        Args:
+            timeout: time before stopping if a node disconnects
+            nodes: optional list of nodes to apply the policy. By default applies to all known nodes of request.
+        """
+        super().__init__(timeout, nodes)
+        self._disconnected = None
+
+    def start(self, requests: List[TRequest]) -> PolicyStatus:
+        """Starts applying the policy to requests, and arms the timeout.
+
+        Args:
+            requests: requests handled by the policy
 
         Returns:
-            CONTINUE if no node disconnect found, STOPPED if some node disconnect found
+            CONTINUE
+        """
+        self._disconnected = None
+        return super().start(requests)
+
+    def on_finished(self, req: TRequest) -> PolicyStatus:
+        """Stops federated request if the node of the request has disconnected
+
+        Args:
+            req: request that has finished
+
+        Returns:
+            CONTINUE if node did not disconnect, STOPPED if node disconnected
                 and timeout is reached
         """
+        if not self.applies_to(req) or req.status != RequestStatus.DISCONNECT:
+            return PolicyStatus.CONTINUE
 
-        if self._nodes:
-            requests = [req for req in requests if req.node.id in self._nodes]
+        if self._is_timeout:
+            return self.stop(req)
 
-        for req in requests:
-            is_timeout = self.is_timeout()
-            if req.status == RequestStatus.DISCONNECT and is_timeout:
-                return self.stop(req)
+        self._disconnected = self._disconnected or req
+        return PolicyStatus.CONTINUE
+
+    def on_timeout(self) -> PolicyStatus:
+        """Stops federated request if some node disconnected before timeout
+
+        Returns:
+            CONTINUE if no node disconnect found, STOPPED if some node disconnect found
+        """
+        if self._disconnected is not None:
+            return self.stop(self._disconnected)
 
         return PolicyStatus.CONTINUE
 
@@ -146,22 +353,162 @@ class StopOnError(RequestPolicy):
     """Stops collecting results if a node returns an error
     """
 
-    def continue_(self, requests: TRequest) -> PolicyStatus:
-        """Continues federated request if nodes does not return error
+    def start(self, requests: List[TRequest]) -> PolicyStatus:
+        """Starts applying the policy to requests.
+
+        Args:
+            requests: requests handled by the policy
+
+        Returns:
+            CONTINUE
+        """
+        self._requests = [req for req in requests if self.applies_to(req)]
+        return self.keep()
+
+    def on_finished(self, req: TRequest) -> PolicyStatus:
+        """Continues federated request if node does not return error
+
+        Args:
+            req: request that has finished
+
+        Returns:
+            CONTINUE if no error found, STOPPED if error found
+        """
+        if self.applies_to(req) and req.error:
+            return self.stop(req)
+
+        return PolicyStatus.CONTINUE
+
+
+class CompleteOnQuorum(RequestPolicy):
+    """Completes collecting results once a quorum of nodes has replied, or a deadline has passed
+
+    Quorum is reached when a `fraction` of the nodes, or `count` nodes, have replied, whichever
+    comes first. Requests that did not finish when the quorum or the deadline is reached are marked
+    as timed out, and are stopped on exit of the federated request, so that their late replies
+    are discarded.
+    """
+
+    def __init__(
+        self,
+        fraction: Optional[float] = None,
+        count: Optional[int] = None,
+        deadline: Optional[float] = None,
+        nodes: Optional[List[str]] = None
+    ) -> None:
+        """Constructor of the policy
+
+        Args:
+            fraction: fraction of the nodes whose reply completes the request, in `]0, 1]`.
+                Defaults to None, no quorum on the fraction of replies.
+            count: number of replies that completes the request. Defaults to None, no quorum on
+                the number of replies.
+            deadline: time in seconds after which the request completes with the replies received so far.
+                Defaults to None, no deadline.
+            nodes: optional list of nodes to apply the policy. By default applies to all known nodes of request.
+
+        Raises:
+            FedbiomedValueError: bad fraction, count or deadline, or none of them is given
+        """
+        super().__init__(nodes)
+        if fraction is not None and (not isinstance(fraction, (int, float)) or isinstance(fraction, bool)
+                                     or not 0 < fraction <= 1):
+            raise FedbiomedValueError(
+                f"{ErrorNumbers.FB400.value}: quorum fraction should be a number in ]0, 1], not {fraction}")
+        if count is not None and (not isinstance(count, int) or isinstance(count, bool) or count < 1):
+            raise FedbiomedValueError(
+                f"{ErrorNumbers.FB400.value}: quorum count should be a positive integer, not {count}")
+        if deadline is not None and (not isinstance(deadline, (int, float)) or isinstance(deadline, bool)
+                                     or deadline < 0):
+            raise FedbiomedValueError(
+                f"{ErrorNumbers.FB400.value}: deadline should be a non negative number, not {deadline}")
+        if fraction is None and count is None and deadline is None:
+            raise FedbiomedValueError(
+                f"{ErrorNumbers.FB400.value}: quorum needs a fraction, a count or a deadline")
+
+        self.fraction = fraction
+        self.count = count
+        self.timeout = deadline
+        self._deadline = None
+        self._quorum = None
+        self._replied = 0
+
+    @property
+    def quorum(self) -> Optional[int]:
+        """Number of replies that completes the request, None if there is no quorum or the policy is not started"""
+        return self._quorum
+
+    def start(self, requests: List[TRequest]) -> PolicyStatus:
+        """Starts applying the policy to requests, computes the quorum and arms the deadline.
+
+        Args:
+            requests: requests handled by the policy
 
         Returns:
-            CONTINUE if no error found, STOPPED if some error found
+            CONTINUE, or COMPLETED if the quorum is already reached
         """
+        self._requests = [req for req in requests if self.applies_to(req)]
+        self._replied = 0
+        self._deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        quorums = []
+        if self.fraction is not None:
+            quorums.append(math.ceil(self.fraction * len(self._requests)))
+        if self.count is not None:
+            quorums.append(self.count)
+        self._quorum = min(quorums) if quorums else None
 
-        if self._nodes:
-            requests = [req for req in requests if req.node.id in self._nodes]
+        return self.completed() if self._quorum == 0 else self.keep()
 
-        for req in requests:
-            if req.error:
-                return self.stop(req)
+    def on_finished(self, req: TRequest) -> PolicyStatus:
+        """Counts the replies, and completes the request once the quorum is reached
+
+        Errors and disconnections do not count towards the quorum.
+
+        Args:
+            req: request that has finished
+
+        Returns:
+            CONTINUE until the quorum is reached, then COMPLETED
+        """
+        if self.status != PolicyStatus.CONTINUE:
+            return self.status
+
+        if self.applies_to(req) and req.status == RequestStatus.SUCCESS:
+            self._replied += 1
+            if self._quorum is not None and self._replied >= self._quorum:
+                return self._complete()
 
         return PolicyStatus.CONTINUE
 
+    def deadline(self) -> Optional[float]:
+        """Returns the time of the deadline, None once the request is completed
+
+        Returns:
+            Time of the deadline, as given by `time.monotonic`
+        """
+        return self._deadline if self.status == PolicyStatus.CONTINUE else None
+
+    def on_deadline(self) -> PolicyStatus:
+        """Completes the request with the replies received so far
+
+        Returns:
+            COMPLETED
+        """
+        return self._complete()
+
+    def _complete(self) -> PolicyStatus:
+        """Marks the requests that did not finish as timed out, and completes
+
+        Returns:
+            COMPLETED
+        """
+        for req in self._requests:
+            if not req.has_finished():
+                req.status = RequestStatus.TIMEOUT
+
+        return self.completed()
+
 
 class PolicyController:
 
@@ -174,8 +521,14 @@ class PolicyController:
         policies.insert(0, RequestPolicy())
         self._policies = policies
 
-    def continue_all(self, requests: List[TRequest]) -> PolicyStatus:
-        """Checks if all policies indicate to continue.
+    @staticmethod
+    def _combine(statuses: List[PolicyStatus]) -> PolicyStatus:
+        """Continues only if all policies indicate to continue"""
+        status = all([st == PolicyStatus.CONTINUE for st in statuses])
+        return PolicyStatus.CONTINUE if status else PolicyStatus.COMPLETED
+
+    def start(self, requests: List[TRequest]) -> PolicyStatus:
+        """Starts applying all policies to requests.
 
         Args:
             requests: List of [Request][fedbiomed.researcher.requests.Request] objects to
@@ -184,16 +537,42 @@ class PolicyController:
         Returns:
             CONTINUE if all policies indicates to continue
         """
+        return self._combine([policy.start(requests) for policy in self._policies])
 
-        if not requests:
-            return False
+    def on_finished(self, req: TRequest) -> PolicyStatus:
+        """Updates all policies when a request has finished.
 
-        status = all(
-            [policy.continue_(requests=requests) == PolicyStatus.CONTINUE
-                for policy in self._policies]
-        )
+        Args:
+            req: request that has finished
 
-        return PolicyStatus.CONTINUE if status else PolicyStatus.COMPLETED
+        Returns:
+            CONTINUE if all policies indicates to continue
+        """
+        return self._combine([policy.on_finished(req) for policy in self._policies])
+
+    def next_deadline(self) -> Optional[float]:
+        """Returns the nearest deadline of the policies.
+
+        Returns:
+            Time of the deadline, as given by `time.monotonic`, or None if no policy has a deadline
+        """
+        deadlines = [d for d in (policy.deadline() for policy in self._policies) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def on_deadline(self) -> PolicyStatus:
+        """Updates the policies whose deadline is reached.
+
+        Returns:
+            CONTINUE if all policies indicates to continue
+        """
+        now = time.monotonic()
+        statuses = []
+        for policy in self._policies:
+            deadline = policy.deadline()
+            if deadline is not None and deadline <= now:
+                statuses.append(policy.on_deadline())
+
+        return self._combine(statuses)
 
     def has_stopped_any(self) -> bool:
         """Checks if any of the policies indicates to stop
@@ -7,10 +7,12 @@ Implements the message exchanges from researcher to nodes
 
 import json
 import os
+import queue
+import time
 import uuid
 import tempfile
-import threading
-from typing import Any, Dict, Callable, Union, List, Optional
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, Callable, Tuple, Union, List, Optional
 
 import tabulate
 from python_minifier import minify
@@ -22,17 +24,16 @@ from fedbiomed.common.singleton import SingletonMeta
 from fedbiomed.common.training_plans import BaseTrainingPlan
 from fedbiomed.common.utils import import_class_object_from_file
 
-from fedbiomed.transport.server import GrpcServer, SSLCredentials
-from fedbiomed.transport.node_agent import NodeAgent, NodeActiveStatus
+from fedbiomed.transport.server import GrpcServer, SSLCredentials, SerializedMessage, SharedFields
+from fedbiomed.transport.node_agent import NodeAgent
+from fedbiomed.transport.compression import PayloadCompressor
+from fedbiomed.transport.limits import TransportLimits
 
 from fedbiomed.researcher.environ import environ
 
 from ._policies import RequestPolicy, PolicyController, DiscardOnTimeout
 from ._status import RequestStatus, PolicyStatus
 
-# timeout in seconds for checking disconnection and node status changes
-REQUEST_STATUS_CHECK_TIMEOUT = 0.5
-
 
 class MessagesByNode(dict):
     """Type to defined messages by node"""
@@ -43,9 +44,8 @@ class Request:
 
     def __init__(
         self,
-        message: Message,
+        message: Union[Message, SerializedMessage],
         node: NodeAgent,
-        sem_pending: threading.Semaphore,
         request_id: Optional[str] = None,
     ) -> None:
         """Single request for node
@@ -54,13 +54,14 @@ class Request:
             message: Message to send to the node
             node: Node agent
             request_id: unique ID of request
-            sem_pending: semaphore for signaling new pending reply
         """
         self._request_id = request_id if request_id else str(uuid.uuid4())
         self._node = node
         self._message = message
 
-        self._sem_pending = sem_pending
+        # completed once the request has finished (reply, error or disconnection)
+        self._finished = Future()
+        self._callbacks: List[Callable[['Request'], None]] = []
 
         self.reply = None
         self.error = None
@@ -74,23 +75,47 @@ class Request:
     def has_finished(self) -> bool:
         """Queries if the request has finished.
 
-        Also tracks if node has disconnected.
+        Returns:
+            True if a reply was received from node, or if node has disconnected
+        """
+        return self._finished.done()
+
+    def add_done_callback(self, callback: Callable[['Request'], None]) -> None:
+        """Adds a callback to execute once the request has finished.
+
+        The callback is executed immediately if the request has already finished.
 
         Args:
-            True if a reply was received from node
+            callback: function called with the request as argument
         """
+        self._callbacks.append(callback)
+        self._finished.add_done_callback(lambda _: callback(self))
 
-        if self._node.status == NodeActiveStatus.DISCONNECTED:
-            self.status = RequestStatus.DISCONNECT
-            return True  # Don't expect any reply
+    def resend(self, message: Union[Message, SerializedMessage]) -> None:
+        """Sends the request again to the node, with another message, once it has finished.
+
+        Answer to the previous message is flushed. Request is sent with a new ID, and has not
+        finished anymore: callbacks of the request are executed again once it finishes.
+
+        Args:
+            message: message sent to the node
+        """
+        self.flush(stopped=False)
+        self._request_id = str(uuid.uuid4())
+        self._message = message
+        self.reply = None
+        self.error = None
 
-        return True if self.reply or self.error else False
+        self._finished = Future()
+        for callback in self._callbacks:
+            self._finished.add_done_callback(lambda _, callback=callback: callback(self))
+        self.send()
 
     def send(self) -> None:
         """Sends the request"""
         self._message.request_id = self._request_id
-        self._node.send(self._message, self.on_reply)
         self.status = RequestStatus.NO_REPLY_YET
+        self._node.send(self._message, self.on_reply, self.on_disconnect)
 
     def flush(self, stopped: bool) -> None:
         """Flushes the reply that has been processed
@@ -114,7 +139,21 @@ class Request:
             self.reply = reply
             self.status = RequestStatus.SUCCESS
 
-        self._sem_pending.release()
+        self._finish()
+
+    def on_disconnect(self) -> None:
+        """Callback for node agent to execute if node disconnects before replying."""
+        if not self.has_finished():
+            self.status = RequestStatus.DISCONNECT
+            self._finish()
+
+    def _finish(self) -> None:
+        """Marks the request as finished, notifying the callbacks"""
+        try:
+            self._finished.set_result(self.status)
+        except InvalidStateError:
+            # request already finished, eg: reply received after disconnection
+            pass
 
 
 class FederatedRequest:
@@ -127,7 +166,9 @@ class FederatedRequest:
         self,
         message: Union[Message, MessagesByNode],
         nodes: List[NodeAgent],
-        policy: Optional[List[RequestPolicy]] = None
+        policy: Optional[List[RequestPolicy]] = None,
+        on_reply: Optional[Callable[[str, Message], None]] = None,
+        on_error: Optional[Callable[[str, ErrorMessage], Optional[Message]]] = None
     ):
         """Constructor of the class.
 
@@ -136,36 +177,94 @@ class FederatedRequest:
                 indexed by the node ID
             nodes: list of nodes that are sent the message
             policy: list of policies for controlling the handling of the request
+            on_reply: optional callback called with the node ID and the reply of each node, as soon as
+                the reply is received. It is called from the thread waiting for the replies.
+            on_error: optional callback called with the node ID and the error of each node, as soon as
+                the error is received. If it returns a message, the request is sent again to the node
+                with this message, and the policies wait for the new answer of the node. It is called
+                from the thread waiting for the replies.
         """
 
         self._message = message
         self._nodes = nodes
+        self._on_reply = on_reply
+        self._on_error = on_error
         self._requests = []
         self._request_id = str(uuid.uuid4())
         self._nodes_status = {}
 
-        self._pending_replies = threading.Semaphore(value=0)
-
         # Set-up policies
         self._policy = PolicyController(policy)
 
         # Set up single requests
         if isinstance(self._message, Message):
+            message = self._serialize_shared_fields([self._message])[0]
             for node in self._nodes:
                 self._requests.append(
-                    Request(self._message, node, self._pending_replies, self._request_id)
+                    Request(message, node, self._request_id)
                 )
 
         # Different message for each node
         elif isinstance(self._message, MessagesByNode):
+            nodes_messages = []
             for node in self._nodes:
                 if m := self._message.get(node.id):
-                    self._requests.append(
-                        Request(m, node, self._pending_replies, self._request_id)
-                    )
+                    nodes_messages.append((node, m))
                 else:
                     logger.warning(f"Node {node.id} is unknown. Send message to others, ignore this one.")
 
+            messages = self._serialize_shared_fields([m for _, m in nodes_messages])
+            for (node, _), m in zip(nodes_messages, messages):
+                self._requests.append(
+                    Request(m, node, self._request_id)
+                )
+
+    @staticmethod
+    def _serialize_shared_fields(messages: List[Message]) -> List[SerializedMessage]:
+        """Serializes once the field values that are shared by several messages.
+
+        A field value is shared when several messages hold the same object for this field, which
+        is the case for the heavy fields of per-node messages (eg: model parameters and training
+        plan of train requests). Messages may hold different shared values for the same field (eg:
+        full model parameters and parameters delta): fields are grouped by the messages holding
+        them, and each group is serialized once. Other fields are serialized separately for each
+        message, when sending it. A single message is sent to all the nodes, thus all its fields
+        are serialized once.
+
+        Args:
+            messages: messages to send to the nodes
+
+        Returns:
+            Messages ready to send, with shared fields already serialized
+        """
+        min_holders = 2 if len(messages) > 1 else 1
+
+        # indices of the messages holding each distinct value of each field
+        holders: Dict[Tuple[str, int], List[int]] = {}
+        values: Dict[Tuple[str, int], Any] = {}
+        for index, message in enumerate(messages):
+            for name, value in message.get_dict().items():
+                # request ID is set when sending each request
+                if name == 'request_id':
+                    continue
+                key = (name, id(value))
+                holders.setdefault(key, []).append(index)
+                values[key] = value
+
+        # field values held by the same messages are serialized together
+        groups: Dict[Tuple[int, ...], Dict[str, Any]] = {}
+        for key, indices in holders.items():
+            if len(indices) >= min_holders:
+                groups.setdefault(tuple(indices), {})[key[0]] = values[key]
+
+        shared_fields = [[] for _ in messages]
+        for indices, fields in groups.items():
+            group = SharedFields(fields)
+            for index in indices:
+                shared_fields[index].append(group)
+
+        return [SerializedMessage(m, shared) for m, shared in zip(messages, shared_fields)]
+
     @property
     def policy(self) -> PolicyController:
         """Returns policy controller"""
@@ -200,10 +299,11 @@ class FederatedRequest:
             traceback: ignored
         """
 
-        # Clear the replies that are processed
+        # Clear the replies that are processed. Requests that did not finish (eg: completed on quorum)
+        # are stopped, so that their late replies are discarded
         has_stopped = self._policy.has_stopped_any()
         for req in self._requests:
-            req.flush(stopped=has_stopped)
+            req.flush(stopped=has_stopped or not req.has_finished())
 
     def replies(self) -> Dict[str, Message]:
         """Returns replies of each request
@@ -237,10 +337,34 @@ class FederatedRequest:
             req.send()
 
     def wait(self) -> None:
-        """Waits for the replies of the messages that are sent"""
+        """Waits for the replies of the messages that are sent
 
-        while self._policy.continue_all(self._requests) == PolicyStatus.CONTINUE:
-            self._pending_replies.acquire(timeout=REQUEST_STATUS_CHECK_TIMEOUT)
+        Each request that finishes (reply, error or disconnection) is handed to the policies as
+        soon as it finishes, after its reply, if any, is passed to the `on_reply` callback.
+        Requests whose error is answered by the `on_error` callback with a new message are sent
+        again, and are handed to the policies once they finish again.
+        Between events, waits until the nearest deadline of the policies.
+        """
+        finished = queue.SimpleQueue()
+        for req in self._requests:
+            req.add_done_callback(finished.put)
+
+        status = self._policy.start(self._requests)
+        while status == PolicyStatus.CONTINUE:
+            deadline = self._policy.next_deadline()
+            timeout = None if deadline is None else max(0., deadline - time.monotonic())
+            try:
+                req = finished.get(timeout=timeout)
+            except queue.Empty:
+                status = self._policy.on_deadline()
+            else:
+                if self._on_error is not None and req.error and \
+                        (message := self._on_error(req.node.id, req.error)) is not None:
+                    req.resend(message)
+                    continue
+                if self._on_reply is not None and req.reply:
+                    self._on_reply(req.node.id, req.reply)
+                status = self._policy.on_finished(req)
 
 
 class Requests(metaclass=SingletonMeta):
@@ -260,8 +384,17 @@ class Requests(metaclass=SingletonMeta):
             on_message=self.on_message,
             ssl=SSLCredentials(
                 key=environ['SERVER_SSL_KEY'],
-                cert=environ['SERVER_SSL_CERT'])
-
+                cert=environ['SERVER_SSL_CERT']),
+            compressor=PayloadCompressor(
+                codec=environ["COMPRESSION_CODEC"],
+                threshold=environ["COMPRESSION_THRESHOLD"],
+                shuffle=environ["COMPRESSION_SHUFFLE"]),
+            limits=TransportLimits(
+                chunk_size=environ["CHUNK_SIZE"],
+                max_message_length=environ["GRPC_MAX_MESSAGE_LENGTH"],
+                flow_control_window=environ["GRPC_FLOW_CONTROL_WINDOW"]),
+            expected_nodes=environ["SERVER_EXPECTED_NODES"],
+            setup_timeout=environ["SERVER_SETUP_TIMEOUT"]
         )
         self.start_messaging()
 
@@ -338,7 +471,9 @@ class Requests(metaclass=SingletonMeta):
             self,
             message: Union[Message, MessagesByNode],
             nodes: Optional[List[str]] = None,
-            policies: List[RequestPolicy] = None
+            policies: List[RequestPolicy] = None,
+            on_reply: Optional[Callable[[str, Message], None]] = None,
+            on_error: Optional[Callable[[str, ErrorMessage], Optional[Message]]] = None
     ) -> FederatedRequest:
         """Sends federated request to given nodes with given message
 
@@ -347,6 +482,10 @@ class Requests(metaclass=SingletonMeta):
                 indexed by the node ID
             nodes: list of nodes that are sent the message. If None, send the message to all known active nodes.
             policy: list of policies for controlling the handling of the request, or None
+            on_reply: optional callback called with the node ID and the reply of each node, as soon as
+                the reply is received
+            on_error: optional callback called with the node ID and the error of each node, as soon as
+                the error is received, that may return a message to send the request again to the node
 
         Returns:
             The object for handling the communications for this request
@@ -357,7 +496,7 @@ class Requests(metaclass=SingletonMeta):
         else:
             nodes = self._grpc_server.get_all_nodes()
 
-        return FederatedRequest(message, nodes, policies)
+        return FederatedRequest(message, nodes, policies, on_reply, on_error)
 
     def search(self, tags: List[str], nodes: Optional[list] = None) -> dict:
         """Searches available data by tags
@@ -0,0 +1,140 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""Per round results of an experiment, with a bounded retention of model parameters in memory."""
+
+from collections import deque
+from collections.abc import ItemsView, ValuesView
+from typing import Any, Deque, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedValueError
+from fedbiomed.common.serializer import Serializer
+
+
+class RoundHistory(dict):
+    """Results of the rounds of an experiment, indexed by round.
+
+    Entries of the history are dictionaries holding model parameters `params` that were saved to
+    the file `params_path` (eg aggregated parameters), or dictionaries of such dictionaries, one
+    for each node (eg training replies).
+
+    Parameters of the `retained_rounds` latest rounds are kept in memory. Parameters of older rounds
+    are evicted from the history, and loaded from their file each time the round is accessed, so that
+    memory use does not grow with the number of rounds. Other fields of the entries are kept.
+    """
+
+    def __init__(self, retained_rounds: Optional[int] = None):
+        """Constructor of the class
+
+        Args:
+            retained_rounds: number of latest rounds whose parameters are kept in memory.
+                Defaults to None, parameters of all the rounds are kept in memory.
+
+        Raises:
+            FedbiomedValueError: bad number of retained rounds
+        """
+        super().__init__()
+        self._retained: Deque[Hashable] = deque()
+        self._retained_rounds = None
+        self.retained_rounds = retained_rounds
+
+    @property
+    def retained_rounds(self) -> Optional[int]:
+        """Number of latest rounds whose parameters are kept in memory, None if not bounded"""
+        return self._retained_rounds
+
+    @retained_rounds.setter
+    def retained_rounds(self, retained_rounds: Optional[int]) -> None:
+        """Sets the number of latest rounds whose parameters are kept in memory
+
+        Parameters of older rounds are evicted.
+
+        Args:
+            retained_rounds: number of rounds, or None to keep all the rounds in memory
+
+        Raises:
+            FedbiomedValueError: bad number of retained rounds
+        """
+        if retained_rounds is not None and \
+                (not isinstance(retained_rounds, int) or isinstance(retained_rounds, bool) or retained_rounds < 1):
+            raise FedbiomedValueError(
+                f"{ErrorNumbers.FB410.value}: number of retained rounds should be a positive integer or None, "
+                f"not {retained_rounds}")
+        self._retained_rounds = retained_rounds
+        self._evict_overflow()
+
+    def __setitem__(self, round_: Hashable, entry: Any) -> None:
+        super().__setitem__(round_, entry)
+        if round_ not in self._retained:
+            self._retained.append(round_)
+        self._evict_overflow()
+
+    def __getitem__(self, round_: Hashable) -> Any:
+        return self._load(super().__getitem__(round_))
+
+    def __delitem__(self, round_: Hashable) -> None:
+        super().__delitem__(round_)
+        if round_ in self._retained:
+            self._retained.remove(round_)
+
+    def get(self, round_: Hashable, default: Any = None) -> Any:
+        return self[round_] if round_ in self else default
+
+    def pop(self, round_: Hashable, *args: Any) -> Any:
+        if round_ in self._retained:
+            self._retained.remove(round_)
+        return self._load(super().pop(round_, *args))
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for round_, entry in dict(*args, **kwargs).items():
+            self[round_] = entry
+
+    def items(self) -> ItemsView:
+        return ItemsView(self)
+
+    def values(self) -> ValuesView:
+        return ValuesView(self)
+
+    def stored_items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Iterates over the entries as they are held in memory, without loading evicted parameters
+
+        Returns:
+            Iterator over the rounds and their entries
+        """
+        return iter(super().items())
+
+    def _evict_overflow(self) -> None:
+        """Evicts the parameters of the rounds exceeding the retention window"""
+        if self._retained_rounds is None:
+            return
+        while len(self._retained) > self._retained_rounds:
+            round_ = self._retained.popleft()
+            if round_ in self:
+                for item in self._param_items(super().__getitem__(round_)):
+                    item.pop('params', None)
+
+    @staticmethod
+    def _param_items(entry: Any) -> List[Dict[str, Any]]:
+        """Returns the dictionaries of an entry whose parameters are saved in a file"""
+        if not isinstance(entry, dict):
+            return []
+        if entry.get('params_path'):
+            return [entry]
+        return [item for item in entry.values() if isinstance(item, dict) and item.get('params_path')]
+
+    @classmethod
+    def _load(cls, entry: Any) -> Any:
+        """Returns an entry with its evicted parameters loaded from their files
+
+        Loaded parameters are returned in a copy of the entry, and are not kept in the history.
+        """
+        if not isinstance(entry, dict):
+            return entry
+        if entry.get('params_path'):
+            if 'params' in entry:
+                return entry
+            return {**entry, 'params': Serializer.load(entry['params_path'])}
+        if not any('params' not in item for item in cls._param_items(entry)):
+            return entry
+        return {key: cls._load(item) if isinstance(item, dict) else item for key, item in entry.items()}
@@ -8,9 +8,10 @@ from typing import List, Union, Dict, Any, Optional
 
 from ._secagg_context import SecaggServkeyContext, SecaggBiprimeContext
 from fedbiomed.common.constants import ErrorNumbers
-from fedbiomed.common.exceptions import FedbiomedSecureAggregationError
-from fedbiomed.common.secagg import SecaggCrypter
+from fedbiomed.common.exceptions import FedbiomedSecaggCrypterError, FedbiomedSecureAggregationError
+from fedbiomed.common.secagg import CiphertextAccumulator, CiphertextVector, SecaggCrypter
 from fedbiomed.common.logger import logger
+from fedbiomed.researcher.environ import environ
 
 
 class SecureAggregation:
@@ -33,6 +34,8 @@ class SecureAggregation:
             parameters.
         _secagg_random: Random float generated tobe sent to node to validate secure aggregation
             after aggregation encrypted parameters.
+        _accumulator: Homomorphic sum of the encrypted model parameters received in the round, if any.
+        _accumulated_nodes: Nodes whose encrypted model parameters were added to `_accumulator`.
     """
 
     def __init__(
@@ -76,7 +79,9 @@ class SecureAggregation:
         self._servkey: Optional[SecaggServkeyContext] = None
         self._biprime: Optional[SecaggBiprimeContext] = None
         self._secagg_random: Optional[float] = None
-        self._secagg_crypter: SecaggCrypter = SecaggCrypter()
+        self._secagg_crypter: SecaggCrypter = SecaggCrypter(max_workers=environ['SECAGG_WORKERS'])
+        self._accumulator: Optional[CiphertextAccumulator] = None
+        self._accumulated_nodes: List[str] = []
 
     @property
     def parties(self) -> Union[List[str], None]:
@@ -253,12 +258,66 @@ class SecureAggregation:
                         f"aggregation context creation for the experiment {self._job_id}")
             self._set_secagg_contexts(parties)
 
+    def precompute_masks(self, round_: int, num_params: int) -> None:
+        """Starts computing the masks that decrypt the aggregated parameters in the background
+
+        Masks only depend on the number of parameters, so they are computed while nodes train.
+        Does nothing if the secure aggregation contexts are not set up.
+
+        Args:
+            round_: current training round number
+            num_params: number of model parameters aggregated in the round
+        """
+        if self._biprime is None or self._servkey is None or \
+                not self._biprime.status or not self._servkey.status:
+            return
+
+        try:
+            self._secagg_crypter.precompute_masks(
+                num_nodes=len(self._parties) - 1,  # -1: don't count researcher
+                current_round=round_,
+                num_params=num_params,
+                key=self._servkey.context["context"]["server_key"],
+                biprime=self._biprime.context["context"]["biprime"])
+        except Exception as e:
+            # masks are computed when aggregating
+            logger.debug(f"Cannot precompute secure aggregation masks: {e}")
+
+    def reset_accumulator(self) -> None:
+        """Discards the encrypted model parameters summed for a round, before a new round starts"""
+        self._accumulator = None
+        self._accumulated_nodes = []
+
+    def accumulate(self, node_id: str, params: Union[CiphertextVector, List[int]]) -> None:
+        """Adds the encrypted model parameters of a node to the homomorphic sum as soon as they are received
+
+        Only the sum is held in memory, the encrypted parameters of the node can be released once added.
+        Parameters that cannot be summed are left to `aggregate`, which then sums the parameters it is given.
+
+        Args:
+            node_id: ID of the node that sent the parameters
+            params: encrypted model parameters of the node
+        """
+        if self._biprime is None or not self._biprime.status:
+            return
+
+        if self._accumulator is None:
+            self._accumulator = CiphertextAccumulator(self._biprime.context["context"]["biprime"])
+
+        try:
+            self._accumulator.add(params)
+        except FedbiomedSecaggCrypterError as e:
+            logger.debug(f"Cannot sum encrypted parameters of node {node_id} when received: {e}")
+            self.reset_accumulator()
+            return
+        self._accumulated_nodes.append(node_id)
+
     def aggregate(
             self,
             round_: int,
             total_sample_size: int,
-            model_params: Dict[str, List[int]],
-            encryption_factors: Union[Dict[str, List[int]], None] = None,
+            model_params: Dict[str, Union[CiphertextVector, List[int]]],
+            encryption_factors: Union[Dict[str, Union[CiphertextVector, List[int]]], None] = None,
     ) -> List[float]:
         """Aggregates given model parameters
 
@@ -323,9 +382,21 @@ class SecureAggregation:
                            "aggregation steps are applied correctly.")
 
         logger.info("Aggregating encrypted parameters. This process may take some time depending on model size.")
-        # Aggregate parameters
-        params = [p for _, p in model_params.items()]
-        aggregated_params = aggregate(params=params)
+        if self._accumulator is not None and sorted(self._accumulated_nodes) == sorted(model_params):
+            # parameters were already summed when received
+            aggregated_params = self._secagg_crypter.decrypt_sum(
+                current_round=round_,
+                num_nodes=num_nodes,
+                summed=self._accumulator,
+                key=key,
+                biprime=biprime,
+                total_sample_size=total_sample_size,
+                clipping_range=self.clipping_range)
+        else:
+            # Aggregate parameters
+            params = [p for _, p in model_params.items()]
+            aggregated_params = aggregate(params=params)
+        self.reset_accumulator()
 
         return aggregated_params
 
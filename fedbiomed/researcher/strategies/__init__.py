@@ -4,8 +4,10 @@
 
 from .strategy import Strategy
 from .default_strategy import DefaultStrategy
+from .buffered_async_strategy import BufferedAsyncStrategy
 
 __all__ = [
+    "BufferedAsyncStrategy",
     "DefaultStrategy",
     "Strategy",
 ]
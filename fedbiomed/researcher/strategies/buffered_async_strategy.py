@@ -0,0 +1,157 @@
+# This file is originally part of Fed-BioMed
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Strategy of the buffered asynchronous training, keeping a number of nodes busy at all times
+"""
+
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedStrategyError
+from fedbiomed.common.logger import logger
+
+from fedbiomed.researcher.datasets import FederatedDataSet
+from fedbiomed.researcher.strategies import Strategy
+
+
+class BufferedAsyncStrategy(Strategy):
+    """
+    Strategy of the buffered asynchronous training, to be used with the
+    [`FedBuff`][fedbiomed.researcher.aggregators.FedBuff] aggregator.
+
+    Strategy is:
+    - keep `concurrency` nodes training at all times: a node that finishes is replaced right away
+      by a node sampled at random among the idle nodes, which include the node that finished
+    - discard the updates of nodes that trained from a version of the global model older than
+      `max_staleness` versions
+    - stop sending requests to a node that returns an error, fails to train or does not reply
+      before the timeout of its train request
+    """
+
+    def __init__(
+            self,
+            data: FederatedDataSet,
+            concurrency: Optional[int] = None,
+            max_staleness: Optional[int] = None
+    ):
+        """Constructor of the strategy
+
+        Args:
+            data: Object that includes all active nodes and the meta-data of the dataset that is going to be
+                used for federated training. Should be passed to `super().__init__` to initialize parent class
+            concurrency: number of nodes training at the same time. Defaults to None, all the nodes.
+            max_staleness: maximum number of versions of the global model created while a node trains,
+                for its update to be aggregated. Defaults to None, updates are never discarded.
+
+        Raises:
+            FedbiomedStrategyError: bad concurrency or maximum staleness
+        """
+        super().__init__(data)
+        for name, value in (('concurrency', concurrency), ('max_staleness', max_staleness)):
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+                raise FedbiomedStrategyError(
+                    f"{ErrorNumbers.FB402.value}: `{name}` should be a non negative integer or None, not {value}")
+        if concurrency == 0:
+            raise FedbiomedStrategyError(f"{ErrorNumbers.FB402.value}: `concurrency` should be positive")
+
+        self._parameters = {'concurrency': concurrency, 'max_staleness': max_staleness}
+        self._failed_nodes = set()
+
+    @property
+    def asynchronous(self) -> bool:
+        """Whether nodes are trained asynchronously"""
+        return True
+
+    @property
+    def concurrency(self) -> Optional[int]:
+        """Number of nodes training at the same time, None for all the nodes"""
+        return self._parameters['concurrency']
+
+    @property
+    def max_staleness(self) -> Optional[int]:
+        """Maximum staleness of an aggregated update, None if not bounded"""
+        return self._parameters['max_staleness']
+
+    def sample_nodes(self, round_i: int, busy_nodes: Iterable[str] = ()) -> List[str]:
+        """Samples the idle nodes that start training, so that `concurrency` nodes are training
+
+        Args:
+            round_i: version of the global model the nodes train from
+            busy_nodes: IDs of the nodes already training
+
+        Returns:
+            IDs of the nodes that start training
+
+        Raises:
+            FedbiomedStrategyError: no node is training and no node is left to train
+        """
+        busy_nodes = list(busy_nodes)
+        idle_nodes = [node for node in self._fds.node_ids()
+                      if node not in busy_nodes and node not in self._failed_nodes]
+        concurrency = len(self._fds.node_ids()) if self.concurrency is None else self.concurrency
+        n_sampled = min(len(idle_nodes), max(concurrency - len(busy_nodes), 0))
+
+        sampled = idle_nodes if n_sampled == len(idle_nodes) else random.sample(idle_nodes, n_sampled)
+        if not sampled and not busy_nodes:
+            msg = ErrorNumbers.FB407.value + ": no node is left to train"
+            logger.critical(msg)
+            raise FedbiomedStrategyError(msg)
+
+        self._sampling_node_history.setdefault(round_i, []).extend(sampled)
+        return sampled
+
+    def refine_reply(
+            self,
+            node_id: str,
+            reply: Optional[Dict[str, Any]],
+            round_i: int,
+            staleness: int
+    ) -> bool:
+        """Checks whether the update of a node is aggregated, as soon as it is received
+
+        Args:
+            node_id: ID of the node
+            reply: training reply of the node, as stored in the training replies, or None if the node
+                returned an error, disconnected or reached the timeout of its train request
+            round_i: current version of the global model
+            staleness: number of versions of the global model created since the node started training
+
+        Returns:
+            True if the update is added to the buffer of the aggregator
+        """
+        if reply is None or not reply['success']:
+            logger.error(f"{ErrorNumbers.FB409.value} (node = {node_id}), node is not sampled anymore")
+            self._failed_nodes.add(node_id)
+            return False
+
+        if self.max_staleness is not None and staleness > self.max_staleness:
+            logger.warning(f"Update of node {node_id} is discarded, its staleness {staleness} exceeds "
+                           f"{self.max_staleness}")
+            return False
+
+        self._success_node_history.setdefault(round_i, []).append(node_id)
+        return True
+
+    def refine(
+            self,
+            training_replies: Dict,
+            round_i: int
+    ) -> Tuple[Dict[str, Dict[str, Union['torch.Tensor', 'numpy.ndarray']]],
+               Dict[str, float],
+               int,
+               Dict[str, List[int]]]:
+        """Updates are refined one at a time with `refine_reply` in asynchronous training
+
+        Raises:
+            FedbiomedStrategyError: always, the strategy does not support synchronous rounds
+        """
+        msg = ErrorNumbers.FB402.value + \
+            f": {type(self).__name__} only supports asynchronous training, use `refine_reply`"
+        logger.critical(msg)
+        raise FedbiomedStrategyError(msg)
+
+    def load_state_breakpoint(self, state: Dict[str, Any] = None, **kwargs):
+        super().load_state_breakpoint(state)
+        self._failed_nodes = set()
@@ -24,7 +24,7 @@ class DefaultStrategy(Strategy):
 
     Strategy is:
     - select all node for each round
-    - raise an error if one node does not answer
+    - aggregate the replies of the nodes that answered, raise an error if no node answers
     - raise an error is one node returns an error
     """
 
@@ -90,39 +90,29 @@ class DefaultStrategy(Strategy):
             encryption_factors: encryption factors from the participating nodes
 
         Raises:
-            FedbiomedStrategyError: - Miss-matched in answered nodes and existing nodes
+            FedbiomedStrategyError: - None of the sampled nodes answered
                 - If not all nodes successfully completes training
                 - if a Node has not sent `sample_size` value in the TrainingReply, making it
                 impossible to compute aggregation weights.
         """
-        # check that all nodes answered
-        answers_count = 0
-
+        # check which nodes answered: replies of the nodes that did not answer (eg: training request
+        # completed on a quorum of replies) are not aggregated
         if self._sampling_node_history.get(round_i) is None:
             raise FedbiomedStrategyError(ErrorNumbers.FB408.value + f": Missing Nodes replies for round: {round_i}")
 
-        for cl in self._sampling_node_history[round_i]:
-            if cl in training_replies:
-                answers_count += 1
-            else:
-                # this node did not answer
-                logger.error(ErrorNumbers.FB408.value +
-                             " (node = " +
-                             cl +
-                             ")"
-                             )
-
-        if len(self._sampling_node_history[round_i]) != answers_count:
-            if answers_count == 0:
-                # none of the nodes answered
-                msg = ErrorNumbers.FB407.value
-
-            else:
-                msg = ErrorNumbers.FB408.value
-
+        missing_nodes = [node_id for node_id in self._sampling_node_history[round_i]
+                         if node_id not in training_replies]
+        if missing_nodes and len(missing_nodes) == len(self._sampling_node_history[round_i]):
+            # none of the nodes answered
+            msg = ErrorNumbers.FB407.value
             logger.critical(msg)
             raise FedbiomedStrategyError(msg)
 
+        if missing_nodes:
+            logger.warning(f"{ErrorNumbers.FB408.value} (nodes = {missing_nodes}), aggregating the replies "
+                           f"of the {len(self._sampling_node_history[round_i]) - len(missing_nodes)} nodes "
+                           "that answered")
+
         # check that all nodes that answer could successfully train
         self._success_node_history[round_i] = []
         all_success = True
@@ -33,6 +33,11 @@ class Strategy:
         self._success_node_history = {}
         self._parameters = None
 
+    @property
+    def asynchronous(self) -> bool:
+        """Whether nodes are trained asynchronously, rather than in synchronous rounds"""
+        return False
+
     def sample_nodes(self, round_i: int):
         """
         Abstract method that must be implemented by child class
@@ -0,0 +1,209 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Sequence
+
+from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedCommunicationError
+
+
+# Time in seconds after which a transfer that did not receive any chunk is discarded
+TRANSFER_EXPIRATION = 600
+
+
+class ChunkBuffer:
+    """Reassembles a message received as a stream of chunks.
+
+    Chunks are copied once into a buffer preallocated when receiving the first
+    chunk of a message, so that reassembling a message costs time linear
+    in its size (instead of quadratic when concatenating `bytes`).
+
+    All chunks of a message have the same length, except the last one which
+    can be shorter. Thus the buffer is preallocated from the first chunk
+    length and the number of chunks of the message.
+    """
+
+    def __init__(self) -> None:
+        """Constructor of the class"""
+        self._buffer: Optional[bytearray] = None
+        self._length: int = 0
+
+    def __len__(self) -> int:
+        """Returns the number of bytes received for the current message"""
+        return self._length
+
+    def add(self, chunk: bytes, size: int) -> None:
+        """Appends a chunk to the message being reassembled.
+
+        Args:
+            chunk: bytes of the chunk
+            size: total number of chunks of the message
+        """
+        if self._buffer is None:
+            self._buffer = bytearray(size * len(chunk))
+
+        end = self._length + len(chunk)
+        # Slice assignment extends the buffer if chunks are longer than expected
+        self._buffer[self._length:end] = chunk
+        self._length = end
+
+    def view(self) -> memoryview:
+        """Returns the reassembled message.
+
+        Returns:
+            A zero-copy view of the bytes received for the current message
+        """
+        if self._buffer is None:
+            return memoryview(b"")
+
+        return memoryview(self._buffer)[:self._length]
+
+    def reset(self) -> None:
+        """Discards the current message, ready to receive the next one"""
+        self._buffer = None
+        self._length = 0
+
+
+def chunk_count(segments: Sequence[bytes], chunk_size: int) -> int:
+    """Returns the number of chunks of a payload.
+
+    Args:
+        segments: consecutive segments of bytes making the payload
+        chunk_size: maximum length of a chunk
+
+    Returns:
+        Number of chunks the payload is split into
+    """
+    return len(range(0, sum(len(segment) for segment in segments), chunk_size))
+
+
+def iter_chunks(segments: Sequence[bytes], chunk_size: int, start: int = 0) -> Iterator[bytes]:
+    """Splits a payload into chunks.
+
+    The payload is given as consecutive segments of bytes, so that segments
+    shared between several payloads don't need to be concatenated with the
+    others before chunking.
+
+    Args:
+        segments: consecutive segments of bytes making the payload
+        chunk_size: maximum length of a chunk
+        start: number of chunks to skip, eg: already received by the peer
+
+    Yields:
+        Chunks of the payload, all of length `chunk_size` except the last one
+    """
+    pending = []
+    pending_length = 0
+    skip = start * chunk_size
+    for segment in segments:
+        view = memoryview(segment)
+        if skip >= len(view):
+            skip -= len(view)
+            continue
+        view = view[skip:]
+        skip = 0
+
+        while len(view):
+            take = min(chunk_size - pending_length, len(view))
+            pending.append(view[:take])
+            pending_length += take
+            view = view[take:]
+
+            if pending_length == chunk_size:
+                yield b"".join(pending)
+                pending = []
+                pending_length = 0
+
+    if pending:
+        yield b"".join(pending)
+
+
+@dataclass
+class _Transfer:
+    """State of a message received as a resumable transfer"""
+    buffer: Optional[ChunkBuffer]
+    received: int
+    updated: float
+
+
+class TransferStore:
+    """Keeps the messages being received as resumable transfers.
+
+    Chunks of a transfer are kept when the stream carrying them breaks, so that the
+    sender can resume the transfer from the first chunk not received, in another stream.
+    Completed transfers are remembered, without their content, so that a sender that
+    did not get the acknowledgement of a transfer does not send the message twice.
+    """
+
+    def __init__(self, expiration: float = TRANSFER_EXPIRATION) -> None:
+        """Constructor of the class
+
+        Args:
+            expiration: time in seconds after which a transfer that did not receive
+                any chunk is discarded
+        """
+        self._expiration = expiration
+        self._transfers: Dict[str, _Transfer] = {}
+
+    def received(self, transfer_id: str) -> int:
+        """Returns the number of consecutive chunks received for a transfer.
+
+        Args:
+            transfer_id: unique ID of the transfer
+
+        Returns:
+            Number of chunks received, 0 for an unknown transfer
+        """
+        transfer = self._transfers.get(transfer_id)
+        return transfer.received if transfer is not None else 0
+
+    def add(self, transfer_id: str, chunk: bytes, iteration: int, size: int) -> Optional[memoryview]:
+        """Adds a chunk to a transfer.
+
+        Chunks already received are ignored, thus a sender can safely send again
+        chunks whose reception was not acknowledged.
+
+        Args:
+            transfer_id: unique ID of the transfer
+            chunk: bytes of the chunk
+            iteration: sequence number of the chunk in the message, starting from 1
+            size: total number of chunks of the message
+
+        Returns:
+            The reassembled message when receiving its last chunk, None otherwise
+
+        Raises:
+            FedbiomedCommunicationError: previous chunks of the transfer are missing
+        """
+        now = time.monotonic()
+        self._discard_expired(now)
+
+        transfer = self._transfers.setdefault(transfer_id, _Transfer(ChunkBuffer(), 0, now))
+        if iteration <= transfer.received:
+            return None
+
+        if transfer.buffer is None or iteration != transfer.received + 1:
+            del self._transfers[transfer_id]
+            raise FedbiomedCommunicationError(
+                f"{ErrorNumbers.FB628.value}: received chunk {iteration} of transfer {transfer_id} "
+                f"but only {transfer.received} previous chunks")
+
+        transfer.buffer.add(chunk, size)
+        transfer.received = iteration
+        transfer.updated = now
+
+        if iteration != size:
+            return None
+
+        message = transfer.buffer.view()
+        transfer.buffer = None
+        return message
+
+    def _discard_expired(self, now: float) -> None:
+        """Discards the transfers that did not receive any chunk before expiration
+
+        Args:
+            now: current time, as returned by `time.monotonic`
+        """
+        expired = [id_ for id_, transfer in self._transfers.items() if now - transfer.updated > self._expiration]
+        for transfer_id in expired:
+            del self._transfers[transfer_id]
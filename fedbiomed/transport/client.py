@@ -5,6 +5,7 @@ import abc
 import ssl
 import socket
 import time
+import uuid
 
 import json
 
@@ -13,11 +14,14 @@ from dataclasses import dataclass
 import grpc
 
 from fedbiomed.transport.protocols.researcher_pb2_grpc import ResearcherServiceStub
+from fedbiomed.transport.chunks import ChunkBuffer, chunk_count, iter_chunks
+from fedbiomed.transport.compression import PayloadCompressor
+from fedbiomed.transport.limits import TransportLimits
 
 from fedbiomed.common.logger import logger
 from fedbiomed.common.serializer import Serializer
-from fedbiomed.common.message import Message, TaskRequest, TaskResult, FeedbackMessage
-from fedbiomed.common.constants import MAX_MESSAGE_BYTES_LENGTH, ErrorNumbers
+from fedbiomed.common.message import Message, TaskRequest, TaskResult, FeedbackMessage, ReplyStatusRequest
+from fedbiomed.common.constants import ErrorNumbers
 from fedbiomed.common.exceptions import FedbiomedCommunicationError
 
 
@@ -29,12 +33,58 @@ class ResearcherCredentials:
     certificate: Optional[str] = None
 
 
+@dataclass
+class ReplyTransfer:
+    """Reply being streamed to the researcher, whose transfer can be resumed after a disconnection"""
+
+    transfer_id: str
+    payload: List[bytes]
+    size: int
+    chunk_size: int
+    compression: str = ""
+    compression_time: float = 0.
+    # whether chunks of the reply may have been sent already
+    started: bool = False
+
+
 class ClientStatus(Enum):
     DISCONNECTED = 0
     CONNECTED = 1
     FAILED = 2
 
 
+class SenderLane(Enum):
+    """Priority lanes of the messages sent to the researcher. Each lane has its own queue, so
+    that messages of a lane are not blocked by the messages of another lane.
+
+    Attributes:
+        CONTROL: feedback messages (logs and scalars)
+        SMALL: replies that fit in one chunk
+        BULK: replies streamed in several chunks, eg training replies
+    """
+    CONTROL = 0
+    SMALL = 1
+    BULK = 2
+
+
+# number of messages sent concurrently in each lane of the sender
+SENDER_LANE_CONCURRENCY = {
+    SenderLane.CONTROL: 1,
+    SenderLane.SMALL: 2,
+    SenderLane.BULK: 1,
+}
+
+
+@dataclass
+class _LaneState:
+    """State of a sender lane worker, sending messages from its lane queue one at a time"""
+
+    queue: asyncio.Queue
+    # reply being sent, kept until the researcher acknowledges it
+    transfer: Optional[ReplyTransfer] = None
+    retry_count: int = 0
+
+
 # timeout in seconds for retrying connection to the server when it does not reply or returns an error
 GRPC_CLIENT_CONN_RETRY_TIMEOUT = 2
 
@@ -71,13 +121,15 @@ class Channels:
     """Keeps gRPC server channels"""
 
 
-    def __init__(self, researcher: ResearcherCredentials):
+    def __init__(self, researcher: ResearcherCredentials, limits: Optional[TransportLimits] = None):
         """Create channels and stubs
 
         Args:
             researcher: An instance of ResearcherCredentials
+            limits: Chunk size and gRPC message limits. If None, default limits are used.
         """
         self._researcher = researcher
+        self._limits = limits if limits is not None else TransportLimits()
 
         self._task_channel: grpc.aio.Channel = None
         self._feedback_channel: grpc.aio.Channel = None
@@ -114,13 +166,15 @@ class Channels:
         return self._create_channel(
             port=self._researcher.port,
             host=self._researcher.host,
-            certificate= grpc.ssl_channel_credentials(self._researcher.certificate))
+            certificate= grpc.ssl_channel_credentials(self._researcher.certificate),
+            limits=self._limits)
 
     @staticmethod
     def _create_channel(
         port: str,
         host: str,
-        certificate: Optional[str] = None
+        certificate: Optional[str] = None,
+        limits: Optional[TransportLimits] = None
     ) -> grpc.Channel :
         """Create gRPC channel
 
@@ -128,13 +182,13 @@ class Channels:
             ip: IP address of the channel
             port: TCP port of the channel
             certificate: certificate for secure channel, or None for unsecure channel
+            limits: gRPC message limits of the channel. If None, default limits are used.
 
         Returns:
             gRPC connection channel
         """
-        channel_options = [
-            ("grpc.max_send_message_length", 100 * 1024 * 1024),
-            ("grpc.max_receive_message_length", 100 * 1024 * 1024),
+        limits = limits if limits is not None else TransportLimits()
+        channel_options = limits.grpc_options() + [
             #
             # Some references for configuring gRPC keepalive:
             # https://github.com/grpc/proposal/blob/master/A8-client-side-keepalive.md
@@ -174,7 +228,9 @@ class GrpcClient:
         self,
         node_id: str,
         researcher: ResearcherCredentials,
-        update_id_map: Callable
+        update_id_map: Callable,
+        compressor: Optional[PayloadCompressor] = None,
+        limits: Optional[TransportLimits] = None
     ) -> None:
         """Class constructor
 
@@ -182,20 +238,30 @@ class GrpcClient:
             node_id: unique ID of this node (connection client)
             researcher: the researcher to which the node connects (connection server)
             update_id_map: function to call when updating the researcher ID, needs proper prototype
+            compressor: Compresses the replies sent to the researcher. If None, replies are sent uncompressed.
+            limits: Chunk size and gRPC message limits. If None, default limits are used.
         """
         self._id = None
         self._researcher = researcher
-        self._channels = Channels(researcher)
+        limits = limits if limits is not None else TransportLimits()
+        self._channels = Channels(researcher, limits)
+        compressor = compressor if compressor is not None else PayloadCompressor()
 
         self._task_listener = TaskListener(
             channels=self._channels,
             node_id=node_id,
             on_status_change = self._on_status_change,
-            update_id=self._update_id)
+            update_id=self._update_id,
+            compressor=compressor,
+            update_codecs=self._update_codecs,
+            limits=limits,
+            update_max_message_length=self._update_max_message_length)
 
         self._sender = Sender(
             channels=self._channels,
-            on_status_change = self._on_status_change)
+            on_status_change = self._on_status_change,
+            compressor=compressor,
+            limits=limits)
 
         # TODO: use `self._status` for finer gRPC agent handling.
         # Currently, the (tentative) status is maintained but not used
@@ -207,8 +273,8 @@ class GrpcClient:
     def start(self, on_task) -> List[Awaitable[Optional[Callable]]]:
         """Start researcher gRPC agent.
 
-        Starts long-lived tasks, one waiting for server requests, one waiting on the async queue
-        for the replies from the node that are going to be sent back to researcher.
+        Starts long-lived tasks, one waiting for server requests, one waiting on the async queues
+        of each lane for the messages from the node that are going to be sent back to researcher.
 
         Args:
             on_task: Callback function to execute once a payload received from researcher.
@@ -305,6 +371,22 @@ class GrpcClient:
         self._id = id_
         await self._update_id_map(f"{self._researcher.host}:{self._researcher.port}", id_)
 
+    def _update_codecs(self, codecs: List[str]) -> None:
+        """Updates the compression codecs the researcher can decompress
+
+        Args:
+            codecs: names of the codecs
+        """
+        self._sender.researcher_codecs = codecs
+
+    def _update_max_message_length(self, length: int) -> None:
+        """Updates the maximum length of the gRPC messages the researcher can receive
+
+        Args:
+            length: maximum length in bytes, 0 if not announced by the researcher
+        """
+        self._sender.researcher_max_message_length = length
+
 
 class Listener:
     """Abstract generic listener method for a node's communications."""
@@ -342,7 +424,11 @@ class TaskListener(Listener):
             channels: Channels,
             node_id: str,
             on_status_change: Callable,
-            update_id: Callable
+            update_id: Callable,
+            compressor: Optional[PayloadCompressor] = None,
+            update_codecs: Optional[Callable] = None,
+            limits: Optional[TransportLimits] = None,
+            update_max_message_length: Optional[Callable] = None
     ) -> None:
         """Class constructor.
 
@@ -351,12 +437,21 @@ class TaskListener(Listener):
             node_id: unique ID for this node
             on_status_change: Callback function to run for changing node agent status
             update_id: Callback function to run updating peer researcher ID
+            compressor: Announces the codecs this node can decompress to the researcher
+            update_codecs: Callback function to run updating the codecs the researcher can decompress
+            limits: Announces the maximum length of the gRPC messages this node can receive to the researcher
+            update_max_message_length: Callback function to run updating the maximum length of the gRPC
+                messages the researcher can receive
         """
         super().__init__(channels)
 
         self._node_id = node_id
         self._on_status_change = on_status_change
         self._update_id = update_id
+        self._compressor = compressor if compressor is not None else PayloadCompressor()
+        self._update_codecs = update_codecs
+        self._limits = limits if limits is not None else TransportLimits()
+        self._update_max_message_length = update_max_message_length
 
     async def _listen(self, callback: Optional[Callable] = None) -> None:
         """"Starts the loop for listening task
@@ -414,18 +509,27 @@ class TaskListener(Listener):
             logger.debug("Sending new task request to researcher")
             self._on_status_change(ClientStatus.CONNECTED)
             iterator = self._channels.task_stub.GetTaskUnary(
-                TaskRequest(node=f"{self._node_id}").to_proto(), timeout=GRPC_CLIENT_TASK_REQUEST_TIMEOUT
+                TaskRequest(
+                    node=f"{self._node_id}",
+                    codecs=self._compressor.codecs,
+                    max_message_length=self._limits.max_message_length).to_proto(),
+                timeout=GRPC_CLIENT_TASK_REQUEST_TIMEOUT
             )
             # Prepare reply
-            reply = bytes()
+            reply = ChunkBuffer()
             async for answer in iterator:
-                reply += answer.bytes_
+                reply.add(answer.bytes_, answer.size)
                 if answer.size != answer.iteration:
                     continue
                 else:
                     # Execute callback
                     logger.debug("New task received from researcher")
-                    task = Serializer.loads(reply)
+                    if isinstance(self._update_codecs, Callable):
+                        self._update_codecs(list(answer.codecs))
+                    if isinstance(self._update_max_message_length, Callable):
+                        self._update_max_message_length(answer.max_message_length)
+
+                    task = Serializer.loads(PayloadCompressor.decompress(reply.view(), answer.compression))
 
                     # Guess ID of connected researcher, for un-authenticated connection
                     await self._update_id(task["researcher_id"])
@@ -435,7 +539,7 @@ class TaskListener(Listener):
                         callback(task)
 
                     # Reset reply
-                    reply = bytes()
+                    reply.reset()
 
 
 class Sender(Listener):
@@ -444,25 +548,58 @@ class Sender(Listener):
         self,
         channels: Channels,
         on_status_change: Callable,
+        compressor: Optional[PayloadCompressor] = None,
+        limits: Optional[TransportLimits] = None,
     ) -> None:
         """Class constructor.
 
         Args:
             channels: RPC channels and stubs to be used for polling tasks from researcher
             on_status_change: Callback function to run for changing node agent status
+            compressor: Compresses the replies sent to the researcher. If None, replies are sent uncompressed.
+            limits: Chunk size of the replies. If None, default limits are used.
         """
         super().__init__(channels)
 
-        self._queue = asyncio.Queue()
+        self._queues = {lane: asyncio.Queue() for lane in SenderLane}
         self._on_status_change = on_status_change
-        self._retry_count = 0
+        self._compressor = compressor if compressor is not None else PayloadCompressor()
+        # Codecs the researcher can decompress, learnt from the tasks it sends
+        self.researcher_codecs: List[str] = []
+        self._limits = limits if limits is not None else TransportLimits()
+        # Maximum length of the gRPC messages the researcher can receive, learnt from the tasks it sends
+        self.researcher_max_message_length = 0
+        # Number of reconnections to the researcher, so that lanes failing together reconnect once
+        self._connection = 0
+        self._connect_lock = asyncio.Lock()
 
     async def _listen(self, callback: Optional[Callable] = None) -> None:
-        """Listens for the messages that are going to be sent to researcher.
+        """Listens for the messages that are going to be sent to researcher, in all lanes.
 
         Args:
             callback: Callback to execute once a task is received
 
+        Raises:
+            FedbiomedCommunicationError: communication error with researcher
+        """
+        tasks = [
+            asyncio.create_task(self._listen_lane(_LaneState(queue=self._queues[lane]), callback))
+            for lane, concurrency in SENDER_LANE_CONCURRENCY.items()
+            for _ in range(concurrency)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _listen_lane(self, state: _LaneState, callback: Optional[Callable] = None) -> None:
+        """Listens for the messages of a lane that are going to be sent to researcher.
+
+        Args:
+            state: state of the lane worker
+            callback: Callback to execute once a task is received
+
         Raises:
             FedbiomedCommunicationError: communication error with researcher
         """
@@ -470,7 +607,7 @@ class Sender(Listener):
         # While loop retires to send if first one fails to send the result
         while True:
             try:
-                await self._get(callback)
+                await self._get(state, callback)
             except grpc.aio.AioRpcError as exp:
                 match exp.code():
                     case grpc.StatusCode.DEADLINE_EXCEEDED:
@@ -478,90 +615,178 @@ class Sender(Listener):
                         logger.warning(
                             "Researcher not answering after timeout, looks like server failure or disconnect. "
                             "Discard message.")
-                        self._queue.task_done()
+                        state.transfer = None
+                        state.queue.task_done()
                     case grpc.StatusCode.UNAVAILABLE:
                         self._on_status_change(ClientStatus.DISCONNECTED)
                         logger.info(
                             "Researcher server is not available, will retry connect in "
                             f"{GRPC_CLIENT_CONN_RETRY_TIMEOUT} seconds")
+                        connection = self._connection
                         await asyncio.sleep(GRPC_CLIENT_CONN_RETRY_TIMEOUT)
-                        await self._channels.connect()
-                        self._retry_count += 1
+                        await self._reconnect(connection)
+                        state.retry_count += 1
+                    case grpc.StatusCode.FAILED_PRECONDITION:
+                        # researcher lost chunks of the reply: restart the transfer from the beginning
+                        logger.warning(f"Researcher could not resume sending the reply: {exp.details()}. "
+                                       "Send the reply again.")
+                        if state.transfer is not None:
+                            state.transfer.transfer_id = uuid.uuid4().hex
+                        state.retry_count += 1
                     case grpc.StatusCode.UNKNOWN:
                         self._on_status_change(ClientStatus.FAILED)
                         logger.error("Unexpected error raised by researcher gRPC server. This is probably due to "
                                      f"bug on the researcher side: {exp}")
+                        state.retry_count += 1
                     case _:
                         self._on_status_change(ClientStatus.FAILED)
+                        state.retry_count += 1
 
             except Exception as exp:
                 self._on_status_change(ClientStatus.FAILED)
                 raise FedbiomedCommunicationError(
                     f"{ErrorNumbers.FB628}: Sender has stopped due to unknown reason: {exp}") from exp
 
+    async def _reconnect(self, connection: int) -> None:
+        """Re-creates the channels, unless another lane already did since the connection failed.
 
-    async def _get(self, callback: Optional[Callable] = None) -> None:
-        """Gets task result from the queue.
+        Args:
+            connection: number of the connection that failed
+        """
+        async with self._connect_lock:
+            if connection == self._connection:
+                await self._channels.connect()
+                self._connection += 1
+
+    async def _get(self, state: _LaneState, callback: Optional[Callable] = None) -> None:
+        """Gets task result from the queue of a lane.
+
+        A reply whose sending failed is sent again, resuming its transfer from the
+        first chunk not received by the researcher.
 
         Args:
+            state: state of the lane worker
             callback: Callback to execute once a task is received
         """
 
         while True:
-            if self._retry_count > 5:
+            if state.retry_count > 5:
                 logger.warning("Message can not be sent to researcher after 5 retries")
-                self._queue.task_done()
+                if state.transfer is not None:
+                    state.transfer = None
+                    state.queue.task_done()
+                state.retry_count = 0
+
+            if state.transfer is None:
+                msg = await state.queue.get()
+
+                # If it is a Unary-Unary RPC call
+                if isinstance(msg["stub"], grpc.aio.UnaryUnaryMultiCallable):
+                    await msg["stub"](msg["message"])
+                    state.queue.task_done()
+                    state.retry_count = 0
+                    continue
 
-            msg = await self._queue.get()
+                elif isinstance(msg["stub"], grpc.aio.StreamUnaryMultiCallable):
+                    if isinstance(callback, Callable):
+                        # we could check the callback prototype
+                        callback(msg["message"])
 
-            # If it is a Unary-Unary RPC call
-            if isinstance(msg["stub"], grpc.aio.UnaryUnaryMultiCallable):
-                await msg["stub"](msg["message"])
+                    state.transfer = msg["transfer"]
+                    stub = msg["stub"]
 
-            elif isinstance(msg["stub"], grpc.aio.StreamUnaryMultiCallable):
-                stream_call = msg["stub"]()
+                else:
+                    raise FedbiomedCommunicationError(
+                        "Unknown type of stub has been in gRPC Sender listener {msg['stub']}"
+                    )
+            else:
+                # channels may have been re-created since the reply was queued
+                stub = self._channels.task_stub.ReplyTask
 
-                if isinstance(callback, Callable):
-                    # we could check the callback prototype
-                    callback(msg["message"])
+            await self._send_reply(stub, state.transfer)
 
-                for reply in self._stream_reply(msg["message"]):
-                    await stream_call.write(reply)
+            state.transfer = None
+            state.queue.task_done()
+            state.retry_count = 0
 
-                await stream_call.done_writing()
 
-            else:
-                raise FedbiomedCommunicationError(
-                    "Unknown type of stub has been in gRPC Sender listener {msg['stub']}"
-                )
+    def _prepare_reply(self, message: Message) -> ReplyTransfer:
+        """Serializes and compresses a reply to send to the researcher.
 
-            self._queue.task_done()
-            self._retry_count = 0
+        Args:
+            message: Message to send
 
+        Returns:
+            Reply transfer, with a new transfer ID
+        """
+        payload, compression, compression_time = self._compressor.compress(
+            [Serializer.dumps(message.get_dict())], self.researcher_codecs)
+        chunk_size = self._limits.chunk_size_for(self.researcher_max_message_length)
+
+        return ReplyTransfer(
+            transfer_id=uuid.uuid4().hex,
+            payload=payload,
+            size=chunk_count(payload, chunk_size),
+            chunk_size=chunk_size,
+            compression=compression,
+            compression_time=compression_time
+        )
+
+    async def _send_reply(self, stub: grpc.aio.StreamUnaryMultiCallable, transfer: ReplyTransfer) -> None:
+        """Streams a reply to the researcher, from the first chunk it did not receive.
 
-    def _stream_reply(self, message: Message) -> Iterable:
+        Args:
+            stub: RPC used to stream the reply
+            transfer: reply to send
+        """
+        start = 0
+        if transfer.started:
+            status = await self._channels.task_stub.GetReplyStatus(
+                ReplyStatusRequest(transfer_id=transfer.transfer_id).to_proto())
+            start = status.received
+            logger.info(f"Resuming reply transfer from chunk {start + 1}/{transfer.size}")
+            if start >= transfer.size:
+                return
+
+        transfer.started = True
+        stream_call = stub()
+        for reply in self._stream_reply(transfer, start):
+            await stream_call.write(reply)
+            # let messages of other lanes be sent between the chunks
+            await asyncio.sleep(0)
+
+        await stream_call.done_writing()
+        # wait for researcher to acknowledge the reply
+        await stream_call
+
+
+    def _stream_reply(self, transfer: ReplyTransfer, start: int = 0) -> Iterable:
         """Streams task result back researcher component.
 
         Args:
-            message: Message to stream
+            transfer: reply to stream
+            start: number of chunks to skip, already received by the researcher
 
         Returns:
             A stream of researcher reply chunks
         """
-
-        reply = Serializer.dumps(message.get_dict())
-        chunk_range = range(0, len(reply), MAX_MESSAGE_BYTES_LENGTH)
-        for start, iter_ in zip(chunk_range, range(1, len(chunk_range) + 1)):
-            stop = start + MAX_MESSAGE_BYTES_LENGTH
+        chunks = iter_chunks(transfer.payload, transfer.chunk_size, start=start)
+        for iter_, chunk in enumerate(chunks, start=start + 1):
             yield TaskResult(
-                size=len(chunk_range),
+                size=transfer.size,
                 iteration=iter_,
-                bytes_=reply[start:stop]
+                bytes_=chunk,
+                compression=transfer.compression,
+                compression_time=transfer.compression_time,
+                transfer_id=transfer.transfer_id
             ).to_proto()
 
     async def send(self, message: Message) -> None:
         """Send a message to peer researcher.
 
+        Feedback messages are sent in the control lane. Replies are serialized when queued,
+        and sent in the small or bulk lane depending on their size.
+
         Args:
             message: Message to send
         """
@@ -569,9 +794,13 @@ class Sender(Listener):
         match message.__class__.__name__:
             case FeedbackMessage.__name__:
                 # Note: FeedbackMessage is designed as proto serializable message.
-                await self._queue.put({"stub": self._channels.feedback_stub.Feedback,
-                                       "message": message.to_proto()})
+                await self._queues[SenderLane.CONTROL].put({"stub": self._channels.feedback_stub.Feedback,
+                                                            "message": message.to_proto()})
 
             case _:
-                await self._queue.put({"stub": self._channels.task_stub.ReplyTask,
-                                       "message": message})
+                # Serialize out of the event loop, so that other lanes keep sending meanwhile
+                transfer = await asyncio.to_thread(self._prepare_reply, message)
+                lane = SenderLane.SMALL if transfer.size <= 1 else SenderLane.BULK
+                await self._queues[lane].put({"stub": self._channels.task_stub.ReplyTask,
+                                              "message": message,
+                                              "transfer": transfer})
@@ -0,0 +1,316 @@
+import abc
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from fedbiomed.common.constants import DEFAULT_COMPRESSION_THRESHOLD, ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedCommunicationError
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Width of the values whose bytes are grouped by shuffling (float32 parameters)
+SHUFFLE_ITEM_SIZE = 4
+
+# Suffix of the codec name on the wire when the payload was shuffled before compression
+_SHUFFLE_SUFFIX = "+shuffle"
+
+# Suffix of the codec name on the wire when the segments of the payload were compressed separately
+_FRAMES_SUFFIX = "+frames"
+
+# Length prefix of each separately compressed segment
+_FRAME_HEADER = struct.Struct("<Q")
+
+
+class Codec(abc.ABC):
+    """Abstract compression codec of the transport payloads"""
+
+    name: str
+
+    @abc.abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compresses data
+
+        Args:
+            data: bytes to compress
+
+        Returns:
+            Compressed bytes
+        """
+
+    @abc.abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """Decompresses data
+
+        Args:
+            data: bytes compressed by this codec
+
+        Returns:
+            Decompressed bytes
+        """
+
+
+class ZlibCodec(Codec):
+    """Codec based on `zlib`, always available"""
+
+    name = "zlib"
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, 1)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class Lz4Codec(Codec):
+    """Codec based on LZ4 frames, available when the `lz4` package is installed"""
+
+    name = "lz4"
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+class ZstdCodec(Codec):
+    """Codec based on Zstandard, available when the `zstandard` package is installed"""
+
+    name = "zstd"
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+_CODECS: Dict[str, Type[Codec]] = {
+    codec.name: codec for codec, module in [
+        (ZlibCodec, zlib),
+        (Lz4Codec, lz4_frame),
+        (ZstdCodec, zstandard),
+    ] if module is not None
+}
+
+
+def available_codecs() -> List[str]:
+    """Returns the names of the codecs that can be used by this component"""
+    return list(_CODECS)
+
+
+def shuffle(data: bytes, item_size: int = SHUFFLE_ITEM_SIZE) -> bytes:
+    """Groups together the n-th bytes of consecutive items of `item_size` bytes.
+
+    Exponent and high mantissa bytes of floating point values are much more
+    redundant than low mantissa bytes, so grouping them improves compression.
+
+    Args:
+        data: bytes to shuffle
+        item_size: number of bytes of an item
+
+    Returns:
+        Shuffled bytes, of same length as `data`
+    """
+    data = np.frombuffer(data, dtype=np.uint8)
+    end = len(data) - len(data) % item_size
+    return data[:end].reshape(-1, item_size).T.tobytes() + data[end:].tobytes()
+
+
+def unshuffle(data: bytes, item_size: int = SHUFFLE_ITEM_SIZE) -> bytes:
+    """Reverts [`shuffle`][fedbiomed.transport.compression.shuffle].
+
+    Args:
+        data: shuffled bytes
+        item_size: number of bytes of an item
+
+    Returns:
+        Original bytes
+    """
+    data = np.frombuffer(data, dtype=np.uint8)
+    end = len(data) - len(data) % item_size
+    return data[:end].reshape(item_size, -1).T.tobytes() + data[end:].tobytes()
+
+
+class CompressionCache:
+    """Compressed versions of a payload segment sent several times, indexed by codec.
+
+    Thread-safe: a segment is compressed once per codec even when several payloads
+    containing it are compressed concurrently.
+    """
+
+    def __init__(self) -> None:
+        """Constructor of the class"""
+        self._lock = threading.Lock()
+        self._compressed: Dict[str, bytes] = {}
+
+    def get(self, name: str, compress: Callable[[], bytes]) -> bytes:
+        """Returns the compressed segment, compressing it on first call for this codec
+
+        Args:
+            name: name of the codec (and shuffling) the segment is compressed with
+            compress: function compressing the segment
+
+        Returns:
+            Compressed segment
+        """
+        with self._lock:
+            if name not in self._compressed:
+                self._compressed[name] = compress()
+            return self._compressed[name]
+
+
+class PayloadCompressor:
+    """Compresses serialized messages before they are chunked and sent to the peer component.
+
+    Payloads are compressed only when they are larger than a threshold and the peer is able to
+    decompress them with the configured codec. The codec used is sent along with the payload
+    chunks, thus the peer can decompress a payload whatever its own configuration.
+    """
+
+    def __init__(
+            self,
+            codec: Optional[str] = None,
+            threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+            shuffle: bool = False
+    ) -> None:
+        """Constructor of the class
+
+        Args:
+            codec: name of the codec used to compress payloads, or None to send them uncompressed
+            threshold: minimum size in bytes of a payload to compress
+            shuffle: whether to shuffle bytes of payloads before compressing them
+
+        Raises:
+            FedbiomedCommunicationError: codec is not available
+        """
+        if codec is not None and codec not in _CODECS:
+            raise FedbiomedCommunicationError(
+                f"{ErrorNumbers.FB628.value}: compression codec `{codec}` is not available, "
+                f"available codecs are {available_codecs()}")
+
+        self._codec = _CODECS[codec]() if codec is not None else None
+        self._threshold = threshold
+        self._shuffle = shuffle
+
+    @property
+    def codecs(self) -> List[str]:
+        """Returns the codecs this component can decompress"""
+        return available_codecs()
+
+    def compress(
+            self,
+            payload: List[bytes],
+            peer_codecs: Iterable[str],
+            caches: Optional[Sequence[Optional[CompressionCache]]] = None
+    ) -> Tuple[List[bytes], str, float]:
+        """Compresses a payload if it is large enough and the peer can decompress it.
+
+        Segments having a cache are compressed separately, once per codec, and the payload is
+        sent as length-prefixed compressed frames. Consecutive segments without cache are
+        compressed together.
+
+        Args:
+            payload: consecutive segments of bytes of the serialized message
+            peer_codecs: codecs the peer component can decompress
+            caches: cache of the compressed version of each segment, or None for segments
+                that are not shared with other payloads. If None, no segment is cached.
+
+        Returns:
+            A tuple of the segments of the payload to send, the name of the codec used to
+                compress it (empty string if not compressed), and the compression time in seconds
+        """
+        if self._codec is None or \
+                sum(len(segment) for segment in payload) < self._threshold or \
+                self._codec.name not in peer_codecs:
+            return payload, "", 0.
+
+        start = time.perf_counter()
+        name = self._codec.name + _SHUFFLE_SUFFIX if self._shuffle else self._codec.name
+        caches = caches if caches is not None else [None] * len(payload)
+
+        frames = []
+        pending = []
+        for segment, cache in zip(payload, caches):
+            if cache is None:
+                pending.append(segment)
+                continue
+            if pending:
+                frames.append(self._compress_segment(b"".join(pending)))
+                pending = []
+            frames.append(cache.get(name, lambda: self._compress_segment(segment)))
+        if pending:
+            frames.append(self._compress_segment(b"".join(pending)))
+
+        if len(frames) == 1:
+            return frames, name, time.perf_counter() - start
+
+        payload = []
+        for frame in frames:
+            payload.extend([_FRAME_HEADER.pack(len(frame)), frame])
+        return payload, name + _FRAMES_SUFFIX, time.perf_counter() - start
+
+    def _compress_segment(self, data: bytes) -> bytes:
+        """Compresses a segment with the configured codec, shuffling it first if configured
+
+        Args:
+            data: bytes to compress
+
+        Returns:
+            Compressed bytes
+        """
+        return self._codec.compress(shuffle(data) if self._shuffle else data)
+
+    @staticmethod
+    def decompress(payload: bytes, compression: str) -> bytes:
+        """Decompresses a payload received from the peer component.
+
+        Args:
+            payload: received payload
+            compression: name of the codec used by the peer to compress the payload, empty string
+                if not compressed
+
+        Returns:
+            Serialized message
+
+        Raises:
+            FedbiomedCommunicationError: codec is not available
+        """
+        if not compression:
+            return payload
+
+        if compression.endswith(_FRAMES_SUFFIX):
+            compression = compression.removesuffix(_FRAMES_SUFFIX)
+            payload = memoryview(payload)
+            frames = []
+            offset = 0
+            while offset < len(payload):
+                size, = _FRAME_HEADER.unpack_from(payload, offset)
+                offset += _FRAME_HEADER.size
+                frames.append(PayloadCompressor.decompress(payload[offset:offset + size], compression))
+                offset += size
+            return b"".join(frames)
+
+        name = compression.removesuffix(_SHUFFLE_SUFFIX)
+        if name not in _CODECS:
+            raise FedbiomedCommunicationError(
+                f"{ErrorNumbers.FB628.value}: received payload compressed with unavailable codec `{name}`")
+
+        payload = _CODECS[name]().decompress(payload)
+        if name != compression:
+            payload = unshuffle(payload)
+
+        return payload
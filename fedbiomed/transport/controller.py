@@ -3,6 +3,8 @@ import threading
 from typing import Callable, List, Dict, Optional
 
 from fedbiomed.transport.client import GrpcClient, ResearcherCredentials
+from fedbiomed.transport.compression import PayloadCompressor
+from fedbiomed.transport.limits import TransportLimits
 
 from fedbiomed.common.constants import ErrorNumbers
 from fedbiomed.common.exceptions import FedbiomedCommunicationError
@@ -22,7 +24,9 @@ class GrpcAsyncTaskController:
             node_id: str,
             researchers: List[ResearcherCredentials],
             on_message: Callable,
-            debug: bool = False
+            debug: bool = False,
+            compressor: Optional[PayloadCompressor] = None,
+            limits: Optional[TransportLimits] = None
     ) -> None:
         """Constructs GrpcAsyncTaskController
 
@@ -31,6 +35,8 @@ class GrpcAsyncTaskController:
             researchers: List of researchers that the RPC client will connect to.
             on_message: Callback function to be executed once a task received from the researcher
             debug: Activates debug mode for `asyncio`
+            compressor: Compresses the replies sent to the researchers. If None, replies are sent uncompressed.
+            limits: Chunk size and gRPC message limits. If None, default limits are used.
 
         Raises:
             FedbiomedCommunicationError: bad argument type
@@ -55,6 +61,8 @@ class GrpcAsyncTaskController:
 
         self._debug = debug
         self._on_message = on_message
+        self._compressor = compressor
+        self._limits = limits
 
 
     async def start(self) -> None:
@@ -62,7 +70,7 @@ class GrpcAsyncTaskController:
 
         tasks = []
         for researcher in self._researchers:
-            client = GrpcClient(self._node_id, researcher, self._update_id_ip_map)
+            client = GrpcClient(self._node_id, researcher, self._update_id_ip_map, self._compressor, self._limits)
             tasks.append(client.start(on_task=self._on_message))
             self._clients[f"{researcher.host}:{researcher.port}"] = client
 
@@ -0,0 +1,84 @@
+from typing import List, Tuple
+
+from fedbiomed.common.constants import DEFAULT_GRPC_MAX_MESSAGE_LENGTH, MAX_MESSAGE_BYTES_LENGTH, ErrorNumbers
+from fedbiomed.common.exceptions import FedbiomedCommunicationError
+
+
+# Room left in a gRPC message for the fields sent along with a chunk (sizes, codec, transfer ID)
+CHUNK_OVERHEAD = 1024
+
+
+class TransportLimits:
+    """Size of the chunks of the messages and limits of the gRPC channels.
+
+    Each component announces the maximum length of the gRPC messages it can receive, and chunks
+    the messages it sends to its peer within this limit.
+    """
+
+    def __init__(
+            self,
+            chunk_size: int = MAX_MESSAGE_BYTES_LENGTH,
+            max_message_length: int = DEFAULT_GRPC_MAX_MESSAGE_LENGTH,
+            flow_control_window: int = 0
+    ) -> None:
+        """Constructor of the class
+
+        Args:
+            chunk_size: maximum size in bytes of the chunks of the messages sent
+            max_message_length: maximum length in bytes of the gRPC messages sent and received
+            flow_control_window: initial HTTP/2 flow control window in bytes of the gRPC streams,
+                or 0 to use gRPC default
+
+        Raises:
+            FedbiomedCommunicationError: chunks do not fit in the gRPC messages
+        """
+        if chunk_size <= 0 or chunk_size + CHUNK_OVERHEAD > max_message_length:
+            raise FedbiomedCommunicationError(
+                f"{ErrorNumbers.FB628.value}: chunk size {chunk_size} must be positive and lower than "
+                f"the maximum gRPC message length {max_message_length} minus {CHUNK_OVERHEAD} bytes")
+        if flow_control_window < 0:
+            raise FedbiomedCommunicationError(
+                f"{ErrorNumbers.FB628.value}: flow control window {flow_control_window} must not be negative")
+
+        self._chunk_size = chunk_size
+        self._max_message_length = max_message_length
+        self._flow_control_window = flow_control_window
+
+    @property
+    def chunk_size(self) -> int:
+        """Returns the maximum size of the chunks of the messages sent"""
+        return self._chunk_size
+
+    @property
+    def max_message_length(self) -> int:
+        """Returns the maximum length of the gRPC messages this component can receive"""
+        return self._max_message_length
+
+    def grpc_options(self) -> List[Tuple[str, int]]:
+        """Returns the gRPC channel or server options setting the limits
+
+        Returns:
+            List of gRPC options
+        """
+        options = [
+            ("grpc.max_send_message_length", self._max_message_length),
+            ("grpc.max_receive_message_length", self._max_message_length),
+        ]
+        if self._flow_control_window:
+            # initial window, bandwidth-delay product probing can still enlarge it
+            options.append(("grpc.http2.lookahead_bytes", self._flow_control_window))
+        return options
+
+    def chunk_size_for(self, peer_max_message_length: int) -> int:
+        """Returns the size of the chunks of the messages sent to a peer component.
+
+        Args:
+            peer_max_message_length: maximum length of the gRPC messages the peer can receive,
+                or 0 if the peer did not announce it
+
+        Returns:
+            Size in bytes of the chunks
+        """
+        if peer_max_message_length <= 0:
+            peer_max_message_length = DEFAULT_GRPC_MAX_MESSAGE_LENGTH
+        return max(1, min(self._chunk_size, peer_max_message_length - CHUNK_OVERHEAD))
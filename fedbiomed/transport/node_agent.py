@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional, Dict, Callable
+from typing import Optional, Dict, Callable, Iterable
 from datetime import datetime
 import copy
 from threading import Event
@@ -138,17 +138,26 @@ class NodeAgentAsync:
                         logger.warning(f"Received a reply from an unexpected request: {message.request_id}")
 
 
-    async def send_async(self, message: Message, on_reply: Optional[Callable] = None) -> None:
+    async def send_async(
+            self,
+            message: Message,
+            on_reply: Optional[Callable] = None,
+            on_disconnect: Optional[Callable] = None
+    ) -> None:
         """Async function send message to researcher.
 
         Args:
             message: Message to send to the researcher
             on_reply: optional callback to execute when receiving message reply
+            on_disconnect: optional callback to execute if the node is disconnected before
+                replying to the message
         """
 
         async with self._status_lock:
             if self._status == NodeActiveStatus.DISCONNECTED:
                 logger.info(f"Node {self._id} is disconnected. Discard message.")
+                if on_disconnect is not None:
+                    on_disconnect()
                 return
 
             if self._status == NodeActiveStatus.WAITING:
@@ -161,7 +170,7 @@ class NodeAgentAsync:
         async with self._replies_lock:
             if message.request_id:
                 self._replies.update({
-                    message.request_id: {'callback': on_reply, 'reply': None}
+                    message.request_id: {'callback': on_reply, 'on_disconnect': on_disconnect, 'reply': None}
                 })
 
         await self._queue.put(message)
@@ -237,13 +246,19 @@ class NodeAgentAsync:
 
         # If the status still WAITING set status to DISCONNECTED
         async with self._status_lock:
-            if self._status == NodeActiveStatus.WAITING:
-                self._status = NodeActiveStatus.DISCONNECTED
-                logger.warning(
-                    f"Node {self._id} is disconnected. Request/task that are created "
-                    "for this node will be flushed" )
-                # TODO: empty the queue when becoming disconnected ?
+            if self._status != NodeActiveStatus.WAITING:
+                return
+            self._status = NodeActiveStatus.DISCONNECTED
+            logger.warning(
+                f"Node {self._id} is disconnected. Request/task that are created "
+                "for this node will be flushed" )
+            # TODO: empty the queue when becoming disconnected ?
 
+        # Notify requests still waiting for a reply from this node
+        async with self._replies_lock:
+            for reply in self._replies.values():
+                if reply['reply'] is None and reply.get('on_disconnect') is not None:
+                    reply['on_disconnect']()
 
 
 class NodeAgent(NodeAgentAsync):
@@ -273,14 +288,22 @@ class NodeAgent(NodeAgentAsync):
             self._loop
         )
 
-    def send(self, message: Message, on_reply: Optional[Callable] = None) -> None:
+    def send(
+            self,
+            message: Message,
+            on_reply: Optional[Callable] = None,
+            on_disconnect: Optional[Callable] = None
+    ) -> None:
         """Send message to researcher.
 
         Args:
             message: Message to send to the researcher
+            on_reply: optional callback to execute when receiving message reply
+            on_disconnect: optional callback to execute if the node is disconnected before
+                replying to the message
         """
         asyncio.run_coroutine_threadsafe(
-            self.send_async(message=message, on_reply=on_reply),
+            self.send_async(message=message, on_reply=on_reply, on_disconnect=on_disconnect),
             self._loop
         )
 
@@ -301,6 +324,8 @@ class AgentStore:
 
         # protect read/write operations on self._node_agents
         self._store_lock = asyncio.Lock()
+        # notified when a new node agent is registered
+        self._registered = asyncio.Condition(self._store_lock)
 
     async def retrieve(
             self,
@@ -325,6 +350,7 @@ class AgentStore:
             if not node:
                 node = NodeAgent(id=node_id, loop=self._loop)
                 self._node_agents.update({node_id: node})
+                self._registered.notify_all()
 
         node.set_context(context)
 
@@ -354,3 +380,26 @@ class AgentStore:
         """
         async with self._store_lock:
             return self._node_agents.get(node_id)
+
+    async def wait_for_nodes(
+            self,
+            count: int = 1,
+            node_ids: Optional[Iterable[str]] = None
+    ) -> None:
+        """Waits until the expected nodes have registered, as soon as they register.
+
+        Args:
+            count: minimum number of registered nodes, ignored if `node_ids` is given
+            node_ids: IDs of the nodes that must be registered
+        """
+        if node_ids is not None:
+            node_ids = set(node_ids)
+
+            def predicate():
+                return node_ids.issubset(self._node_agents)
+        else:
+            def predicate():
+                return len(self._node_agents) >= count
+
+        async with self._registered:
+            await self._registered.wait_for(predicate)
@@ -1,7 +1,7 @@
 from google.protobuf.internal import containers as _containers
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
-from typing import ClassVar as _ClassVar, Mapping as _Mapping, Optional as _Optional, Union as _Union
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
@@ -73,35 +73,57 @@ class FeedbackMessage(_message.Message):
     def __init__(self, protocol_version: _Optional[str] = ..., researcher_id: _Optional[str] = ..., scalar: _Optional[_Union[FeedbackMessage.Scalar, _Mapping]] = ..., log: _Optional[_Union[FeedbackMessage.Log, _Mapping]] = ...) -> None: ...
 
 class TaskRequest(_message.Message):
-    __slots__ = ["node", "protocol_version"]
+    __slots__ = ["node", "protocol_version", "codecs", "max_message_length"]
     NODE_FIELD_NUMBER: _ClassVar[int]
     PROTOCOL_VERSION_FIELD_NUMBER: _ClassVar[int]
+    CODECS_FIELD_NUMBER: _ClassVar[int]
+    MAX_MESSAGE_LENGTH_FIELD_NUMBER: _ClassVar[int]
     node: str
     protocol_version: str
-    def __init__(self, node: _Optional[str] = ..., protocol_version: _Optional[str] = ...) -> None: ...
+    codecs: _containers.RepeatedScalarFieldContainer[str]
+    max_message_length: int
+    def __init__(self, node: _Optional[str] = ..., protocol_version: _Optional[str] = ..., codecs: _Optional[_Iterable[str]] = ..., max_message_length: _Optional[int] = ...) -> None: ...
 
 class TaskResponse(_message.Message):
-    __slots__ = ["size", "iteration", "bytes_"]
+    __slots__ = ["size", "iteration", "bytes_", "compression", "codecs", "max_message_length"]
     SIZE_FIELD_NUMBER: _ClassVar[int]
     ITERATION_FIELD_NUMBER: _ClassVar[int]
     BYTES__FIELD_NUMBER: _ClassVar[int]
+    COMPRESSION_FIELD_NUMBER: _ClassVar[int]
+    CODECS_FIELD_NUMBER: _ClassVar[int]
+    MAX_MESSAGE_LENGTH_FIELD_NUMBER: _ClassVar[int]
     size: int
     iteration: int
     bytes_: bytes
-    def __init__(self, size: _Optional[int] = ..., iteration: _Optional[int] = ..., bytes_: _Optional[bytes] = ...) -> None: ...
+    compression: str
+    codecs: _containers.RepeatedScalarFieldContainer[str]
+    max_message_length: int
+    def __init__(self, size: _Optional[int] = ..., iteration: _Optional[int] = ..., bytes_: _Optional[bytes] = ..., compression: _Optional[str] = ..., codecs: _Optional[_Iterable[str]] = ..., max_message_length: _Optional[int] = ...) -> None: ...
 
 class TaskResult(_message.Message):
-    __slots__ = ["size", "iteration", "bytes_"]
+    __slots__ = ["size", "iteration", "bytes_", "compression", "compression_time", "transfer_id"]
     SIZE_FIELD_NUMBER: _ClassVar[int]
     ITERATION_FIELD_NUMBER: _ClassVar[int]
     BYTES__FIELD_NUMBER: _ClassVar[int]
+    COMPRESSION_FIELD_NUMBER: _ClassVar[int]
+    COMPRESSION_TIME_FIELD_NUMBER: _ClassVar[int]
+    TRANSFER_ID_FIELD_NUMBER: _ClassVar[int]
     size: int
     iteration: int
     bytes_: bytes
-    def __init__(self, size: _Optional[int] = ..., iteration: _Optional[int] = ..., bytes_: _Optional[bytes] = ...) -> None: ...
+    compression: str
+    compression_time: float
+    transfer_id: str
+    def __init__(self, size: _Optional[int] = ..., iteration: _Optional[int] = ..., bytes_: _Optional[bytes] = ..., compression: _Optional[str] = ..., compression_time: _Optional[float] = ..., transfer_id: _Optional[str] = ...) -> None: ...
 
-class TaskResponseUnary(_message.Message):
-    __slots__ = ["bytes_"]
-    BYTES__FIELD_NUMBER: _ClassVar[int]
-    bytes_: bytes
-    def __init__(self, bytes_: _Optional[bytes] = ...) -> None: ...
+class ReplyStatusRequest(_message.Message):
+    __slots__ = ["transfer_id"]
+    TRANSFER_ID_FIELD_NUMBER: _ClassVar[int]
+    transfer_id: str
+    def __init__(self, transfer_id: _Optional[str] = ...) -> None: ...
+
+class ReplyStatus(_message.Message):
+    __slots__ = ["received"]
+    RECEIVED_FIELD_NUMBER: _ClassVar[int]
+    received: int
+    def __init__(self, received: _Optional[int] = ...) -> None: ...
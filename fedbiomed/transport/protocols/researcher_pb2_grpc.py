@@ -29,6 +29,11 @@ class ResearcherServiceStub(object):
                 request_serializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.TaskResult.SerializeToString,
                 response_deserializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.Empty.FromString,
                 )
+        self.GetReplyStatus = channel.unary_unary(
+                '/researcher.ResearcherService/GetReplyStatus',
+                request_serializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.ReplyStatusRequest.SerializeToString,
+                response_deserializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.ReplyStatus.FromString,
+                )
         self.Feedback = channel.unary_unary(
                 '/researcher.ResearcherService/Feedback',
                 request_serializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.FeedbackMessage.SerializeToString,
@@ -60,6 +65,13 @@ class ResearcherServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetReplyStatus(self, request, context):
+        """RPC to get the chunks of a reply already received, for resuming its transfer
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Feedback(self, request, context):
         """Node logs
         """
@@ -85,6 +97,11 @@ def add_ResearcherServiceServicer_to_server(servicer, server):
                     request_deserializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.TaskResult.FromString,
                     response_serializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.Empty.SerializeToString,
             ),
+            'GetReplyStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetReplyStatus,
+                    request_deserializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.ReplyStatusRequest.FromString,
+                    response_serializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.ReplyStatus.SerializeToString,
+            ),
             'Feedback': grpc.unary_unary_rpc_method_handler(
                     servicer.Feedback,
                     request_deserializer=fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.FeedbackMessage.FromString,
@@ -151,6 +168,23 @@ class ResearcherService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def GetReplyStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/researcher.ResearcherService/GetReplyStatus',
+            fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.ReplyStatusRequest.SerializeToString,
+            fedbiomed_dot_transport_dot_protocols_dot_researcher__pb2.ReplyStatus.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def Feedback(request,
             target,
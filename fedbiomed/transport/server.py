@@ -1,7 +1,7 @@
 
 import time
 import os
-from typing import Callable, Iterable, Any, Coroutine, Dict, Optional, List
+from typing import Callable, Iterable, Any, Coroutine, Dict, Optional, List, Tuple, Union
 import threading
 
 import asyncio
@@ -11,14 +11,18 @@ from google.protobuf.message import Message as ProtoBufMessage
 from fedbiomed.transport.protocols.researcher_pb2 import Empty
 import fedbiomed.transport.protocols.researcher_pb2_grpc as researcher_pb2_grpc
 from fedbiomed.transport.client import GRPC_CLIENT_CONN_RETRY_TIMEOUT, GRPC_CLIENT_TASK_REQUEST_TIMEOUT
+from fedbiomed.transport.chunks import ChunkBuffer, TransferStore, chunk_count, iter_chunks
+from fedbiomed.transport.compression import CompressionCache, PayloadCompressor
+from fedbiomed.transport.limits import TransportLimits
 from fedbiomed.transport.node_agent import AgentStore, NodeAgent
 
 from fedbiomed.common.constants import ErrorNumbers
 from fedbiomed.common.exceptions import FedbiomedCommunicationError
 from fedbiomed.common.logger import logger
 from fedbiomed.common.serializer import Serializer
-from fedbiomed.common.message import Message, TaskResponse, TaskRequest, FeedbackMessage
-from fedbiomed.common.constants import MessageType, MAX_MESSAGE_BYTES_LENGTH
+from fedbiomed.common.message import Message, TaskResponse, TaskRequest, FeedbackMessage, \
+    ReplyStatus, ReplyStatusRequest
+from fedbiomed.common.constants import MessageType
 
 
 # timeout in seconds for server to establish connections with nodes and initialize
@@ -44,6 +48,109 @@ class SSLCredentials:
             self.certificate = f.read()
 
 
+class SharedFields:
+    """Message fields serialized once, to be shared between several messages"""
+
+    def __init__(self, fields: Dict[str, Any]) -> None:
+        """Serializes the shared fields
+
+        Args:
+            fields: shared fields values, indexed by field name
+        """
+        self._names = frozenset(fields)
+        self._serialized = Serializer.dumps_fields(fields)
+        self._compression_cache = CompressionCache()
+
+    @property
+    def names(self) -> frozenset:
+        """Returns names of the shared fields"""
+        return self._names
+
+    @property
+    def serialized(self) -> bytes:
+        """Returns MsgPack-encoded shared fields, without map header"""
+        return self._serialized
+
+    @property
+    def compression_cache(self) -> CompressionCache:
+        """Returns the serialized shared fields compressed by codec, compressed once for all messages"""
+        return self._compression_cache
+
+
+class SerializedMessage:
+    """Message to send to a node, whose fields shared with other messages are serialized once.
+
+    Fields that are the same for several messages (eg: model parameters and training
+    plan of the train requests of a round) are serialized once in `SharedFields`.
+    Remaining fields of each message are serialized when sending the message and spliced
+    with the shared fields.
+    """
+
+    def __init__(self, message: Message, shared_fields: List[SharedFields]) -> None:
+        """Constructor of the class
+
+        Args:
+            message: Message to send
+            shared_fields: groups of fields of the message already serialized, with distinct names
+        """
+        self._message = message
+        self._shared_fields = shared_fields
+        self._shared_names = frozenset().union(*(shared.names for shared in shared_fields))
+
+    @property
+    def message(self) -> Message:
+        """Returns the wrapped message"""
+        return self._message
+
+    @property
+    def shared_fields(self) -> List[SharedFields]:
+        """Returns groups of fields of the message already serialized"""
+        return self._shared_fields
+
+    @property
+    def request_id(self) -> Optional[str]:
+        """Returns request ID of the wrapped message"""
+        return self._message.request_id
+
+    @request_id.setter
+    def request_id(self, request_id: str) -> None:
+        """Sets request ID of the wrapped message
+
+        Args:
+            request_id: request ID, must not be one of the shared fields
+        """
+        self._message.request_id = request_id
+
+    def get_dict(self) -> Dict[str, Any]:
+        """Returns the wrapped message as a dictionary"""
+        return self._message.get_dict()
+
+    def serialize(self) -> List[bytes]:
+        """Serializes the message
+
+        Returns:
+            Consecutive segments of the MsgPack-encoded message
+        """
+        fields = {
+            name: value for name, value in self._message.get_dict().items()
+            if name not in self._shared_names
+        }
+
+        return [
+            Serializer.dumps_map_header(len(fields) + len(self._shared_names)),
+            Serializer.dumps_fields(fields),
+            *(shared.serialized for shared in self._shared_fields),
+        ]
+
+    def compression_caches(self) -> List[Optional[CompressionCache]]:
+        """Returns the compression cache of each segment returned by `serialize`
+
+        Returns:
+            Cache of each group of compressed shared fields, None for the segments specific to this message
+        """
+        return [None, None, *(shared.compression_cache for shared in self._shared_fields)]
+
+
 class ResearcherServicer(researcher_pb2_grpc.ResearcherServiceServicer):
     """RPC Servicer """
 
@@ -51,17 +158,24 @@ class ResearcherServicer(researcher_pb2_grpc.ResearcherServiceServicer):
     def __init__(
             self,
             agent_store: AgentStore,
-            on_message: Callable
+            on_message: Callable,
+            compressor: Optional[PayloadCompressor] = None,
+            limits: Optional[TransportLimits] = None
     ) -> None:
         """Constructor of gRPC researcher servicer
 
         Args:
             agent_store: The class that stores node agents
             on_message: Callback function to execute once a message received from the nodes
+            compressor: Compresses the tasks sent to the nodes. If None, tasks are sent uncompressed.
+            limits: Chunk size of the tasks sent to the nodes. If None, default limits are used.
         """
         super().__init__()
         self._agent_store = agent_store
         self._on_message = on_message
+        self._compressor = compressor if compressor is not None else PayloadCompressor()
+        self._limits = limits if limits is not None else TransportLimits()
+        self._transfers = TransferStore()
 
 
     async def GetTaskUnary(
@@ -92,48 +206,125 @@ class ResearcherServicer(researcher_pb2_grpc.ResearcherServiceServicer):
         # Choice: be simple, mark task as de-queued as soon as retrieved
         node_agent.task_done()
 
-        task = Serializer.dumps(task.get_dict())
-
-        chunk_range = range(0, len(task), MAX_MESSAGE_BYTES_LENGTH)
-        for start, iter_ in zip(chunk_range, range(1, len(chunk_range) + 1)):
-            stop = start + MAX_MESSAGE_BYTES_LENGTH
+        # Serialization and compression of large tasks must not block the event loop
+        task, compression = await asyncio.to_thread(self._prepare_task, task, task_request["codecs"])
 
+        chunk_size = self._limits.chunk_size_for(task_request["max_message_length"])
+        size = chunk_count(task, chunk_size)
+        for iter_, chunk in enumerate(iter_chunks(task, chunk_size), start=1):
             yield TaskResponse(
-                size=len(chunk_range),
+                size=size,
                 iteration=iter_,
-                bytes_=task[start:stop]
+                bytes_=chunk,
+                compression=compression,
+                codecs=self._compressor.codecs,
+                max_message_length=self._limits.max_message_length
             ).to_proto()
 
 
+    def _prepare_task(
+            self,
+            task: Union[Message, SerializedMessage],
+            codecs: Iterable[str]
+    ) -> Tuple[List[bytes], str]:
+        """Serializes and compresses a task to send to a node.
+
+        Fields shared by several tasks are compressed once per codec.
+
+        Args:
+            task: task to send
+            codecs: codecs the node can decompress
+
+        Returns:
+            A tuple of the segments of the payload to send, and the name of the codec used to
+                compress it (empty string if not compressed)
+        """
+        if isinstance(task, SerializedMessage):
+            payload, caches = task.serialize(), task.compression_caches()
+        else:
+            payload, caches = [Serializer.dumps(task.get_dict())], None
+
+        payload, compression, _ = self._compressor.compress(payload, codecs, caches)
+        return payload, compression
+
+
     async def ReplyTask(
             self,
             request_iterator: Iterable[ProtoBufMessage],
-            unused_context: grpc.aio.ServicerContext
+            context: grpc.aio.ServicerContext
     ) -> None:
         """Gets stream replies from the nodes
 
+        Replies sent with a transfer ID are kept when the stream breaks, and the node
+        can resume sending them in another stream.
+
         Args:
             request_iterator: Iterator for streaming
-            unused_context: Request service context
+            context: Request service context
         """
 
-        reply = bytes()
+        reply = ChunkBuffer()
         async for answer in request_iterator:
-            reply += answer.bytes_
-            if answer.size != answer.iteration:
-                continue
+            if answer.transfer_id:
+                try:
+                    payload = self._transfers.add(answer.transfer_id, answer.bytes_, answer.iteration, answer.size)
+                except FedbiomedCommunicationError as e:
+                    logger.error(str(e))
+                    await context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+                if payload is None:
+                    continue
             else:
-                # Deserialize message
-                message = Serializer.loads(reply)
-
-                # Replies are handles by node agent callbacks
-                node = await self._agent_store.get(message["node_id"])
-                await node.on_reply(message)
+                reply.add(answer.bytes_, answer.size)
+                if answer.size != answer.iteration:
+                    continue
+                payload = reply.view()
+                reply.reset()
 
-                reply = bytes()
+            await self._on_reply(payload, answer)
 
         return Empty()
 
+    async def GetReplyStatus(
+            self,
+            request: ProtoBufMessage,
+            unused_context: grpc.aio.ServicerContext
+    ) -> ProtoBufMessage:
+        """Gets the number of chunks of a reply already received, for resuming its transfer
+
+        Args:
+            request: reply status request
+            unused_context: Request service context
+
+        Returns:
+            Number of consecutive chunks of the reply received
+        """
+        transfer_id = ReplyStatusRequest.from_proto(request).transfer_id
+        return ReplyStatus(received=self._transfers.received(transfer_id)).to_proto()
+
+    async def _on_reply(self, payload: memoryview, answer: ProtoBufMessage) -> None:
+        """Deserializes a reply received from a node and passes it to the node agent
+
+        Args:
+            payload: received reply
+            answer: last chunk of the reply
+        """
+        start = time.perf_counter()
+        message = PayloadCompressor.decompress(payload, answer.compression)
+        rtime_decompression = time.perf_counter() - start
+        message_length = len(message)
+        message = Serializer.loads(message)
+
+        # Report compression statistics along with training timing statistics
+        if answer.compression and isinstance(message.get("timing"), dict):
+            message["timing"].update({
+                "compression_ratio": message_length / len(payload),
+                "rtime_compression": answer.compression_time,
+                "rtime_decompression": rtime_decompression,
+            })
+
+        # Replies are handles by node agent callbacks
+        node = await self._agent_store.get(message["node_id"])
+        await node.on_reply(message)
 
     async def Feedback(
             self,
@@ -169,6 +360,10 @@ class _GrpcAsyncServer:
             on_message: Callable,
             ssl: SSLCredentials,
             debug: bool = False,
+            compressor: Optional[PayloadCompressor] = None,
+            limits: Optional[TransportLimits] = None,
+            expected_nodes: Optional[Union[int, List[str]]] = None,
+            setup_timeout: Optional[float] = None,
     ) -> None:
         """Class constructor
 
@@ -178,10 +373,22 @@ class _GrpcAsyncServer:
             on_message: Callback function to execute once a message received from the nodes
             ssl: Ssl credentials.
             debug: Activate debug mode for gRPC asyncio
+            compressor: Compresses the tasks sent to the nodes. If None, tasks are sent uncompressed.
+            limits: Chunk size and gRPC message limits. If None, default limits are used.
+            expected_nodes: Server is ready once this number of nodes, or the nodes with these IDs,
+                have connected. Use 0 for the server to be ready as soon as it is started. If None,
+                nodes are given `GRPC_SERVER_SETUP_TIMEOUT` seconds to connect, and the server is
+                ready once at least one node has connected.
+            setup_timeout: Maximum time in seconds to wait for the server to be ready when starting it.
+                If None, waits `MAX_GRPC_SERVER_SETUP_TIMEOUT` seconds.
         """
 
         # inform all threads whether server is started
         self._is_started = threading.Event()
+        # inform all threads whether expected nodes have connected
+        self._is_ready = threading.Event()
+        self._expected_nodes = expected_nodes
+        self._setup_timeout = setup_timeout if setup_timeout is not None else MAX_GRPC_SERVER_SETUP_TIMEOUT
         self._ssl = ssl
         self._host = host
         self._port = port
@@ -189,8 +396,11 @@ class _GrpcAsyncServer:
         self._server = None
         self._debug = debug
         self._on_message = on_message
+        self._compressor = compressor
+        self._limits = limits if limits is not None else TransportLimits()
         self._loop = None
         self._agent_store : Optional[AgentStore] = None
+        self._ready_task: Optional[asyncio.Task] = None
 
 
     async def start(self):
@@ -198,9 +408,7 @@ class _GrpcAsyncServer:
 
         self._server = grpc.aio.server(
             # futures.ThreadPoolExecutor(max_workers=10),
-            options=[
-                ("grpc.max_send_message_length", 100 * 1024 * 1024),
-                ("grpc.max_receive_message_length", 100 * 1024 * 1024),
+            options=self._limits.grpc_options() + [
                 #
                 # Some references for configuring gRPC keepalive:
                 # https://github.com/grpc/proposal/blob/master/A8-client-side-keepalive.md
@@ -232,7 +440,9 @@ class _GrpcAsyncServer:
         researcher_pb2_grpc.add_ResearcherServiceServicer_to_server(
             ResearcherServicer(
                 agent_store=self._agent_store,
-                on_message=self._on_message),
+                on_message=self._on_message,
+                compressor=self._compressor,
+                limits=self._limits),
             server=self._server
         )
 
@@ -250,6 +460,7 @@ class _GrpcAsyncServer:
         await self._server.start()
 
         self._is_started.set()
+        self._ready_task = asyncio.create_task(self._wait_for_nodes())
         try:
             if self._debug:
                 logger.debug("Waiting for termination")
@@ -259,6 +470,30 @@ class _GrpcAsyncServer:
                 logger.debug("Done starting the server")
 
 
+    async def _wait_for_nodes(self) -> None:
+        """Waits for the expected nodes to connect, then informs the server is ready"""
+        if self._expected_nodes is None:
+            # nodes are not known in advance: give all of them the time to connect
+            await asyncio.gather(asyncio.sleep(GRPC_SERVER_SETUP_TIMEOUT),
+                                 self._agent_store.wait_for_nodes(count=1))
+        elif isinstance(self._expected_nodes, int):
+            await self._agent_store.wait_for_nodes(count=self._expected_nodes)
+        else:
+            await self._agent_store.wait_for_nodes(node_ids=self._expected_nodes)
+        self._is_ready.set()
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the server is started and the expected nodes have connected.
+
+        Args:
+            timeout: maximum time to wait in seconds, or None to wait without timeout
+
+        Returns:
+            True if the server is ready, False if the timeout expired before
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._is_ready.wait, timeout)
+
     async def send(self, message: Message, node_id: str) -> None:
         """Send given message to a given client
 
@@ -284,6 +519,9 @@ class _GrpcAsyncServer:
         """
 
         agents = await self._agent_store.get_all()
+
+        # Same message for all nodes: serialize it only once
+        message = SerializedMessage(message, [SharedFields(message.get_dict())])
         for _, agent in agents.items():
             await agent.send_async(message)
 
@@ -334,37 +572,27 @@ class GrpcServer(_GrpcAsyncServer):
             logger.error(f"Researcher gRPC server has stopped. Please try to restart: {e}")
 
     def start(self) -> None:
-        """Starts async GrpcServer """
+        """Starts async GrpcServer, and returns as soon as the expected nodes have connected,
+        or after the setup timeout.
+        """
 
+        self._is_ready.clear()
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
-        # FIXME: This implementation assumes that nodes will be able connect and server complete setup with this delay
-        logger.info("Starting researcher service...")
-
-
-        logger.info(f'Waiting {GRPC_SERVER_SETUP_TIMEOUT}s for nodes to connect...')
-        time.sleep(GRPC_SERVER_SETUP_TIMEOUT)
-
-        sleep_ = 0
-        while len(self.get_all_nodes()) == 0:
-
-            if sleep_ == 0:
-                logger.info(f"No nodes found, server will wait "
-                            f"{MAX_GRPC_SERVER_SETUP_TIMEOUT - GRPC_SERVER_SETUP_TIMEOUT} "
-                            "more seconds until a node creates connection.")
-
-            if sleep_ > MAX_GRPC_SERVER_SETUP_TIMEOUT - GRPC_SERVER_SETUP_TIMEOUT:
-                if len(self.get_all_nodes()) == 0:
-                    logger.warning("Server has not received connection from any remote nodes in "
-                                   f"MAX_GRPC_SERVER_SETUP_TIMEOUT: {MAX_GRPC_SERVER_SETUP_TIMEOUT} "
-                                   "This may effect the request created right after the server initialization. "
-                                   "However, server will keep running in the background so you can retry the "
-                                   "operations for sending requests to remote nodes until one receives.")
-                break
-
-            time.sleep(1)
-            sleep_ += 1
+        logger.info(f"Starting researcher service, waiting up to {self._setup_timeout}s for nodes to connect...")
+
+        if self._is_ready.wait(timeout=self._setup_timeout):
+            logger.info(f"Researcher service is ready, {len(self.get_all_nodes())} node(s) connected")
+        elif not self._is_started.is_set():
+            logger.warning(f"Researcher server has not started in {self._setup_timeout}s. It may have failed, or "
+                           "may still be starting in the background.")
+        else:
+            logger.warning("Server has not received connection from the expected remote nodes in "
+                           f"{self._setup_timeout}s, {len(self.get_all_nodes())} node(s) connected. "
+                           "This may effect the request created right after the server initialization. "
+                           "However, server will keep running in the background so you can retry the "
+                           "operations for sending requests to remote nodes until one receives.")
 
 
     def send(self, message: Message, node_id: str) -> None:
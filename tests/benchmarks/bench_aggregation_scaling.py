@@ -0,0 +1,101 @@
+"""Benchmark of the scaling of researcher-side aggregation with the number of workers.
+
+Aggregates the models of several nodes with `FedAverage` (layer by layer and on flat
+buffers) and computes the Scaffold model updates, correction states and aggregated
+model, with an `AggregationExecutor` of an increasing number of threads or processes.
+Speedups are relative to the aggregation in the calling thread.
+
+Usage:
+    python tests/benchmarks/bench_aggregation_scaling.py [--workers 1 2 4 8] [--nodes 8]
+        [--layers 100] [--width 512] [--format numpy torch] [--processes] [--repeat 3]
+"""
+
+import argparse
+import os
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import torch
+
+from fedbiomed.researcher.aggregators import AggregationExecutor, FedAverage, Scaffold
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_models(n_nodes, n_layers, width, format_):
+    rng = np.random.default_rng(0)
+    models = {}
+    for i in range(n_nodes):
+        params = {f'layer_{j}': rng.standard_normal((width, width), dtype=np.float32) for j in range(n_layers)}
+        if format_ == 'torch':
+            params = {key: torch.from_numpy(val) for key, val in params.items()}
+        models[f'node_{i}'] = params
+    return models
+
+
+def make_scaffold(models, global_model, executor):
+    node_ids = list(models)
+    fds = MagicMock()
+    fds.node_ids = MagicMock(return_value=node_ids)
+    scaffold = Scaffold(server_lr=.5, fds=fds, executor=executor)
+    scaffold.init_correction_states(global_model)
+    scaffold.nodes_lr = {node_id: {key: .1 for key in global_model} for node_id in node_ids}
+    return scaffold
+
+
+def scaffold_round(scaffold, models, global_model):
+    # same computations as `Scaffold.aggregate`, without the training plan and replies
+    scaffold.set_nodes_learning_rate_after_training = MagicMock()
+    scaffold.aggregate(models, {}, global_model, training_plan=None, training_replies=None, n_round=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, 8, 16, 32, os.cpu_count() or 1}),
+                        help='numbers of workers of the executor')
+    parser.add_argument('--nodes', type=int, default=8, help='number of nodes')
+    parser.add_argument('--layers', type=int, default=100, help='number of layers of the model')
+    parser.add_argument('--width', type=int, default=512, help='layers are width x width matrices')
+    parser.add_argument('--format', nargs='+', choices=['numpy', 'torch'], default=['numpy', 'torch'],
+                        help='type of the parameters: numpy arrays or torch tensors')
+    parser.add_argument('--processes', action='store_true', help='use a pool of processes rather than threads')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, best time is reported')
+    args = parser.parse_args()
+
+    size_mb = args.nodes * args.layers * args.width ** 2 * 4 / 1e6
+    print(f"{args.nodes} nodes, {args.layers} layers of {args.width}x{args.width}, {size_mb:.0f} MB of parameters, "
+          f"{os.cpu_count()} CPUs, {'processes' if args.processes else 'threads'}")
+    print(f"{'format':>7} {'method':>9} {'workers':>8} {'time s':>8} {'speedup':>8}")
+
+    for format_ in args.format:
+        models = make_models(args.nodes, args.layers, args.width, format_)
+        global_model = make_models(1, args.layers, args.width, format_)['node_0']
+        weights = {node_id: 1 / args.nodes for node_id in models}
+
+        methods = {
+            'fedavg': lambda executor: FedAverage(executor=executor).aggregate(models, weights),
+            'flat': lambda executor: FedAverage(flat=True, executor=executor).aggregate(models, weights),
+            'scaffold': lambda executor: scaffold_round(
+                make_scaffold(models, global_model, executor), models, global_model),
+        }
+        for method, func in methods.items():
+            baseline = timeit(lambda: func(None), args.repeat)
+            print(f"{format_:>7} {method:>9} {'-':>8} {baseline:>8.3f} {1:>8.2f}")
+            for workers in args.workers:
+                executor = AggregationExecutor(max_workers=workers, processes=args.processes)
+                elapsed = timeit(lambda: func(executor), args.repeat)
+                executor.shutdown()
+                print(f"{format_:>7} {method:>9} {workers:>8} {elapsed:>8.3f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark of the wall-clock time to reach a target loss with synchronous and buffered asynchronous training.
+
+Simulates nodes with heterogeneous training times, each minimizing a quadratic loss centered on its own
+optimum with a few local gradient steps. Synchronous rounds (`FedAverage`) wait for the slowest node of
+each round, while buffered asynchronous training (`FedBuff` with `BufferedAsyncStrategy`) keeps
+`concurrency` nodes busy and aggregates every `buffer` updates. Time is simulated: the training time of
+each node is drawn from a log-normal distribution whose spread is set by `--heterogeneity`.
+Fast nodes contribute more updates to asynchronous training, which biases the model towards their
+optimum: tight targets may not be reached when nodes are very heterogeneous.
+
+Usage:
+    python tests/benchmarks/bench_async_training.py [--nodes 20] [--concurrency 10] [--buffer 5]
+        [--heterogeneity 0 .5 1 1.5] [--target 1.02] [--dim 100] [--max-time 2000] [--seed 0]
+"""
+
+import argparse
+import heapq
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from fedbiomed.researcher.aggregators import FedAverage, FedBuff
+from fedbiomed.researcher.strategies import BufferedAsyncStrategy
+
+
+class Simulation:
+    def __init__(self, n_nodes, dim, heterogeneity, seed):
+        self.rng = np.random.default_rng(seed)
+        self.optima = self.rng.standard_normal((n_nodes, dim))
+        self.nodes = [f'node_{i}' for i in range(n_nodes)]
+        # mean training time of each node, spread by the heterogeneity
+        self.speed = np.exp(heterogeneity * self.rng.standard_normal(n_nodes))
+        self.lr = .02
+        self.local_steps = 2
+
+    def loss(self, params):
+        return float(np.mean(np.sum((params['w'] - self.optima) ** 2, axis=1)))
+
+    def train(self, node, params):
+        i = self.nodes.index(node)
+        w = params['w'].copy()
+        for _ in range(self.local_steps):
+            w -= self.lr * 2 * (w - self.optima[i])
+        duration = self.speed[i] * self.rng.lognormal(0., .2)
+        return {'w': w}, duration
+
+
+def run_sync(sim, concurrency, target, max_time):
+    aggregator = FedAverage()
+    model = {'w': np.zeros(sim.optima.shape[1])}
+    clock, rounds = 0., 0
+    while sim.loss(model) > target and clock < max_time:
+        sampled = list(sim.rng.choice(sim.nodes, size=concurrency, replace=False))
+        results = {node: sim.train(node, model) for node in sampled}
+        clock += max(duration for _, duration in results.values())
+        models = {node: params for node, (params, _) in results.items()}
+        model = aggregator.aggregate(models, {node: 1 / len(models) for node in models})
+        rounds += 1
+    return clock, rounds, sim.loss(model)
+
+
+def run_async(sim, concurrency, buffer_size, target, max_time):
+    fds = MagicMock()
+    fds.node_ids.return_value = sim.nodes
+    strategy = BufferedAsyncStrategy(fds, concurrency=concurrency)
+    aggregator = FedBuff(buffer_size=buffer_size)
+
+    model = {'w': np.zeros(sim.optima.shape[1])}
+    version = 0
+    aggregator.set_global_model(version, model)
+    events = []  # (finish time, node, params, version)
+    clock = 0.
+    busy = {}
+    while sim.loss(model) > target and clock < max_time:
+        for node in strategy.sample_nodes(version, busy_nodes=busy):
+            params, duration = sim.train(node, model)
+            busy[node] = version
+            heapq.heappush(events, (clock + duration, node, params, version))
+
+        clock, node, params, node_version = heapq.heappop(events)
+        del busy[node]
+        if strategy.refine_reply(node, {'success': True}, version, version - node_version):
+            aggregator.add_update(node, params, node_version)
+        if aggregator.is_full:
+            model = aggregator.aggregate({}, {}, global_model=model)
+            version += 1
+            aggregator.set_global_model(version, model)
+            aggregator.release_global_models(keep=list(busy.values()) + [version])
+    return clock, version, sim.loss(model)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodes', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--buffer', type=int, default=5)
+    parser.add_argument('--heterogeneity', type=float, nargs='+', default=[0., .5, 1., 1.5])
+    parser.add_argument('--target', type=float, default=1.02, help='target loss, relative to the optimal loss')
+    parser.add_argument('--dim', type=int, default=100)
+    parser.add_argument('--max-time', type=float, default=2000.)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'heterogeneity':>13} {'mode':>6} {'time':>9} {'aggregations':>12} {'loss':>8}")
+    for heterogeneity in args.heterogeneity:
+        sim = Simulation(args.nodes, args.dim, heterogeneity, args.seed)
+        # loss of the average of the optima is the lowest reachable loss
+        target = args.target * sim.loss({'w': sim.optima.mean(axis=0)})
+        results = {
+            'sync': run_sync(sim, args.concurrency, target, args.max_time),
+            'async': run_async(Simulation(args.nodes, args.dim, heterogeneity, args.seed),
+                               args.concurrency, args.buffer, target, args.max_time),
+        }
+        for mode, (clock, aggregations, loss) in results.items():
+            print(f"{heterogeneity:>13.1f} {mode:>6} {clock:>9.1f} {aggregations:>12} {loss:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Micro-benchmark of the reassembly of chunked gRPC messages.
+
+Compares `ChunkBuffer` with the former `bytes` concatenation, for payloads
+made of an increasing number of `MAX_MESSAGE_BYTES_LENGTH` chunks. Time per
+MB stays constant with `ChunkBuffer` (linear cost) while it grows with the
+payload size for concatenation (quadratic cost).
+
+Usage:
+    python tests/benchmarks/bench_chunk_reassembly.py [--chunks 10 20 40 80] [--no-concat]
+"""
+
+import argparse
+import time
+
+from fedbiomed.common.constants import MAX_MESSAGE_BYTES_LENGTH
+from fedbiomed.transport.chunks import ChunkBuffer
+
+
+def reassemble_concat(chunks):
+    reply = bytes()
+    for chunk in chunks:
+        reply += chunk
+    return reply
+
+
+def reassemble_buffer(chunks):
+    reply = ChunkBuffer()
+    for chunk in chunks:
+        reply.add(chunk, len(chunks))
+    return reply.view()
+
+
+def timeit(func, chunks, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(chunks)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chunks', type=int, nargs='+', default=[10, 20, 40, 80],
+                        help='number of chunks of the payloads to reassemble')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, best time is reported')
+    parser.add_argument('--no-concat', action='store_true', help='skip the `bytes` concatenation baseline')
+    args = parser.parse_args()
+
+    chunk = bytes(MAX_MESSAGE_BYTES_LENGTH)
+    print(f"{'chunks':>8} {'MB':>8} {'buffer s':>10} {'buffer ms/MB':>13} {'concat s':>10} {'concat ms/MB':>13}")
+    for n in args.chunks:
+        chunks = [chunk] * n
+        size_mb = n * MAX_MESSAGE_BYTES_LENGTH / 1e6
+
+        t_buffer = timeit(reassemble_buffer, chunks, args.repeat)
+        line = f"{n:>8} {size_mb:>8.0f} {t_buffer:>10.3f} {1e3 * t_buffer / size_mb:>13.3f}"
+        if not args.no_concat:
+            t_concat = timeit(reassemble_concat, chunks, args.repeat)
+            line += f" {t_concat:>10.3f} {1e3 * t_concat / size_mb:>13.3f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
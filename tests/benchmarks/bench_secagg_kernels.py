@@ -0,0 +1,123 @@
+"""Benchmark of the element-wise kernels of secure aggregation: quantization, clipping range check,
+reverse quantization, full-domain hashing of the time periods and packing of the ciphertexts.
+
+Each kernel is timed against its former element-wise Python implementation, reproduced here, and
+outputs are checked to be identical. Time periods are hashed once per ciphertext, for the number
+of ciphertexts of the packed parameters of `--nodes` nodes. Ciphertexts are packed into and
+unpacked from a `CiphertextVector`, for the number of ciphertexts of a model of `--vector-params`
+parameters.
+
+Usage:
+    python tests/benchmarks/bench_secagg_kernels.py [--params 1000000] [--vector-params 10000000]
+        [--nodes 2] [--repeat 3] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+from math import ceil
+
+import gmpy2
+import numpy as np
+
+from fedbiomed.common.constants import VEParameters
+from fedbiomed.common.secagg import CiphertextVector, SecaggCrypter
+from fedbiomed.common.secagg._jls import FDH, _check_clipping_range, quantize, reverse_quantize
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def make_biprime(bits, rng):
+    p = gmpy2.next_prime(gmpy2.mpz(rng.getrandbits(bits // 2) | 1 << (bits // 2 - 1)))
+    q = gmpy2.next_prime(gmpy2.mpz(rng.getrandbits(bits // 2) | 1 << (bits // 2 - 1)))
+    return gmpy2.mpz(p * q)
+
+
+def legacy_check_clipping_range(values, clipping_range):
+    state = False
+    for x in values:
+        if x < -clipping_range or x > clipping_range:
+            state = True
+    return state
+
+
+def legacy_quantize(weights, clipping_range=VEParameters.CLIPPING_RANGE, target_range=VEParameters.TARGET_RANGE):
+    legacy_check_clipping_range(weights, clipping_range)
+    f = np.vectorize(
+        lambda x: min(
+            target_range - 1,
+            (sorted((-clipping_range, x, clipping_range))[1] + clipping_range) * target_range / (2 * clipping_range),
+        )
+    )
+    return f(weights).astype(int).tolist()
+
+
+def legacy_reverse_quantize(weights, clipping_range=VEParameters.CLIPPING_RANGE,
+                            target_range=VEParameters.TARGET_RANGE):
+    step_size = 2 * clipping_range / (target_range - 1)
+    f = np.vectorize(lambda x: (-clipping_range + step_size * x))
+    return f(np.array(weights).astype(float)).tolist()
+
+
+def legacy_pack(values, width):
+    return b"".join([int(value).to_bytes(width, "big") for value in values])
+
+
+def legacy_unpack(data, width):
+    data = memoryview(data)
+    return [gmpy2.mpz(int.from_bytes(data[i:i + width], "big")) for i in range(0, len(data), width)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--params', type=int, default=1000000, help='number of model parameters')
+    parser.add_argument('--vector-params', type=int, default=10000000,
+                        help='number of model parameters of the packed ciphertext vector')
+    parser.add_argument('--nodes', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    params = np.random.default_rng(args.seed).normal(scale=1.5, size=args.params).tolist()
+    biprime = make_biprime(VEParameters.KEY_SIZE, rng)
+    fdh = FDH(bits_size=VEParameters.KEY_SIZE, n_modulus=biprime * biprime)
+    num_ciphertexts = ceil(args.params / SecaggCrypter().compression_ratio(args.nodes))
+    taus = [(i << VEParameters.KEY_SIZE // 4) | 1 for i in range(num_ciphertexts)]
+    quantized = quantize(params)
+    width = ((biprime * biprime).bit_length() + 7) // 8
+    ciphertexts = [gmpy2.mpz(rng.getrandbits(2 * VEParameters.KEY_SIZE - 1))
+                   for _ in range(ceil(args.vector_params / SecaggCrypter().compression_ratio(args.nodes)))]
+    packed = CiphertextVector.from_ints(ciphertexts, width)
+
+    kernels = [
+        ('check clipping range', lambda: legacy_check_clipping_range(params, VEParameters.CLIPPING_RANGE),
+         lambda: _check_clipping_range(params, VEParameters.CLIPPING_RANGE), False),
+        ('quantize', lambda: legacy_quantize(params), lambda: quantize(params), True),
+        ('reverse quantize', lambda: legacy_reverse_quantize(quantized), lambda: reverse_quantize(quantized), True),
+        (f'hash {num_ciphertexts} taus', lambda: [fdh.H(t) for t in taus], lambda: fdh.H_batch(taus), True),
+        (f'pack {len(ciphertexts)} ciphertexts', lambda: legacy_pack(ciphertexts, width),
+         lambda: bytes(CiphertextVector.from_ints(ciphertexts, width).data), True),
+        (f'unpack {len(ciphertexts)} ciphertexts', lambda: legacy_unpack(packed.data, width),
+         packed.to_mpz, True),
+    ]
+
+    print(f"{'kernel':>26} {'element-wise (s)':>17} {'vectorized (s)':>15} {'speedup':>8}")
+    for name, legacy, vectorized, compare in kernels:
+        legacy_time, expected = timeit(legacy, args.repeat)
+        vectorized_time, result = timeit(vectorized, args.repeat)
+        if compare and result != expected:
+            raise RuntimeError(f"{name}: vectorized kernel output differs from the element-wise kernel")
+        print(f"{name:>26} {legacy_time:>17.3f} {vectorized_time:>15.3f} {legacy_time / vectorized_time:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark of the packing of several model parameters in each Joye-Libert ciphertext.
+
+Encrypts the parameters of a model with `SecaggCrypter`, as a node does, with the packing ratio derived
+from `VEParameters` and the number of nodes, and with a single parameter per ciphertext. Reports the
+number of ciphertexts, the size of the serialized ciphertexts and the encryption and aggregation times.
+The biprime is drawn at random with the key size used by Fed-BioMed.
+
+Usage:
+    python tests/benchmarks/bench_secagg_packing.py [--params 2000] [--nodes 2 10 100] [--repeat 1] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+from math import ceil, log2
+
+import gmpy2
+
+from fedbiomed.common.constants import VEParameters
+from fedbiomed.common.secagg import SecaggCrypter
+from fedbiomed.common.secagg._jls import VES
+from fedbiomed.common.serializer import Serializer
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def make_biprime(bits, rng):
+    p = gmpy2.next_prime(gmpy2.mpz(rng.getrandbits(bits // 2) | 1 << (bits // 2 - 1)))
+    q = gmpy2.next_prime(gmpy2.mpz(rng.getrandbits(bits // 2) | 1 << (bits // 2 - 1)))
+    return int(p * q)
+
+
+def unpacked_crypter(nodes):
+    """Crypter encrypting each parameter in its own ciphertext"""
+    crypter = SecaggCrypter()
+    valuesize = ceil(log2(VEParameters.TARGET_RANGE) + log2(VEParameters.WEIGHT_RANGE))
+    crypter._jls._vector_encoder = VES(ptsize=valuesize + ceil(log2(nodes + 1)), valuesize=valuesize)
+    return crypter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--params', type=int, default=2000, help='number of model parameters')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[2, 10, 100])
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    biprime = make_biprime(VEParameters.KEY_SIZE, rng)
+    params = [rng.uniform(-1., 1.) for _ in range(args.params)]
+
+    print(f"{'nodes':>5} {'mode':>8} {'ratio':>5} {'ciphertexts':>11} {'bytes':>10} "
+          f"{'encrypt (s)':>12} {'aggregate (s)':>14} {'max error':>10}")
+    for nodes in args.nodes:
+        # server key is the opposite of the sum of the user keys, all nodes share the same key
+        key = rng.getrandbits(VEParameters.KEY_SIZE)
+        for mode, crypter in (('packed', SecaggCrypter()), ('unpacked', unpacked_crypter(nodes))):
+            encrypt_time, encrypted = timeit(
+                lambda: crypter.encrypt(num_nodes=nodes, current_round=1, params=params, key=key,
+                                        biprime=biprime, weight=1),
+                args.repeat)
+            size = len(Serializer.dumps(encrypted))
+            aggregate_time, aggregated = timeit(
+                lambda: crypter.aggregate(current_round=1, num_nodes=nodes, params=[encrypted] * nodes,
+                                          key=-nodes * key, biprime=biprime, total_sample_size=nodes),
+                args.repeat)
+            error = max(abs(a - p) for a, p in zip(aggregated, params))
+            print(f"{nodes:>5} {mode:>8} {crypter.compression_ratio(nodes):>5} {len(encrypted):>11} {size:>10} "
+                  f"{encrypt_time:>12.3f} {aggregate_time:>14.3f} {error:>10.2e}")
+
+
+if __name__ == '__main__':
+    main()
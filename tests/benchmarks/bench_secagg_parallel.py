@@ -0,0 +1,82 @@
+"""Benchmark of the scaling of Joye-Libert encryption and decryption with the number of worker processes.
+
+Encrypts the parameters of a model with `SecaggCrypter`, as a node does, and aggregates the
+encrypted parameters of several nodes, as the researcher does, with a pool of an increasing
+number of processes. Speedups are relative to the computation in the calling process.
+The biprime is drawn at random with the key size used by Fed-BioMed.
+
+Usage:
+    python tests/benchmarks/bench_secagg_parallel.py [--workers 1 2 4 8] [--params 5000]
+        [--nodes 2] [--repeat 1] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+
+import gmpy2
+
+from fedbiomed.common.constants import VEParameters
+from fedbiomed.common.secagg import SecaggCrypter
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def make_biprime(bits, rng):
+    p = gmpy2.next_prime(gmpy2.mpz(rng.getrandbits(bits // 2) | 1 << (bits // 2 - 1)))
+    q = gmpy2.next_prime(gmpy2.mpz(rng.getrandbits(bits // 2) | 1 << (bits // 2 - 1)))
+    return int(p * q)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--params', type=int, default=5000, help='number of model parameters')
+    parser.add_argument('--nodes', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    biprime = make_biprime(VEParameters.KEY_SIZE, rng)
+    params = [rng.uniform(-1., 1.) for _ in range(args.params)]
+    user_keys = [rng.getrandbits(VEParameters.KEY_SIZE) for _ in range(args.nodes)]
+    server_key = -sum(user_keys)
+
+    print(f"{'workers':>7} {'encrypt (s)':>12} {'speedup':>8} {'aggregate (s)':>14} {'speedup':>8}")
+    reference = None
+    for workers in args.workers:
+        crypter = SecaggCrypter(max_workers=workers)
+
+        def encrypt(key):
+            return crypter.encrypt(num_nodes=args.nodes, current_round=1, params=params, key=key,
+                                   biprime=biprime, weight=1)
+
+        # first call starts the pool of processes
+        encrypt(user_keys[0])
+        encrypt_time, _ = timeit(lambda: encrypt(user_keys[0]), args.repeat)
+        encrypted = [encrypt(key) for key in user_keys]
+        aggregate_time, aggregated = timeit(
+            lambda: crypter.aggregate(current_round=1, num_nodes=args.nodes, params=encrypted, key=server_key,
+                                      biprime=biprime, total_sample_size=args.nodes),
+            args.repeat)
+        crypter._jls._pool.shutdown()
+
+        if reference is None:
+            reference = (encrypt_time, aggregate_time, aggregated)
+        elif aggregated != reference[2]:
+            raise RuntimeError(f"aggregation with {workers} workers differs from the reference")
+        print(f"{workers:>7} {encrypt_time:>12.3f} {reference[0] / encrypt_time:>8.2f} "
+              f"{aggregate_time:>14.3f} {reference[1] / aggregate_time:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
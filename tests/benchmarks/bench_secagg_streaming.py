@@ -0,0 +1,97 @@
+"""Benchmark of the memory used by the researcher to aggregate the encrypted parameters of the nodes.
+
+Encrypted parameters of each node are written to a file and mapped from it, as the researcher does
+when it receives them. They are then aggregated either all at once, converting the ciphertexts of
+all the nodes to `EncryptedNumber` objects before summing them, or by folding the ciphertexts of each
+node into a running sum, one node at a time. Each mode runs in its own process, and the growth of the
+peak resident memory of this process during the aggregation is reported.
+The biprime is drawn at random with the key size used by Fed-BioMed.
+
+Usage:
+    python tests/benchmarks/bench_secagg_streaming.py [--params 100000] [--nodes 2 10 50] [--seed 0]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+
+import gmpy2
+
+from fedbiomed.common.constants import VEParameters
+from fedbiomed.common.secagg import CiphertextAccumulator, SecaggCrypter
+from fedbiomed.common.secagg._jls import ServerKey
+from fedbiomed.common.serializer import Serializer
+
+
+def make_biprime(bits, rng):
+    p = gmpy2.next_prime(gmpy2.mpz(rng.getrandbits(bits // 2) | 1 << (bits // 2 - 1)))
+    q = gmpy2.next_prime(gmpy2.mpz(rng.getrandbits(bits // 2) | 1 << (bits // 2 - 1)))
+    return int(p * q)
+
+
+def legacy_aggregate(crypter, paths, nodes, key, biprime):
+    """Aggregation holding the ciphertexts of all the nodes as `EncryptedNumber` objects"""
+    public_param = crypter._setup_public_param(biprime=biprime)
+    params = crypter._convert_to_encrypted_number([Serializer.load(path) for path in paths], public_param)
+    summed = crypter._jls.aggregate(sk_0=ServerKey(public_param, key), tau=1, list_y_u_tau=params)
+    return crypter._apply_average(summed, nodes)
+
+
+def streaming_aggregate(crypter, paths, nodes, key, biprime):
+    """Aggregation folding the ciphertexts of each node into a running sum"""
+    summed = CiphertextAccumulator(biprime)
+    for path in paths:
+        summed.add(Serializer.load(path))
+    return crypter.decrypt_sum(current_round=1, num_nodes=nodes, summed=summed, key=key, biprime=biprime,
+                               total_sample_size=nodes)
+
+
+def run(mode, paths, nodes, key, biprime, queue):
+    crypter = SecaggCrypter()
+    aggregate = legacy_aggregate if mode == 'all' else streaming_aggregate
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    aggregate(crypter, paths, nodes, key, biprime)
+    elapsed = time.perf_counter() - start
+    # peak resident memory is given in kilobytes on Linux
+    queue.put((elapsed, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--params', type=int, default=100000, help='number of model parameters')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[2, 10, 50])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    biprime = make_biprime(VEParameters.KEY_SIZE, rng)
+    params = [rng.uniform(-1., 1.) for _ in range(args.params)]
+    context = multiprocessing.get_context('spawn')
+
+    print(f"{'nodes':>5} {'ciphertexts':>11} {'mode':>9} {'aggregate (s)':>14} {'peak memory growth (MB)':>24}")
+    with tempfile.TemporaryDirectory() as folder:
+        for nodes in args.nodes:
+            # server key is the opposite of the sum of the user keys, all nodes share the same key
+            key = rng.getrandbits(VEParameters.KEY_SIZE)
+            encrypted = SecaggCrypter().encrypt(num_nodes=nodes, current_round=1, params=params, key=key,
+                                                biprime=biprime, weight=1)
+            paths = [os.path.join(folder, f"params_{i}.mpk") for i in range(nodes)]
+            for path in paths:
+                Serializer.dump(encrypted, path)
+
+            for mode in ('all', 'streaming'):
+                queue = context.Queue()
+                process = context.Process(target=run, args=(mode, paths, nodes, -nodes * key, biprime, queue))
+                process.start()
+                elapsed, memory = queue.get()
+                process.join()
+                print(f"{nodes:>5} {len(encrypted):>11} {mode:>9} {elapsed:>14.3f} {memory:>24.1f}")
+
+
+if __name__ == '__main__':
+    main()
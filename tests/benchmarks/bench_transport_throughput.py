@@ -0,0 +1,113 @@
+"""Benchmark of the throughput of the replies sent by a node to the researcher.
+
+Streams replies from a node `Sender` to a `ResearcherServicer` served on loopback,
+for a range of chunk sizes, and reports the throughput in MB/s. The time measured
+covers serialization, chunking, gRPC transfer, reassembly and deserialization of the
+replies, as for training replies sent by the nodes.
+
+Usage:
+    python tests/benchmarks/bench_transport_throughput.py [--size-mb 256] [--chunk-mb 1 4 16 64]
+        [--window-mb 0 16]
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import grpc
+
+import fedbiomed.transport.protocols.researcher_pb2_grpc as researcher_pb2_grpc
+from fedbiomed.transport.client import Channels, ResearcherCredentials, Sender
+from fedbiomed.transport.limits import CHUNK_OVERHEAD, TransportLimits
+from fedbiomed.transport.server import ResearcherServicer
+
+
+MB = 1024 * 1024
+
+
+class LoopbackChannels(Channels):
+    """Insecure channels to the local benchmark server"""
+
+    def _create(self):
+        return grpc.aio.insecure_channel(
+            f"{self._researcher.host}:{self._researcher.port}",
+            options=self._limits.grpc_options())
+
+
+class Reply:
+    """Reply of the node, sent as is by the sender"""
+
+    def __init__(self, size: int):
+        self._reply = {'node_id': 'bench-node', 'data': bytes(size)}
+
+    def get_dict(self):
+        return self._reply
+
+
+async def run(size: int, limits: TransportLimits, repeat: int) -> float:
+    """Sends replies to a loopback server, returns the best time per reply in seconds"""
+    replies = asyncio.Queue()
+    node = MagicMock()
+
+    async def on_reply(message):
+        await replies.put(message)
+    node.on_reply = on_reply
+    agent_store = MagicMock()
+
+    async def get(_):
+        return node
+    agent_store.get = get
+
+    server = grpc.aio.server(options=limits.grpc_options())
+    researcher_pb2_grpc.add_ResearcherServiceServicer_to_server(
+        ResearcherServicer(agent_store=agent_store, on_message=MagicMock(), limits=limits), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    channels = LoopbackChannels(ResearcherCredentials(port=str(port), host="127.0.0.1"), limits)
+    await channels.connect()
+    sender = Sender(channels=channels, on_status_change=MagicMock(), limits=limits)
+    sender.researcher_max_message_length = limits.max_message_length
+    task = sender.listen()
+
+    reply = Reply(size)
+    best = float('inf')
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await sender.send(reply)
+            await replies.get()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        task.cancel()
+        await server.stop(None)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=int, default=256, help='size of the replies in MB')
+    parser.add_argument('--chunk-mb', type=float, nargs='+', default=[1, 4, 16, 64],
+                        help='chunk sizes in MB')
+    parser.add_argument('--window-mb', type=float, nargs='+', default=[0],
+                        help='HTTP/2 flow control windows in MB, 0 for gRPC default')
+    parser.add_argument('--repeat', type=int, default=3, help='number of replies sent, best time is reported')
+    args = parser.parse_args()
+
+    size = args.size_mb * MB
+    print(f"{'chunk MB':>9} {'window MB':>10} {'chunks':>7} {'s':>8} {'MB/s':>9}")
+    for chunk_mb in args.chunk_mb:
+        chunk_size = int(chunk_mb * MB)
+        for window_mb in args.window_mb:
+            limits = TransportLimits(
+                chunk_size=chunk_size,
+                max_message_length=max(2 * chunk_size, chunk_size + CHUNK_OVERHEAD),
+                flow_control_window=int(window_mb * MB))
+            seconds = asyncio.run(run(size, limits, args.repeat))
+            chunks = -(-size // chunk_size)
+            print(f"{chunk_mb:>9g} {window_mb:>10g} {chunks:>7} {seconds:>8.3f} {args.size_mb / seconds:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
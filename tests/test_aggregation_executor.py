@@ -0,0 +1,91 @@
+import pickle
+import unittest
+
+import numpy as np
+import torch
+
+from fedbiomed.common.exceptions import FedbiomedAggregatorError
+from fedbiomed.researcher.aggregators.executor import AggregationExecutor
+from fedbiomed.researcher.aggregators.flat import flat_weighted_sum
+from fedbiomed.researcher.aggregators.functional import WeightedSumAccumulator, weighted_sum
+
+
+class TestAggregationExecutor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        torch.manual_seed(0)
+        self.torch_models = [
+            {f'layer_{j}': torch.randn(8, 4 * (j + 1)) for j in range(6)}
+            for _ in range(3)
+        ]
+        rng = np.random.default_rng(0)
+        self.numpy_models = [
+            {f'layer_{j}': rng.standard_normal((8, 4 * (j + 1))) for j in range(6)}
+            for _ in range(3)
+        ]
+        self.proportions = [.2, .3, .5]
+
+    def test_aggregation_executor_01_split(self):
+        """Layers are split in contiguous shards of about the same size"""
+        executor = AggregationExecutor(max_workers=3, min_shard_size=1)
+        self.assertListEqual(executor.split([1] * 10), [(0, 3), (3, 7), (7, 10)])
+        self.assertListEqual(executor.split([10, 1, 1, 1]), [(0, 1), (1, 2), (2, 4)])
+        self.assertListEqual(executor.split([5]), [(0, 1)])
+        self.assertListEqual(executor.split([]), [(0, 0)])
+
+        # small models are not split
+        executor = AggregationExecutor(max_workers=3, min_shard_size=6)
+        self.assertListEqual(executor.split([1] * 10), [(0, 10)])
+
+        shards = AggregationExecutor(max_workers=2, min_shard_size=1).shard_keys(self.torch_models[0])
+        self.assertListEqual(shards, [['layer_0', 'layer_1', 'layer_2', 'layer_3'], ['layer_4', 'layer_5']])
+
+        for max_workers in (0, -1, 1.5):
+            with self.assertRaises(FedbiomedAggregatorError):
+                AggregationExecutor(max_workers=max_workers)
+        with self.assertRaises(FedbiomedAggregatorError):
+            AggregationExecutor(min_shard_size=0)
+
+    def test_aggregation_executor_02_map(self):
+        """Shards are mapped in order, and the pool is not copied with the executor"""
+        executor = AggregationExecutor(max_workers=2)
+        self.assertListEqual(executor.map(pow, [2, 3, 4], [2, 2, 2]), [4, 9, 16])
+        self.assertListEqual(executor.map(pow, [2], [3]), [8])
+
+        copied = pickle.loads(pickle.dumps(executor))
+        self.assertIsNone(copied._pool)
+        self.assertEqual(copied.max_workers, 2)
+        executor.shutdown()
+        self.assertIsNone(executor._pool)
+
+    def test_aggregation_executor_03_weighted_sum(self):
+        """Weighted sums on shards give the same result, with threads and processes"""
+        for processes in (False, True):
+            executor = AggregationExecutor(max_workers=2, processes=processes, min_shard_size=1)
+            for models in (self.torch_models, self.numpy_models):
+                expected = weighted_sum(models, self.proportions)
+                for result in (weighted_sum(models, self.proportions, executor=executor),
+                               flat_weighted_sum(models, self.proportions, executor=executor)):
+                    self.assertListEqual(list(result), list(expected))
+                    for key, value in expected.items():
+                        np.testing.assert_allclose(np.asarray(result[key]), np.asarray(value),
+                                                   rtol=1e-5, atol=1e-6)
+            executor.shutdown()
+
+    def test_aggregation_executor_04_accumulator(self):
+        """Models are added to the running sum shard by shard"""
+        executor = AggregationExecutor(max_workers=2, min_shard_size=1)
+        for flat in (False, True):
+            for models in (self.torch_models, self.numpy_models):
+                accumulator = WeightedSumAccumulator(flat=flat, executor=executor)
+                for i, (model, weight) in enumerate(zip(models, self.proportions)):
+                    accumulator.add(f'node_{i}', model, weight)
+                result = accumulator.average()
+                expected = weighted_sum(models, self.proportions)
+                for key, value in expected.items():
+                    np.testing.assert_allclose(np.asarray(result[key]), np.asarray(value), rtol=1e-5, atol=1e-6)
+        executor.shutdown()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -2,6 +2,7 @@ from testsupport.base_case import ResearcherTestCase
 
 import unittest
 from fedbiomed.common.constants import TrainingPlans
+from fedbiomed.common.exceptions import FedbiomedAggregatorError
 from fedbiomed.researcher.aggregators.aggregator import Aggregator
 from fedbiomed.researcher.datasets import FederatedDataSet
 
@@ -56,6 +57,13 @@ class TestAggregator(ResearcherTestCase):
         self.aggregator.set_fds(fds)
         self.assertEqual(fds, self.aggregator._fds)
 
+    def test_5_streaming(self):
+        """ testing that aggregators don't accumulate parameters by default"""
+        self.assertFalse(self.aggregator.streaming)
+        self.aggregator.reset_accumulator()
+        with self.assertRaises(FedbiomedAggregatorError):
+            self.aggregator.accumulate('node-1', {'w': [1.]})
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -135,6 +135,9 @@ class TestResearcherConfig(BaseConfigTest):
         self.assertTrue(r_port)
         self.assertTrue(r_pem)
         self.assertTrue(r_key)
+        # nodes are given a grace period to connect by default
+        self.assertEqual(config.get('server', 'expected_nodes'), '')
+        self.assertEqual(config.get('server', 'setup_timeout'), '')
 
     def test_02_researcher_config_sections(self):
 
@@ -0,0 +1,63 @@
+from testsupport.base_case import ResearcherTestCase
+
+import unittest
+from unittest.mock import MagicMock
+
+from fedbiomed.common.exceptions import FedbiomedStrategyError
+from fedbiomed.researcher.strategies.default_strategy import DefaultStrategy
+
+
+class TestDefaultStrategy(ResearcherTestCase):
+    """Tests the default strategy"""
+
+    def setUp(self):
+        fds = MagicMock()
+        fds.node_ids.return_value = ['node-1', 'node-2', 'node-3']
+        self.strategy = DefaultStrategy(fds)
+
+    @staticmethod
+    def reply(node_id, sample_size, success=True):
+        return {'node_id': node_id, 'success': success, 'params': {'w': sample_size},
+                'sample_size': sample_size}
+
+    def test_default_strategy_01_sample_nodes(self):
+        """Tests that all the nodes are sampled"""
+        self.assertEqual(self.strategy.sample_nodes(0), ['node-1', 'node-2', 'node-3'])
+
+    def test_default_strategy_02_refine(self):
+        """Tests weights computed from the sample sizes of all the replies"""
+        self.strategy.sample_nodes(0)
+        replies = {node_id: self.reply(node_id, size) for node_id, size in
+                   (('node-1', 1), ('node-2', 1), ('node-3', 2))}
+        model_params, weights, total_rows, _ = self.strategy.refine(replies, 0)
+
+        self.assertEqual(set(model_params), {'node-1', 'node-2', 'node-3'})
+        self.assertEqual(weights, {'node-1': .25, 'node-2': .25, 'node-3': .5})
+        self.assertEqual(total_rows, 4)
+
+        with self.assertRaises(FedbiomedStrategyError):
+            self.strategy.refine(replies, 1)
+
+    def test_default_strategy_03_refine_partial_replies(self):
+        """Tests that the replies of the nodes that answered are aggregated"""
+        self.strategy.sample_nodes(0)
+        replies = {node_id: self.reply(node_id, size) for node_id, size in (('node-1', 1), ('node-3', 3))}
+        model_params, weights, total_rows, _ = self.strategy.refine(replies, 0)
+
+        self.assertEqual(set(model_params), {'node-1', 'node-3'})
+        self.assertEqual(weights, {'node-1': .25, 'node-3': .75})
+        self.assertEqual(total_rows, 4)
+        self.assertEqual(self.strategy._success_node_history[0], ['node-1', 'node-3'])
+
+        # no node answered
+        with self.assertRaises(FedbiomedStrategyError):
+            self.strategy.refine({}, 0)
+
+        # a node failed training
+        replies['node-2'] = self.reply('node-2', 1, success=False)
+        with self.assertRaises(FedbiomedStrategyError):
+            self.strategy.refine(replies, 0)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
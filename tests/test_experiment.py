@@ -1,6 +1,7 @@
 """Unit tests for 'fedbiomed.researcher.experiment.Experiment'."""
 
 import copy
+import functools
 import inspect
 import json
 import os
@@ -25,6 +26,7 @@ import testsupport.fake_researcher_environ  ## noqa (remove flake8 false warning
 from testsupport import base_fake_training_plan
 from testsupport.fake_dataset import FederatedDataSetMock
 from testsupport.fake_experiment import ExperimentMock
+from testsupport.fake_researcher_secagg import FAKE_BIPRIME
 from testsupport.fake_training_plan import FakeModel
 from testsupport.base_fake_training_plan import BaseFakeTrainingPlan
 
@@ -39,8 +41,10 @@ from fedbiomed.common.constants import __breakpoints_version__
 
 import fedbiomed.researcher.experiment
 from fedbiomed.common.optimizers.generic_optimizers import DeclearnOptimizer, NativeTorchOptimizer
+from fedbiomed.common.secagg import SecaggCrypter
 from fedbiomed.common.serializer import Serializer
 from fedbiomed.researcher.aggregators.fedavg import FedAverage
+from fedbiomed.researcher.aggregators.fedbuff import FedBuff
 from fedbiomed.researcher.aggregators.aggregator import Aggregator
 from fedbiomed.researcher.aggregators.scaffold import Scaffold
 from fedbiomed.researcher.datasets import FederatedDataSet
@@ -48,9 +52,12 @@ from fedbiomed.researcher.environ import environ
 from fedbiomed.researcher.experiment import Experiment
 from fedbiomed.researcher.job import Job
 from fedbiomed.researcher.monitor import Monitor
+from fedbiomed.researcher.requests import CompleteOnQuorum
+from fedbiomed.researcher.round_history import RoundHistory
 from fedbiomed.researcher.secagg import SecureAggregation
 from fedbiomed.researcher.strategies.strategy import Strategy
 from fedbiomed.researcher.strategies.default_strategy import DefaultStrategy
+from fedbiomed.researcher.strategies.buffered_async_strategy import BufferedAsyncStrategy
 
 
 class FakeAggregator(Aggregator):
@@ -962,6 +969,37 @@ class TestExperiment(ResearcherTestCase):
         sb = self.test_exp.set_save_breakpoints(True)
         self.assertTrue(sb, 'save_breakpoint has not been set correctly')
 
+    def test_experiment_22b_set_retained_rounds(self):
+        """ Test setter for retained_rounds attr of experiment class """
+        self.assertEqual(self.test_exp.retained_rounds(), 1)
+        self.assertIsInstance(self.test_exp.aggregated_params(), RoundHistory)
+
+        # Test invalid type and value of argument
+        for retained_rounds in ('two', 1.5, True, 0, -2):
+            with self.assertRaises(SystemExit):
+                self.test_exp.set_retained_rounds(retained_rounds)
+
+        # test valid argument, applied to aggregated params and job
+        self.test_exp._job = MagicMock()
+        for retained_rounds in (3, None):
+            self.assertEqual(self.test_exp.set_retained_rounds(retained_rounds), retained_rounds)
+            self.assertEqual(self.test_exp.retained_rounds(), retained_rounds)
+            self.assertEqual(self.test_exp.aggregated_params().retained_rounds, retained_rounds)
+            self.assertEqual(self.test_exp._job.retained_rounds, retained_rounds)
+
+    def test_experiment_22c_set_training_policies(self):
+        """ Test setter for training_policies attr of experiment class """
+        self.assertIsNone(self.test_exp.training_policies())
+
+        for policies in ('quorum', CompleteOnQuorum(count=1), [CompleteOnQuorum(count=1), 'deadline']):
+            with self.assertRaises(SystemExit):
+                self.test_exp.set_training_policies(policies)
+
+        policies = [CompleteOnQuorum(fraction=.5, deadline=60)]
+        self.assertIs(self.test_exp.set_training_policies(policies), policies)
+        self.assertIs(self.test_exp.training_policies(), policies)
+        self.assertIsNone(self.test_exp.set_training_policies(None))
+
     def test_experiment_23_set_secagg(self):
         """ Test setter for use_secagg attr of experiment class """
 
@@ -1102,27 +1140,33 @@ class TestExperiment(ResearcherTestCase):
         # Set secagg true
         self.test_exp.set_secagg(True)
 
-        # Return encrypted params
-        mock_strategy_refine.return_value = ({'node-1': [1, 1, 1, 1], 'node-2': [1, 1, 1, 1]},
+        # Return encrypted params, nodes encrypt with keys 10 and 10
+        encrypt = functools.partial(SecaggCrypter().encrypt, num_nodes=2, current_round=1, key=10,
+                                    biprime=FAKE_BIPRIME, weight=5)
+        mock_strategy_refine.return_value = ({'node-1': encrypt(params=[1., 1., 1., 1.]),
+                                              'node-2': encrypt(params=[1., 1., 1., 1.])},
                                              [0.1, 0.9],
                                              10,
-                                             {'node-1': [1], 'node-2': [1]})
+                                             {'node-1': encrypt(params=[.5]), 'node-2': encrypt(params=[.5])})
         # Prepare secure aggregation context
         self.test_exp.secagg._configure_round(parties=[environ["ID"], "node-1", "node-2"],
                                               job_id="dummy-job-id")
         self.test_exp.secagg._biprime._status = True
         self.test_exp.secagg._servkey._status = True
-        self.test_exp.secagg._biprime._context = {"context": {"biprime": 1234}}
-        self.test_exp.secagg._servkey._context = {"context": {"server_key": 1234}}
+        self.test_exp.secagg._biprime._context = {"context": {"biprime": FAKE_BIPRIME}}
+        self.test_exp.secagg._servkey._context = {"context": {"server_key": -20}}
 
         # Run experiment with secure aggregation
         # Fix secagg_random value to pass validation step
 
         with patch("fedbiomed.researcher.secagg._secure_aggregation.random.uniform") as s_m:
-            s_m.return_value = -2.9988
-            self.test_exp.secagg._secagg_random = -2.9988  # hard coded for validation of encryption
+            s_m.return_value = .5
+            self.test_exp.secagg._secagg_random = .5  # aggregation of encryption factors [.5], [.5]
             self.test_exp._round_current = 1
             self.test_exp.run_once()
+        # encrypted parameters are summed as soon as they are received
+        self.assertEqual(self.mock_job.return_value.start_nodes_training_round.call_args[1]['on_params'],
+                         self.test_exp.secagg.accumulate)
 
     @patch('fedbiomed.researcher.experiment.Experiment.breakpoint')
     @patch('fedbiomed.researcher.aggregators.scaffold.Scaffold.aggregate')
@@ -1179,6 +1223,69 @@ class TestExperiment(ResearcherTestCase):
         result = self.test_exp.run_once()
         self.assertEqual(result, 1, "run_once did not successfully run the round")
 
+    @patch('fedbiomed.researcher.experiment.Experiment.breakpoint')
+    @patch('fedbiomed.researcher.aggregators.Aggregator.create_aggregator_args', return_value={})
+    def test_experiment_25b_run_once_asynchronous(self, mock_create_aggregator_args, mock_experiment_breakpoint):
+        """Tests buffered asynchronous rounds, nodes keep training across rounds"""
+        self.test_exp.set_training_plan_class(TestExperiment.FakeModelTorch)
+        self.test_exp.set_job()
+        job = self.mock_job.return_value
+        job.update_parameters = MagicMock(return_value="path/to/my/file")
+
+        # node-1 is fast and replies twice in round 0
+        pending = {}
+        replies = iter([('node-1', torch.ones(2)), ('node-1', 3 * torch.ones(2)),
+                        ('node-2', torch.zeros(2)), ('node-1', torch.ones(2))])
+
+        def send_training_requests(nodes, round_, aggregator_args=None, policies=None):
+            pending.update({node: round_ for node in nodes})
+
+        def wait_training_reply(round_):
+            node_id, params = next(replies)
+            return node_id, {'success': True, 'params': {'w': params}, 'model_version': pending.pop(node_id)}
+
+        type(job).pending_training = PropertyMock(side_effect=lambda: dict(pending))
+        job.send_training_requests.side_effect = send_training_requests
+        job.wait_training_reply.side_effect = wait_training_reply
+
+        fds = MagicMock()
+        fds.node_ids.return_value = ['node-1', 'node-2']
+        self.test_exp._fds = fds
+        self.test_exp.set_strategy(BufferedAsyncStrategy(fds))
+        self.test_exp._global_model = {'w': torch.zeros(2)}
+
+        # aggregator does not support asynchronous training
+        self.test_exp.set_aggregator(FedAverage())
+        with self.assertRaises(SystemExit):
+            self.test_exp.run_once()
+
+        self.test_exp.set_aggregator(FedBuff(buffer_size=2, staleness_exponent=1.))
+        self.assertEqual(self.test_exp.run_once(), 1)
+        # both nodes started training, node-1 started again as soon as it replied
+        self.assertListEqual([c.args[0] for c in job.send_training_requests.call_args_list],
+                             [['node-1', 'node-2'], ['node-1']])
+        self.assertTrue(torch.allclose(self.test_exp._global_model['w'], 2 * torch.ones(2)))
+        self.assertDictEqual(pending, {'node-2': 0})
+        job.cancel_training_requests.assert_not_called()
+
+        # round 1: node-1 starts training from version 1, update of node-2 has staleness 1
+        self.assertEqual(self.test_exp.run_once(), 1)
+        self.assertEqual(self.test_exp.round_current(), 2)
+        self.assertTupleEqual(job.send_training_requests.call_args_list[2].args[:2], (['node-1'], 1))
+        self.assertIsNone(job.send_training_requests.call_args_list[2].kwargs['policies'])
+        self.assertTrue(torch.allclose(self.test_exp._global_model['w'], 1.5 * torch.ones(2)))
+        self.assertDictEqual(pending, {'node-2': 1})
+        job.cancel_training_requests.assert_not_called()
+        self.assertEqual(job.update_parameters.call_count, 2)
+        self.assertEqual(mock_experiment_breakpoint.call_count, 2)
+
+        # last round: updates of the nodes still training are cancelled
+        replies = iter([('node-1', torch.ones(2)), ('node-2', torch.ones(2))])
+        self.test_exp.set_round_limit(3)
+        self.assertEqual(self.test_exp.run_once(), 1)
+        job.cancel_training_requests.assert_called_once()
+
+
     def test_experiment_27_run_once_with_optimizer(self):
         """Test the `Experiment.run_once` method when an optimizer is used."""
         # Populate the Experiment with a mock Job.
@@ -10,6 +10,7 @@ from torch.nn import Linear
 import numpy as np
 
 
+from fedbiomed.researcher.aggregators.executor import AggregationExecutor
 from fedbiomed.researcher.aggregators.fedavg import FedAverage
 
 
@@ -120,6 +121,83 @@ class TestFedaverage(ResearcherTestCase):
             self.aggregator.aggregate(model_params=model_params,
                                       weights=weights)
 
+    def test_fed_average_07_streaming(self):
+        """Tests aggregation of parameters accumulated as soon as they are received"""
+        models = {node_id: {'weight': torch.randn(3, 10), 'bias': torch.randn(3)} for node_id in self.models}
+        expected = self.aggregator.aggregate(models, self.weights)
+
+        aggregator = FedAverage(streaming=True)
+        self.assertTrue(aggregator.streaming)
+        self.assertFalse(self.aggregator.streaming)
+        for node_id, params in reversed(list(models.items())):
+            aggregator.accumulate(node_id, params)
+        aggregated_params = aggregator.aggregate(models, self.weights)
+
+        for key, value in expected.items():
+            self.assertTrue(torch.allclose(aggregated_params[key], value))
+
+        # accumulator is emptied by the aggregation: nodes missing from the accumulator are
+        # aggregated from the parameters passed to `aggregate`
+        aggregator.accumulate('node_0', {'weight': torch.zeros(3, 10), 'bias': torch.zeros(3)})
+        aggregated_params = aggregator.aggregate(models, self.weights)
+        for key, value in expected.items():
+            self.assertTrue(torch.allclose(aggregated_params[key], value))
+
+    def test_fed_average_08_streaming_numpy(self):
+        """Tests aggregation of numpy parameters accumulated as soon as they are received"""
+        model_params = {'node_1': {'coef_': np.array([0., 1.]), 'intercept_': np.array([1.])},
+                        'node_2': {'coef_': np.array([10., 3.]), 'intercept_': np.array([2.])}}
+        weights = {'node_1': 0.5, 'node_2': 0.5}
+
+        aggregator = FedAverage(streaming=True)
+        for node_id, params in model_params.items():
+            aggregator.accumulate(node_id, params)
+        # parameters received are not modified
+        np.testing.assert_array_equal(model_params['node_1']['coef_'], [0., 1.])
+
+        aggregated_params = aggregator.aggregate(model_params, weights)
+        np.testing.assert_allclose(aggregated_params['coef_'], [5., 2.])
+        np.testing.assert_allclose(aggregated_params['intercept_'], [1.5])
+
+        aggregator.accumulate('node_1', model_params['node_1'])
+        aggregator.reset_accumulator()
+        aggregator.accumulate('node_2', model_params['node_2'])
+        aggregated_params = aggregator.aggregate({'node_2': model_params['node_2']}, {'node_2': 1.})
+        np.testing.assert_allclose(aggregated_params['coef_'], [10., 3.])
+
+    def test_fed_average_09_flat(self):
+        """Tests aggregation on flat buffers, in batch and in streaming mode"""
+        expected = self.aggregator.aggregate(self.models, self.weights)
+
+        for streaming in (False, True):
+            aggregator = FedAverage(streaming=streaming, flat=True)
+            if streaming:
+                for node_id, params in self.models.items():
+                    aggregator.accumulate(node_id, params)
+            aggregated_params = aggregator.aggregate(self.models, self.weights)
+
+            self.assertListEqual(list(aggregated_params), list(expected))
+            for key, value in expected.items():
+                self.assertTrue(torch.allclose(aggregated_params[key], value))
+
+    def test_fed_average_10_executor(self):
+        """Tests aggregation of shards of the model layers in parallel"""
+        expected = self.aggregator.aggregate(self.models, self.weights)
+        executor = AggregationExecutor(max_workers=2, min_shard_size=1)
+
+        for streaming in (False, True):
+            for flat in (False, True):
+                aggregator = FedAverage(streaming=streaming, flat=flat, executor=executor)
+                if streaming:
+                    for node_id, params in self.models.items():
+                        aggregator.accumulate(node_id, params)
+                aggregated_params = aggregator.aggregate(self.models, self.weights)
+
+                self.assertListEqual(list(aggregated_params), list(expected))
+                for key, value in expected.items():
+                    self.assertTrue(torch.allclose(aggregated_params[key], value))
+        executor.shutdown()
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
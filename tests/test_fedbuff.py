@@ -0,0 +1,118 @@
+from testsupport.base_case import ResearcherTestCase
+
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import torch
+
+from fedbiomed.common.exceptions import FedbiomedAggregatorError, FedbiomedStrategyError
+from fedbiomed.researcher.aggregators.fedbuff import FedBuff
+from fedbiomed.researcher.strategies.buffered_async_strategy import BufferedAsyncStrategy
+
+
+class TestFedBuff(ResearcherTestCase):
+    """Tests the FedBuff aggregator and the buffered asynchronous strategy"""
+
+    def setUp(self):
+        self.global_model = {'weight': torch.zeros(3, 2), 'bias': torch.zeros(3)}
+
+    def test_fedbuff_01_init(self):
+        """Tests bad arguments of the aggregator"""
+        for kwargs in ({'buffer_size': 0}, {'buffer_size': 2.}, {'server_lr': 0.}, {'staleness_exponent': -1}):
+            with self.assertRaises(FedbiomedAggregatorError):
+                FedBuff(**kwargs)
+
+        aggregator = FedBuff(buffer_size=3, server_lr=.5)
+        self.assertEqual(aggregator.buffer_size, 3)
+        self.assertEqual(aggregator.server_lr, .5)
+        self.assertAlmostEqual(aggregator.staleness_weight(0), 1.)
+        self.assertAlmostEqual(aggregator.staleness_weight(3), .5)
+
+    def test_fedbuff_02_synchronous(self):
+        """Tests that fresh updates of a round are averaged, with the server learning rate"""
+        models = {
+            'node-1': {'weight': torch.ones(3, 2), 'bias': torch.ones(3)},
+            'node-2': {'weight': 3 * torch.ones(3, 2), 'bias': torch.zeros(3)},
+        }
+        aggregated = FedBuff(server_lr=.5).aggregate(models, {}, global_model=self.global_model)
+        self.assertTrue(torch.allclose(aggregated['weight'], torch.ones(3, 2)))
+        self.assertTrue(torch.allclose(aggregated['bias'], .25 * torch.ones(3)))
+
+        numpy_global = {'coef_': np.ones(4)}
+        aggregated = FedBuff().aggregate({'node-1': {'coef_': np.full(4, 3.)}}, {}, global_model=numpy_global)
+        np.testing.assert_allclose(aggregated['coef_'], np.full(4, 3.))
+
+        with self.assertRaises(FedbiomedAggregatorError):
+            FedBuff().aggregate({}, {}, global_model=self.global_model)
+
+    def test_fedbuff_03_asynchronous(self):
+        """Tests staleness weighted updates of the versions of the global model"""
+        aggregator = FedBuff(buffer_size=2, staleness_exponent=1.)
+        aggregator.set_global_model(0, self.global_model)
+        aggregator.add_update('node-1', {'weight': torch.ones(3, 2), 'bias': torch.ones(3)}, 0)
+        self.assertFalse(aggregator.is_full)
+
+        # version 1 is created while node-2 trains from version 0
+        version_1 = {'weight': torch.ones(3, 2), 'bias': torch.ones(3)}
+        aggregator.set_global_model(1, version_1)
+        aggregator.add_update('node-2', {'weight': 3 * torch.ones(3, 2), 'bias': torch.ones(3)}, 0)
+        self.assertTrue(aggregator.is_full)
+        self.assertListEqual(aggregator.nodes, ['node-1', 'node-2'])
+
+        # update of node-2 has staleness 1 and weight 0.5
+        aggregated = aggregator.aggregate({}, {}, global_model=version_1)
+        self.assertTrue(torch.allclose(aggregated['weight'], 2.25 * torch.ones(3, 2)))
+        self.assertTrue(torch.allclose(aggregated['bias'], 1.75 * torch.ones(3)))
+        self.assertEqual(aggregator.buffered, 0)
+
+        # versions that no node trains from are released
+        aggregator.release_global_models(keep=[1])
+        with self.assertRaises(FedbiomedAggregatorError):
+            aggregator.add_update('node-1', self.global_model, 0)
+
+    def test_fedbuff_04_breakpoint(self):
+        """Tests saving and loading the aggregator parameters"""
+        state = FedBuff(buffer_size=4, server_lr=.1, staleness_exponent=2.).save_state_breakpoint()
+        aggregator = FedBuff()
+        aggregator.load_state_breakpoint(state)
+        self.assertEqual(aggregator.buffer_size, 4)
+        self.assertEqual(aggregator.server_lr, .1)
+        self.assertAlmostEqual(aggregator.staleness_weight(1), .25)
+
+    def test_fedbuff_05_strategy(self):
+        """Tests sampling of the idle nodes and refining of the updates of the asynchronous strategy"""
+        fds = MagicMock()
+        fds.node_ids.return_value = ['node-1', 'node-2', 'node-3']
+        for kwargs in ({'concurrency': 0}, {'max_staleness': -1}, {'concurrency': 1.5}):
+            with self.assertRaises(FedbiomedStrategyError):
+                BufferedAsyncStrategy(fds, **kwargs)
+
+        strategy = BufferedAsyncStrategy(fds, concurrency=2, max_staleness=1)
+        self.assertTrue(strategy.asynchronous)
+        sampled = strategy.sample_nodes(0)
+        self.assertEqual(len(sampled), 2)
+        self.assertListEqual(strategy.sample_nodes(0, busy_nodes=sampled), [])
+        self.assertEqual(len(strategy.sample_nodes(0, busy_nodes=sampled[:1])), 1)
+
+        reply = {'success': True, 'params': {}}
+        self.assertTrue(strategy.refine_reply('node-1', reply, 1, staleness=1))
+        self.assertFalse(strategy.refine_reply('node-1', reply, 2, staleness=2))
+
+        # nodes that fail are not sampled anymore
+        self.assertFalse(strategy.refine_reply('node-2', None, 2, staleness=0))
+        self.assertFalse(strategy.refine_reply('node-3', {'success': False}, 2, staleness=0))
+        self.assertListEqual(strategy.sample_nodes(2, busy_nodes=[]), ['node-1'])
+        self.assertListEqual(strategy.sample_nodes(2, busy_nodes=['node-1']), [])
+        self.assertTrue(strategy.refine_reply('node-1', reply, 2, staleness=0))
+        with self.assertRaises(FedbiomedStrategyError):
+            strategy.refine({}, 2)
+
+        # no node is left to train
+        strategy.refine_reply('node-1', None, 2, staleness=0)
+        with self.assertRaises(FedbiomedStrategyError):
+            strategy.sample_nodes(3, busy_nodes=[])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
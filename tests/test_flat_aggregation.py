@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+import torch
+
+from fedbiomed.researcher.aggregators.flat import FlatLayout, flat_weighted_sum
+from fedbiomed.researcher.aggregators.functional import weighted_sum
+
+
+class TestFlatAggregation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        torch.manual_seed(0)
+        self.torch_models = [
+            {'weight': torch.randn(3, 10), 'bias': torch.randn(3), 'steps': torch.tensor(i)}
+            for i in range(4)
+        ]
+        rng = np.random.default_rng(0)
+        self.numpy_models = [
+            {'coef_': rng.standard_normal((2, 5)), 'intercept_': rng.standard_normal(2).astype(np.float32)}
+            for _ in range(4)
+        ]
+        self.proportions = [0.1, 0.2, 0.3, 0.4]
+
+    def test_flat_aggregation_01_layout(self):
+        """Tests packing and unpacking of model parameters"""
+        layout = FlatLayout(self.torch_models[0])
+        self.assertEqual(layout.size, 34)
+
+        buffer = layout.pack(self.torch_models[1])
+        self.assertEqual(buffer.dtype, torch.float32)
+        self.assertTupleEqual(tuple(buffer.shape), (34,))
+
+        params = layout.unpack(buffer)
+        self.assertListEqual(list(params), ['weight', 'bias', 'steps'])
+        for key, value in self.torch_models[1].items():
+            self.assertTrue(torch.equal(params[key], value.float()))
+        # unpacked parameters are views of the buffer
+        buffer.zero_()
+        self.assertEqual(params['weight'].abs().sum(), 0)
+
+        # buffers are reused
+        out = layout.zeros()
+        self.assertIs(layout.pack(self.torch_models[2], out=out), out)
+
+        layout = FlatLayout(self.numpy_models[0])
+        buffer = layout.pack(self.numpy_models[0])
+        self.assertEqual(buffer.dtype, np.float64)
+        np.testing.assert_array_equal(layout.unpack(buffer)['coef_'], self.numpy_models[0]['coef_'])
+
+    def test_flat_aggregation_02_axpy(self):
+        """Tests weighted addition of buffers"""
+        for x, y in [(np.arange(5.), np.ones(5)), (torch.arange(5.), torch.ones(5))]:
+            FlatLayout.axpy(2., x, y)
+            self.assertListEqual(y.tolist(), [1., 3., 5., 7., 9.])
+
+    def test_flat_aggregation_03_weighted_sum(self):
+        """Tests that weighted sum on flat buffers gives the same result as layer by layer"""
+        for models in (self.torch_models, self.numpy_models):
+            expected = weighted_sum(models, self.proportions)
+            result = flat_weighted_sum(models, self.proportions)
+
+            self.assertListEqual(list(result), list(expected))
+            for key, value in expected.items():
+                self.assertEqual(type(result[key]), type(value))
+                self.assertEqual(result[key].dtype, value.dtype)
+                np.testing.assert_allclose(np.asarray(result[key]), np.asarray(value), rtol=1e-5, atol=1e-6)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -11,6 +11,7 @@ import numpy as np
 import torch
 import fedbiomed
 from fedbiomed.common.exceptions import FedbiomedNodeStateAgentError
+from fedbiomed.common.secagg import CiphertextVector
 from fedbiomed.common.serializer import Serializer
 from fedbiomed.researcher.datasets import FederatedDataSet
 
@@ -25,14 +26,14 @@ from testsupport.fake_message import FakeMessages
 from testsupport import fake_training_plan
 
 
-from fedbiomed.common.constants import ErrorNumbers
+from fedbiomed.common.constants import ErrorNumbers, ParamsDeltaMode, TransportPrecision
 from fedbiomed.common.message import TrainingPlanStatusReply, TrainingPlanStatusRequest, TrainReply, ErrorMessage
 from fedbiomed.common.training_args import TrainingArgs
 from fedbiomed.common.training_plans import BaseTrainingPlan
 from fedbiomed.common.exceptions import FedbiomedJobError
 from fedbiomed.researcher.environ import environ
 from fedbiomed.researcher.job import Job
-from fedbiomed.researcher.requests import Requests
+from fedbiomed.researcher.requests import Requests, Request, CompleteOnQuorum, DiscardOnTimeout
 import fedbiomed.researcher.job # needed for specific mocking
 
 
@@ -313,6 +314,10 @@ class TestJob(ResearcherTestCase, MockRequestModule):
         nodes = self.job.start_nodes_training_round(1, aggregator_args=aggregator_args)
         self.mock_requests.return_value.send.assert_called_once()
         self.assertListEqual(nodes, ['node-1', 'node-2'])
+        # parameters are written to, and mapped from, a parameters file
+        reply = self.job.training_replies[1]['node-1']
+        self.assertDictEqual(reply['params'], {"x": 0})
+        self.assertDictEqual(Serializer.load_params(reply['params_path']), {"x": 0})
 
         # Test - 2 When one of the nodes returns error
         self.mock_federated_request.replies.return_value = {'node-1': replies['node-1']}
@@ -342,6 +347,346 @@ class TestJob(ResearcherTestCase, MockRequestModule):
                 1, {}, {}, do_training=False, optim_aux_var=fake_aux_var
         )
 
+    def test_job_13_start_nodes_training_round_params_delta(self):
+        """Test that nodes holding a previous version of the model parameters are sent a delta"""
+        self.job._params_delta_mode = ParamsDeltaMode.DIFF
+        self.job._nodes = ['node-1', 'node-2']
+        self.job._model_args = {}
+        self.fds.data = MagicMock(return_value={
+            'node-1': {'dataset_id': '1234'},
+            'node-2': {'dataset_id': '12345'}
+        })
+        params_1 = {'w': np.zeros((10, 10), dtype=np.float32)}
+        params_2 = {'w': np.zeros((10, 10), dtype=np.float32)}
+        params_2['w'][0, 0] = 1.
+        self.job._get_model_params = MagicMock(side_effect=[params_1, params_2, params_2])
+
+        def reply(node_id):
+            return TrainReply(
+                node_id=node_id, researcher_id=environ['RESEARCHER_ID'], job_id=self.job._id,
+                state_id=f'state_{node_id}', params={'w': 0}, optimizer_args=None, optim_aux_var=None,
+                encryption_factor=None, timing={}, success=True, msg='', dataset_id='1234',
+                command='train', sample_size=10)
+
+        def sent_messages():
+            return self.mock_requests.return_value.send.call_args[0][0]
+
+        # round 1: no node holds a version, node-2 fails
+        self.mock_federated_request.replies.return_value = {'node-1': reply('node-1')}
+        self.mock_federated_request.errors.return_value = {
+            'node-2': ErrorMessage(node_id='node-2', researcher_id=environ['RESEARCHER_ID'], extra_msg='',
+                                   errnum=ErrorNumbers.FB100.value, command='error')}
+        self.job.start_nodes_training_round(1, aggregator_args={})
+        messages = sent_messages()
+        version_1 = messages['node-1'].model_version
+        for node in ['node-1', 'node-2']:
+            self.assertIs(messages[node].params, params_1)
+            self.assertEqual(messages[node].model_version, version_1)
+            self.assertIsNone(messages[node].base_model_version)
+        self.assertDictEqual(self.job._nodes_model_version, {'node-1': version_1})
+
+        # round 2: node-1 is sent a delta, node-2 the full parameters
+        self.job._nodes = ['node-1', 'node-2']
+        self.mock_federated_request.replies.return_value = {'node-1': reply('node-1'), 'node-2': reply('node-2')}
+        self.mock_federated_request.errors.return_value = {}
+        self.job.start_nodes_training_round(2, aggregator_args={})
+        messages = sent_messages()
+        version_2 = messages['node-2'].model_version
+        self.assertIs(messages['node-2'].params, params_2)
+        self.assertEqual(messages['node-1'].base_model_version, version_1)
+        self.assertEqual(messages['node-1'].model_version, version_2)
+        self.assertEqual(messages['node-1'].params['w']['encoding'], 'sparse')
+        self.assertDictEqual(self.job._nodes_model_version, {'node-1': version_2, 'node-2': version_2})
+        self.assertListEqual(list(self.job._model_versions), [version_2])
+
+        # round 3: both nodes share the same delta
+        self.job.start_nodes_training_round(3, aggregator_args={})
+        messages = sent_messages()
+        self.assertIs(messages['node-1'].params, messages['node-2'].params)
+        self.assertEqual(messages['node-1'].base_model_version, version_2)
+
+    def test_job_13_start_nodes_training_round_training_plan_cache(self):
+        """Test that training plan source is sent only to nodes which don't have it in cache"""
+        self.job._nodes = ['node-1', 'node-2']
+        self.job._model_args = {}
+        self.fds.data = MagicMock(return_value={
+            'node-1': {'dataset_id': '1234'},
+            'node-2': {'dataset_id': '12345'}
+        })
+        source = self.job._training_plan.source()
+        self.job._training_plan.source = MagicMock(return_value=source)
+
+        def reply(node_id):
+            return TrainReply(
+                node_id=node_id, researcher_id=environ['RESEARCHER_ID'], job_id=self.job._id,
+                state_id=f'state_{node_id}', params={'w': 0}, optimizer_args=None, optim_aux_var=None,
+                encryption_factor=None, timing={}, success=True, msg='', dataset_id='1234',
+                command='train', sample_size=10)
+
+        # round 1: source is sent to all nodes
+        self.mock_federated_request.replies.return_value = {'node-1': reply('node-1'), 'node-2': reply('node-2')}
+        self.mock_federated_request.errors.return_value = {}
+        self.job.start_nodes_training_round(1, aggregator_args={})
+        messages = self.mock_requests.return_value.send.call_args[0][0]
+        for node in ['node-1', 'node-2']:
+            self.assertEqual(messages[node].training_plan, source)
+            self.assertEqual(messages[node].training_plan_hash, fedbiomed.common.utils.get_source_hash(source))
+
+        # round 2: only the hash is sent, node-2 misses the training plan and is sent the source again,
+        # within the same request so that the policies of the round apply to the new request
+        cache_miss = ErrorMessage(node_id='node-2', researcher_id=environ['RESEARCHER_ID'], extra_msg='',
+                                  errnum=ErrorNumbers.FB324.name, command='error')
+        other_error = ErrorMessage(node_id='node-1', researcher_id=environ['RESEARCHER_ID'], extra_msg='',
+                                   errnum=ErrorNumbers.FB300.name, command='error')
+        sent = {}
+
+        def send(messages, nodes, on_error, **kwargs):
+            sent['first'] = {node: messages[node].training_plan for node in nodes}
+            self.assertIsNone(on_error('node-1', other_error))
+            sent['retry'] = on_error('node-2', cache_miss)
+            # source is sent once
+            self.assertIsNone(on_error('node-2', cache_miss))
+            return self.mock_federated_request
+
+        self.mock_requests.return_value.send.reset_mock()
+        self.mock_requests.return_value.send.side_effect = send
+        policies = [MagicMock()]
+        nodes = self.job.start_nodes_training_round(2, aggregator_args={}, policies=policies)
+
+        self.assertListEqual(nodes, ['node-1', 'node-2'])
+        self.mock_requests.return_value.send.assert_called_once()
+        self.assertIs(self.mock_requests.return_value.send.call_args.kwargs['policies'], policies)
+        self.assertDictEqual(sent['first'], {'node-1': None, 'node-2': None})
+        self.assertEqual(sent['retry'].training_plan, source)
+        self.assertEqual(sent['retry'].training_plan_hash, fedbiomed.common.utils.get_source_hash(source))
+        self.assertSetEqual(set(self.job.training_replies[2]), {'node-1', 'node-2'})
+        self.assertSetEqual(self.job._nodes_training_plan, {'node-1', 'node-2'})
+        # source and its hash are computed once for all the rounds, and sent as the same object
+        self.job._training_plan.source.assert_called_once()
+        self.assertIs(sent['retry'].training_plan, messages['node-1'].training_plan)
+
+    def test_job_13_start_nodes_training_round_params_precision(self):
+        """Test that parameters are exchanged with a low precision when requested in training arguments"""
+        self.job._params_delta_mode = ParamsDeltaMode.DIFF
+        self.job.training_args = TrainingArgs({'transport_precision': 'int8'}, only_required=False)
+        self.job._nodes = ['node-1']
+        self.job._model_args = {}
+        self.fds.data = MagicMock(return_value={'node-1': {'dataset_id': '1234'}})
+        params = {'w': torch.linspace(-1, 1, 100).reshape(10, 10)}
+        self.job._get_model_params = MagicMock(return_value=params)
+
+        reply = TrainReply(
+            node_id='node-1', researcher_id=environ['RESEARCHER_ID'], job_id=self.job._id,
+            state_id='state_node-1', optimizer_args=None, optim_aux_var=None,
+            params=fedbiomed.common.utils.encode_params_precision(params, TransportPrecision.FP16),
+            params_precision='fp16', encryption_factor=None, timing={}, success=True, msg='',
+            dataset_id='1234', command='train', sample_size=10)
+        self.mock_federated_request.replies.return_value = {'node-1': reply}
+        self.mock_federated_request.errors.return_value = {}
+
+        self.job.start_nodes_training_round(1, aggregator_args={})
+        message = self.mock_requests.return_value.send.call_args[0][0]['node-1']
+        self.assertEqual(message.params_precision, 'int8')
+        self.assertEqual(message.params['w']['values'].dtype, np.int8)
+        self.assertIsNone(message.base_model_version)
+        # node holds the parameters as rebuilt from the low precision encoding
+        held = self.job._model_versions[message.model_version]['w']
+        self.assertTrue(torch.allclose(held, params['w'], atol=message.params['w']['scale']))
+        self.assertFalse(torch.equal(held, params['w']))
+
+        # replies are decoded to full precision before aggregation
+        received = self.job.training_replies[1]['node-1']['params']['w']
+        self.assertIsInstance(received, torch.Tensor)
+        self.assertEqual(received.dtype, torch.float32)
+        self.assertTrue(torch.allclose(received, params['w'], atol=1e-3))
+
+        # nodes holding a version are sent a full precision delta
+        self.job.start_nodes_training_round(2, aggregator_args={})
+        message = self.mock_requests.return_value.send.call_args[0][0]['node-1']
+        self.assertIsNone(message.params_precision)
+        self.assertIsNotNone(message.base_model_version)
+
+    def test_job_13_start_nodes_training_round_on_params(self):
+        """Test that parameters of each reply are handed to the callback and released as soon as received"""
+        self.job._nodes = ['node-1', 'node-2']
+        self.job._model_args = {}
+        self.fds.data = MagicMock(return_value={
+            'node-1': {'dataset_id': '1234'},
+            'node-2': {'dataset_id': '12345'}
+        })
+
+        def reply(node_id, success=True):
+            return TrainReply(
+                node_id=node_id, researcher_id=environ['RESEARCHER_ID'], job_id=self.job._id,
+                state_id=f'state_{node_id}', params={'w': np.full(3, float(node_id[-1]))}, optimizer_args=None,
+                optim_aux_var=None, encryption_factor=None, timing={}, success=success, msg='', dataset_id='1234',
+                command='train', sample_size=10)
+        replies = {'node-1': reply('node-1'), 'node-2': reply('node-2', success=False)}
+
+        def send(messages, nodes, on_reply=None, on_error=None, policies=None):
+            for node_id, node_reply in replies.items():
+                on_reply(node_id, node_reply)
+            return self.mock_federated_request
+        self.mock_requests.return_value.send.side_effect = send
+        self.mock_federated_request.replies.return_value = replies
+        self.mock_federated_request.errors.return_value = {}
+
+        on_params = MagicMock()
+        nodes = self.job.start_nodes_training_round(1, aggregator_args={}, on_params=on_params)
+
+        self.assertListEqual(nodes, ['node-1'])
+        on_params.assert_called_once()
+        node_id, params = on_params.call_args[0]
+        self.assertEqual(node_id, 'node-1')
+        np.testing.assert_array_equal(params['w'], [1., 1., 1.])
+        # parameters deserialized from the reply were released, mapped parameters are kept
+        self.assertIsNone(replies['node-1'].params)
+        self.assertIsNotNone(replies['node-2'].params)
+        reply_1 = self.job.training_replies[1]['node-1']
+        self.assertIs(reply_1['params'], params)
+        np.testing.assert_array_equal(Serializer.load_params(reply_1['params_path'])['w'], params['w'])
+        self.assertDictEqual(self.job._received_params, {})
+        # each round has its own parameters file
+        self.assertTrue(reply_1['params_path'].endswith('params_node-1_round_1.mpk'))
+
+    def test_job_13_start_nodes_training_round_on_encrypted_params(self):
+        """Test that encrypted parameters of each reply are handed to the callback and mapped from a file"""
+        self.job._nodes = ['node-1']
+        self.job._model_args = {}
+        self.fds.data = MagicMock(return_value={'node-1': {'dataset_id': '1234'}})
+
+        vector = CiphertextVector.from_ints([2**4095 + i for i in range(100)], width=512)
+        reply = TrainReply(
+            node_id='node-1', researcher_id=environ['RESEARCHER_ID'], job_id=self.job._id,
+            state_id='state_node-1', params=vector, optimizer_args=None, optim_aux_var=None,
+            encryption_factor=[1], encrypted=True, timing={}, success=True, msg='', dataset_id='1234',
+            command='train', sample_size=10)
+
+        def send(messages, nodes, on_reply=None, on_error=None, policies=None):
+            on_reply('node-1', reply)
+            return self.mock_federated_request
+        self.mock_requests.return_value.send.side_effect = send
+        self.mock_federated_request.replies.return_value = {'node-1': reply}
+        self.mock_federated_request.errors.return_value = {}
+
+        on_params = MagicMock()
+        self.job.start_nodes_training_round(1, aggregator_args={}, on_params=on_params)
+
+        on_params.assert_called_once()
+        node_id, params = on_params.call_args[0]
+        self.assertEqual(node_id, 'node-1')
+        self.assertEqual(params, vector)
+        self.assertIsInstance(params.data, memoryview)
+        self.assertIsNone(reply.params)
+        reply_1 = self.job.training_replies[1]['node-1']
+        self.assertIs(reply_1['params'], params)
+        self.assertEqual(Serializer.load(reply_1['params_path']), vector)
+
+    def test_job_13_asynchronous_training(self):
+        """Test sending train requests without waiting for the replies, and processing replies one at a time"""
+        self.job._model_args = {}
+        self.fds.data = MagicMock(return_value={
+            'node-1': {'dataset_id': '1234'},
+            'node-2': {'dataset_id': '12345'}
+        })
+        source = self.job._training_plan.source()
+
+        def reply(node_id, success=True):
+            return TrainReply(
+                node_id=node_id, researcher_id=environ['RESEARCHER_ID'], job_id=self.job._id,
+                state_id=f'state_{node_id}', params={'w': np.full(3, float(node_id[-1]))}, optimizer_args=None,
+                optim_aux_var=None, encryption_factor=None, timing={}, success=success, msg='', dataset_id='1234',
+                command='train', sample_size=10)
+
+        agents = {}
+        requests = {}
+
+        def send(messages, nodes):
+            federated_req = MagicMock()
+            federated_req.requests = []
+            for node_id in nodes:
+                agents.setdefault(node_id, MagicMock(id=node_id))
+                requests[node_id] = Request(messages[node_id], agents[node_id])
+                federated_req.requests.append(requests[node_id])
+            federated_req.send.side_effect = lambda: [req.send() for req in federated_req.requests]
+            return federated_req
+        self.mock_requests.return_value.send.side_effect = send
+
+        self.job.send_training_requests(['node-1', 'node-2'], 0)
+        self.assertDictEqual(self.job.pending_training, {'node-1': 0, 'node-2': 0})
+        agents['node-1'].send.assert_called_once()
+
+        # replies are processed in the order they are received
+        requests['node-2'].on_reply(reply('node-2'))
+        node_id, entry = self.job.wait_training_reply(0)
+        self.assertEqual(node_id, 'node-2')
+        self.assertEqual(entry['model_version'], 0)
+        np.testing.assert_array_equal(entry['params']['w'], [2., 2., 2.])
+        self.assertIs(self.job.training_replies[0]['node-2'], entry)
+        self.assertEqual(self.job._node_state_agent.get_last_node_states()['node-2'], 'state_node-2')
+        agents['node-2'].flush.assert_called_once_with(requests['node-2']._request_id, False)
+        self.assertDictEqual(self.job.pending_training, {'node-1': 0})
+
+        # node-2 trains again from version 1, node-1 misses the training plan and is sent its source
+        self.job.send_training_requests(['node-2'], 1)
+        first_request = requests['node-1']
+        first_request.on_reply(ErrorMessage(node_id='node-1', researcher_id=environ['RESEARCHER_ID'], extra_msg='',
+                                            errnum=ErrorNumbers.FB324.name, command='error'))
+        requests['node-2'].on_reply(reply('node-2', success=False))
+        self.assertTupleEqual(self.job.wait_training_reply(1), ('node-2', None))
+        self.assertIsNot(requests['node-1'], first_request)
+        self.assertEqual(agents['node-1'].send.call_args[0][0].training_plan, source)
+        self.assertDictEqual(self.job.pending_training, {'node-1': 1})
+
+        # requests of the nodes still training are cancelled, their replies are ignored
+        self.job.cancel_training_requests()
+        agents['node-1'].flush.assert_called_with(requests['node-1']._request_id, True)
+        self.assertDictEqual(self.job.pending_training, {})
+        requests['node-1'].on_reply(reply('node-1'))
+        with self.assertRaises(FedbiomedJobError):
+            self.job.wait_training_reply(1)
+
+    def test_job_13b_asynchronous_training_timeout(self):
+        """Test timeout of the train requests sent without waiting for the replies"""
+        self.job._model_args = {}
+        self.fds.data = MagicMock(return_value={
+            'node-1': {'dataset_id': '1234'},
+            'node-2': {'dataset_id': '12345'}
+        })
+
+        agents = {}
+        requests = {}
+
+        def send(messages, nodes):
+            federated_req = MagicMock()
+            federated_req.requests = []
+            for node_id in nodes:
+                agents.setdefault(node_id, MagicMock(id=node_id))
+                requests[node_id] = Request(messages[node_id], agents[node_id])
+                federated_req.requests.append(requests[node_id])
+            return federated_req
+        self.mock_requests.return_value.send.side_effect = send
+
+        # policies that depend on the replies of several nodes are not supported
+        with self.assertRaises(FedbiomedJobError):
+            self.job.send_training_requests(['node-1', 'node-2'], 0, policies=[CompleteOnQuorum(count=1)])
+        self.mock_requests.return_value.send.assert_not_called()
+
+        self.job.send_training_requests(['node-1', 'node-2'], 0, policies=[DiscardOnTimeout(0.05, nodes=['node-1'])])
+        self.assertDictEqual(self.job.pending_training, {'node-1': 0, 'node-2': 0})
+
+        # node-1 did not reply before its timeout, its request is stopped
+        self.assertTupleEqual(self.job.wait_training_reply(0), ('node-1', None))
+        agents['node-1'].flush.assert_called_once_with(requests['node-1']._request_id, True)
+        self.assertDictEqual(self.job.pending_training, {'node-2': 0})
+
+        # late reply of node-1 is ignored, node-2 has no timeout
+        requests['node-1'].on_reply(MagicMock(spec=TrainReply))
+        requests['node-2'].on_reply(ErrorMessage(node_id='node-2', researcher_id=environ['RESEARCHER_ID'],
+                                                 extra_msg='', errnum=ErrorNumbers.FB300.name, command='error'))
+        self.assertTupleEqual(self.job.wait_training_reply(0), ('node-2', None))
+        self.assertDictEqual(self.job.pending_training, {})
+
     def test_job_14_update_parameters_from_params(self):
         """Testing update_parameters when passing 'params'."""
         params = {'params': [1, 2, 3, 4]}
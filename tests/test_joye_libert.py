@@ -1,10 +1,14 @@
+import pickle
 import unittest
 
 from math import ceil, log2
+
+import numpy as np
 from gmpy2 import mpz
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from fedbiomed.common.constants import VEParameters
-from fedbiomed.common.secagg._jls import PublicParam, JoyeLibert, FDH, EncryptedNumber, UserKey, BaseKey, ServerKey
+from fedbiomed.common.secagg._jls import PublicParam, JoyeLibert, FDH, EncryptedNumber, UserKey, BaseKey, ServerKey, \
+    JLSPool, VES, quantize, reverse_quantize, _check_clipping_range
 
 
 class TestFDH(unittest.TestCase):
@@ -48,6 +52,19 @@ class TestFDH(unittest.TestCase):
         result_2 = fdh.H(10)
         self.assertTrue(result_1 == result_2)
 
+    def test_fdh_02_H_batch(self):
+        """Tests batched H function gives the same hashes as H"""
+        taus = [(i << VEParameters.KEY_SIZE // 4) | 3 for i in range(50)] + [0, 1, 2 ** 600]
+
+        # many hashes are not invertible modulo 12345, and are hashed again
+        for n in (mpz(12345), mpz(123457)):
+            fdh = FDH(bits_size=VEParameters.KEY_SIZE, n_modulus=n)
+            self.assertListEqual(fdh.H_batch(taus), [fdh.H(t) for t in taus])
+        self.assertListEqual(fdh.H_batch([]), [])
+
+        with self.assertRaises(OverflowError):
+            fdh.H_batch([1, 2 ** (VEParameters.KEY_SIZE * 4)])
+
 
 class TestPublicParam(unittest.TestCase):
 
@@ -90,6 +107,51 @@ class TestPublicParam(unittest.TestCase):
         self.assertTrue(result != 0)
         self.assertIsInstance(result, mpz)
 
+        # values are hashed one at a time, or at once by the batch hashing function
+        self.assertListEqual(self.pp_1.hashing_function_batch([10, 11]), [result, self.pp_1.hashing_function(11)])
+        fdh = FDH(VEParameters.KEY_SIZE, self.n_1 * self.n_1)
+        pp = PublicParam(n_modulus=self.n_1, bits=VEParameters.KEY_SIZE // 2, hashing_function=fdh.H,
+                         batch_hashing_function=fdh.H_batch)
+        self.assertListEqual(pp.hashing_function_batch([10, 11]), [result, self.pp_1.hashing_function(11)])
+
+        batch_hashing_function = MagicMock(return_value=[mpz(1), mpz(2)])
+        pp = PublicParam(n_modulus=self.n_1, bits=VEParameters.KEY_SIZE // 2, hashing_function=fdh.H,
+                         batch_hashing_function=batch_hashing_function)
+        self.assertListEqual(pp.hashing_function_batch([10, 11]), [1, 2])
+        batch_hashing_function.assert_called_once_with([10, 11])
+
+
+class TestQuantization(unittest.TestCase):
+
+    def test_quantization_01_quantize(self):
+        clip, target = 3, VEParameters.TARGET_RANGE
+        weights = [-4., -3., -1.5, 0., 1e-9, 2.9999, 3., 100.]
+        expected = [min(target - 1, int((min(max(w, -clip), clip) + clip) * target / (2 * clip))) for w in weights]
+
+        self.assertListEqual(quantize(weights, clipping_range=clip), expected)
+        self.assertListEqual(quantize(np.array(weights), clipping_range=clip), expected)
+        self.assertListEqual(quantize([0.5], clipping_range=1, target_range=10), [7])
+        self.assertListEqual(quantize([]), [])
+
+    def test_quantization_02_reverse_quantize(self):
+        clip, target = 3, VEParameters.TARGET_RANGE
+        quantized = [0, 1, target // 2, target - 1]
+        step = 2 * clip / (target - 1)
+
+        self.assertListEqual(reverse_quantize(quantized, clipping_range=clip), [-clip + step * q for q in quantized])
+        result = reverse_quantize(quantize([-2.5, 0., 1.25], clipping_range=clip), clipping_range=clip)
+        for r, w in zip(result, [-2.5, 0., 1.25]):
+            self.assertAlmostEqual(r, w, delta=step)
+
+    def test_quantization_03_check_clipping_range(self):
+        with patch('fedbiomed.common.secagg._jls.logger.info') as info:
+            _check_clipping_range([-1., 0., 2.], 2)
+            _check_clipping_range(np.array([]), 2)
+            info.assert_not_called()
+            _check_clipping_range([-1., -2.5], 2)
+            _check_clipping_range(np.array([3.]), 2)
+            self.assertEqual(info.call_count, 2)
+
 
 class TestEncryptedNumber(unittest.TestCase):
 
@@ -372,4 +434,127 @@ class TestJoyeLibert(unittest.TestCase):
                                 tau=1,
                                 list_y_u_tau=[en_1_, en_2_])
 
-        self.assertListEqual(agg, [20, 20, 20])
\ No newline at end of file
+        self.assertListEqual(agg, [20, 20, 20])
+
+
+class TestVES(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.ves = VES(ptsize=100, valuesize=8)
+
+    def test_ves_01_compression_ratio(self):
+        # 8 bits per value and 2 bits for the sum of 3 vectors
+        self.assertEqual(self.ves.compression_ratio(add_ops=3), 10)
+
+    def test_ves_02_encode_decode(self):
+        # zeros are kept, including at the end of an encoded element and of the vector
+        vector = [1, 0, 255] * 7 + [0, 0]
+        encoded = self.ves.encode(vector, add_ops=1)
+        self.assertEqual(len(encoded), 3)
+        self.assertListEqual(self.ves.decode(encoded, add_ops=1), vector)
+
+        for len_ in (0, 1, 10, 11):
+            self.assertListEqual(self.ves.decode(self.ves.encode([0] * len_, add_ops=1), add_ops=1), [0] * len_)
+
+    def test_ves_03_sum(self):
+        vectors = [[0, 255, 1] * 7, [255, 255, 0] * 7, [0, 0, 0] * 7]
+        summed = [sum(e) for e in zip(*[self.ves.encode(v, add_ops=3) for v in vectors])]
+        self.assertListEqual(self.ves.decode(summed, add_ops=3), [sum(v) for v in zip(*vectors)])
+
+
+class TestJLSPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        n = mpz(123457)
+        self.public_param = PublicParam(
+            n_modulus=n,
+            bits=VEParameters.KEY_SIZE // 2,
+            hashing_function=FDH(VEParameters.KEY_SIZE, n * n).H
+        )
+        self.pool = JLSPool(max_workers=3, min_shard_size=2)
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+
+    def test_jls_pool_01_init(self):
+        for max_workers in (0, 1.5, True):
+            with self.assertRaises(ValueError):
+                JLSPool(max_workers=max_workers)
+        with self.assertRaises(ValueError):
+            JLSPool(min_shard_size=0)
+
+        self.assertEqual(self.pool.max_workers, 3)
+        self.assertGreaterEqual(JLSPool().max_workers, 1)
+
+    def test_jls_pool_02_shards(self):
+        self.assertEqual(self.pool.shards(7), [(0, 2), (2, 4), (4, 7)])
+        self.assertEqual(self.pool.shards(3), [(0, 3)])
+        self.assertEqual(self.pool.shards(0), [(0, 0)])
+
+    def test_jls_pool_03_masks(self):
+        """Tests masks computed by the workers are the masks computed in the calling process"""
+        key = UserKey(self.public_param, 10)
+        expected = list(key._masks(tau=2, len_=7, exponent=mpz(10)))
+        self.assertEqual(self.pool.masks(self.public_param, 2, 7, mpz(10)), expected)
+
+        # small vectors are computed in the calling process
+        pool = JLSPool(max_workers=3, min_shard_size=10)
+        self.assertEqual(pool.masks(self.public_param, 2, 7, mpz(10)), expected)
+        self.assertIsNone(pool._pool)
+
+    def test_jls_pool_04_encrypt_decrypt(self):
+        """Tests encryption and decryption in parallel"""
+        plaintext = [mpz(i) for i in range(10)]
+        user_key_1 = UserKey(self.public_param, 10)
+        user_key_2 = UserKey(self.public_param, 10)
+        server_key = ServerKey(self.public_param, -20)
+
+        en_1 = user_key_1.encrypt(plaintext, tau=1, pool=self.pool)
+        self.assertEqual(en_1, user_key_1.encrypt(plaintext, tau=1))
+        en_2 = user_key_2.encrypt(plaintext, tau=1, pool=self.pool)
+
+        sum_ = [EncryptedNumber(self.public_param, c_1) + EncryptedNumber(self.public_param, c_2)
+                for c_1, c_2 in zip(en_1, en_2)]
+        self.assertEqual(server_key.decrypt(sum_, tau=1, pool=self.pool), [2 * i for i in range(10)])
+
+        # pool is started again for other public parameters
+        workers = self.pool._pool
+        n = mpz(123461)
+        public_param = PublicParam(n_modulus=n, bits=VEParameters.KEY_SIZE // 2,
+                                   hashing_function=FDH(VEParameters.KEY_SIZE, n * n).H)
+        self.assertEqual(self.pool.masks(public_param, 1, 10, mpz(10)),
+                         list(UserKey(public_param, 10)._masks(1, 10, mpz(10))))
+        self.assertIsNot(self.pool._pool, workers)
+
+    def test_jls_pool_05_precompute(self):
+        """Tests masks computed in the background are used for vectors of at most the same length"""
+        expected = list(UserKey(self.public_param, 10)._masks(tau=2, len_=7, exponent=mpz(10)))
+        pool = JLSPool(max_workers=1)
+        pool.precompute(self.public_param, 2, 7, mpz(10))
+        try:
+            with patch.object(JLSPool, '_compute', wraps=pool._compute) as compute:
+                self.assertEqual(pool.masks(self.public_param, 2, 7, mpz(10)), expected)
+                self.assertEqual(pool.masks(self.public_param, 2, 1, mpz(10)), expected[:1])
+                compute.assert_not_called()
+
+                # other vectors are computed when needed
+                pool.masks(self.public_param, 2, 8, mpz(10))
+                pool.masks(self.public_param, 3, 7, mpz(10))
+                pool.masks(self.public_param, 2, 7, mpz(-20))
+                self.assertEqual(compute.call_count, 3)
+
+            # masks of other time periods are discarded
+            pool.precompute(self.public_param, 3, 7, mpz(10))
+            self.assertEqual(list(pool._precomputed), [(self.public_param.n_modulus, 3, mpz(10))])
+
+            state = pickle.loads(pickle.dumps(pool))
+            self.assertEqual(state._precomputed, {})
+            self.assertIsNone(state._background)
+        finally:
+            pool.shutdown()
+        self.assertIsNone(pool._background)
+        self.assertEqual(pool._precomputed, {})
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
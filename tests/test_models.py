@@ -391,6 +391,12 @@ class TestSkLearnModel(unittest.TestCase):
             with self.assertRaises(FedbiomedModelError):
                 model.unflatten(["not-float-list"])
 
+            self.assertEqual(model.num_params(), len(flatten))
+
+        with self.assertRaises(FedbiomedModelError):
+            # should raise exception regarding missing `param_list`
+            SkLearnModel(self.models[0]).num_params()
+
     def test_sklearnmodel_11_set_weights(self):
         """Test that 'SkLearnModel.set_weights' works properly."""
         for skmodel in self.models:
@@ -717,6 +723,8 @@ class TestTorchModel(unittest.TestCase):
         with self.assertRaises(FedbiomedModelError):
             self.model.unflatten(["not-float-list"])
 
+        self.assertEqual(self.model.num_params(), len(flatten))
+
     def test_torchmodel_09_export(self):
         """Test that 'TorchModel.export' works properly."""
         with patch("torch.save") as save_patch:
@@ -27,6 +27,7 @@ from fedbiomed.node.environ import environ
 from fedbiomed.common.constants import ErrorNumbers, SecaggElementTypes, _BaseEnum, TrainingPlans, __messaging_protocol_version__
 from fedbiomed.common.optimizers.optimizer import Optimizer
 from fedbiomed.common.message import NodeMessages, TrainRequest, SecaggReply, SecaggDeleteReply
+from fedbiomed.common.utils import get_source_hash
 from fedbiomed.common.models import TorchModel
 from fedbiomed.node.history_monitor import HistoryMonitor
 from fedbiomed.node.node import Node
@@ -468,6 +469,48 @@ class TestNode(NodeTestCase):
         # checks
         self.grpc_send_mock.assert_called_once()
 
+    @patch('fedbiomed.node.node.Round', autospec=True)
+    @patch('fedbiomed.node.history_monitor.HistoryMonitor.__init__')
+    def test_node_13_parser_task_train_training_plan_cache(self,
+                                                           history_monitor_patch,
+                                                           round_patch):
+        """Tests parser_task_train method with a training plan sent only as a hash"""
+        history_monitor_patch.return_value = None
+        round_patch.return_value.initialize_arguments.return_value = None
+        self.n1.dataset_manager = MagicMock()
+        self.n1.dataset_manager.get_by_id.return_value = {'dataset_id': 'dataset_id_1234'}
+
+        msg = TrainRequest(**{
+            'model_args': {},
+            'training_args': {},
+            'training_plan': None,
+            'training_plan_hash': get_source_hash('TP'),
+            'training_plan_class': 'my_test_training_plan',
+            'params': {"x": 0},
+            'job_id': 'job_id_1234',
+            'researcher_id': 'researcher_id_1234',
+            'dataset_id': 'dataset_id_1234',
+            'request_id': 'request-id',
+            'aggregator_args': {},
+            'state_id': None,
+            'training': True,
+            'command': 'train',
+            'round': 1
+        })
+
+        # cache miss: node requests the training plan source
+        self.assertIsNone(self.n1.parser_task_train(msg))
+        round_patch.assert_not_called()
+        error = self.grpc_send_mock.call_args[0][1]
+        self.assertEqual(error.errnum, ErrorNumbers.FB324.name)
+        self.assertEqual(error.request_id, 'request-id')
+
+        # cache hit: round is created with the cached source
+        self.n1._training_plan_cache.get = MagicMock(return_value=MagicMock(source='TP'))
+        self.n1.parser_task_train(msg)
+        self.assertEqual(round_patch.call_args[1]['training_plan'], 'TP')
+        self.assertEqual(round_patch.call_args[1]['training_plan_hash'], get_source_hash('TP'))
+
     @patch('fedbiomed.node.node.Round', autospec=True)
     @patch('fedbiomed.node.history_monitor.HistoryMonitor.__init__', spec=True)
     def test_node_14_parser_task_train_create_round_deserializer_str_msg(self,
@@ -517,6 +560,9 @@ class TestNode(NodeTestCase):
             training=True, 
             dataset=self.database_id, 
             params=dict_msg_1_dataset['params'], 
+            model_version=None,
+            base_model_version=None,
+            params_precision=None,
             job_id=dict_msg_1_dataset['job_id'], 
             researcher_id=dict_msg_1_dataset['researcher_id'], 
             history_monitor=unittest.mock.ANY, 
@@ -526,7 +572,9 @@ class TestNode(NodeTestCase):
             training_plan_class=dict_msg_1_dataset['training_plan_class'], 
             round_number=1, 
             dlp_and_loading_block_metadata=None, 
-            aux_vars= dict_msg_1_dataset['aux_vars']
+            aux_vars= dict_msg_1_dataset['aux_vars'],
+            training_plan_hash=get_source_hash(dict_msg_1_dataset['training_plan']),
+            training_plan_cache=self.n1._training_plan_cache
         )
 
     @patch('fedbiomed.node.node.Round', autospec=True)
@@ -579,6 +627,9 @@ class TestNode(NodeTestCase):
             training=True, 
             dataset=self.database_id, 
             params=dict_msg_1_dataset['params'], 
+            model_version=None,
+            base_model_version=None,
+            params_precision=None,
             job_id=dict_msg_1_dataset['job_id'], 
             researcher_id=dict_msg_1_dataset['researcher_id'], 
             history_monitor=unittest.mock.ANY, 
@@ -588,7 +639,9 @@ class TestNode(NodeTestCase):
             training_plan_class=dict_msg_1_dataset['training_plan_class'], 
             round_number=1, 
             dlp_and_loading_block_metadata=None, 
-            aux_vars= dict_msg_1_dataset['aux_vars']
+            aux_vars= dict_msg_1_dataset['aux_vars'],
+            training_plan_hash=get_source_hash(dict_msg_1_dataset['training_plan']),
+            training_plan_cache=self.n1._training_plan_cache
         )
 
 
@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+import torch
+
+from fedbiomed.common.constants import ParamsDeltaMode
+from fedbiomed.common.exceptions import FedbiomedValueError
+from fedbiomed.common.serializer import Serializer
+from fedbiomed.common.utils import decode_params_delta, encode_params_delta
+
+
+class TestParamsDelta(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.base = {
+            'w': rng.standard_normal((50, 20)).astype(np.float32),
+            'b': rng.standard_normal(20),
+            'n': np.arange(10),
+        }
+        self.params = {name: value.copy() for name, value in self.base.items()}
+
+    def assertParamsEqual(self, params, expected):
+        self.assertEqual(set(params), set(expected))
+        for name, value in expected.items():
+            self.assertEqual(type(params[name]), type(value))
+            if isinstance(value, torch.Tensor):
+                self.assertTrue(torch.equal(params[name], value))
+            else:
+                np.testing.assert_array_equal(params[name], value)
+                self.assertEqual(params[name].dtype, value.dtype)
+
+    def test_params_delta_01_sparse(self):
+        """Few changed weights are sent as indices and values"""
+        self.params['w'][3, 4] = 1.5
+        self.params['n'][0] = 42
+
+        delta = encode_params_delta(self.base, self.params, ParamsDeltaMode.DIFF)
+
+        self.assertEqual(delta['w']['encoding'], 'sparse')
+        self.assertListEqual(delta['w']['indices'].tolist(), [3 * 20 + 4])
+        self.assertEqual(delta['b']['encoding'], 'sparse')
+        self.assertEqual(len(delta['b']['indices']), 0)
+        self.assertParamsEqual(decode_params_delta(self.base, delta), self.params)
+
+    def test_params_delta_02_xor(self):
+        """Dense updates are encoded losslessly as bitwise XOR"""
+        self.params['w'] += 1e-3
+        self.params['b'] *= 2
+
+        delta = encode_params_delta(self.base, self.params, ParamsDeltaMode.DIFF)
+
+        self.assertEqual(delta['w']['encoding'], 'xor')
+        self.assertEqual(delta['b']['encoding'], 'xor')
+        self.assertParamsEqual(decode_params_delta(self.base, delta), self.params)
+
+    def test_params_delta_03_quantized(self):
+        """Floating point differences are quantized, other layers are lossless"""
+        self.params['w'] += np.linspace(-1, 1, self.params['w'].size, dtype=np.float32).reshape(50, 20)
+        self.params['n'] += 1
+
+        delta = encode_params_delta(self.base, self.params, ParamsDeltaMode.QUANTIZED)
+
+        self.assertEqual(delta['w']['encoding'], 'quantized')
+        self.assertEqual(delta['w']['values'].dtype, np.uint8)
+        self.assertNotEqual(delta['n']['encoding'], 'quantized')
+
+        params = decode_params_delta(self.base, delta)
+        self.assertEqual(params['w'].dtype, np.float32)
+        np.testing.assert_allclose(params['w'], self.params['w'], atol=delta['w']['scale'])
+        np.testing.assert_array_equal(params['n'], self.params['n'])
+
+    def test_params_delta_04_full_layers(self):
+        """Layers that cannot be encoded against the previous version are sent in full"""
+        self.params['w'] = np.zeros((10, 10), dtype=np.float32)
+        self.params['b'] = self.params['b'].astype(np.float32)
+        self.params['new'] = np.ones(3)
+
+        delta = encode_params_delta(self.base, self.params, ParamsDeltaMode.DIFF)
+
+        for name in ['w', 'b', 'new']:
+            self.assertEqual(delta[name]['encoding'], 'full')
+        self.assertParamsEqual(decode_params_delta(self.base, delta), self.params)
+
+    def test_params_delta_05_torch(self):
+        """Torch tensors are rebuilt as tensors, also after serialization"""
+        base = {name: torch.from_numpy(value) for name, value in self.base.items()}
+        params = {name: value.clone() for name, value in base.items()}
+        params['w'][0] += 1.
+
+        delta = encode_params_delta(base, params, ParamsDeltaMode.DIFF)
+        delta = Serializer.loads(Serializer.dumps(delta))
+
+        self.assertParamsEqual(decode_params_delta(base, delta), params)
+
+    def test_params_delta_06_errors(self):
+        """Deltas that cannot be decoded raise errors"""
+        self.params['w'][0, 0] = 1.
+        delta = encode_params_delta(self.base, self.params, ParamsDeltaMode.DIFF)
+
+        with self.assertRaises(FedbiomedValueError):
+            decode_params_delta({'b': self.base['b'], 'n': self.base['n']}, delta)
+
+        delta['w']['encoding'] = 'unknown'
+        with self.assertRaises(FedbiomedValueError):
+            decode_params_delta(self.base, delta)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
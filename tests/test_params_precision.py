@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+import torch
+
+from fedbiomed.common.constants import TransportPrecision
+from fedbiomed.common.exceptions import FedbiomedValueError
+from fedbiomed.common.serializer import Serializer
+from fedbiomed.common.utils import decode_params_precision, encode_params_precision
+
+
+class TestParamsPrecision(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.params = {
+            'w': rng.standard_normal((50, 20)).astype(np.float32),
+            'b': rng.standard_normal(20),
+            'n': np.arange(10),
+        }
+
+    def test_params_precision_01_fp16(self):
+        """Floating point layers are cast to half precision, other layers are sent in full"""
+        encoded = encode_params_precision(self.params, TransportPrecision.FP16)
+
+        self.assertEqual(encoded['w']['values'].dtype, np.float16)
+        self.assertEqual(encoded['b']['values'].dtype, np.float16)
+        self.assertEqual(encoded['n']['encoding'], 'full')
+
+        params = decode_params_precision(encoded)
+        self.assertEqual(params['w'].dtype, np.float32)
+        self.assertEqual(params['b'].dtype, np.float64)
+        np.testing.assert_allclose(params['w'], self.params['w'], rtol=1e-3)
+        np.testing.assert_array_equal(params['n'], self.params['n'])
+
+    def test_params_precision_02_bf16(self):
+        """Layers are cast to bfloat16, rounded to nearest, keeping special values"""
+        self.params['w'][0, :4] = [np.nan, np.inf, -np.inf, 1e30]
+        encoded = encode_params_precision(self.params, TransportPrecision.BF16)
+
+        self.assertEqual(encoded['w']['values'].dtype, np.uint16)
+
+        params = decode_params_precision(encoded)
+        self.assertTrue(np.isnan(params['w'][0, 0]))
+        self.assertListEqual(params['w'][0, 1:3].tolist(), [np.inf, -np.inf])
+        np.testing.assert_allclose(params['w'][1:], self.params['w'][1:], rtol=2 ** -8)
+        np.testing.assert_allclose(params['w'][0, 3], 1e30, rtol=2 ** -8)
+        # exactly representable values are unchanged
+        exact = encode_params_precision({'x': np.array([1., -0.5, 3.], dtype=np.float32)}, TransportPrecision.BF16)
+        self.assertListEqual(decode_params_precision(exact)['x'].tolist(), [1., -0.5, 3.])
+
+    def test_params_precision_03_int8(self):
+        """Layers are quantized on 8 bits with a scale for each layer"""
+        self.params['zero'] = np.zeros(5, dtype=np.float32)
+        encoded = encode_params_precision(self.params, TransportPrecision.INT8)
+
+        self.assertEqual(encoded['w']['values'].dtype, np.int8)
+        scale = encoded['w']['scale']
+        self.assertAlmostEqual(scale, np.abs(self.params['w']).max() / 127, places=6)
+
+        params = decode_params_precision(encoded)
+        self.assertEqual(params['w'].dtype, np.float32)
+        np.testing.assert_allclose(params['w'], self.params['w'], atol=scale / 2 + 1e-6)
+        np.testing.assert_array_equal(params['zero'], self.params['zero'])
+
+    def test_params_precision_04_torch(self):
+        """Torch tensors are rebuilt as tensors, also after serialization"""
+        params = {name: torch.from_numpy(value) for name, value in self.params.items()}
+
+        for precision in TransportPrecision:
+            encoded = encode_params_precision(params, precision)
+            data = Serializer.dumps(encoded)
+            self.assertLess(len(data), len(Serializer.dumps(params)))
+
+            decoded = decode_params_precision(Serializer.loads(data))
+            for name, value in params.items():
+                self.assertIsInstance(decoded[name], torch.Tensor)
+                self.assertEqual(decoded[name].dtype, value.dtype)
+                self.assertTrue(torch.allclose(decoded[name].double(), value.double(), atol=2e-2, rtol=1e-2))
+
+    def test_params_precision_05_errors(self):
+        """Parameters that cannot be decoded raise errors"""
+        encoded = encode_params_precision(self.params, TransportPrecision.FP16)
+
+        encoded['w']['encoding'] = 'unknown'
+        with self.assertRaises(FedbiomedValueError):
+            decode_params_precision(encoded)
+
+        with self.assertRaises(FedbiomedValueError):
+            decode_params_precision({'w': self.params['w']})
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
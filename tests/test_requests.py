@@ -2,12 +2,12 @@ import inspect
 import os.path
 import string
 import random
+import threading
 import unittest
 import time
 
 from typing import Any, Dict
 from unittest.mock import patch,PropertyMock, MagicMock, ANY
-from threading import Semaphore
 #############################################################
 # Import ResearcherTestCase before importing any FedBioMed Module
 from testsupport.base_case import ResearcherTestCase
@@ -18,6 +18,8 @@ from testsupport.fake_message import FakeMessages
 
 from fedbiomed.common.training_plans import TorchTrainingPlan
 from fedbiomed.common.constants import MessageType
+from fedbiomed.common.exceptions import FedbiomedTypeError, FedbiomedValueError
+from fedbiomed.common.serializer import Serializer
 from fedbiomed.common.message import Log, Scalar, SearchReply, SearchRequest, ErrorMessage, ApprovalReply
 
 from fedbiomed.researcher.requests import (
@@ -32,6 +34,7 @@ from fedbiomed.researcher.requests import (
     StopOnTimeout,
     StopOnDisconnect,
     StopOnError,
+    CompleteOnQuorum,
     MessagesByNode)
 from fedbiomed.researcher.monitor import Monitor
 
@@ -421,13 +424,11 @@ class TestRequest(unittest.TestCase):
     def setUp(self):
         self.message = MagicMock(spec=SearchRequest)
         self.node = MagicMock(spec=NodeAgent)
-        self.sem_pending = MagicMock(spec=Semaphore)
 
         self.request  = Request(
             message = self.message,
             node=self.node,
             request_id = 'test-request-id',
-            sem_pending = self.sem_pending
         )
 
         pass
@@ -440,7 +441,7 @@ class TestRequest(unittest.TestCase):
 
 
         self.request.send()
-        self.node.send.assert_called_once_with(self.message, self.request.on_reply)
+        self.node.send.assert_called_once_with(self.message, self.request.on_reply, self.request.on_disconnect)
         self.assertEqual(self.request.status, RequestStatus.NO_REPLY_YET)
 
 
@@ -460,28 +461,62 @@ class TestRequest(unittest.TestCase):
 
     def test_04_request_has_finished(self):
 
+        callback = MagicMock()
+        self.request.add_done_callback(callback)
+        self.assertFalse(self.request.has_finished())
+        callback.assert_not_called()
 
-        type(self.node).status = PropertyMock(return_value=NodeActiveStatus.DISCONNECTED)
-        r = self.request.has_finished()
-        self.assertTrue(r)
+        self.request.on_reply(self.message)
+        self.assertTrue(self.request.has_finished())
+        callback.assert_called_once_with(self.request)
+
+        # already finished: callback is executed immediately
+        callback = MagicMock()
+        self.request.add_done_callback(callback)
+        callback.assert_called_once_with(self.request)
 
-        type(self.node).status = PropertyMock(return_value=NodeActiveStatus.ACTIVE)
-        r = self.request.has_finished()
-        self.assertFalse(r)
+    def test_05_request_on_disconnect(self):
 
+        callback = MagicMock()
+        self.request.add_done_callback(callback)
 
+        self.request.on_disconnect()
+        self.assertTrue(self.request.has_finished())
+        self.assertEqual(self.request.status, RequestStatus.DISCONNECT)
+
+        # reply received after disconnection is kept, request finished once
         self.request.on_reply(self.message)
-        r = self.request.has_finished()
-        self.assertTrue(r)
+        self.assertEqual(self.request.reply, self.message)
+        callback.assert_called_once_with(self.request)
+
+    def test_06_request_resend(self):
+
+        callback = MagicMock()
+        self.request.add_done_callback(callback)
+        self.request.send()
+        self.request.on_reply(MagicMock(spec=ErrorMessage))
+        callback.assert_called_once_with(self.request)
+
+        # request is sent again with a new ID, answer to the first message is flushed
+        message = MagicMock(spec=SearchRequest)
+        self.request.resend(message)
+        self.node.flush.assert_called_once_with('test-request-id', False)
+        self.node.send.assert_called_with(message, self.request.on_reply, self.request.on_disconnect)
+        self.assertNotEqual(self.request._request_id, 'test-request-id')
+        self.assertFalse(self.request.has_finished())
+        self.assertIsNone(self.request.error)
+        self.assertEqual(self.request.status, RequestStatus.NO_REPLY_YET)
+
+        # callbacks are executed again once it finishes
+        self.request.on_reply(self.message)
+        self.assertEqual(self.request.reply, self.message)
+        self.assertEqual(callback.call_count, 2)
 
 
 class TestFederatedRequest(unittest.TestCase):
 
     def setUp(self):
 
-        self.sem_patch = patch('fedbiomed.researcher.requests._requests.threading.Semaphore')
-        self.sem_mock = self.sem_patch.start()
-
         self.policy_patch = patch('fedbiomed.researcher.requests._requests.PolicyController', autospec=True)
         self.policy_mock = self.policy_patch.start()
 
@@ -502,7 +537,6 @@ class TestFederatedRequest(unittest.TestCase):
 
     def tearDown(self):
 
-        self.sem_patch.stop()
         self.policy_patch.stop()
 
     def test_01_federated_request_init(self):
@@ -525,18 +559,122 @@ class TestFederatedRequest(unittest.TestCase):
 
         self.federated_request.send()
 
-        self.node_1.send.assert_called_once_with(self.message_1, ANY)
-        self.node_2.send.assert_called_once_with(self.message_1, ANY)
+        self.node_1.send.assert_called_once_with(ANY, ANY, ANY)
+        self.node_2.send.assert_called_once_with(ANY, ANY, ANY)
+        self.assertIs(self.node_1.send.call_args[0][0].message, self.message_1)
+        self.assertIs(self.node_2.send.call_args[0][0].message, self.message_1)
 
 
     def test_03_federated_request_wait(self):
 
-        self.policy_mock.return_value.continue_all.side_effect = [ PolicyStatus.CONTINUE, PolicyStatus.COMPLETED]
+        policy = self.policy_mock.return_value
+        policy.start.return_value = PolicyStatus.CONTINUE
+        policy.next_deadline.return_value = None
+        policy.on_finished.side_effect = [PolicyStatus.CONTINUE, PolicyStatus.COMPLETED]
+
+        req_1, req_2 = self.federated_request.requests
+        req_1.on_reply(MagicMock(spec=SearchReply))
+        req_2.on_disconnect()
+        self.federated_request.wait()
+
+        policy.start.assert_called_once_with(self.federated_request.requests)
+        self.assertEqual([c.args[0] for c in policy.on_finished.call_args_list], [req_1, req_2])
+
+    def test_04_federated_request_wait_deadline(self):
+
+        policy = self.policy_mock.return_value
+        policy.start.return_value = PolicyStatus.CONTINUE
+        policy.next_deadline.side_effect = lambda: time.monotonic() + 0.01
+        policy.on_deadline.return_value = PolicyStatus.COMPLETED
+
         self.federated_request.wait()
 
-    def test_04_federaeted_request_with_context_manager(self):
+        policy.on_deadline.assert_called_once_with()
+        policy.on_finished.assert_not_called()
+
+    def test_05_federated_request_wait_returns_on_last_reply(self):
+        """Control returns as soon as the last reply is received, without polling"""
+        federated_request = FederatedRequest(
+            message=self.message_1,
+            nodes=[self.node_1, self.node_2],
+            policy=[]
+        )
+        federated_request._policy = PolicyController([StopOnTimeout(timeout=60)])
+
+        def reply():
+            for req in federated_request.requests:
+                time.sleep(0.05)
+                req.on_reply(MagicMock(spec=SearchReply))
+
+        thread = threading.Thread(target=reply)
+        thread.start()
+        start = time.monotonic()
+        federated_request.wait()
+        thread.join()
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(2, len(federated_request.replies()))
+
+    def test_05_federated_request_wait_on_reply(self):
+        """Replies are passed to the callback as soon as they are received, before the policies"""
+        events = []
+        on_reply = MagicMock(side_effect=lambda node_id, reply: events.append(('reply', node_id)))
+        federated_request = FederatedRequest(
+            message=self.message_1,
+            nodes=[self.node_1, self.node_2],
+            policy=[],
+            on_reply=on_reply
+        )
+        policy = self.policy_mock.return_value
+        policy.start.return_value = PolicyStatus.CONTINUE
+        policy.next_deadline.return_value = None
+        policy.on_finished.side_effect = lambda req: events.append(('finished', req.node.id)) or (
+            PolicyStatus.CONTINUE if len(events) < 3 else PolicyStatus.COMPLETED)
+
+        req_1, req_2 = federated_request.requests
+        reply = MagicMock(spec=SearchReply)
+        req_1.on_reply(reply)
+        req_2.on_disconnect()
+        federated_request.wait()
+
+        on_reply.assert_called_once_with('node-1', reply)
+        self.assertListEqual(events, [('reply', 'node-1'), ('finished', 'node-1'), ('finished', 'node-2')])
+
+    def test_05_federated_request_wait_on_error_resend(self):
+        """Requests sent again on error are handled by the policies once they finish again"""
+        retry = MagicMock(spec=SearchRequest)
+        on_error = MagicMock(side_effect=lambda node_id, error: retry if node_id == 'node-2' else None)
+        federated_request = FederatedRequest(
+            message=self.message_1,
+            nodes=[self.node_1, self.node_2],
+            policy=[],
+            on_error=on_error
+        )
+        federated_request._policy = PolicyController([CompleteOnQuorum(count=2, deadline=60)])
+
+        req_1, req_2 = federated_request.requests
+        req_1.on_reply(MagicMock(spec=SearchReply))
+        req_2.on_reply(MagicMock(spec=ErrorMessage))
+
+        def reply():
+            time.sleep(0.05)
+            req_2.on_reply(MagicMock(spec=SearchReply))
 
-        self.policy_mock.return_value.continue_all.side_effect = [ PolicyStatus.CONTINUE, PolicyStatus.COMPLETED]
+        thread = threading.Thread(target=reply)
+        thread.start()
+        federated_request.wait()
+        thread.join()
+
+        # node-2 counts towards the quorum once it replies to the request sent again
+        self.node_2.send.assert_called_once_with(retry, req_2.on_reply, req_2.on_disconnect)
+        on_error.assert_called_once()
+        self.assertEqual(2, len(federated_request.replies()))
+        self.assertEqual({}, federated_request.errors())
+
+    def test_06_federaeted_request_with_context_manager(self):
+
+        policy = self.policy_mock.return_value
+        policy.start.return_value = PolicyStatus.COMPLETED
 
         with FederatedRequest(message=self.message_1,
                               nodes = [self.node_1, self.node_2],
@@ -546,6 +684,92 @@ class TestFederatedRequest(unittest.TestCase):
             self.assertEqual({}, fed_req.replies())
             self.assertEqual({}, fed_req.errors())
 
+    def test_07_federated_request_shared_fields(self):
+
+        tags = ['tag-1', 'tag-2']
+        message = MessagesByNode({
+            'node-1': SearchRequest(researcher_id='r-1', tags=tags, command='search'),
+            'node-2': SearchRequest(researcher_id='r-2', tags=tags, command='search'),
+        })
+
+        r = FederatedRequest(
+            message=message,
+            nodes=[self.node_1, self.node_2],
+            policy=[self.policy]
+        )
+
+        messages = [req._message for req in r.requests]
+        # fields holding the same objects in all messages are serialized once
+        self.assertEqual(len(messages[0].shared_fields), 1)
+        self.assertEqual({'tags', 'command', 'protocol_version'}, messages[0].shared_fields[0].names)
+        self.assertEqual(messages[0].shared_fields, messages[1].shared_fields)
+
+        for req, node_message in zip(r.requests, message.values()):
+            node_message.request_id = req._request_id
+            self.assertEqual(
+                Serializer.loads(b''.join(req._message.serialize())),
+                node_message.get_dict()
+            )
+
+    def test_07_federated_request_shared_fields_groups(self):
+
+        tags_1, tags_2, researcher_id = ['tag-1'], ['tag-2'], 'r-3'
+        message = MessagesByNode({
+            'node-1': SearchRequest(researcher_id='r-1', tags=tags_1, command='search'),
+            'node-2': SearchRequest(researcher_id='r-2', tags=tags_1, command='search'),
+            'node-3': SearchRequest(researcher_id=researcher_id, tags=tags_2, command='search'),
+            'node-4': SearchRequest(researcher_id=researcher_id, tags=tags_2, command='search'),
+        })
+        node_3 = MagicMock(spec=NodeAgent)
+        type(node_3).id = PropertyMock(return_value='node-3')
+        node_4 = MagicMock(spec=NodeAgent)
+        type(node_4).id = PropertyMock(return_value='node-4')
+
+        r = FederatedRequest(
+            message=message,
+            nodes=[self.node_1, self.node_2, node_3, node_4],
+            policy=[self.policy]
+        )
+
+        messages = [req._message for req in r.requests]
+        # one group of fields shared by all messages, one group per subset of messages sharing tags
+        self.assertEqual(messages[0].shared_fields, messages[1].shared_fields)
+        self.assertEqual(messages[2].shared_fields, messages[3].shared_fields)
+        common, = set(messages[0].shared_fields) & set(messages[2].shared_fields)
+        self.assertEqual({'command', 'protocol_version'}, common.names)
+        self.assertEqual(
+            {frozenset({'command', 'protocol_version'}), frozenset({'tags'})},
+            {shared.names for shared in messages[0].shared_fields})
+        self.assertEqual(
+            {frozenset({'command', 'protocol_version'}), frozenset({'tags', 'researcher_id'})},
+            {shared.names for shared in messages[2].shared_fields})
+
+        for req, node_message in zip(r.requests, message.values()):
+            node_message.request_id = req._request_id
+            self.assertEqual(
+                Serializer.loads(b''.join(req._message.serialize())),
+                node_message.get_dict()
+            )
+
+    def test_08_federated_request_exit_stops_unfinished_requests(self):
+
+        policy = self.policy_mock.return_value
+        policy.start.return_value = PolicyStatus.CONTINUE
+        policy.next_deadline.return_value = None
+        policy.on_finished.return_value = PolicyStatus.COMPLETED
+        policy.has_stopped_any.return_value = False
+
+        fed_req = FederatedRequest(message=self.message_1,
+                                   nodes=[self.node_1, self.node_2],
+                                   policy=[self.policy])
+        req_1, req_2 = fed_req.requests
+        req_1.on_reply(MagicMock(spec=SearchReply))
+        with fed_req:
+            pass
+
+        # late reply of the request that did not finish is discarded by the node agent
+        self.node_1.flush.assert_called_once_with(req_1._request_id, False)
+        self.node_2.flush.assert_called_once_with(req_2._request_id, True)
 
 
 class TestRequestPolicy(unittest.TestCase):
@@ -559,12 +783,17 @@ class TestRequestPolicy(unittest.TestCase):
 
     def test_01_request_policy_continue(self):
 
-        self.req_1.has_finished.return_value = False
-        self.req_2.has_finished.return_value = True
+        r = self.pol.start([self.req_1, self.req_2])
+        self.assertEqual(r, PolicyStatus.CONTINUE)
 
-        r = self.pol.continue_([self.req_1, self.req_2])
+        r = self.pol.on_finished(self.req_2)
         self.assertEqual(r, PolicyStatus.CONTINUE)
+        r = self.pol.on_finished(self.req_1)
+        self.assertEqual(r, PolicyStatus.COMPLETED)
+        self.assertIsNone(self.pol.deadline())
 
+        r = self.pol.start([])
+        self.assertEqual(r, PolicyStatus.COMPLETED)
 
     def test_02_request_policy_stop(self):
 
@@ -584,6 +813,38 @@ class TestRequestPolicy(unittest.TestCase):
         self.assertEqual(r, PolicyStatus.COMPLETED)
         self.assertEqual(self.pol.status, PolicyStatus.COMPLETED)
 
+    @patch('fedbiomed.researcher.requests._policies.logger.warning')
+    def test_05_request_policy_legacy_continue(self, warning):
+        """Tests policies that only implement the deprecated `continue_`"""
+
+        class LegacyPolicy(RequestPolicy):
+            def continue_(self, requests):
+                if any(req.error for req in requests):
+                    return self.stop(requests[0])
+                return super().continue_(requests)
+
+        warning.assert_called_once()
+        self.req_1.has_finished.return_value = False
+        self.req_1.error = False
+        self.req_2.has_finished.return_value = True
+        self.req_2.error = False
+        pol = LegacyPolicy(nodes=['other-node'])
+
+        # requests are not filtered, `continue_` is called on each event and polled until it completes
+        with patch('fedbiomed.researcher.requests._policies.time.monotonic', return_value=10.):
+            self.assertEqual(pol.start([self.req_1, self.req_2]), PolicyStatus.CONTINUE)
+        self.assertEqual(pol.deadline(), 10.5)
+        self.assertEqual(pol.on_finished(self.req_2), PolicyStatus.CONTINUE)
+        self.req_1.error = True
+        self.assertEqual(pol.on_deadline(), PolicyStatus.STOPPED)
+        self.assertIsNone(pol.deadline())
+
+        # former API cannot be adapted to the hooks of the timeout policies
+        with self.assertRaises(FedbiomedTypeError):
+            class LegacyTimeoutPolicy(DiscardOnTimeout):
+                def continue_(self, requests):
+                    return PolicyStatus.CONTINUE
+
 
 class TestPolicyController(unittest.TestCase):
 
@@ -604,14 +865,21 @@ class TestPolicyController(unittest.TestCase):
         self.req_policy_patch.stop()
 
 
-    def test_01_policy_controller_continue_all(self):
+    def test_01_policy_controller_start_on_finished(self):
 
-        self.req_policy_mock.return_value.continue_.return_value = PolicyStatus.CONTINUE
-        self.policy_1.continue_.return_value = PolicyStatus.CONTINUE
+        self.req_policy_mock.return_value.start.return_value = PolicyStatus.CONTINUE
+        self.policy_1.start.return_value = PolicyStatus.CONTINUE
 
-        r = self.pol_cont.continue_all([self.req_1, self.req_1])
+        r = self.pol_cont.start([self.req_1, self.req_2])
         self.assertEqual(r, PolicyStatus.CONTINUE)
 
+        self.req_policy_mock.return_value.on_finished.return_value = PolicyStatus.CONTINUE
+        self.policy_1.on_finished.return_value = PolicyStatus.STOPPED
+
+        r = self.pol_cont.on_finished(self.req_1)
+        self.assertEqual(r, PolicyStatus.COMPLETED)
+        self.policy_1.on_finished.assert_called_once_with(self.req_1)
+
     def test_02_policy_controller_has_stopped_any(self):
 
         type(self.policy_1).status = PropertyMock(return_value=PolicyStatus.STOPPED)
@@ -625,6 +893,24 @@ class TestPolicyController(unittest.TestCase):
 
         self.assertTrue(r[list(r.keys())[0]])
 
+    def test_04_policy_controller_deadlines(self):
+
+        now = time.monotonic()
+        self.req_policy_mock.return_value.deadline.return_value = None
+        self.policy_1.deadline.return_value = now + 60
+        self.assertEqual(self.pol_cont.next_deadline(), now + 60)
+
+        # only policies whose deadline is reached are updated
+        r = self.pol_cont.on_deadline()
+        self.assertEqual(r, PolicyStatus.CONTINUE)
+        self.policy_1.on_deadline.assert_not_called()
+
+        self.policy_1.deadline.return_value = now
+        self.policy_1.on_deadline.return_value = PolicyStatus.STOPPED
+        r = self.pol_cont.on_deadline()
+        self.assertEqual(r, PolicyStatus.COMPLETED)
+        self.req_policy_mock.return_value.on_deadline.assert_not_called()
+
 
 class TestPolicyImplementations(unittest.TestCase):
 
@@ -638,54 +924,142 @@ class TestPolicyImplementations(unittest.TestCase):
         type(self.req).status = PropertyMock()
         type(self.req).error = PropertyMock()
 
+        self.other_req = MagicMock(spec=Request)
+        self.other_node = MagicMock()
+        type(self.other_node).id = PropertyMock(return_value='node-2')
+        type(self.other_req).node = PropertyMock(return_value=self.other_node)
+
 
     def test_01_discard_on_timeout(self):
 
         pol = DiscardOnTimeout(nodes=['node-1'], timeout=0.1)
+        del type(self.req).status
+        self.req.has_finished.return_value = False
 
-        def time_out():
-            time.sleep(1)
-            return False
+        start = time.monotonic()
+        r = pol.start([self.req, self.other_req])
+        self.assertEqual(r, PolicyStatus.CONTINUE)
+        self.assertGreaterEqual(pol.deadline(), start + 0.1)
 
-        self.req.has_finished.side_effect = time_out
-        pol.continue_([self.req])
-        pol.continue_([self.req])
+        r = pol.on_deadline()
+        self.assertEqual(r, PolicyStatus.CONTINUE)
+        self.assertEqual(self.req.status, RequestStatus.TIMEOUT)
+        self.other_req.has_finished.assert_not_called()
+        # timer is armed once
+        self.assertIsNone(pol.deadline())
 
     def test_02_stop_on_timeout(self):
 
         pol = StopOnTimeout(nodes=['node-1'], timeout=0.1)
+        del type(self.req).status
+        self.req.has_finished.return_value = False
 
-        def time_out():
-            time.sleep(1)
-            return False
-
-        self.req.has_finished.side_effect = time_out
-        pol.continue_([self.req])
-        r = pol.continue_([self.req])
+        pol.start([self.req])
+        r = pol.on_finished(self.req)
+        self.assertEqual(r, PolicyStatus.CONTINUE)
+        r = pol.on_deadline()
         self.assertEqual(r, PolicyStatus.STOPPED)
+        self.assertEqual(self.req.status, RequestStatus.TIMEOUT)
+        self.assertIs(pol.stop_caused_by, self.req)
+
+        self.req.has_finished.return_value = True
+        pol.start([self.req])
+        r = pol.on_deadline()
+        self.assertEqual(r, PolicyStatus.CONTINUE)
 
-    def test_01_stop_on_disconnect(self):
+    def test_03_stop_on_disconnect(self):
 
-        pol = StopOnDisconnect(nodes=['node-1'], timeout=0)
+        pol = StopOnDisconnect(nodes=['node-1'], timeout=60)
+        pol.start([self.req])
 
-        r = pol.continue_([self.req])
+        type(self.req).status = PropertyMock(return_value=RequestStatus.SUCCESS)
+        r = pol.on_finished(self.req)
         self.assertEqual(r, PolicyStatus.CONTINUE)
 
-        time.sleep(1)
+        # disconnection before timeout stops once timeout is reached
         type(self.req).status = PropertyMock(return_value=RequestStatus.DISCONNECT)
-        r = pol.continue_([self.req])
+        r = pol.on_finished(self.req)
+        self.assertEqual(r, PolicyStatus.CONTINUE)
+        r = pol.on_deadline()
+        self.assertEqual(r, PolicyStatus.STOPPED)
+
+        # disconnection after timeout stops immediately
+        pol.start([self.req])
+        r = pol.on_deadline()
+        self.assertEqual(r, PolicyStatus.CONTINUE)
+        r = pol.on_finished(self.req)
         self.assertEqual(r, PolicyStatus.STOPPED)
 
-    def test_01_stop_on_error(self):
+    def test_04_stop_on_error(self):
 
         pol = StopOnError(nodes=['node-1'])
+        pol.start([self.req])
 
         type(self.req).error = PropertyMock(return_value=False)
-        r = pol.continue_([self.req])
+        r = pol.on_finished(self.req)
         self.assertEqual(r, PolicyStatus.CONTINUE)
         type(self.req).error = PropertyMock(return_value={'error': True})
-        r = pol.continue_([self.req])
+        r = pol.on_finished(self.req)
         self.assertEqual(r, PolicyStatus.STOPPED)
+        self.assertIsNone(pol.deadline())
+
+    def test_05_complete_on_quorum(self):
+
+        def requests(n):
+            reqs = []
+            for i in range(n):
+                node = MagicMock(spec=NodeAgent)
+                type(node).id = PropertyMock(return_value=f'node-{i}')
+                reqs.append(Request(MagicMock(), node, 'request-id'))
+            return reqs
+
+        for args in ({}, {'fraction': 0}, {'fraction': 1.5}, {'count': 0}, {'count': 1.}, {'deadline': -1}):
+            with self.assertRaises(FedbiomedValueError):
+                CompleteOnQuorum(**args)
+
+        # quorum on the fraction of replies, errors do not count
+        reqs = requests(4)
+        pol = CompleteOnQuorum(fraction=.5)
+        self.assertEqual(pol.start(reqs), PolicyStatus.CONTINUE)
+        self.assertEqual(pol.quorum, 2)
+        self.assertIsNone(pol.deadline())
+        reqs[0].on_reply(MagicMock(spec=SearchReply))
+        self.assertEqual(pol.on_finished(reqs[0]), PolicyStatus.CONTINUE)
+        reqs[1].on_reply(MagicMock(spec=ErrorMessage))
+        self.assertEqual(pol.on_finished(reqs[1]), PolicyStatus.CONTINUE)
+        reqs[2].on_reply(MagicMock(spec=SearchReply))
+        self.assertEqual(pol.on_finished(reqs[2]), PolicyStatus.COMPLETED)
+        self.assertEqual(reqs[3].status, RequestStatus.TIMEOUT)
+        self.assertEqual(reqs[2].status, RequestStatus.SUCCESS)
+
+        # first quorum reached completes
+        pol = CompleteOnQuorum(fraction=1., count=1)
+        pol.start(requests(4))
+        self.assertEqual(pol.quorum, 1)
+
+        # deadline completes with the replies received so far
+        reqs = requests(3)
+        pol = CompleteOnQuorum(count=3, deadline=0.1)
+        start = time.monotonic()
+        pol.start(reqs)
+        self.assertGreaterEqual(pol.deadline(), start + 0.1)
+        reqs[0].on_reply(MagicMock(spec=SearchReply))
+        self.assertEqual(pol.on_finished(reqs[0]), PolicyStatus.CONTINUE)
+        self.assertEqual(pol.on_deadline(), PolicyStatus.COMPLETED)
+        self.assertEqual([req.status for req in reqs],
+                         [RequestStatus.SUCCESS, RequestStatus.TIMEOUT, RequestStatus.TIMEOUT])
+        self.assertIsNone(pol.deadline())
+
+        # with other policies, waiting completes on quorum
+        reqs = requests(3)
+        controller = PolicyController([CompleteOnQuorum(count=2, deadline=60)])
+        self.assertEqual(controller.start(reqs), PolicyStatus.CONTINUE)
+        for req in reqs[:2]:
+            req.on_reply(MagicMock(spec=SearchReply))
+        self.assertEqual(controller.on_finished(reqs[0]), PolicyStatus.CONTINUE)
+        self.assertEqual(controller.on_finished(reqs[1]), PolicyStatus.COMPLETED)
+        self.assertIsNone(controller.next_deadline())
+        self.assertFalse(controller.has_stopped_any())
 
 
 if __name__ == '__main__':  # pragma: no cover
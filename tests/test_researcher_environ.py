@@ -5,7 +5,7 @@ import inspect
 import configparser
 from unittest.mock import patch
 
-from fedbiomed.common.constants import ComponentType
+from fedbiomed.common.constants import ComponentType, ParamsDeltaMode
 from fedbiomed.common.exceptions import FedbiomedEnvironError
 from testsupport.fake_common_environ import Environ
 
@@ -25,8 +25,8 @@ class TestResearcherEnviron(unittest.TestCase):
         self.patch_open.start()
 
         self.config_mock.return_value.get.side_effect = [
-            'db.json', 'mpspdz-localhost', 'port-14000', 'True', 'c.pem', 'c.key',  # Common
-            'researcher-id', 'localhost', '50051', 'pir-key', 'pub-key']  # Node
+            'db.json', 'mpspdz-localhost', 'port-14000', 'True', 'c.pem', 'c.key', 'none', '65536', 'False', '4000000', '104857600', '0', '0',  # Common
+            'researcher-id', 'localhost', '50051', '', '', 'pir-key', 'pub-key', 'none']  # Node
 
         environ_module_dir = os.path.join(os.path.dirname(
                 os.path.abspath(inspect.getfile(inspect.currentframe()))
@@ -41,8 +41,8 @@ class TestResearcherEnviron(unittest.TestCase):
         ## Reset
         self.config_mock.return_value.get.side_effect = None
         self.config_mock.return_value.get.side_effect = [
-            '../var/db.json', 'mpspdz-localhost', 'port-14000', 'True', 'c.pem', 'c.key',  # Common
-            'researcher-id', 'localhost', '50051', 'pir-key', 'pub-key']  # Node
+            '../var/db.json', 'mpspdz-localhost', 'port-14000', 'True', 'c.pem', 'c.key', 'none', '65536', 'False', '4000000', '104857600', '0', '0',  # Common
+            'researcher-id', 'localhost', '50051', '', '', 'pir-key', 'pub-key', 'none']  # Node
 
         if ResearcherEnviron in ResearcherEnviron._objects:
             del ResearcherEnviron._objects[ResearcherEnviron]
@@ -58,8 +58,8 @@ class TestResearcherEnviron(unittest.TestCase):
         """Tests setting variables for researcher environ"""
 
         self.config_mock.return_value.get.side_effect = [
-            '../var/db_researcher-1.json', 'mpspdz-localhost', 'port-14000', 'True', 'c.pem', 'c.key',
-            'researcher-1', 'localhost', '50051', 'pir-key', 'pub-key']
+            '../var/db_researcher-1.json', 'mpspdz-localhost', 'port-14000', 'True', 'c.pem', 'c.key', 'none', '65536', 'False', '4000000', '104857600', '0', '0',
+            'researcher-1', 'localhost', '50051', '', '', 'pir-key', 'pub-key', 'none']
 
         self.environ.set_environment()
 
@@ -75,7 +75,55 @@ class TestResearcherEnviron(unittest.TestCase):
         
         self.assertEqual(self.environ._values["SERVER_HOST"], "localhost")
         self.assertEqual(self.environ._values["SERVER_PORT"], "50051")
+        self.assertEqual(self.environ._values["PARAMS_DELTA"], ParamsDeltaMode.NONE)
+        self.assertIsNone(self.environ._values["SERVER_EXPECTED_NODES"])
+        self.assertIsNone(self.environ._values["SERVER_SETUP_TIMEOUT"])
 
+    def test_02_researcher_environ_params_delta(self):
+        """Tests setting the encoding of model parameters deltas"""
+
+        common = ['../var/db.json', 'mpspdz-localhost', 'port-14000', 'True', 'c.pem', 'c.key', 'none', '65536',
+                  'False', '4000000', '104857600', '0', '0', 'researcher-1', 'localhost', '50051', '', '',
+                  'pir-key', 'pub-key']
+
+        self.config_mock.return_value.get.side_effect = common + ['Quantized']
+        self.environ.set_environment()
+        self.assertEqual(self.environ._values["PARAMS_DELTA"], ParamsDeltaMode.QUANTIZED)
+
+        self.config_mock.return_value.get.side_effect = common + ['unknown']
+        with self.assertRaises(FedbiomedEnvironError):
+            self.environ.set_environment()
+
+
+    def test_03_researcher_environ_server_setup(self):
+        """Tests setting the nodes expected by the server when it starts"""
+
+        common = ['../var/db.json', 'mpspdz-localhost', 'port-14000', 'True', 'c.pem', 'c.key', 'none', '65536',
+                  'False', '4000000', '104857600', '0', '0', 'researcher-1', 'localhost', '50051', '', '',
+                  'pir-key', 'pub-key', 'none']
+
+        self.config_mock.return_value.get.side_effect = common
+        with patch.dict(os.environ, {'RESEARCHER_EXPECTED_NODES': '3', 'RESEARCHER_SERVER_SETUP_TIMEOUT': '2.5'}):
+            self.environ.set_environment()
+        self.assertEqual(self.environ._values["SERVER_EXPECTED_NODES"], 3)
+        self.assertEqual(self.environ._values["SERVER_SETUP_TIMEOUT"], 2.5)
+
+        self.config_mock.return_value.get.side_effect = common
+        with patch.dict(os.environ, {'RESEARCHER_EXPECTED_NODES': 'node-1, node-2'}):
+            self.environ.set_environment()
+        self.assertEqual(self.environ._values["SERVER_EXPECTED_NODES"], ['node-1', 'node-2'])
+
+        # expected nodes and setup timeout are read from the configuration file
+        self.config_mock.return_value.get.side_effect = \
+            common[:16] + ['node-3', '10'] + common[18:]
+        self.environ.set_environment()
+        self.assertEqual(self.environ._values["SERVER_EXPECTED_NODES"], ['node-3'])
+        self.assertEqual(self.environ._values["SERVER_SETUP_TIMEOUT"], 10.)
+
+        self.config_mock.return_value.get.side_effect = common
+        with patch.dict(os.environ, {'RESEARCHER_SERVER_SETUP_TIMEOUT': 'soon'}):
+            with self.assertRaises(FedbiomedEnvironError):
+                self.environ.set_environment()
 
     @patch("fedbiomed.common.logger.logger.info")
     def test_05_researcher_environ_info(self, mock_logger_info):
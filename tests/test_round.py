@@ -29,7 +29,7 @@ from testsupport import fake_training_plan
 import torch
 from fedbiomed.common.optimizers.declearn import YogiModule, ScaffoldClientModule, RidgeRegularizer
 
-from fedbiomed.common.constants import DatasetTypes, TrainingPlans
+from fedbiomed.common.constants import DatasetTypes, ParamsDeltaMode, TrainingPlans, TransportPrecision
 from fedbiomed.common.data import DataManager, DataLoadingPlanMixin, DataLoadingPlan
 from fedbiomed.common.exceptions import  FedbiomedOptimizerError, FedbiomedRoundError, FedbiomedUserInputError
 from fedbiomed.common.logger import logger
@@ -38,7 +38,9 @@ from fedbiomed.common.optimizers import BaseOptimizer, Optimizer
 from fedbiomed.common.training_plans import BaseTrainingPlan
 from fedbiomed.node.environ import environ
 from fedbiomed.node.round import Round
+from fedbiomed.node.training_plan_cache import TrainingPlanCache
 from fedbiomed.common.data import NPDataLoader
+from fedbiomed.common.utils import encode_params_delta, encode_params_precision
 
 # Needed to access length of dataset from Round class
 class FakeLoader:
@@ -312,9 +314,12 @@ class TestRound(NodeTestCase):
         tp_security_manager_patch.return_value = (False, {'name': "model_name"})
         environ["TRAINING_PLAN_APPROVAL"] = True
         # action
-        msg_test = self.r1.run_model_training()
+        with patch.object(self.r1._secagg_crypter, 'shutdown') as shutdown:
+            msg_test = self.r1.run_model_training()
 
         self.assertFalse(msg_test.get_param('success'))
+        # secure aggregation workers are stopped at the end of the round
+        shutdown.assert_called_once()
 
     @patch('fedbiomed.node.round.Round._split_train_and_test_data')
     @patch('fedbiomed.common.message.NodeMessages.format_incoming_message')
@@ -938,6 +943,113 @@ class TestRound(NodeTestCase):
         self.state_manager_mock.return_value.initialize.assert_called_once_with(previous_state_id=previous_state_id, 
                                                                                 testing=False)
 
+    def test_round_32_save_and_rebuild_model_params(self):
+        """Tests rebuilding model parameters from a delta against the parameters saved in node state"""
+        base = {'w': torch.zeros(4, 4), 'b': torch.ones(4)}
+        params = {'w': torch.zeros(4, 4), 'b': torch.arange(4, dtype=torch.float32)}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            params_path = os.path.join(tmp_dir, 'model_params')
+            self.state_manager_mock.return_value.generate_folder_and_create_file_name.return_value = params_path
+
+            # saving received parameters
+            self.r1.params = base
+            self.r1._model_version = 'version-1'
+            self.r1._save_model_params()
+            self.assertDictEqual(self.r1._model_state_entry, {'version': 'version-1', 'state_path': params_path})
+            self.state_manager_mock.return_value.generate_folder_and_create_file_name.assert_called_once_with(
+                self.r1.job_id, self.r1._round, NodeStateFileName.MODEL_PARAMS)
+
+            # rebuilding parameters from the saved ones
+            self.r1._base_model_state = self.r1._model_state_entry
+            self.r1._base_model_version = 'version-1'
+            self.r1.params = encode_params_delta(base, params, ParamsDeltaMode.DIFF)
+            rebuilt = self.r1._rebuild_model_params()
+            for name, value in params.items():
+                self.assertTrue(torch.equal(rebuilt[name], value))
+
+            # delta against another version
+            self.r1._base_model_version = 'version-0'
+            with self.assertRaises(FedbiomedRoundError):
+                self.r1._rebuild_model_params()
+
+            self.r1._base_model_state = None
+            with self.assertRaises(FedbiomedRoundError):
+                self.r1._rebuild_model_params()
+
+    @patch('fedbiomed.node.round.Round._split_train_and_test_data')
+    @patch('fedbiomed.common.message.NodeMessages.format_outgoing_message')
+    @patch('fedbiomed.node.training_plan_security_manager.TrainingPlanSecurityManager.check_training_plan_status')
+    def test_round_33_run_model_training_training_plan_cache(self,
+                                                             tp_security_manager_patch,
+                                                             node_msg_patch,
+                                                             mock_split_test_train_data):
+        """Tests that training plan loaded by a round is reused by next rounds"""
+        FakeModel.SLEEPING_TIME = 0
+        tp_security_manager_patch.return_value = (True, {'name': "model_name"})
+        node_msg_patch.side_effect = TestRound.node_msg_side_effect
+        mock_split_test_train_data.return_value = (FakeLoader, FakeLoader)
+
+        cache = TrainingPlanCache()
+        self.r1._training_plan_cache = cache
+        self.r1.initialize_arguments()
+        msg = self.r1.run_model_training()
+        self.assertTrue(msg.get_dict().get('success', False))
+        self.assertEqual(len(cache), 1)
+        self.ic_from_spec_mock.assert_called_once()
+        self.ic_from_file_mock.assert_called_once()
+
+        # same training plan source and class: imported module is reused
+        self.r2.training_plan_class = 'MyTrainingPlan'
+        self.r2._training_plan_cache = cache
+        self.r2.initialize_arguments()
+        msg = self.r2.run_model_training()
+        self.assertTrue(msg.get_dict().get('success', False))
+        self.ic_from_spec_mock.assert_called_once()
+        self.ic_from_file_mock.assert_called_once()
+
+        # same source, another class: training plan is imported again
+        self.r2.training_plan_class = 'another_training_plan'
+        self.r2.run_model_training()
+        self.assertEqual(self.ic_from_spec_mock.call_count, 2)
+
+    @patch('fedbiomed.node.round.Round._split_train_and_test_data')
+    @patch('fedbiomed.common.message.NodeMessages.format_outgoing_message')
+    @patch('fedbiomed.node.training_plan_security_manager.TrainingPlanSecurityManager.check_training_plan_status')
+    def test_round_34_run_model_training_params_precision(self,
+                                                          tp_security_manager_patch,
+                                                          node_msg_patch,
+                                                          mock_split_test_train_data):
+        """Tests that model parameters are decoded and encoded with the requested transport precision"""
+        FakeModel.SLEEPING_TIME = 0
+        tp_security_manager_patch.return_value = (True, {'name': "model_name"})
+        node_msg_patch.side_effect = TestRound.node_msg_side_effect
+        mock_split_test_train_data.return_value = (FakeLoader, FakeLoader)
+
+        received = {}
+
+        class M(FakeModel):
+            def set_model_params(self, params):
+                received.update(params)
+
+            def after_training_params(self, flatten):
+                return {'w': torch.full((3, 3), 0.5)}
+
+        self.ic_from_file_mock.return_value = (fake_training_plan, M())
+        params = {'w': torch.linspace(0, 1, 9).reshape(3, 3)}
+        self.r1.params = encode_params_precision(params, TransportPrecision.FP16)
+        self.r1._params_precision = 'fp16'
+        self.r1.training_kwargs = {'transport_precision': 'bf16'}
+
+        self.r1.initialize_arguments()
+        msg = self.r1.run_model_training()
+
+        self.assertTrue(msg.get_dict()['success'])
+        self.assertEqual(received['w'].dtype, torch.float32)
+        self.assertTrue(torch.allclose(received['w'], params['w'], atol=1e-3))
+        self.assertEqual(msg.get_dict()['params_precision'], 'bf16')
+        self.assertEqual(msg.get_dict()['params']['w']['values'].dtype, np.uint16)
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
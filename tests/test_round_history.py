@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from fedbiomed.common.exceptions import FedbiomedValueError
+from fedbiomed.common.serializer import Serializer
+from fedbiomed.researcher.round_history import RoundHistory
+
+
+class TestRoundHistory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def _params_file(self, name, value):
+        path = os.path.join(self.tempdir.name, f"{name}.mpk")
+        Serializer.dump_params({'w': np.full(4, value, dtype=float)}, path)
+        return path
+
+    def test_round_history_01_aggregated_params(self):
+        """Parameters of older rounds are evicted, and loaded from their file on access"""
+        history = RoundHistory(retained_rounds=2)
+        for round_ in range(5):
+            history[round_] = {'params': {'w': np.full(4, round_, dtype=float)},
+                               'params_path': self._params_file(f"agg_{round_}", round_)}
+
+        stored = dict(history.stored_items())
+        self.assertListEqual([round_ for round_, entry in stored.items() if 'params' in entry], [3, 4])
+        self.assertListEqual(list(history), [0, 1, 2, 3, 4])
+
+        # evicted parameters are loaded, but not kept in memory
+        np.testing.assert_array_equal(history[1]['params']['w'], np.full(4, 1.))
+        np.testing.assert_array_equal(history.get(0)['params']['w'], np.zeros(4))
+        self.assertNotIn('params', dict(history.stored_items())[1])
+        self.assertTrue(all('params' in entry for entry in history.values()))
+        self.assertIs(history[4], stored[4])
+        self.assertIsNone(history.get(5))
+
+        # retention can be changed
+        history.retained_rounds = 1
+        self.assertNotIn('params', dict(history.stored_items())[3])
+        del history[4]
+        self.assertNotIn(4, history)
+
+    def test_round_history_02_training_replies(self):
+        """Parameters of training replies are evicted node by node, other fields are kept"""
+        history = RoundHistory(retained_rounds=1)
+        for round_ in range(3):
+            history[round_] = {
+                node_id: {'node_id': node_id, 'timing': {'rtime_total': 1.},
+                          'params': {'w': np.zeros(4)},
+                          'params_path': self._params_file(f"{node_id}_{round_}", round_)}
+                for node_id in ('node-1', 'node-2')
+            }
+
+        stored = dict(history.stored_items())
+        self.assertNotIn('params', stored[0]['node-1'])
+        self.assertEqual(stored[0]['node-2']['node_id'], 'node-2')
+        self.assertIn('params', stored[2]['node-1'])
+
+        replies = history[1]
+        np.testing.assert_array_equal(replies['node-2']['params']['w'], np.full(4, 1.))
+        self.assertDictEqual(replies['node-2']['timing'], {'rtime_total': 1.})
+        self.assertNotIn('params', dict(history.stored_items())[1]['node-2'])
+
+    def test_round_history_03_bounded_memory(self):
+        """Only the parameters of the retained rounds are held, whatever the number of rounds"""
+        history = RoundHistory(retained_rounds=2)
+        path = self._params_file("agg", 0.)
+        for round_ in range(1000):
+            history[round_] = {'params': {'w': np.zeros(1000)}, 'params_path': path}
+        held = sum('params' in entry for _, entry in history.stored_items())
+        self.assertEqual(held, 2)
+
+        # entries without parameters file, or other values, are kept as they are
+        history = RoundHistory(retained_rounds=1)
+        history.update({0: {'params': 1, 'params_path': None}, 1: 'un', 2: {}})
+        self.assertDictEqual(history, {0: {'params': 1, 'params_path': None}, 1: 'un', 2: {}})
+
+        # no retention bound
+        history = RoundHistory()
+        history.update({round_: {'params': round_, 'params_path': path} for round_ in range(10)})
+        self.assertEqual(sum('params' in entry for _, entry in history.stored_items()), 10)
+
+    def test_round_history_04_errors(self):
+        """Bad number of retained rounds"""
+        for retained_rounds in (0, -1, 1.5, True, 'two'):
+            with self.assertRaises(FedbiomedValueError):
+                RoundHistory(retained_rounds)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
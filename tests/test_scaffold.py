@@ -6,6 +6,7 @@ from fedbiomed.common.exceptions import FedbiomedAggregatorError
 from fedbiomed.common.optimizers.generic_optimizers import NativeTorchOptimizer
 from fedbiomed.common.training_args import TrainingArgs
 from fedbiomed.common.training_plans import TorchTrainingPlan
+from fedbiomed.researcher.aggregators.executor import AggregationExecutor
 from fedbiomed.researcher.aggregators.fedavg import FedAverage
 from fedbiomed.researcher.aggregators.functional import federated_averaging
 from fedbiomed.researcher.datasets import FederatedDataSet
@@ -197,6 +198,68 @@ class TestScaffold(ResearcherTestCase):
             for layer in deltas.values():
                 self.assertFalse(torch.nonzero(layer).all())
 
+    def test_4_aggregate_flat(self):
+        """Test that aggregation on flat buffers gives the same result as layer by layer."""
+        training_plan = MagicMock()
+        training_plan.get_model_params = MagicMock(return_value = Linear(10, 3).state_dict())
+        weights = {node_id: 1./self.n_nodes for node_id in self.node_ids}
+        global_model = {key: torch.randn_like(val) for key, val in self.zero_model.state_dict().items()}
+
+        results = []
+        for agg in (Scaffold(server_lr=.2, fds=self.fds), Scaffold(server_lr=.2, fds=self.fds, flat=True)):
+            results.append(agg.aggregate(
+                model_params=copy.deepcopy(self.models),
+                weights=weights,
+                global_model=copy.deepcopy(global_model),
+                training_plan=training_plan,
+                training_replies=self.replies,
+                n_round=0
+            ))
+
+        expected, flat = results
+        self.assertListEqual(list(flat), list(expected))
+        for key, value in expected.items():
+            self.assertTrue(torch.allclose(flat[key], value, atol=1e-6))
+
+    def test_4b_aggregate_executor(self):
+        """Test that aggregation on shards of the model layers gives the same result and states."""
+        training_plan = MagicMock()
+        training_plan.get_model_params = MagicMock(return_value = Linear(10, 3).state_dict())
+        weights = {node_id: 1./self.n_nodes for node_id in self.node_ids}
+        global_model = {key: torch.randn_like(val) for key, val in self.zero_model.state_dict().items()}
+
+        expected = Scaffold(server_lr=.2, fds=self.fds)
+        expected_params = expected.aggregate(
+            model_params=copy.deepcopy(self.models),
+            weights=weights,
+            global_model=copy.deepcopy(global_model),
+            training_plan=training_plan,
+            training_replies=self.replies,
+            n_round=0
+        )
+        for flat in (False, True):
+            agg = Scaffold(server_lr=.2, fds=self.fds, flat=flat,
+                           executor=AggregationExecutor(max_workers=2, min_shard_size=1))
+            params = agg.aggregate(
+                model_params=copy.deepcopy(self.models),
+                weights=weights,
+                global_model=copy.deepcopy(global_model),
+                training_plan=training_plan,
+                training_replies=self.replies,
+                n_round=0
+            )
+            agg._executor.shutdown()
+
+            self.assertListEqual(list(params), list(expected_params))
+            for key, value in expected_params.items():
+                self.assertTrue(torch.allclose(params[key], value, atol=1e-6))
+            for key, value in expected.global_state.items():
+                self.assertTrue(torch.allclose(agg.global_state[key], value))
+            for node_id, deltas in expected.nodes_deltas.items():
+                self.assertListEqual(list(agg.nodes_deltas[node_id]), list(deltas))
+                for key, value in deltas.items():
+                    self.assertTrue(torch.allclose(agg.nodes_deltas[node_id][key], value))
+
     def test_5_setting_scaffold_with_wrong_parameters(self):
         """test_5_setting_scaffold_with_wrong_parameters: tests that scaffold is
         returning an error when set with incorrect parameters
@@ -5,8 +5,9 @@ from unittest.mock import patch
 
 from gmpy2 import mpz
 
-from fedbiomed.common.secagg import SecaggCrypter, EncryptedNumber
-from fedbiomed.common.secagg._jls import PublicParam
+from fedbiomed.common.constants import VEParameters
+from fedbiomed.common.secagg import CiphertextAccumulator, CiphertextVector, SecaggCrypter, EncryptedNumber
+from fedbiomed.common.secagg._jls import JLSPool, PublicParam
 from fedbiomed.common.exceptions import FedbiomedSecaggCrypterError
 
 
@@ -70,10 +71,12 @@ class TestSecaggCrypter(unittest.TestCase):
                                              biprime=TestSecaggCrypter.biprime,
                                              key=key)
 
-        self.assertIsInstance(result, list)
+        self.assertIsInstance(result, CiphertextVector)
+        self.assertEqual(result.width, TestSecaggCrypter.biprime.bit_length() * 2 // 8)
 
-        # IMPORTANT = Bit size can change based on current_round and num_nodes
-        self.assertEqual(ceil(log2(int(result[0]))), TestSecaggCrypter.biprime.bit_length() * 2)
+        # ciphertexts are integers modulo biprime ** 2, parameters are packed in a single ciphertext
+        self.assertEqual(len(result), 1)
+        self.assertLess(int(result.to_mpz()[0]), TestSecaggCrypter.biprime ** 2)
 
         with self.assertRaises(FedbiomedSecaggCrypterError):
             result = self.secagg_crypter.encrypt(num_nodes=num_nodes,
@@ -133,10 +136,18 @@ class TestSecaggCrypter(unittest.TestCase):
                                                total_sample_size=8)
 
         print(result)
-        self.assertEqual(len(result), len(params))
         self.assertTrue(result[0] > 0.4 or result[0] < 0.6,
                         "Secure aggregation result is not closer to expected avereage")
 
+        # Ciphertexts can also be given as lists of integers
+        result_ints = self.secagg_crypter.aggregate(current_round=current_round,
+                                                    num_nodes=num_nodes,
+                                                    params=[[int(c) for c in node_1.to_mpz()], node_2],
+                                                    biprime=TestSecaggCrypter.biprime,
+                                                    key=-20,
+                                                    total_sample_size=8)
+        self.assertListEqual(result_ints, result)
+
         # Test failure of JLS aggregate
         # If num of nodes does not match the number of parameters provided
         with patch("fedbiomed.common.secagg._secagg_crypter.SecaggCrypter._convert_to_encrypted_number") as m:
@@ -181,6 +192,175 @@ class TestSecaggCrypter(unittest.TestCase):
                                           biprime=TestSecaggCrypter.biprime,
                                           total_sample_size=8)
 
+    def test_secagg_crypter_04_parallel(self):
+        """Tests encryption and decryption in a pool of processes"""
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            SecaggCrypter(max_workers=0)
+
+        crypter = SecaggCrypter(max_workers=2)
+        crypter._jls._pool._min_shard_size = 1
+        params = [0.5, 0.8, -0.5, 0.0] * 100
+        kwargs = dict(num_nodes=2, current_round=2, params=params, biprime=TestSecaggCrypter.biprime)
+        try:
+            node_1 = crypter.encrypt(key=10, **kwargs)
+            self.assertEqual(node_1, self.secagg_crypter.encrypt(key=10, **kwargs))
+            node_2 = crypter.encrypt(key=10, **kwargs)
+
+            result = crypter.aggregate(current_round=2, num_nodes=2, params=[node_1, node_2],
+                                       biprime=TestSecaggCrypter.biprime, key=-20, total_sample_size=8)
+            # workers are spawned, not forked
+            self.assertEqual(crypter._pool._pool._mp_context.get_start_method(), 'spawn')
+        finally:
+            crypter.shutdown()
+        self.assertIsNone(crypter._pool._pool)
+
+        self.assertListEqual(result, self.secagg_crypter.aggregate(
+            current_round=2, num_nodes=2, params=[node_1, node_2],
+            biprime=TestSecaggCrypter.biprime, key=-20, total_sample_size=8))
+
+    def test_secagg_crypter_05_packing(self):
+        """Tests packing of several parameters in each ciphertext"""
+        num_nodes = 2
+        ratio = self.secagg_crypter.compression_ratio(num_nodes)
+        self.assertEqual(ratio, (VEParameters.KEY_SIZE // 2 - 1) // (
+            ceil(log2(VEParameters.TARGET_RANGE * VEParameters.WEIGHT_RANGE)) + ceil(log2(num_nodes + 1))))
+
+        # lowest value of the clipping range is quantized to 0, also at the end of a ciphertext
+        params = [-3.] * ratio + [2.9, -3., 0.5] * ratio + [-3.]
+        weight = VEParameters.WEIGHT_RANGE - 1
+        kwargs = dict(num_nodes=num_nodes, current_round=1, params=params, biprime=TestSecaggCrypter.biprime,
+                      weight=weight)
+        node_1 = self.secagg_crypter.encrypt(key=10, **kwargs)
+        node_2 = self.secagg_crypter.encrypt(key=10, **kwargs)
+        self.assertEqual(len(node_1), ceil(len(params) / ratio))
+
+        # sums of weighted parameters do not fit in 32 bits
+        result = self.secagg_crypter.aggregate(current_round=1, num_nodes=num_nodes, params=[node_1, node_2],
+                                               biprime=TestSecaggCrypter.biprime, key=-20,
+                                               total_sample_size=num_nodes * weight)
+        self.assertEqual(len(result), len(params))
+        for r, p in zip(result, params):
+            self.assertAlmostEqual(r, p, delta=1e-3)
+
+    def test_secagg_crypter_06_precompute_masks(self):
+        """Tests encryption and aggregation with masks computed in the background"""
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            self.secagg_crypter.precompute_masks(num_nodes=2, current_round=1, num_params=10, key='key',
+                                                 biprime=TestSecaggCrypter.biprime)
+
+        params = [0.5, 0.8, -0.5, 0.0] * 20
+        kwargs = dict(num_nodes=2, current_round=2, biprime=TestSecaggCrypter.biprime)
+        expected = self.secagg_crypter.encrypt(params=params, key=10, **kwargs)
+        expected_factor = self.secagg_crypter.encrypt(params=[.5], key=10, **kwargs)
+
+        crypter = SecaggCrypter()
+        crypter.precompute_masks(num_params=len(params), key=10, **kwargs)
+        self.assertEqual(list(crypter._pool._precomputed.values())[0][1], 3)
+        with patch.object(JLSPool, '_compute') as compute:
+            # encryption factor uses the masks of the first ciphertext
+            self.assertEqual(crypter.encrypt(params=params, key=10, **kwargs), expected)
+            self.assertEqual(crypter.encrypt(params=[.5], key=10, **kwargs), expected_factor)
+            compute.assert_not_called()
+
+        crypter.precompute_masks(num_params=len(params), key=-20, **kwargs)
+        with patch.object(JLSPool, '_compute') as compute:
+            result = crypter.aggregate(current_round=2, num_nodes=2, params=[expected, expected],
+                                       biprime=TestSecaggCrypter.biprime, key=-20, total_sample_size=2)
+            compute.assert_not_called()
+        crypter._pool.shutdown()
+
+        self.assertListEqual(result, self.secagg_crypter.aggregate(
+            current_round=2, num_nodes=2, params=[expected, expected],
+            biprime=TestSecaggCrypter.biprime, key=-20, total_sample_size=2))
+
+    def test_secagg_crypter_07_decrypt_sum(self):
+        """Tests decryption of encrypted parameters summed as they are received"""
+        params = [0.5, 0.8, -0.5, 0.0] * 20
+        kwargs = dict(num_nodes=2, current_round=2, biprime=TestSecaggCrypter.biprime)
+        node_1 = self.secagg_crypter.encrypt(params=params, key=10, **kwargs)
+        node_2 = self.secagg_crypter.encrypt(params=params, key=10, **kwargs)
+
+        summed = CiphertextAccumulator(TestSecaggCrypter.biprime)
+        summed.add(node_1)
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            # all nodes are not summed
+            self.secagg_crypter.decrypt_sum(current_round=2, num_nodes=2, summed=summed, key=-20,
+                                            biprime=TestSecaggCrypter.biprime, total_sample_size=2)
+        summed.add(node_2)
+        result = self.secagg_crypter.decrypt_sum(current_round=2, num_nodes=2, summed=summed, key=-20,
+                                                 biprime=TestSecaggCrypter.biprime, total_sample_size=2)
+        self.assertListEqual(result, self.secagg_crypter.aggregate(
+            current_round=2, num_nodes=2, params=[node_1, node_2],
+            biprime=TestSecaggCrypter.biprime, key=-20, total_sample_size=2))
+
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            self.secagg_crypter.decrypt_sum(current_round=2, num_nodes=2, summed=[node_1, node_2], key=-20,
+                                            biprime=TestSecaggCrypter.biprime, total_sample_size=2)
+
+
+class TestCiphertextAccumulator(unittest.TestCase):
+
+    def test_ciphertext_accumulator_01_add(self):
+        """Tests homomorphic summation of ciphertext vectors"""
+        accumulator = CiphertextAccumulator(biprime=11)
+        self.assertEqual(len(accumulator), 0)
+        self.assertListEqual(accumulator.to_mpz(), [])
+
+        accumulator.add(CiphertextVector.from_ints([2, 3, 200], width=2))
+        accumulator.add([5, 7, 1])
+        accumulator.add(CiphertextVector.from_ints([10, 10, 10], width=2))
+        self.assertEqual(accumulator.count, 3)
+        self.assertEqual(len(accumulator), 3)
+        # ciphertexts are multiplied modulo the square of the biprime
+        self.assertListEqual(accumulator.to_mpz(), [100 % 121, 210 % 121, 2000 % 121])
+        self.assertIsInstance(accumulator.to_mpz()[0], type(mpz(0)))
+
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            accumulator.add([1, 2])
+
+        accumulator.reset()
+        self.assertEqual(accumulator.count, 0)
+        accumulator.add([1, 2])
+        self.assertListEqual(accumulator.to_mpz(), [1, 2])
+
+
+class TestCiphertextVector(unittest.TestCase):
+
+    def test_ciphertext_vector_01_pack_unpack(self):
+        """Tests packing of ciphertexts into a vector"""
+        values = [0, 1, 2**64 + 3, 2**127]
+        vector = CiphertextVector.from_ints([mpz(v) for v in values], width=16)
+
+        self.assertEqual(len(vector), 4)
+        self.assertEqual(vector.width, 16)
+        self.assertEqual(len(vector.data), 64)
+        self.assertEqual(vector.to_mpz(), values)
+        self.assertIsInstance(vector.to_mpz()[0], type(mpz(0)))
+
+        self.assertEqual(vector, CiphertextVector(memoryview(bytes(vector.data)), 16))
+        self.assertNotEqual(vector, CiphertextVector(vector.data, 32))
+
+        # big-endian layout, converted by batches of ciphertexts
+        values = [2**128 - 1 - i * 255 for i in range(5000)] + [256]
+        vector = CiphertextVector.from_ints(values, width=16)
+        self.assertEqual(vector.data, b"".join(v.to_bytes(16, "big") for v in values))
+        self.assertEqual(vector.to_mpz(), values)
+        self.assertEqual(len(CiphertextVector.from_ints([], width=16)), 0)
+        self.assertEqual(CiphertextVector.from_ints([], width=16).to_mpz(), [])
+
+    def test_ciphertext_vector_02_errors(self):
+        """Tests errors on invalid vectors"""
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            CiphertextVector.from_ints([2**128], width=16)
+
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            CiphertextVector.from_ints([1, -1], width=16)
+
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            CiphertextVector(bytes(10), width=16)
+
+        with self.assertRaises(FedbiomedSecaggCrypterError):
+            CiphertextVector(bytes(10), width=0)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
+import functools
 import unittest
 from unittest.mock import patch
 
 from testsupport.base_case import ResearcherTestCase
 from testsupport.base_mocks import MockRequestGrpc
+from testsupport.fake_researcher_secagg import FAKE_BIPRIME
 
+from fedbiomed.common.secagg import SecaggCrypter
 from fedbiomed.researcher.environ import environ
 from fedbiomed.researcher.secagg import SecureAggregation
-from fedbiomed.common.exceptions import FedbiomedSecureAggregationError, FedbiomedSecaggError
+from fedbiomed.common.exceptions import FedbiomedSecureAggregationError, FedbiomedSecaggError, \
+    FedbiomedSecaggCrypterError
 
 
 class TestSecureAggregation(ResearcherTestCase):
@@ -156,44 +160,50 @@ class TestSecureAggregation(ResearcherTestCase):
         self.secagg._biprime._status = True
         self.secagg._servkey._status = True
 
-        # Force to set context
-        self.secagg._biprime._context = {'context': {'biprime': 1234}}
-        self.secagg._servkey._context = {'context': {'server_key': 1234}}
+        # Force to set context, nodes encrypt with keys 10 and 10
+        self.secagg._biprime._context = {'context': {'biprime': FAKE_BIPRIME}}
+        self.secagg._servkey._context = {'context': {'server_key': -20}}
+
+        encrypt = functools.partial(SecaggCrypter().encrypt, num_nodes=2, current_round=1, key=10,
+                                    biprime=FAKE_BIPRIME, weight=50)
+        params = [.1, -.2, .3, 0., -3.]
+        model_params = {'node-1': encrypt(params=params), 'node-2': encrypt(params=params)}
+        encryption_factors = {'node-1': encrypt(params=[.5]), 'node-2': encrypt(params=[.5])}
 
         # raises error if secagg_random is set but encryption factors are not provided
         with self.assertRaises(FedbiomedSecureAggregationError):
             self.secagg.aggregate(round_=1,
                                   total_sample_size=100,
-                                  model_params={'node-1': [1, 2, 3, 4, 5], 'node-2': [1, 2, 3, 4, 5]},
+                                  model_params=model_params,
                                   )
 
         # Aggregation without secagg_random validation
         self.secagg._secagg_random = None
         agg_params = self.secagg.aggregate(round_=1,
                                            total_sample_size=100,
-                                           model_params={'node-1': [1, 2, 3, 4, 5], 'node-2': [1, 2, 3, 4, 5]},
-                                           encryption_factors={'node-1': [1], 'node-2': [1]}
+                                           model_params=model_params,
+                                           encryption_factors=encryption_factors
                                            )
         self.assertTrue(len(agg_params) == 5)
 
-        # IMPORTANT: this value has been set for biprime 1234 and servkey 1234
-        # aggregation of [1], [1] will be closer to -2.9988
-        self.secagg._secagg_random = -2.9988
-
+        # aggregation of encryption factors [.5], [.5] is .5
+        self.secagg._secagg_random = .5
         agg_params = self.secagg.aggregate(round_=1,
                                            total_sample_size=100,
-                                           model_params={'node-1': [1, 2, 3, 4, 5], 'node-2': [1, 2, 3, 4, 5]},
-                                           encryption_factors={'node-1': [1], 'node-2': [1]}
+                                           model_params=model_params,
+                                           encryption_factors=encryption_factors
                                            )
         self.assertTrue(len(agg_params) == 5)
+        for agg, param in zip(agg_params, params):
+            self.assertAlmostEqual(agg, param, delta=1e-3)
 
         # Will fail since secagg random is not correctly decrypted
         with self.assertRaises(FedbiomedSecureAggregationError):
             self.secagg._secagg_random = 2.9988
             self.secagg.aggregate(round_=1,
                                   total_sample_size=100,
-                                  model_params={'node-1': [1, 2, 3, 4, 5], 'node-2': [1, 2, 3, 4, 5]},
-                                  encryption_factors={'node-1': [1], 'node-2': [1]}
+                                  model_params=model_params,
+                                  encryption_factors=encryption_factors
                                   )
 
     def test_secure_aggregation_09_save_state_breakpoint(self):
@@ -237,6 +247,68 @@ class TestSecureAggregation(ResearcherTestCase):
 
         pass
 
+    def test_secure_aggregation_11_precompute_masks(self):
+        """Tests precomputation of the decryption masks"""
+        with patch.object(SecaggCrypter, 'precompute_masks') as precompute:
+            # Does nothing before setup
+            self.secagg.precompute_masks(round_=1, num_params=100)
+            self.secagg.setup(parties=[environ["ID"], "node-1", "node-2"], job_id="exp-id-1")
+            self.secagg.precompute_masks(round_=1, num_params=100)
+            precompute.assert_not_called()
+
+            self.secagg._biprime._status = True
+            self.secagg._servkey._status = True
+            self.secagg._biprime._context = {'context': {'biprime': FAKE_BIPRIME}}
+            self.secagg._servkey._context = {'context': {'server_key': -20}}
+            self.secagg.precompute_masks(round_=1, num_params=100)
+            precompute.assert_called_once_with(num_nodes=2, current_round=1, num_params=100, key=-20,
+                                               biprime=FAKE_BIPRIME)
+
+            # Precomputation errors are not raised, masks are computed when aggregating
+            precompute.side_effect = FedbiomedSecaggCrypterError
+            self.secagg.precompute_masks(round_=1, num_params=100)
+
+    def test_secure_aggregation_12_accumulate(self):
+        """Tests summation of encrypted parameters as soon as they are received"""
+        # Does nothing before setup
+        self.secagg.accumulate('node-1', [1, 2, 3])
+        self.assertIsNone(self.secagg._accumulator)
+
+        self.secagg.setup(parties=[environ["ID"], "node-1", "node-2"], job_id="exp-id-1")
+        self.secagg._biprime._status = True
+        self.secagg._servkey._status = True
+        self.secagg._biprime._context = {'context': {'biprime': FAKE_BIPRIME}}
+        self.secagg._servkey._context = {'context': {'server_key': -20}}
+        self.secagg._secagg_random = None
+
+        encrypt = functools.partial(SecaggCrypter().encrypt, num_nodes=2, current_round=1, key=10,
+                                    biprime=FAKE_BIPRIME, weight=50)
+        params = [.1, -.2, .3, 0., -3.]
+        model_params = {'node-1': encrypt(params=params), 'node-2': encrypt(params=params)}
+        self.secagg.reset_accumulator()
+        for node_id, node_params in model_params.items():
+            self.secagg.accumulate(node_id, node_params)
+        self.assertListEqual(self.secagg._accumulated_nodes, ['node-1', 'node-2'])
+
+        # parameters summed when received are not summed again
+        with patch.object(SecaggCrypter, 'aggregate') as aggregate:
+            agg_params = self.secagg.aggregate(round_=1, total_sample_size=100, model_params=model_params)
+            aggregate.assert_not_called()
+        for agg, param in zip(agg_params, params):
+            self.assertAlmostEqual(agg, param, delta=1e-3)
+        self.assertIsNone(self.secagg._accumulator)
+
+        # parameters of other nodes than the summed ones are aggregated all at once
+        self.secagg.accumulate('node-1', model_params['node-1'])
+        self.assertListEqual(self.secagg.aggregate(round_=1, total_sample_size=100, model_params=model_params),
+                             agg_params)
+
+        # parameters that cannot be summed are left to aggregation
+        self.secagg.accumulate('node-1', model_params['node-1'])
+        self.secagg.accumulate('node-2', [1, 2])
+        self.assertIsNone(self.secagg._accumulator)
+        self.assertListEqual(self.secagg._accumulated_nodes, [])
+
 
 if __name__ == "__main__":
     unittest.main()
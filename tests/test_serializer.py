@@ -14,8 +14,9 @@ import torch
 from declearn.model.sklearn import NumpyVector
 from declearn.model.torch import TorchVector
 
-from fedbiomed.common.exceptions import FedbiomedTypeError
+from fedbiomed.common.exceptions import FedbiomedTypeError, FedbiomedValueError
 from fedbiomed.common.logger import logger
+from fedbiomed.common.secagg import CiphertextVector
 from fedbiomed.common.serializer import Serializer
 
 
@@ -153,6 +154,133 @@ class TestSerializer(unittest.TestCase):
         }
         self.assert_serializable(obj)
 
+    def test_serializer_11_dumps_fields(self) -> None:
+        """Test that fields serialized separately can be spliced into a map."""
+        obj = {
+            "str": "test",
+            "vec": np.random.normal(size=(4, 8)),
+            "dct": {"int": 1},
+        }
+        shared = Serializer.dumps_fields({"vec": obj["vec"], "dct": obj["dct"]})
+        data = Serializer.dumps_map_header(len(obj)) + Serializer.dumps_fields({"str": "test"}) + shared
+        bis = Serializer.loads(data)
+        self.assertEqual(bis.keys(), obj.keys())
+        self.assertTrue(np.array_equal(bis["vec"], obj["vec"]))
+        self.assertEqual(bis["dct"], obj["dct"])
+        self.assertEqual(Serializer.dumps_fields({}), b"")
+
+    def test_serializer_12_array_views(self) -> None:
+        """Test that arrays and tensors are decoded as views on the payload."""
+        obj = {
+            "array": np.arange(24, dtype=np.float32).reshape(2, 3, 4)[:, ::2],
+            "scalar": np.array(1.5),
+            "empty": np.zeros((0, 3), dtype=np.int64),
+            "tensor": torch.randn(size=(4, 8), requires_grad=True),
+        }
+        data = Serializer.dumps(obj)
+        bis = Serializer.loads(data)
+        for key in ("array", "scalar", "empty"):
+            self.assertEqual(bis[key].dtype, obj[key].dtype)
+            self.assertTrue(np.array_equal(bis[key], obj[key]))
+            # decoded arrays are read-only views, not copies
+            self.assertFalse(bis[key].flags.writeable)
+            self.assertFalse(bis[key].flags.owndata)
+        self.assertTrue(torch.equal(bis["tensor"], obj["tensor"].detach()))
+        # tensors are copied out of the immutable payload, and can be modified in place
+        bis["tensor"] += 1.
+        self.assertTrue(torch.equal(Serializer.loads(data)["tensor"], obj["tensor"].detach()))
+        # arrays are not wrapped into msgpack maps
+        with mock.patch.object(Serializer, "_object_hook") as p_hook:
+            Serializer.loads(data)
+        p_hook.assert_called_once()
+
+    def test_serializer_13_legacy_arrays(self) -> None:
+        """Test that arrays encoded as '__type__' maps can still be loaded."""
+        array = np.random.normal(size=(4, 8))
+        obj = {
+            "array": {"__type__": "np.ndarray", "value": [array.tobytes(), "float64", [4, 8]]},
+            "tensor": {"__type__": "torch.Tensor", "value": [array.tobytes(), "float64", [4, 8]]},
+        }
+        bis = Serializer.loads(Serializer.dumps(obj))
+        self.assertTrue(np.array_equal(bis["array"], array))
+        self.assertTrue(torch.equal(bis["tensor"], torch.from_numpy(array)))
+
+    def test_serializer_14_params_file(self) -> None:
+        """Test that parameters files are written and mapped layer by layer."""
+        params = {
+            "weight": torch.randn(size=(16, 8)),
+            "bias": np.random.normal(size=(8,)).astype(np.float32),
+            "scalar": np.array(3, dtype=np.int16),
+            "empty": torch.zeros(0),
+            "other": {"tuple": (1, 2), "str": "test"},
+        }
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "params.mpk")
+            Serializer.dump_params(params, path)
+            self.assertListEqual(os.listdir(folder), ["params.mpk"])
+            loaded = Serializer.load_params(path)
+            # 'load' also supports parameters files
+            self.assertListEqual(list(Serializer.load(path)), list(params))
+
+            self.assertListEqual(list(loaded), list(params))
+            self.assertTrue(torch.equal(loaded["weight"], params["weight"]))
+            self.assertTrue(torch.equal(loaded["empty"], params["empty"]))
+            # tensors are views on the mapped file
+            self.assertEqual(loaded["weight"].data_ptr() % 16, 0)
+            self.assertFalse(loaded["weight"].numpy().flags.owndata)
+            for key in ("bias", "scalar"):
+                self.assertEqual(loaded[key].dtype, params[key].dtype)
+                self.assertTrue(np.array_equal(loaded[key], params[key]))
+                self.assertEqual(loaded[key].ctypes.data % 16, 0)
+            self.assertDictEqual(loaded["other"], params["other"])
+
+            # mapping is copy-on-write, the file is not modified
+            loaded["bias"] += 1.
+            self.assertTrue(np.array_equal(Serializer.load_params(path)["bias"], params["bias"]))
+
+            # overwriting the file keeps the parameters already mapped valid
+            Serializer.dump_params({"weight": torch.zeros(2)}, path)
+            self.assertTrue(torch.equal(loaded["weight"], params["weight"]))
+            self.assertListEqual(list(Serializer.load_params(path)), ["weight"])
+
+    def test_serializer_15_params_file_errors(self) -> None:
+        """Test that 'load_params' raises on files of another format."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "params.mpk")
+            Serializer.dump({"weight": np.zeros(2)}, path)
+            with self.assertRaises(FedbiomedValueError):
+                Serializer.load_params(path)
+            self.assertListEqual(list(Serializer.load(path)), ["weight"])
+
+    def test_serializer_16_ciphertext_vector(self) -> None:
+        """Test that secagg ciphertext vectors are serialized as a single buffer."""
+        vector = CiphertextVector.from_ints([2**4095 + i for i in range(100)], width=512)
+        data = Serializer.dumps({"params": vector})
+        self.assertLess(len(data), 100 * 512 + 32)
+
+        bis = Serializer.loads(data)["params"]
+        self.assertIsInstance(bis, CiphertextVector)
+        self.assertEqual(bis, vector)
+        self.assertEqual(bis.to_mpz()[99], 2**4095 + 99)
+
+    def test_serializer_17_ciphertext_vector_file(self) -> None:
+        """Test that files holding a single secagg ciphertext vector are mapped."""
+        vector = CiphertextVector.from_ints([2**4095 + i for i in range(100)], width=512)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "params.mpk")
+            Serializer.dump(vector, path)
+            bis = Serializer.load(path)
+            self.assertIsInstance(bis, CiphertextVector)
+            self.assertIsInstance(bis.data, memoryview)
+            self.assertEqual(bis, vector)
+
+            # vectors in other objects are read from the file
+            Serializer.dump([vector], path)
+            self.assertEqual(Serializer.load(path), [vector])
+            # small vectors are read from the file
+            Serializer.dump(CiphertextVector.from_ints([1], width=4), path)
+            self.assertEqual(Serializer.load(path), CiphertextVector.from_ints([1], width=4))
+
 
 if __name__ == "__main__":
     unittest.main()
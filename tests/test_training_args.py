@@ -162,6 +162,20 @@ class TestTrainingArgs(unittest.TestCase):
         with self.assertRaises(FedbiomedUserInputError):
             t ^= {"test_metric_args": "not a dict"}
 
+    def test_training_args_05_transport_precision(self):
+        """
+        test transport precision validator
+        """
+        t = TrainingArgs()
+        self.assertIsNone(t['transport_precision'])
+
+        t ^= {"transport_precision": "int8"}
+        self.assertEqual(t['transport_precision'], "int8")
+
+        with self.assertRaises(FedbiomedUserInputError):
+            t ^= {"transport_precision": "fp8"}
+        self.assertEqual(t['transport_precision'], "int8")
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import MagicMock
+
+from fedbiomed.node.training_plan_cache import CachedTrainingPlan, TrainingPlanCache
+
+
+class TestTrainingPlanCache(unittest.TestCase):
+
+    @staticmethod
+    def entry(source: str) -> CachedTrainingPlan:
+        return CachedTrainingPlan(source=source, class_name='TP', module=MagicMock(), training_plan_class=MagicMock)
+
+    def test_training_plan_cache_01_get_add(self):
+        cache = TrainingPlanCache()
+        self.assertIsNone(cache.get('hash-1'))
+
+        entry = self.entry('source-1')
+        cache.add('hash-1', entry)
+
+        self.assertEqual(len(cache), 1)
+        self.assertIs(cache.get('hash-1'), entry)
+
+    def test_training_plan_cache_02_evicts_least_recently_used(self):
+        cache = TrainingPlanCache(max_size=2)
+        cache.add('hash-1', self.entry('source-1'))
+        cache.add('hash-2', self.entry('source-2'))
+
+        # using hash-1 makes hash-2 the least recently used
+        cache.get('hash-1')
+        cache.add('hash-3', self.entry('source-3'))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('hash-2'))
+        self.assertEqual(cache.get('hash-1').source, 'source-1')
+        self.assertEqual(cache.get('hash-3').source, 'source-3')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+from unittest.mock import patch
+
+from fedbiomed.common.exceptions import FedbiomedCommunicationError
+from fedbiomed.common.serializer import Serializer
+from fedbiomed.transport.chunks import ChunkBuffer, TransferStore, chunk_count, iter_chunks
+
+
+class TestChunkBuffer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.buffer = ChunkBuffer()
+
+    def test_chunk_buffer_01_add_view(self):
+
+        message = bytes(range(256)) * 10
+        chunks = [message[i:i + 1000] for i in range(0, len(message), 1000)]
+
+        for chunk in chunks:
+            self.buffer.add(chunk, len(chunks))
+
+        view = self.buffer.view()
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(len(self.buffer), len(message))
+        self.assertEqual(view.tobytes(), message)
+
+    def test_chunk_buffer_02_longer_chunks(self):
+
+        # chunks longer than the first one extend the buffer
+        for chunk in [b'ab', b'cdef', b'ghijkl']:
+            self.buffer.add(chunk, 3)
+
+        self.assertEqual(self.buffer.view().tobytes(), b'abcdefghijkl')
+
+    def test_chunk_buffer_03_reset(self):
+
+        self.assertEqual(self.buffer.view().tobytes(), b'')
+
+        self.buffer.add(b'first', 1)
+        view = self.buffer.view()
+        self.buffer.reset()
+        self.assertEqual(len(self.buffer), 0)
+
+        self.buffer.add(b'second', 1)
+        self.assertEqual(self.buffer.view().tobytes(), b'second')
+        # previous view is not affected by next message
+        self.assertEqual(view.tobytes(), b'first')
+
+    def test_chunk_buffer_04_serializer_loads(self):
+
+        data = {'researcher_id': 'r-id', 'params': {'w': [1.0, 2.0]}}
+        dump = Serializer.dumps(data)
+
+        for i in range(0, len(dump), 7):
+            self.buffer.add(dump[i:i + 7], -(-len(dump) // 7))
+
+        self.assertEqual(Serializer.loads(self.buffer.view()), data)
+
+
+class TestIterChunks(unittest.TestCase):
+
+    def test_iter_chunks_01_segments(self):
+
+        segments = [b'abc', b'', b'defghij', b'k']
+        for chunk_size in [1, 2, 3, 4, 11, 20]:
+            chunks = list(iter_chunks(segments, chunk_size))
+            self.assertEqual(len(chunks), chunk_count(segments, chunk_size))
+            self.assertEqual(b''.join(chunks), b'abcdefghijk')
+            self.assertTrue(all(len(chunk) == chunk_size for chunk in chunks[:-1]))
+            self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+
+    def test_iter_chunks_02_empty(self):
+
+        self.assertEqual(list(iter_chunks([], 4)), [])
+        self.assertEqual(list(iter_chunks([b''], 4)), [])
+        self.assertEqual(chunk_count([b''], 4), 0)
+
+    def test_iter_chunks_03_start(self):
+
+        segments = [b'abc', b'', b'defghij', b'k']
+        for chunk_size in [1, 2, 3, 4, 11]:
+            chunks = list(iter_chunks(segments, chunk_size))
+            for start in range(len(chunks) + 1):
+                self.assertEqual(list(iter_chunks(segments, chunk_size, start=start)), chunks[start:])
+
+
+class TestTransferStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.store = TransferStore()
+        self.message = bytes(range(256))
+        self.chunks = [self.message[i:i + 100] for i in range(0, len(self.message), 100)]
+
+    def test_transfer_store_01_add(self):
+
+        self.assertEqual(self.store.received('t-1'), 0)
+        self.assertIsNone(self.store.add('t-1', self.chunks[0], 1, 3))
+        self.assertIsNone(self.store.add('t-1', self.chunks[1], 2, 3))
+        self.assertEqual(self.store.received('t-1'), 2)
+
+        # chunks already received are ignored
+        self.assertIsNone(self.store.add('t-1', self.chunks[1], 2, 3))
+
+        self.assertEqual(self.store.add('t-1', self.chunks[2], 3, 3).tobytes(), self.message)
+        self.assertEqual(self.store.received('t-1'), 3)
+        self.assertIsNone(self.store.add('t-1', self.chunks[2], 3, 3))
+
+    def test_transfer_store_02_missing_chunks(self):
+
+        self.store.add('t-1', self.chunks[0], 1, 3)
+        with self.assertRaises(FedbiomedCommunicationError):
+            self.store.add('t-1', self.chunks[2], 3, 3)
+
+        # transfer is discarded, to be restarted
+        self.assertEqual(self.store.received('t-1'), 0)
+
+    @patch('fedbiomed.transport.chunks.time.monotonic')
+    def test_transfer_store_03_expiration(self, monotonic):
+
+        store = TransferStore(expiration=10)
+        monotonic.return_value = 0
+        store.add('t-1', self.chunks[0], 1, 3)
+        monotonic.return_value = 5
+        store.add('t-2', self.chunks[0], 1, 3)
+
+        monotonic.return_value = 12
+        store.add('t-3', self.chunks[0], 1, 3)
+        self.assertEqual(store.received('t-1'), 0)
+        self.assertEqual(store.received('t-2'), 1)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -5,7 +5,7 @@ import grpc
 
 
 from unittest.mock import patch, MagicMock, AsyncMock
-from fedbiomed.transport.client import GrpcClient, \
+from fedbiomed.transport.client import GrpcClient, SenderLane, \
     ClientStatus, \
     ResearcherCredentials, \
     TaskListener, \
@@ -14,10 +14,25 @@ from fedbiomed.transport.client import GrpcClient, \
 from fedbiomed.common.exceptions import FedbiomedCommunicationError
 from fedbiomed.common.message import SearchReply, FeedbackMessage, Log
 from fedbiomed.transport.protocols.researcher_pb2 import TaskResponse
+from fedbiomed.transport.compression import PayloadCompressor
+from fedbiomed.transport.limits import CHUNK_OVERHEAD, TransportLimits
+from fedbiomed.common.serializer import Serializer
 from fedbiomed.transport.protocols.researcher_pb2_grpc import ResearcherServiceStub
 from testsupport.mock import AsyncMock
 
 
+class StreamCall(MagicMock):
+    """Awaitable mock of a stream-unary call"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write = AsyncMock()
+        self.done_writing = AsyncMock()
+
+    def __await__(self):
+        return asyncio.sleep(0).__await__()
+
+
 class TestGrpcClient(unittest.IsolatedAsyncioTestCase):
 
 
@@ -244,17 +259,25 @@ class TestSender(unittest.IsolatedAsyncioTestCase):
 
 
     async def test_sender_01_send(self):
+        self.serializer_patch.stop()
 
         await self.sender.send(message=self.message_search)
-        item = await self.sender._queue.get()
-        self.assertEqual(item, {'stub': self.channels.task_stub.ReplyTask, 'message': self.message_search})
-
+        item = await self.sender._queues[SenderLane.SMALL].get()
+        self.assertEqual(item['stub'], self.channels.task_stub.ReplyTask)
+        self.assertEqual(item['message'], self.message_search)
+        self.assertEqual(item['transfer'].size, 1)
 
         await self.sender.send(message=self.message_log)
-        item = await self.sender._queue.get()
+        item = await self.sender._queues[SenderLane.CONTROL].get()
         self.assertEqual(item, {'stub': self.channels.feedback_stub.Feedback, 'message': self.message_log.to_proto()})
 
+        # replies that don't fit in one chunk are sent in bulk lane
+        self.sender._limits = TransportLimits(chunk_size=10)
+        await self.sender.send(message=self.message_search)
+        item = await self.sender._queues[SenderLane.BULK].get()
+        self.assertGreater(item['transfer'].size, 1)
 
+    @patch.dict('fedbiomed.transport.client.SENDER_LANE_CONCURRENCY', {lane: 1 for lane in SenderLane})
     async def test_sender_02_listen(self):
         self.serializer_patch.stop()
 
@@ -270,7 +293,7 @@ class TestSender(unittest.IsolatedAsyncioTestCase):
             await task
         task.cancel()
 
-        stream_call = AsyncMock()
+        stream_call = StreamCall()
         self.channels.task_stub.ReplyTask.side_effect = [stream_call, asyncio.CancelledError]
         await self.sender.send(message=self.message_search)
         await self.sender.send(message=self.message_search)
@@ -283,6 +306,106 @@ class TestSender(unittest.IsolatedAsyncioTestCase):
         stream_call.write.assert_called()
         stream_call.done_writing.assert_called()
 
+    def test_sender_03_stream_reply_compression(self):
+        self.serializer_patch.stop()
+
+        sender = Sender(
+            channels=self.channels,
+            on_status_change=self.on_status_change,
+            compressor=PayloadCompressor(codec='zlib', threshold=0)
+        )
+
+        # researcher codecs are not known yet
+        replies = list(sender._stream_reply(sender._prepare_reply(self.message_search)))
+        self.assertEqual(replies[-1].compression, '')
+        self.assertEqual(Serializer.loads(b''.join(r.bytes_ for r in replies)), self.message_search.get_dict())
+
+        sender.researcher_codecs = ['zlib']
+        replies = list(sender._stream_reply(sender._prepare_reply(self.message_search)))
+        self.assertEqual(replies[-1].compression, 'zlib')
+        payload = PayloadCompressor.decompress(b''.join(r.bytes_ for r in replies), replies[-1].compression)
+        self.assertEqual(Serializer.loads(payload), self.message_search.get_dict())
+
+    async def test_sender_04_resume_reply(self):
+        self.serializer_patch.stop()
+        self.sender._limits = TransportLimits(chunk_size=10)
+
+        transfer = self.sender._prepare_reply(self.message_search)
+        self.assertGreater(transfer.size, 3)
+
+        # first attempt streams all chunks
+        stream_call = StreamCall()
+        self.channels.task_stub.ReplyTask.return_value = stream_call
+        await self.sender._send_reply(self.channels.task_stub.ReplyTask, transfer)
+        self.assertTrue(transfer.started)
+        self.assertEqual([c.args[0].iteration for c in stream_call.write.call_args_list],
+                         list(range(1, transfer.size + 1)))
+
+        # next attempt resumes from the first chunk not received by researcher
+        stream_call = StreamCall()
+        self.channels.task_stub.ReplyTask.return_value = stream_call
+        self.channels.task_stub.GetReplyStatus = AsyncMock(return_value=MagicMock(received=2))
+        await self.sender._send_reply(self.channels.task_stub.ReplyTask, transfer)
+        self.assertEqual(self.channels.task_stub.GetReplyStatus.call_args.args[0].transfer_id, transfer.transfer_id)
+        chunks = [c.args[0] for c in stream_call.write.call_args_list]
+        self.assertEqual([c.iteration for c in chunks], list(range(3, transfer.size + 1)))
+        self.assertTrue(all(c.transfer_id == transfer.transfer_id for c in chunks))
+
+        # researcher received the whole reply
+        stream_call = StreamCall()
+        self.channels.task_stub.ReplyTask.return_value = stream_call
+        self.channels.task_stub.GetReplyStatus = AsyncMock(return_value=MagicMock(received=transfer.size))
+        await self.sender._send_reply(self.channels.task_stub.ReplyTask, transfer)
+        stream_call.write.assert_not_called()
+
+    async def test_sender_05_lanes(self):
+        """Feedback messages are not blocked by a bulk reply being sent"""
+        self.serializer_patch.stop()
+        self.sender._limits = TransportLimits(chunk_size=10)
+
+        bulk_sent = asyncio.Event()
+        feedback_sent = asyncio.Event()
+
+        stream_call = StreamCall()
+        async def write(reply):
+            # bulk reply waits until feedback was sent
+            if reply.iteration == 2:
+                await feedback_sent.wait()
+        stream_call.write = write
+        stream_call.done_writing.side_effect = bulk_sent.set
+        self.channels.task_stub.ReplyTask.return_value = stream_call
+        self.channels.feedback_stub.Feedback.side_effect = lambda _: feedback_sent.set() or asyncio.sleep(0)
+
+        await self.sender.send(message=self.message_search)
+        self.assertEqual(self.sender._queues[SenderLane.BULK].qsize(), 1)
+
+        task = self.sender.listen()
+        await asyncio.sleep(0.01)
+        self.assertFalse(bulk_sent.is_set())
+
+        await self.sender.send(message=self.message_log)
+        await asyncio.wait_for(bulk_sent.wait(), timeout=5)
+        self.assertTrue(feedback_sent.is_set())
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    def test_sender_06_negotiated_chunk_size(self):
+        self.serializer_patch.stop()
+        self.sender._limits = TransportLimits(chunk_size=100)
+
+        # researcher maximum message length is not known yet
+        transfer = self.sender._prepare_reply(self.message_search)
+        self.assertEqual(transfer.chunk_size, 100)
+
+        self.sender.researcher_max_message_length = CHUNK_OVERHEAD + 20
+        transfer = self.sender._prepare_reply(self.message_search)
+        self.assertEqual(transfer.chunk_size, 20)
+        replies = list(self.sender._stream_reply(transfer))
+        self.assertEqual(len(replies), transfer.size)
+        self.assertTrue(all(len(r.bytes_) <= 20 for r in replies))
+
     @patch('fedbiomed.transport.client.asyncio.sleep')
     async def test_sender_02_listen_exceptions(self, sleep):
 
@@ -302,7 +425,6 @@ class TestSender(unittest.IsolatedAsyncioTestCase):
         task.cancel()
 
         # Unavailable
-        retry = self.sender._retry_count 
         self.channels.feedback_stub.Feedback.side_effect = [
             grpc.aio.AioRpcError(code=grpc.StatusCode.UNAVAILABLE,
                                  trailing_metadata=grpc.aio.Metadata(('test', 'test')),
@@ -317,11 +439,10 @@ class TestSender(unittest.IsolatedAsyncioTestCase):
             await task
         task.cancel()
         sleep.assert_called()
-        self.assertEqual(self.sender._retry_count, retry+1)
+        self.channels.connect.assert_called_once()
 
 
         # Deadline
-        retry = self.sender._retry_count 
         self.channels.feedback_stub.Feedback.side_effect = [
             grpc.aio.AioRpcError(code=grpc.StatusCode.DEADLINE_EXCEEDED,
                                  trailing_metadata=grpc.aio.Metadata(('test', 'test')),
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from fedbiomed.common.exceptions import FedbiomedCommunicationError
+from fedbiomed.common.serializer import Serializer
+from fedbiomed.transport.compression import CompressionCache, PayloadCompressor, available_codecs, shuffle, \
+    unshuffle
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.payload = Serializer.dumps({
+            'researcher_id': 'r-id',
+            'params': {'w': np.ones((100, 100), dtype=np.float32)}
+        })
+
+    def test_compression_01_available_codecs(self):
+
+        self.assertIn('zlib', available_codecs())
+        self.assertEqual(PayloadCompressor().codecs, available_codecs())
+
+    def test_compression_02_shuffle(self):
+
+        for data in [b'', b'abc', bytes(range(256)), bytes(range(255))]:
+            shuffled = shuffle(data)
+            self.assertEqual(len(shuffled), len(data))
+            self.assertEqual(unshuffle(shuffled), data)
+
+        self.assertEqual(shuffle(b'abcdABCD'), b'aAbBcCdD')
+
+    def test_compression_03_compress_decompress(self):
+
+        for codec in available_codecs():
+            for shuffle_ in [False, True]:
+                compressor = PayloadCompressor(codec=codec, threshold=0, shuffle=shuffle_)
+                payload, compression, compression_time = compressor.compress([self.payload], [codec])
+
+                self.assertTrue(compression.startswith(codec))
+                self.assertLess(len(payload[0]), len(self.payload))
+                self.assertGreaterEqual(compression_time, 0)
+                self.assertEqual(PayloadCompressor.decompress(payload[0], compression), self.payload)
+
+    def test_compression_04_not_compressed(self):
+
+        # no codec
+        payload = [self.payload]
+        self.assertEqual(PayloadCompressor().compress(payload, available_codecs()), (payload, '', 0.))
+
+        # below threshold
+        compressor = PayloadCompressor(codec='zlib', threshold=len(self.payload) + 1)
+        self.assertEqual(compressor.compress(payload, ['zlib']), (payload, '', 0.))
+
+        # peer cannot decompress
+        compressor = PayloadCompressor(codec='zlib', threshold=0)
+        self.assertEqual(compressor.compress(payload, []), (payload, '', 0.))
+
+        self.assertEqual(PayloadCompressor.decompress(self.payload, ''), self.payload)
+
+    def test_compression_05_segments(self):
+
+        compressor = PayloadCompressor(codec='zlib', threshold=0)
+        payload, compression, _ = compressor.compress(
+            [self.payload[:10], self.payload[10:100], self.payload[100:]], ['zlib'])
+
+        self.assertEqual(len(payload), 1)
+        self.assertEqual(PayloadCompressor.decompress(payload[0], compression), self.payload)
+
+    def test_compression_07_cached_segments(self):
+
+        for shuffle_ in [False, True]:
+            compressor = PayloadCompressor(codec='zlib', threshold=0, shuffle=shuffle_)
+            cache = CompressionCache()
+            segments = [self.payload[:10], self.payload[10:100], self.payload[100:]]
+
+            payload, compression, _ = compressor.compress(segments, ['zlib'], [None, None, cache])
+            self.assertTrue(compression.endswith('+frames'))
+            self.assertEqual(PayloadCompressor.decompress(b''.join(payload), compression), self.payload)
+
+            # cached segment is not compressed again
+            with patch.object(compressor, '_compress_segment', wraps=compressor._compress_segment) as compress:
+                payload_2, _, _ = compressor.compress(segments, ['zlib'], [None, None, cache])
+                compress.assert_called_once_with(self.payload[:100])
+            self.assertIs(payload_2[-1], payload[-1])
+
+    def test_compression_06_unavailable_codec(self):
+
+        with self.assertRaises(FedbiomedCommunicationError):
+            PayloadCompressor(codec='unknown-codec')
+
+        with self.assertRaises(FedbiomedCommunicationError):
+            PayloadCompressor.decompress(self.payload, 'unknown-codec')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from fedbiomed.common.constants import DEFAULT_GRPC_MAX_MESSAGE_LENGTH
+from fedbiomed.common.exceptions import FedbiomedCommunicationError
+from fedbiomed.transport.limits import CHUNK_OVERHEAD, TransportLimits
+
+
+class TestTransportLimits(unittest.TestCase):
+
+    def test_transport_limits_01_init(self):
+        limits = TransportLimits(chunk_size=1000, max_message_length=CHUNK_OVERHEAD + 1000)
+        self.assertEqual(limits.chunk_size, 1000)
+        self.assertEqual(limits.max_message_length, CHUNK_OVERHEAD + 1000)
+
+        for kwargs in [{'chunk_size': 0},
+                       {'chunk_size': 1001, 'max_message_length': CHUNK_OVERHEAD + 1000},
+                       {'flow_control_window': -1}]:
+            with self.assertRaises(FedbiomedCommunicationError):
+                TransportLimits(**kwargs)
+
+    def test_transport_limits_02_grpc_options(self):
+        options = dict(TransportLimits(max_message_length=DEFAULT_GRPC_MAX_MESSAGE_LENGTH * 2).grpc_options())
+        self.assertEqual(options['grpc.max_send_message_length'], DEFAULT_GRPC_MAX_MESSAGE_LENGTH * 2)
+        self.assertEqual(options['grpc.max_receive_message_length'], DEFAULT_GRPC_MAX_MESSAGE_LENGTH * 2)
+        self.assertNotIn('grpc.http2.lookahead_bytes', options)
+
+        options = dict(TransportLimits(flow_control_window=16 * 1024 * 1024).grpc_options())
+        self.assertEqual(options['grpc.http2.lookahead_bytes'], 16 * 1024 * 1024)
+
+    def test_transport_limits_03_chunk_size_for(self):
+        limits = TransportLimits(chunk_size=64 * 1024 * 1024, max_message_length=2 * 64 * 1024 * 1024)
+
+        # peer that did not announce its limit uses default gRPC message length
+        self.assertEqual(limits.chunk_size_for(0), 64 * 1024 * 1024)
+        self.assertEqual(limits.chunk_size_for(CHUNK_OVERHEAD + 1000), 1000)
+        self.assertEqual(limits.chunk_size_for(4 * 64 * 1024 * 1024), 64 * 1024 * 1024)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -110,6 +110,28 @@ class TestNodeAgent(unittest.IsolatedAsyncioTestCase):
             await self.node_agent._status_task
             self.assertEqual(self.node_agent._status, NodeActiveStatus.DISCONNECTED)
 
+    async def test_node_agent_10_on_disconnect(self):
+        """Requests waiting for a reply are notified when the node disconnects"""
+        replied, pending = MagicMock(spec=SearchRequest), MagicMock(spec=SearchRequest)
+        replied.request_id, pending.request_id = 'request-1', 'request-2'
+        on_disconnect_replied, on_disconnect_pending = MagicMock(), MagicMock()
+
+        await self.node_agent.send_async(replied, on_reply=MagicMock(), on_disconnect=on_disconnect_replied)
+        await self.node_agent.send_async(pending, on_reply=MagicMock(), on_disconnect=on_disconnect_pending)
+        self.node_agent._replies['request-1']['reply'] = MagicMock()
+
+        with patch('fedbiomed.transport.node_agent.asyncio.sleep'):
+            self.node_agent._status = NodeActiveStatus.WAITING
+            await self.node_agent._change_node_status_disconnected()
+
+        on_disconnect_replied.assert_not_called()
+        on_disconnect_pending.assert_called_once_with()
+
+        # message sent to a disconnected node is notified immediately
+        on_disconnect = MagicMock()
+        await self.node_agent.send_async(message, on_disconnect=on_disconnect)
+        on_disconnect.assert_called_once_with()
+
 
 
 
@@ -152,5 +174,23 @@ class TestAgentStore(unittest.IsolatedAsyncioTestCase):
         result = await self.agent_store.get('node-id-1')
         self.assertEqual(result.id, 'node-id-1')
 
+    async def test_agent_store_04_wait_for_nodes(self):
+
+        mock = MagicMock()
+        by_count = asyncio.create_task(self.agent_store.wait_for_nodes(count=2))
+        by_ids = asyncio.create_task(self.agent_store.wait_for_nodes(node_ids=['node-id-2']))
+
+        await self.agent_store.retrieve(node_id='node-id-1', context=mock)
+        await asyncio.sleep(0)
+        self.assertFalse(by_count.done())
+        self.assertFalse(by_ids.done())
+
+        await self.agent_store.retrieve(node_id='node-id-2', context=mock)
+        await asyncio.wait_for(asyncio.gather(by_count, by_ids), timeout=1)
+
+        # returns at once when nodes are already registered
+        await asyncio.wait_for(self.agent_store.wait_for_nodes(count=0), timeout=1)
+        await asyncio.wait_for(self.agent_store.wait_for_nodes(node_ids=['node-id-1']), timeout=1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
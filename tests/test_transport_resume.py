@@ -0,0 +1,116 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import grpc
+
+import fedbiomed.transport.protocols.researcher_pb2_grpc as researcher_pb2_grpc
+from fedbiomed.transport.client import Channels, ResearcherCredentials, Sender, SenderLane
+from fedbiomed.transport.limits import TransportLimits
+from fedbiomed.transport.server import ResearcherServicer
+
+
+CHUNK_SIZE = 1000
+
+
+class InsecureChannels(Channels):
+    """Channels to the local test server, counting reconnections"""
+
+    connections = 0
+
+    def _create(self):
+        self.connections += 1
+        return grpc.aio.insecure_channel(f"{self._researcher.host}:{self._researcher.port}")
+
+
+class InterruptedReplyTask(grpc.aio.StreamUnaryMultiCallable):
+    """Streams a reply to the researcher, but breaks the stream after some chunks were received"""
+
+    def __init__(self, stub, transfers, interrupt_after: int):
+        self._stub = stub
+        self._transfers = transfers
+        self._interrupt_after = interrupt_after
+        self.transfer_id = None
+
+    def __call__(self, *args, **kwargs):
+        call = self._stub(*args, **kwargs)
+        write = call.write
+
+        async def interrupted_write(reply):
+            self.transfer_id = reply.transfer_id
+            if reply.iteration > self._interrupt_after:
+                # wait for researcher to receive the chunks already written, then kill the stream
+                while self._transfers.received(reply.transfer_id) < self._interrupt_after:
+                    await asyncio.sleep(0.01)
+                call.cancel()
+                raise grpc.aio.AioRpcError(
+                    code=grpc.StatusCode.UNAVAILABLE,
+                    initial_metadata=grpc.aio.Metadata(),
+                    trailing_metadata=grpc.aio.Metadata(),
+                    details="stream interrupted")
+            await write(reply)
+
+        call.write = interrupted_write
+        return call
+
+
+class TestReplyResume(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.reply = asyncio.get_running_loop().create_future()
+
+        node = MagicMock()
+        node.on_reply = AsyncMock(side_effect=self.reply.set_result)
+        agent_store = MagicMock()
+        agent_store.get = AsyncMock(return_value=node)
+
+        self.servicer = ResearcherServicer(agent_store=agent_store, on_message=MagicMock())
+        self.server = grpc.aio.server()
+        researcher_pb2_grpc.add_ResearcherServiceServicer_to_server(self.servicer, self.server)
+        port = self.server.add_insecure_port("127.0.0.1:0")
+        await self.server.start()
+
+        self.channels = InsecureChannels(ResearcherCredentials(port=str(port), host="127.0.0.1"))
+        await self.channels.connect()
+        self.sender = Sender(channels=self.channels, on_status_change=MagicMock(),
+                             limits=TransportLimits(chunk_size=CHUNK_SIZE))
+
+    async def asyncTearDown(self):
+        await self.server.stop(None)
+
+    @patch('fedbiomed.transport.client.GRPC_CLIENT_CONN_RETRY_TIMEOUT', 0)
+    async def test_reply_resume_01_interrupted_stream(self):
+        """Reply interrupted mid-upload is resumed after reconnecting, without resending received chunks"""
+        message = MagicMock()
+        message.get_dict.return_value = {'node_id': 'node-1', 'data': os.urandom(20 * CHUNK_SIZE)}
+
+        stub = InterruptedReplyTask(self.channels.task_stub.ReplyTask, self.servicer._transfers, 5)
+        queue = self.sender._queues[SenderLane.BULK]
+        await queue.put({'stub': stub, 'message': message, 'transfer': self.sender._prepare_reply(message)})
+
+        sent = []
+        stream_reply = self.sender._stream_reply
+
+        def spy_stream_reply(transfer, start=0):
+            sent.append((start, transfer.size))
+            return stream_reply(transfer, start)
+
+        with patch.object(self.sender, '_stream_reply', side_effect=spy_stream_reply):
+            task = asyncio.create_task(self.sender._listen())
+            reply = await asyncio.wait_for(self.reply, timeout=10)
+            await asyncio.wait_for(queue.join(), timeout=10)
+            task.cancel()
+
+        self.assertEqual(reply, message.get_dict.return_value)
+        # second stream starts from the first chunk not received by the researcher
+        size = sent[0][1]
+        self.assertEqual(sent, [(0, size), (5, size)])
+        self.assertEqual(self.servicer._transfers.received(stub.transfer_id), size)
+        # feedback and task channels were re-created after the interruption
+        self.assertEqual(self.channels.connections, 4)
+        self.assertEqual(self.sender._connection, 1)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -1,5 +1,8 @@
+import copy
 import unittest
+import zlib
 import asyncio 
+import threading
 
 
 
@@ -7,11 +10,16 @@ from unittest.mock import patch, MagicMock, AsyncMock, PropertyMock
 
 
 from fedbiomed.transport.node_agent import AgentStore
-from fedbiomed.transport.server import SSLCredentials, GrpcServer, _GrpcAsyncServer, ResearcherServicer, NodeAgent
+from fedbiomed.transport.server import SSLCredentials, GrpcServer, _GrpcAsyncServer, ResearcherServicer, NodeAgent, \
+    SerializedMessage, SharedFields
 from fedbiomed.transport.node_agent import NodeActiveStatus
+from fedbiomed.transport.compression import PayloadCompressor
+from fedbiomed.transport.limits import CHUNK_OVERHEAD, TransportLimits
 from fedbiomed.common.exceptions import FedbiomedCommunicationError
+from fedbiomed.common.serializer import Serializer
 from fedbiomed.common.message import SearchRequest, SearchReply
-from fedbiomed.transport.protocols.researcher_pb2 import TaskRequest, TaskResult, Empty, FeedbackMessage
+from fedbiomed.transport.protocols.researcher_pb2 import TaskRequest, TaskResult, Empty, FeedbackMessage, \
+    ReplyStatusRequest
 
 
 example_task = SearchRequest(
@@ -67,6 +75,51 @@ class TestResearcherServicer(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(r.iteration, 1)
             self.assertEqual(r.size, 1)
 
+    async def test_researcher_servicer_04_GetTaskUnary_serialized_message(self):
+
+        self.servicer = ResearcherServicer(
+            agent_store=self.agent_store,
+            on_message=self.on_message,
+            limits=TransportLimits(chunk_size=10)
+        )
+        task = SerializedMessage(example_task, [SharedFields({'tags': example_task.tags})])
+        node_agent = AsyncMock()
+        node_agent.set_context = MagicMock()
+        node_agent.task_done = MagicMock()
+        node_agent.get_task.return_value = task
+
+        self.agent_store.retrieve.return_value = node_agent
+        chunks = [r async for r in self.servicer.GetTaskUnary(request=self.request, context=self.context)]
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual([r.iteration for r in chunks], list(range(1, len(chunks) + 1)))
+        self.assertTrue(all(r.size == len(chunks) for r in chunks))
+        self.assertEqual(Serializer.loads(b''.join(r.bytes_ for r in chunks)), example_task.get_dict())
+
+
+    async def test_researcher_servicer_08_GetTaskUnary_negotiated_chunk_size(self):
+
+        self.servicer = ResearcherServicer(
+            agent_store=self.agent_store,
+            on_message=self.on_message,
+            limits=TransportLimits(chunk_size=50, max_message_length=CHUNK_OVERHEAD + 1000)
+        )
+        node_agent = AsyncMock()
+        node_agent.set_context = MagicMock()
+        node_agent.task_done = MagicMock()
+        node_agent.get_task.return_value = example_task
+        self.agent_store.retrieve.return_value = node_agent
+
+        # chunks are limited by researcher chunk size
+        chunks = [r async for r in self.servicer.GetTaskUnary(request=self.request, context=self.context)]
+        self.assertEqual(len(chunks[0].bytes_), 50)
+        self.assertTrue(all(r.max_message_length == CHUNK_OVERHEAD + 1000 for r in chunks))
+
+        # chunks are limited by the maximum message length of the node
+        request = TaskRequest(node="node-1", protocol_version="x", max_message_length=CHUNK_OVERHEAD + 30)
+        chunks = [r async for r in self.servicer.GetTaskUnary(request=request, context=self.context)]
+        self.assertEqual(len(chunks[0].bytes_), 30)
+        self.assertEqual(Serializer.loads(b''.join(r.bytes_ for r in chunks)), example_task.get_dict())
 
     @patch('fedbiomed.transport.server.Serializer.loads')
     async def test_researcher_servicer_02_ReplyTask(self, load):
@@ -81,10 +134,126 @@ class TestResearcherServicer(unittest.IsolatedAsyncioTestCase):
                 )
 
         load.return_value = {'node_id': 'test-node'}
-        result = await self.servicer.ReplyTask(request_iterator=request_iterator(), unused_context=self.context)
+        result = await self.servicer.ReplyTask(request_iterator=request_iterator(), context=self.context)
         self.assertEqual(result, Empty())
 
 
+    async def test_researcher_servicer_05_GetTaskUnary_compression(self):
+
+        self.servicer = ResearcherServicer(
+            agent_store=self.agent_store,
+            on_message=self.on_message,
+            compressor=PayloadCompressor(codec='zlib', threshold=0)
+        )
+        node_agent = AsyncMock()
+        node_agent.set_context = MagicMock()
+        node_agent.task_done = MagicMock()
+        node_agent.get_task.return_value = example_task
+        self.agent_store.retrieve.return_value = node_agent
+
+        # node announces it can decompress
+        request = TaskRequest(node="node-1", protocol_version="x", codecs=['zlib'])
+        chunks = [r async for r in self.servicer.GetTaskUnary(request=request, context=self.context)]
+        self.assertEqual(chunks[-1].compression, 'zlib')
+        self.assertIn('zlib', chunks[-1].codecs)
+        payload = PayloadCompressor.decompress(b''.join(r.bytes_ for r in chunks), chunks[-1].compression)
+        self.assertEqual(Serializer.loads(payload), example_task.get_dict())
+
+        # node cannot decompress
+        chunks = [r async for r in self.servicer.GetTaskUnary(request=self.request, context=self.context)]
+        self.assertEqual(chunks[-1].compression, '')
+        self.assertEqual(Serializer.loads(b''.join(r.bytes_ for r in chunks)), example_task.get_dict())
+
+    async def test_researcher_servicer_09_GetTaskUnary_shared_fields_compressed_once(self):
+
+        self.servicer = ResearcherServicer(
+            agent_store=self.agent_store,
+            on_message=self.on_message,
+            compressor=PayloadCompressor(codec='zlib', threshold=0)
+        )
+        shared_fields = SharedFields({'tags': example_task.tags})
+        node_agent = AsyncMock()
+        node_agent.set_context = MagicMock()
+        node_agent.task_done = MagicMock()
+        self.agent_store.retrieve.return_value = node_agent
+        request = TaskRequest(node="node-1", protocol_version="x", codecs=['zlib'])
+
+        with patch('fedbiomed.transport.compression.ZlibCodec.compress', autospec=True,
+                   side_effect=lambda _, data: zlib.compress(data)) as compress:
+            for request_id in ['request-1', 'request-2']:
+                task = copy.deepcopy(example_task)
+                task.request_id = request_id
+                node_agent.get_task.return_value = SerializedMessage(task, [shared_fields])
+
+                chunks = [r async for r in self.servicer.GetTaskUnary(request=request, context=self.context)]
+                self.assertEqual(chunks[-1].compression, 'zlib+frames')
+                payload = PayloadCompressor.decompress(b''.join(r.bytes_ for r in chunks), chunks[-1].compression)
+                self.assertEqual(Serializer.loads(payload), task.get_dict())
+
+        # shared fields compressed for the first task only
+        self.assertEqual(compress.call_count, 3)
+
+    async def test_researcher_servicer_06_ReplyTask_compression(self):
+
+        node = AsyncMock()
+        self.agent_store.get.return_value = node
+        message = {'node_id': 'test-node', 'timing': {'rtime_training': 1.}, 'params': list(range(1000))}
+        payload, compression, _ = PayloadCompressor(codec='zlib', threshold=0).compress(
+            [Serializer.dumps(message)], ['zlib'])
+
+        async def request_iterator():
+            yield TaskResult(size=1, iteration=1, bytes_=payload[0], compression=compression,
+                             compression_time=0.5)
+
+        await self.servicer.ReplyTask(request_iterator=request_iterator(), context=self.context)
+        reply = node.on_reply.call_args.args[0]
+        self.assertEqual(reply['params'], message['params'])
+        self.assertEqual(reply['timing']['rtime_training'], 1.)
+        self.assertEqual(reply['timing']['rtime_compression'], 0.5)
+        self.assertGreater(reply['timing']['compression_ratio'], 1)
+        self.assertIn('rtime_decompression', reply['timing'])
+
+    async def test_researcher_servicer_07_ReplyTask_resume_transfer(self):
+
+        node = AsyncMock()
+        self.agent_store.get.return_value = node
+        payload = Serializer.dumps({'node_id': 'test-node', 'params': list(range(100))})
+        chunks = [payload[i:i + 50] for i in range(0, len(payload), 50)]
+
+        def request_iterator(iterations, transfer_id='transfer-1'):
+            async def iterator():
+                for i in iterations:
+                    yield TaskResult(size=len(chunks), iteration=i, bytes_=chunks[i - 1], transfer_id=transfer_id)
+            return iterator()
+
+        async def received(transfer_id='transfer-1'):
+            status = await self.servicer.GetReplyStatus(ReplyStatusRequest(transfer_id=transfer_id), self.context)
+            return status.received
+
+        self.assertEqual(await received(), 0)
+
+        # stream breaks after the first chunk
+        await self.servicer.ReplyTask(request_iterator=request_iterator([1]), context=self.context)
+        node.on_reply.assert_not_called()
+        self.assertEqual(await received(), 1)
+
+        # transfer is resumed, already received chunks are ignored
+        await self.servicer.ReplyTask(request_iterator=request_iterator(range(1, len(chunks) + 1)),
+                                      context=self.context)
+        node.on_reply.assert_called_once_with(Serializer.loads(payload))
+        self.assertEqual(await received(), len(chunks))
+
+        # completed transfer is not delivered twice
+        await self.servicer.ReplyTask(request_iterator=request_iterator([len(chunks)]), context=self.context)
+        node.on_reply.assert_called_once()
+
+        # missing chunks abort the stream
+        self.context.abort = AsyncMock(side_effect=Exception('aborted'))
+        with self.assertRaises(Exception):
+            await self.servicer.ReplyTask(request_iterator=request_iterator([2], 'transfer-2'), context=self.context)
+        self.context.abort.assert_called_once()
+        self.assertEqual(await received('transfer-2'), 0)
+
     async def test_researcher_servicer_03_Feedback(self):
 
         request = FeedbackMessage(
@@ -170,9 +339,15 @@ class TestGrpcAsyncServer(unittest.IsolatedAsyncioTestCase):
         self.agent_store_mock.return_value.get_all.return_value = agents
         await self.grpc_server.start()
         await self.grpc_server.broadcast(example_task)
-        agents['node-2'].send_async.assert_called_once()
+        agents['node-1'].send_async.assert_called_once()
         agents['node-2'].send_async.assert_called_once()
 
+        # message is serialized once for all nodes
+        message_1 = agents['node-1'].send_async.call_args.args[0]
+        message_2 = agents['node-2'].send_async.call_args.args[0]
+        self.assertIsInstance(message_1, SerializedMessage)
+        self.assertIs(message_1, message_2)
+
 
     async def test_grpc_async_server_04_get_all_nodes(self):
 
@@ -190,6 +365,15 @@ class TestGrpcAsyncServer(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(nodes[0]._status, NodeActiveStatus.DISCONNECTED)
         self.assertEqual(nodes[1]._status, NodeActiveStatus.ACTIVE)
 
+    async def test_grpc_async_server_05_wait_for_nodes_grace_period(self):
+        """Without expected nodes, server is ready after a grace period once a node has connected"""
+        self.agent_store_mock.return_value.wait_for_nodes = AsyncMock()
+        await self.grpc_server.start()
+        with patch('fedbiomed.transport.server.GRPC_SERVER_SETUP_TIMEOUT', 0.3):
+            self.assertFalse(await self.grpc_server.wait_ready(timeout=0.1))
+            self.assertTrue(await self.grpc_server.wait_ready(timeout=1))
+        self.agent_store_mock.return_value.wait_for_nodes.assert_called_once_with(count=1)
+
 
 class TestGrpcServer(unittest.IsolatedAsyncioTestCase):
 
@@ -245,30 +429,53 @@ class TestGrpcServer(unittest.IsolatedAsyncioTestCase):
             port="50051",
             ssl=self.ssl_credentials,
             on_message=self.on_message,
-            debug=False
+            debug=False,
+            expected_nodes=['node-1'],
+            setup_timeout=5
         )
 
         self.asyncio_patch.stop()
 
-        with patch("fedbiomed.transport.server.MAX_GRPC_SERVER_SETUP_TIMEOUT", 2):
-            self.grpc_server.start()
+        # server runs until termination is set
+        termination = threading.Event()
+        self.server_mock.return_value.wait_for_termination.side_effect = \
+            lambda: asyncio.get_running_loop().run_in_executor(None, termination.wait)
+
+        # expected nodes connect
+        get_all_nodes.return_value = [1]
+        try:
+            with patch('fedbiomed.transport.server.logger') as logger:
+                self.grpc_server.start()
+            self.assertTrue(self.grpc_server._is_ready.is_set())
+        finally:
+            termination.set()
+            self.grpc_server._thread.join()
 
         self.server_mock.return_value.start.assert_called_once()
         self.server_mock.return_value.wait_for_termination.assert_called_once()
-        self.grpc_server._thread.join()
+        self.agent_store_mock.return_value.wait_for_nodes.assert_called_once_with(node_ids=['node-1'])
+        logger.warning.assert_not_called()
 
         self.server_mock.return_value.start.reset_mock()
-        self.server_mock.return_value.wait_for_termination.reset_mock()
         self.grpc_server._debug = True
 
-
-        get_all_nodes.side_effect = [ [], [1, 2]]    
-        self.grpc_server.start()
-
+        # expected nodes don't connect before timeout: server keeps running
+        termination.clear()
+        async def never_connect(**_):
+            await asyncio.sleep(60)
+        self.agent_store_mock.return_value.wait_for_nodes.side_effect = never_connect
+        self.grpc_server._setup_timeout = 0.5
+        try:
+            with patch('fedbiomed.transport.server.logger') as logger:
+                self.grpc_server.start()
+            self.assertFalse(self.grpc_server._is_ready.is_set())
+            self.assertTrue(self.grpc_server._thread.is_alive())
+        finally:
+            termination.set()
+            self.grpc_server._thread.join()
+
+        logger.warning.assert_called_once()
         self.server_mock.return_value.start.assert_called_once()
-        self.server_mock.return_value.wait_for_termination.assert_called_once()
-
-        self.grpc_server._thread.join()
 
     def test_grpc_server_02_send(self):
 
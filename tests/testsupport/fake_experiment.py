@@ -37,6 +37,7 @@ class ExperimentMock:
                 tensorboard: bool = False,
                 experimentation_folder: Union[str, None] = None,
                 secagg: Union[bool, SecureAggregation] = False,
+                retained_rounds: Optional[int] = 1,
                 ):
         """ Constructor of the class.
 
@@ -50,6 +51,7 @@ class ExperimentMock:
         self._node_selection_strategy = node_selection_strategy
         self._round_current = 0
         self._round_limit = round_limit
+        self._retained_rounds = retained_rounds
         self._experimentation_folder = experimentation_folder
         self._training_plan_class = training_plan_class
         self._training_plan_path = training_plan_path
@@ -74,6 +74,13 @@ class NodeEnviron:
 
         self._values['MPSPDZ_CERTIFICATE_KEY'] = 'dummy/path'
         self._values['MPSPDZ_CERTIFICATE_PEM'] = 'dummy/path'
+        self._values['COMPRESSION_CODEC'] = None
+        self._values['COMPRESSION_THRESHOLD'] = 65536
+        self._values['COMPRESSION_SHUFFLE'] = False
+        self._values['CHUNK_SIZE'] = 4000000
+        self._values['GRPC_MAX_MESSAGE_LENGTH'] = 100 * 1024 * 1024
+        self._values['GRPC_FLOW_CONTROL_WINDOW'] = 0
+        self._values['SECAGG_WORKERS'] = 1
 
     def __getitem__(self, key):
         return self._values[key]
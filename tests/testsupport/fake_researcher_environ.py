@@ -9,7 +9,7 @@ import shutil
 import uuid
 from fedbiomed.common.exceptions import FedbiomedEnvironError
 from fedbiomed.common.logger import logger
-from fedbiomed.common.constants import __researcher_config_version__
+from fedbiomed.common.constants import __researcher_config_version__, ParamsDeltaMode
 
 
 __config_version__ = __researcher_config_version__
@@ -68,6 +68,16 @@ class ResearcherEnviron:
 
         self._values['MPSPDZ_CERTIFICATE_KEY'] = 'dummy/path'
         self._values['MPSPDZ_CERTIFICATE_PEM'] = 'dummy/path'
+        self._values['COMPRESSION_CODEC'] = None
+        self._values['COMPRESSION_THRESHOLD'] = 65536
+        self._values['COMPRESSION_SHUFFLE'] = False
+        self._values['CHUNK_SIZE'] = 4000000
+        self._values['GRPC_MAX_MESSAGE_LENGTH'] = 100 * 1024 * 1024
+        self._values['GRPC_FLOW_CONTROL_WINDOW'] = 0
+        self._values['SECAGG_WORKERS'] = 1
+        self._values['SERVER_EXPECTED_NODES'] = None
+        self._values['SERVER_SETUP_TIMEOUT'] = None
+        self._values['PARAMS_DELTA'] = ParamsDeltaMode.NONE
 
         self._values['SERVER_SSL_KEY'] = b'key'
         self._values['SERVER_SSL_CERT'] = b'cert'
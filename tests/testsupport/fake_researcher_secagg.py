@@ -2,6 +2,9 @@ from typing import Union, List
 
 FAKE_CONTEXT_VALUE = "MY_CONTEXT"
 
+# biprime of the key size used for secure aggregation, to encrypt and aggregate parameters in tests
+FAKE_BIPRIME = 158820908809271716671659880613366104677813341255487834154303909761107215283569995523817428402987962641429395032343305343341950966867458277812575065022203120547706127493272939455658018882112230042773163870472621818892994896895819790062496734944602899772583591514631486212290112369502692304700112819186167541107
+
 
 class FakeSecaggContext:
     def __init__(self, parties: List[str], job_id: str):